@@ -0,0 +1,57 @@
+"""add project prefect indexes
+
+Revision ID: 1cca57fba1f2
+Revises:
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '1cca57fba1f2'
+down_revision: Union[str, Sequence[str], None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (索引名称, 表名, 索引列)，与项目、项目流程及审核意见模型中声明的索引保持一致
+PROJECT_INDEXES = [
+    ('idx_project_del_status_time', 'project', ['del_flag', 'prefect_status', 'create_time']),
+    ('idx_project_create_time', 'project', ['create_time']),
+    ('idx_project_prefect_pro', 'project_prefect', ['pro_id', 'del_flag', 'update_time']),
+    ('idx_project_prefect_status', 'project_prefect', ['current_status', 'del_flag', 'update_time']),
+    ('idx_project_opinion_project', 'project_prefect_opinion', ['project_id', 'del_flag', 'create_time']),
+]
+
+
+def get_existing_indexes(table_name: str) -> Union[set[str], None]:
+    """
+    获取表中已存在的索引名称
+
+    :param table_name: 表名
+    :return: 已存在的索引名称集合，表不存在时返回None
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for index_name, table_name, columns in PROJECT_INDEXES:
+        existing_indexes = get_existing_indexes(table_name)
+        if existing_indexes is not None and index_name not in existing_indexes:
+            op.create_index(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for index_name, table_name, _ in reversed(PROJECT_INDEXES):
+        existing_indexes = get_existing_indexes(table_name)
+        if existing_indexes is not None and index_name in existing_indexes:
+            op.drop_index(index_name, table_name=table_name)
@@ -0,0 +1,73 @@
+"""add search indexes
+
+Revision ID: 5d0e8b3a7c21
+Revises: 1cca57fba1f2
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from collections.abc import Sequence
+from typing import Union
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '5d0e8b3a7c21'
+down_revision: Union[str, Sequence[str], None] = '1cca57fba1f2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (索引名称, 表名, 索引列)，与项目、企业及合同模型中以 SearchUtil.get_search_index 声明的全文索引保持一致
+SEARCH_INDEXES = [
+    ('ft_project_name', 'project', 'project_name'),
+    ('ft_project_code', 'project', 'project_code'),
+    ('ft_enterprise_name', 'enterprise_info', 'enterprise_name'),
+    ('ft_contact_person', 'enterprise_info', 'contact_person'),
+    ('ft_contract_name', 'contract', 'contract_name'),
+]
+
+
+def get_existing_indexes(table_name: str) -> Union[set[str], None]:
+    """
+    获取表中已存在的索引名称
+
+    :param table_name: 表名
+    :return: 已存在的索引名称集合，表不存在时返回None
+    """
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table(table_name):
+        return None
+    return {index['name'] for index in inspector.get_indexes(table_name)}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    dialect_name = op.get_bind().dialect.name
+    if dialect_name not in ('mysql', 'postgresql'):
+        return
+    if dialect_name == 'postgresql':
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, table_name, column_name in SEARCH_INDEXES:
+        existing_indexes = get_existing_indexes(table_name)
+        if existing_indexes is None or index_name in existing_indexes:
+            continue
+        op.create_index(
+            index_name,
+            table_name,
+            [column_name],
+            mysql_prefix='FULLTEXT',
+            mysql_with_parser='ngram',
+            postgresql_using='gin',
+            postgresql_ops={column_name: 'gin_trgm_ops'},
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name not in ('mysql', 'postgresql'):
+        return
+    for index_name, table_name, _ in reversed(SEARCH_INDEXES):
+        existing_indexes = get_existing_indexes(table_name)
+        if existing_indexes is not None and index_name in existing_indexes:
+            op.drop_index(index_name, table_name=table_name)
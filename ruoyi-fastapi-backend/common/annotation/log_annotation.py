@@ -8,7 +8,7 @@ from typing import Any, Callable, Literal, Optional, TypeVar
 
 import httpx
 from async_lru import alru_cache
-from fastapi import Request
+from fastapi import Request, Response
 from fastapi.responses import JSONResponse, ORJSONResponse, UJSONResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.status import HTTP_200_OK
@@ -18,7 +18,8 @@ from user_agents import parse
 from common.context import RequestContext
 from common.enums import BusinessType
 from config.env import AppConfig
-from exceptions.exception import LoginException, ServiceException, ServiceWarning
+from config.get_log_writer import LogWriterUtil
+from exceptions.exception import ConflictException, LoginException, ServiceException, ServiceWarning
 from module_admin.entity.vo.log_vo import LogininforModel, OperLogModel
 from module_admin.service.log_service import LoginLogService, OperationLogService
 from utils.dependency_util import DependencyUtil
@@ -88,15 +89,8 @@ class Log:
             try:
                 # 调用原始函数
                 result = await func(*args, **kwargs)
-            except (LoginException, ServiceWarning) as e:
-                logger.warning(e.message)
-                result = ResponseUtil.failure(data=e.data, msg=e.message)
-            except ServiceException as e:
-                logger.error(e.message)
-                result = ResponseUtil.error(data=e.data, msg=e.message)
             except Exception as e:
-                logger.exception(e)
-                result = ResponseUtil.error(msg=str(e))
+                result = self._get_exception_result(e)
             # 获取请求耗时
             cost_time = float(time.perf_counter() - start_time) * 1000
             # 判断请求是否来自api文档
@@ -122,7 +116,10 @@ class Log:
                         }
                     )
 
-                    await LoginLogService.add_login_log_services(query_db, LogininforModel(**login_log))
+                    login_log_model = LogininforModel(**login_log)
+                    # 日志异步写入未开启或已关闭时在请求内同步写入
+                    if not await LogWriterUtil.submit_log(login_log_model):
+                        await LoginLogService.add_login_log_services(query_db, login_log_model)
             else:
                 current_user = RequestContext.get_current_user()
                 oper_name = current_user.user.user_name
@@ -145,7 +142,8 @@ class Log:
                     operTime=oper_time,
                     costTime=int(cost_time),
                 )
-                await OperationLogService.add_operation_log_services(query_db, operation_log)
+                if not await LogWriterUtil.submit_log(operation_log):
+                    await OperationLogService.add_operation_log_services(query_db, operation_log)
 
             return result
 
@@ -293,6 +291,25 @@ class Log:
         if 'form_data' in origin_kwargs:
             origin_kwargs['form_data'].login_info = login_log
 
+    def _get_exception_result(self, exc: Exception) -> Response:
+        """
+        根据被装饰函数抛出的异常获取对应的响应结果
+
+        :param exc: 异常对象
+        :return: 响应结果
+        """
+        if isinstance(exc, (LoginException, ServiceWarning)):
+            logger.warning(exc.message)
+            return ResponseUtil.failure(data=exc.data, msg=exc.message)
+        if isinstance(exc, ConflictException):
+            logger.warning(exc.message)
+            return ResponseUtil.conflict(data=exc.data, msg=exc.message)
+        if isinstance(exc, ServiceException):
+            logger.error(exc.message)
+            return ResponseUtil.error(data=exc.data, msg=exc.message)
+        logger.exception(exc)
+        return ResponseUtil.error(msg=str(exc))
+
     def _get_status_and_error_msg(self, result_dict: dict) -> tuple[int, str]:
         """
         获取操作状态和错误信息
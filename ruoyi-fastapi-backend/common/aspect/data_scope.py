@@ -1,12 +1,15 @@
 from typing import Optional
 
 from fastapi import Depends, Request, params
-from sqlalchemy import ColumnElement, func, or_, select
+from sqlalchemy import ColumnElement, or_
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.context import RequestContext
 from config.database import Base
-from module_admin.entity.do.dept_do import SysDept
-from module_admin.entity.do.role_do import SysRoleDept
+from config.get_db import get_db
+from module_admin.dao.dept_dao import DeptDao
+from module_admin.entity.vo.user_vo import CurrentUserModel, UserDataScopeModel
+from module_admin.service.user_cache_service import UserCacheService
 from utils.dependency_util import DependencyUtil
 
 
@@ -38,65 +41,86 @@ class GetDataScope:
         self.user_alias = user_alias
         self.dept_alias = dept_alias
 
-    def __call__(self, request: Request) -> ColumnElement:
+    async def __call__(self, request: Request, query_db: AsyncSession = Depends(get_db)) -> ColumnElement:
         DependencyUtil.check_exclude_routes(request, err_msg='当前路由不在认证规则内，不可使用GetDataScope依赖项')
         current_user = RequestContext.get_current_user()
-        user_id = current_user.user.user_id
-        dept_id = current_user.user.dept_id
-        custom_data_scope_role_id_list = [
-            item.role_id for item in current_user.user.role if item.data_scope == self.DATA_SCOPE_CUSTOM
-        ]
+        data_scope = await self._get_user_data_scope(request, query_db, current_user)
+        if data_scope.all_data:
+            return or_(True)
         param_sql_list = []
-        for role in current_user.user.role:
-            if current_user.user.admin or role.data_scope == self.DATA_SCOPE_ALL:
-                param_sql_list = [True]
-                break
-            if role.data_scope == self.DATA_SCOPE_CUSTOM:
-                if len(custom_data_scope_role_id_list) > 1:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(custom_data_scope_role_id_list))
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-                else:
-                    param_sql_list.append(
-                        getattr(self.query_alias, self.dept_alias).in_(
-                            select(SysRoleDept.dept_id).where(SysRoleDept.role_id == role.role_id)
-                        )
-                        if hasattr(self.query_alias, self.dept_alias)
-                        else False
-                    )
-            elif role.data_scope == self.DATA_SCOPE_DEPT:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias) == dept_id
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_DEPT_AND_CHILD:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.dept_alias).in_(
-                        select(SysDept.dept_id).where(
-                            or_(SysDept.dept_id == dept_id, func.find_in_set(dept_id, SysDept.ancestors))
-                        )
-                    )
-                    if hasattr(self.query_alias, self.dept_alias)
-                    else False
-                )
-            elif role.data_scope == self.DATA_SCOPE_SELF:
-                param_sql_list.append(
-                    getattr(self.query_alias, self.user_alias) == user_id
-                    if hasattr(self.query_alias, self.user_alias)
-                    else False
-                )
-            else:
-                param_sql_list.append(False)
-        param_sql_list = list(dict.fromkeys(param_sql_list))
-        param_sql = or_(*param_sql_list)
+        if data_scope.dept_ids is not None:
+            param_sql_list.append(
+                getattr(self.query_alias, self.dept_alias).in_(data_scope.dept_ids)
+                if hasattr(self.query_alias, self.dept_alias)
+                else False
+            )
+        if data_scope.self_data:
+            param_sql_list.append(
+                getattr(self.query_alias, self.user_alias) == current_user.user.user_id
+                if hasattr(self.query_alias, self.user_alias)
+                else False
+            )
+        param_sql = or_(*param_sql_list) if param_sql_list else or_(False)
 
         return param_sql
 
+    @classmethod
+    async def _get_user_data_scope(
+        cls, request: Request, query_db: AsyncSession, current_user: CurrentUserModel
+    ) -> UserDataScopeModel:
+        """
+        获取当前用户的数据权限，优先读取会话缓存，未命中时解析角色数据权限并写入缓存
+
+        :param request: Request对象
+        :param query_db: orm对象
+        :param current_user: 当前用户信息
+        :return: 当前用户的数据权限
+        """
+        data_scope = UserCacheService.parse_data_scope_cache_services(
+            getattr(request.state, 'data_scope_cache_value', None)
+        )
+        if data_scope is not None:
+            return data_scope
+        data_scope = await cls._resolve_user_data_scope(query_db, current_user)
+        token_id = getattr(request.state, 'token_id', None)
+        if token_id is not None:
+            await UserCacheService.set_data_scope_cache_services(
+                request.app.state.redis, current_user.user.user_id, token_id, data_scope
+            )
+            request.state.data_scope_cache_value = data_scope.model_dump_json(by_alias=True)
+
+        return data_scope
+
+    @classmethod
+    async def _resolve_user_data_scope(
+        cls, query_db: AsyncSession, current_user: CurrentUserModel
+    ) -> UserDataScopeModel:
+        """
+        根据当前用户的角色解析数据权限，将部门类数据权限合并为可见部门id列表
+
+        :param query_db: orm对象
+        :param current_user: 当前用户信息
+        :return: 当前用户的数据权限
+        """
+        role_list = current_user.user.role
+        if current_user.user.admin or any(role.data_scope == cls.DATA_SCOPE_ALL for role in role_list):
+            return UserDataScopeModel(allData=True)
+        data_scope_set = {role.data_scope for role in role_list}
+        custom_data_scope_role_id_list = [
+            role.role_id for role in role_list if role.data_scope == cls.DATA_SCOPE_CUSTOM
+        ]
+        with_dept = bool({cls.DATA_SCOPE_DEPT, cls.DATA_SCOPE_DEPT_AND_CHILD} & data_scope_set)
+        dept_ids = None
+        if custom_data_scope_role_id_list or with_dept:
+            dept_ids = await DeptDao.get_data_scope_dept_ids_dao(
+                query_db,
+                custom_data_scope_role_id_list,
+                current_user.user.dept_id if with_dept else None,
+                cls.DATA_SCOPE_DEPT_AND_CHILD in data_scope_set,
+            )
+
+        return UserDataScopeModel(deptIds=dept_ids, selfData=cls.DATA_SCOPE_SELF in data_scope_set)
+
 
 def DataScopeDependency(  # noqa: N802
     query_alias: Base,
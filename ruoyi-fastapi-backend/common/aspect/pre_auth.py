@@ -5,7 +5,6 @@ from fastapi import Depends, Request, params
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from common.context import RequestContext
 from config.env import AppConfig
 from config.get_db import get_db
 from exceptions.exception import AuthException
@@ -28,6 +27,74 @@ class ExcludeRoute(TypedDict, total=False):
     ignore_paths: list[str]
 
 
+class ExcludeRouteMatcher:
+    """
+    排除路由匹配器，将排除路由按请求方法编译为单个合并正则表达式
+    """
+
+    def __init__(self, exclude_routes: list[ExcludeRoute]) -> None:
+        """
+        初始化排除路由匹配器
+
+        :param exclude_routes: 需要排除的路由列表
+        """
+        # 所有方法均适用的路径模式，以及仅适用于特定方法的路径模式
+        any_method_patterns: list[str] = []
+        method_patterns: dict[str, list[str]] = {}
+        for route in exclude_routes:
+            pattern_str = self._compile_path_pattern(route.get('path', ''), route.get('ignore_paths', []))
+            methods = [method.upper() for method in route.get('methods', [])]
+            if not methods:
+                any_method_patterns.append(pattern_str)
+            for method in methods:
+                method_patterns.setdefault(method, []).append(pattern_str)
+        self._any_method_regex = self._build_regex(any_method_patterns)
+        self._method_regex_map = {
+            method: self._build_regex(any_method_patterns + patterns) for method, patterns in method_patterns.items()
+        }
+
+    @staticmethod
+    def _compile_path_pattern(path: str, ignore_paths: list[str]) -> str:
+        """
+        将FastAPI路径转换为正则表达式片段
+
+        :param path: FastAPI路径（如 /configKey/{config_key}）
+        :param ignore_paths: 需要忽略的特定路径列表
+        :return: 正则表达式片段
+        """
+        # 将FastAPI路径参数转换为正则表达式
+        # 例如：/configKey/{config_key} -> /configKey/[^/]+
+        pattern_str = re.sub(r'\{[^}]+\}', r'[^/]+', path)
+        if ignore_paths:
+            # 忽略路径使用否定前瞻排除，即使匹配通配符也不排除
+            ignore_str = '|'.join(re.escape(ignore_path) for ignore_path in ignore_paths)
+            pattern_str = f'(?!(?:{ignore_str})$){pattern_str}'
+        return pattern_str
+
+    @staticmethod
+    def _build_regex(patterns: list[str]) -> Optional[re.Pattern]:
+        """
+        将多个正则表达式片段合并为单个带锚点的正则表达式
+
+        :param patterns: 正则表达式片段列表
+        :return: 编译后的正则表达式，片段为空时返回None
+        """
+        if not patterns:
+            return None
+        return re.compile(f'^(?:{"|".join(patterns)})$')
+
+    def match(self, path: str, method: str) -> bool:
+        """
+        判断请求路径和方法是否匹配排除路由
+
+        :param path: 请求路径（已去除APP_ROOT_PATH前缀）
+        :param method: 请求方法
+        :return: 是否匹配
+        """
+        regex = self._method_regex_map.get(method, self._any_method_regex)
+        return regex is not None and regex.match(path) is not None
+
+
 # 创建OAuth2PasswordBearer对象
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl='/login')
 
@@ -46,39 +113,8 @@ class PreAuth:
                             methods 可以是字符串或列表，空列表表示所有方法
         """
         self.exclude_routes = exclude_routes or []
-        # 编译排除路径为正则表达式模式，并存储方法信息
-        self.exclude_patterns = []
-
-        for route in self.exclude_routes:
-            # 使用TypedDict，确保路由字典包含path字段
-            path = route.get('path', '')
-            methods = route.get('methods', [])
-            ignore_paths = route.get('ignore_paths', [])
-
-            # 编译路径为正则表达式
-            pattern = self._compile_path_pattern(path)
-            # 存储编译后的模式和方法信息
-            self.exclude_patterns.append(
-                {
-                    'pattern': pattern,
-                    'methods': [method.upper() for method in methods],
-                    'original_path': path,
-                    'ignore_paths': ignore_paths,
-                }
-            )
-
-    def _compile_path_pattern(self, path: str) -> re.Pattern:
-        """
-        将FastAPI路径转换为正则表达式模式
-
-        :param path: FastAPI路径（如 /configKey/{config_key}）
-        :return: 编译后的正则表达式模式
-        """
-        # 将FastAPI路径参数转换为正则表达式
-        # 例如：/configKey/{config_key} -> /configKey/[^/]+
-        pattern_str = re.sub(r'\{[^}]+\}', r'[^/]+', path)
-        # 添加开始和结束锚点，确保精确匹配
-        return re.compile(f'^{pattern_str}$')
+        # 在路由注册时将排除路由一次性编译为按请求方法划分的合并正则，请求时只需一次匹配
+        self.exclude_matcher = ExcludeRouteMatcher(self.exclude_routes)
 
     async def __call__(self, request: Request, db: AsyncSession = Depends(get_db)) -> Union[CurrentUserModel, None]:
         """
@@ -99,23 +135,12 @@ class PreAuth:
         if app_root_path and path.startswith(app_root_path):
             path = path[len(app_root_path) :]
 
-        # 设置上下文变量
-        RequestContext.set_current_exclude_patterns(self.exclude_patterns)
-
-        # 检查路径和方法是否匹配排除模式
-        for item in self.exclude_patterns:
-            pattern = item['pattern']
-            exclude_methods = item['methods']
-            ignore_paths = item['ignore_paths']
-
-            # 检查当前路径是否在忽略列表中
-            if path in ignore_paths:
-                continue
-
-            # 检查路径是否匹配，并且methods为空列表（匹配所有方法）或者当前方法在允许列表中
-            if pattern.match(path) and (not exclude_methods or method in exclude_methods):
-                # 跳过认证
-                return None
+        # 将匹配结果存储到request.state，后续依赖项直接读取，无需重复匹配
+        is_exclude_route = self.exclude_matcher.match(path, method)
+        request.state.is_exclude_route = is_exclude_route
+        if is_exclude_route:
+            # 跳过认证
+            return None
 
         # 否则执行正常认证
         token = request.headers.get('Authorization')
@@ -50,3 +50,12 @@ class RedisInitKeyConfig(Enum):
     ACCOUNT_LOCK = {'key': 'account_lock', 'remark': '用户锁定'}
     PASSWORD_ERROR_COUNT = {'key': 'password_error_count', 'remark': '密码错误次数'}
     SMS_CODE = {'key': 'sms_code', 'remark': '短信验证码'}
+    CURRENT_USER = {'key': 'current_user', 'remark': '登录用户信息'}
+    DATA_SCOPE = {'key': 'data_scope', 'remark': '用户数据权限'}
+    USER_SESSION = {'key': 'user_session', 'remark': '用户会话索引'}
+    ONLINE_SESSION = {'key': 'online_session', 'remark': '在线用户会话信息'}
+    PAGE_COUNT = {'key': 'page_count', 'remark': '分页总数统计缓存'}
+    EXPORT_TASK = {'key': 'export_task', 'remark': '后台导出任务'}
+    PREFECT_STATS = {'key': 'prefect_stats', 'remark': '项目流程状态计数'}
+    ENTERPRISE_SUGGEST = {'key': 'enterprise_suggest', 'remark': '企业名称联想索引'}
+    DEPT_CLOSURE = {'key': 'dept_closure', 'remark': '部门闭包表重建锁'}
@@ -87,8 +87,25 @@ class PageModel(BaseModel, Generic[T]):
     rows: list[T] = Field(description='记录列表')
     page_num: int = Field(description='当前页码')
     page_size: int = Field(description='每页记录数')
-    total: int = Field(description='总记录数')
+    total: Optional[int] = Field(default=None, description='总记录数，游标分页时不返回')
+    total_exact: Optional[bool] = Field(default=None, description='总记录数是否为精确值，为否时表示估算值')
     has_next: bool = Field(description='是否有下一页')
+    next_cursor: Optional[str] = Field(default=None, description='下一页游标，仅游标分页时返回')
+
+
+class ImportResultModel(BaseModel):
+    """
+    Excel导入结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    dry_run: bool = Field(default=False, description='是否仅校验不写入数据')
+    total_count: int = Field(default=0, description='数据总行数')
+    insert_count: int = Field(default=0, description='新增行数，仅校验时为可新增的行数')
+    update_count: int = Field(default=0, description='更新行数，仅校验时为可更新的行数')
+    fail_count: int = Field(default=0, description='失败行数')
+    error_list: list[str] = Field(default=[], description='失败行的错误信息，超过上限的部分不返回')
 
 
 class PageResponseModel(PageModel, ResponseBaseModel, Generic[T]):
@@ -24,6 +24,25 @@ class AppSettings(BaseSettings):
     app_reload: bool = True
     app_ip_location_query: bool = True
     app_same_time_login: bool = True
+    app_user_cache_local_size: int = 0
+    app_user_cache_local_ttl: int = 10
+    app_pwd_hash_workers: int = 4
+    app_log_async_enabled: bool = True
+    app_log_queue_size: int = 10000
+    app_log_batch_size: int = 200
+    app_log_flush_interval: float = 1.0
+    app_log_overflow_policy: Literal['block', 'drop_new', 'drop_oldest'] = 'block'
+    app_log_block_timeout: float = 1.0
+    app_log_drain_timeout: float = 10.0
+    app_page_count_cache_ttl: int = 30
+    app_page_count_estimate_threshold: int = 1000000
+    app_export_max_workers: int = 2
+    app_export_user_max_tasks: int = 2
+    app_export_queue_size: int = 20
+    app_export_file_ttl: int = 3600
+    app_prefect_stats_reconcile_interval: int = 300
+    app_search_ngram_token_size: int = 2
+    app_enterprise_suggest_backend: Literal['memory', 'redis'] = 'memory'
 
 
 class JwtSettings(BaseSettings):
@@ -217,8 +236,8 @@ class GetConfig:
             # 使用argparse定义命令行参数
             parser = argparse.ArgumentParser(description='命令行参数')
             parser.add_argument('--env', type=str, default='', help='运行环境')
-            # 解析命令行参数
-            args = parser.parse_args()
+            # 解析命令行参数，忽略未定义的参数，以便导入配置的脚本定义自身的命令行参数
+            args, _ = parser.parse_known_args()
             # 设置环境变量，如果未设置命令行参数，默认APP_ENV为dev
             os.environ['APP_ENV'] = args.env if args.env else 'dev'
         # 读取运行环境
@@ -1,8 +1,10 @@
 from collections.abc import AsyncGenerator
 
+from redis import asyncio as aioredis
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from config.database import AsyncSessionLocal, Base, async_engine
+from module_admin.service.dept_service import DeptService
 from utils.log_util import logger
 
 
@@ -26,3 +28,14 @@ async def init_create_table() -> None:
     async with async_engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
     logger.info('✅️ 数据库连接成功')
+
+
+async def init_dept_closure(redis: aioredis.Redis) -> None:
+    """
+    应用启动时初始化部门闭包表，闭包表为空时根据部门表祖级列表回填
+
+    :param redis: redis对象
+    :return:
+    """
+    async with AsyncSessionLocal() as session:
+        await DeptService.init_dept_closure_services(session, redis)
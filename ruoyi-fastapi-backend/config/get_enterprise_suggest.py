@@ -0,0 +1,433 @@
+import asyncio
+import json
+import unicodedata
+from bisect import bisect_left, insort
+from collections.abc import Iterable, Sequence
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from redis import asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from common.enums import RedisInitKeyConfig
+from config.database import AsyncSessionLocal
+from config.env import AppConfig
+from module_admin.dao.enterprise_info_dao import EnterpriseDao
+from module_admin.entity.vo.enterprise_info_vo import EnterpriseSuggestModel
+from utils.log_util import logger
+
+# 企业联想信息：(企业名称, 纳税人识别号, 企业类型)
+SuggestInfo = tuple[str, str, Optional[int]]
+
+
+class EnterpriseSuggestUtil:
+    """
+    企业名称联想索引相关方法
+
+    以规范化后的企业名称及纳税人识别号加企业ID作为键（如 杭州某某有限公司\\x0012），按字典序维护有序索引，前缀查询以二分定位键的范围；
+    memory方式在每个进程内维护有序数组，仅适用于单进程部署；redis方式以 enterprise_suggest:index 有序集合的字典序范围查询
+    （ZRANGEBYLEX）在多个进程间共享索引，企业信息以 enterprise_suggest:info 哈希维护。
+    应用启动时全量构建索引（redis方式下多个进程间仅由一个进程执行），新增、编辑、删除及导入企业时在会话中记录变化的企业，
+    事务提交后按数据库中的最新数据增量更新索引，回滚时丢弃
+    """
+
+    # 键与企业ID之间的分隔符，小于任何可见字符，同一前缀下较短的键排在前面
+    KEY_SEPARATOR = '\x00'
+    # 按企业类型过滤时单次查询最多扫描的键数，避免短前缀下匹配的企业类型过少时遍历大量键
+    MAX_SCAN_COUNT = 1000
+    # redis方式下全量构建索引时每批写入的键数
+    REDIS_BUILD_BATCH_SIZE = 10000
+    # redis方式下全量构建索引的锁过期时间（单位：秒）
+    REDIS_BUILD_LOCK_EXPIRE = 300
+
+    _redis: Union[aioredis.Redis, None] = None
+    _keys: list[str] = []
+    _infos: dict[int, SuggestInfo] = {}
+    _pending_tasks: set['asyncio.Task[None]'] = set()
+
+    @classmethod
+    async def init_enterprise_suggest(cls, redis: aioredis.Redis) -> None:
+        """
+        应用启动时注册事务提交监听，并全量构建企业名称联想索引
+
+        :param redis: redis对象
+        :return:
+        """
+        cls._redis = redis
+        if not event.contains(Session, 'after_commit', cls._apply_committed_changes):
+            event.listen(Session, 'after_commit', cls._apply_committed_changes)
+            event.listen(Session, 'after_rollback', cls._discard_recorded_changes)
+        try:
+            enterprise_count = await cls.rebuild()
+        except Exception as e:
+            logger.error(f'❌️ 企业名称联想索引构建失败，详细错误信息：{e}')
+            return
+        if enterprise_count is None:
+            logger.info('✅️ 企业名称联想索引由其他进程构建')
+        else:
+            logger.info(f'✅️ 企业名称联想索引构建成功，共{enterprise_count}家企业')
+
+    @classmethod
+    async def close_enterprise_suggest(cls) -> None:
+        """
+        应用关闭时等待未完成的索引更新，并释放内存中的索引
+
+        :return:
+        """
+        await asyncio.gather(*cls._pending_tasks, return_exceptions=True)
+        cls._keys = []
+        cls._infos = {}
+        cls._redis = None
+
+    @classmethod
+    def get_index_key(cls) -> str:
+        """
+        获取联想索引有序集合的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ENTERPRISE_SUGGEST.key}:index'
+
+    @classmethod
+    def get_info_key(cls) -> str:
+        """
+        获取企业联想信息哈希的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ENTERPRISE_SUGGEST.key}:info'
+
+    @classmethod
+    def get_build_lock_key(cls) -> str:
+        """
+        获取全量构建索引锁的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ENTERPRISE_SUGGEST.key}:lock'
+
+    @classmethod
+    def get_build_time_key(cls) -> str:
+        """
+        获取最近一次全量构建时间的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ENTERPRISE_SUGGEST.key}:build_time'
+
+    @classmethod
+    def normalize(cls, text: Optional[str]) -> str:
+        """
+        规范化企业名称或纳税人识别号：全角转半角、忽略大小写并去除空白字符
+
+        :param text: 企业名称或纳税人识别号
+        :return: 规范化后的文本
+        """
+        if not text:
+            return ''
+        normalized_text = unicodedata.normalize('NFKC', text).casefold().replace(cls.KEY_SEPARATOR, '')
+
+        return ''.join(normalized_text.split())
+
+    @classmethod
+    def get_index_keys(cls, ent_id: int, info: SuggestInfo) -> set[str]:
+        """
+        获取企业在联想索引中的键
+
+        :param ent_id: 企业ID
+        :param info: 企业联想信息
+        :return: 键集合
+        """
+        return {
+            f'{normalized_text}{cls.KEY_SEPARATOR}{ent_id}'
+            for normalized_text in (cls.normalize(info[0]), cls.normalize(info[1]))
+            if normalized_text
+        }
+
+    @classmethod
+    def record_enterprise_change(
+        cls, db: AsyncSession, ent_ids: Iterable[int] = (), taxpayer_ids: Iterable[str] = ()
+    ) -> None:
+        """
+        在会话中记录新增、编辑或删除的企业，事务提交后同步至联想索引
+
+        :param db: orm对象
+        :param ent_ids: 变化的企业ID列表
+        :param taxpayer_ids: 变化的企业纳税人识别号列表，用于批量新增等无法获取企业ID的写入
+        :return:
+        """
+        db.info.setdefault('enterprise_suggest_ent_ids', set()).update(int(ent_id) for ent_id in ent_ids)
+        db.info.setdefault('enterprise_suggest_taxpayer_ids', set()).update(taxpayer_ids)
+
+    @classmethod
+    async def suggest(
+        cls, keyword: str, limit: int = 10, ent_type: Optional[int] = None
+    ) -> list[EnterpriseSuggestModel]:
+        """
+        按企业名称或纳税人识别号的前缀获取联想的企业
+
+        :param keyword: 企业名称或纳税人识别号的前缀
+        :param limit: 返回的最大条数
+        :param ent_type: 企业类型，为None时不过滤
+        :return: 联想的企业列表，按匹配的键的字典序排列
+        """
+        prefix = cls.normalize(keyword)
+        if not prefix:
+            return []
+        if AppConfig.app_enterprise_suggest_backend == 'redis':
+            matched_infos = await cls._suggest_from_redis(prefix, limit, ent_type)
+        else:
+            matched_infos = cls._suggest_from_memory(prefix, limit, ent_type)
+
+        return [
+            EnterpriseSuggestModel(entId=ent_id, enterpriseName=info[0], taxpayerId=info[1], entType=info[2])
+            for ent_id, info in matched_infos
+        ]
+
+    @classmethod
+    async def rebuild(cls) -> Optional[int]:
+        """
+        以数据库中的全部企业重建联想索引
+
+        :return: 索引的企业数，redis方式下其他进程正在构建时返回None
+        """
+        use_redis = AppConfig.app_enterprise_suggest_backend == 'redis'
+        if use_redis and not await cls._redis.set(cls.get_build_lock_key(), 1, nx=True, ex=cls.REDIS_BUILD_LOCK_EXPIRE):
+            return None
+        try:
+            async with AsyncSessionLocal() as session:
+                ent_rows = await EnterpriseDao.get_ent_suggest_rows(session)
+            return await cls.build_index(ent_rows)
+        finally:
+            if use_redis:
+                await cls._redis.delete(cls.get_build_lock_key())
+
+    @classmethod
+    async def build_index(cls, ent_rows: Sequence[Any]) -> int:
+        """
+        以给定的企业信息全量构建联想索引
+
+        :param ent_rows: 企业信息（ent_id, enterprise_name, taxpayer_id, ent_type）列表
+        :return: 索引的企业数
+        """
+        infos = cls._get_suggest_infos(ent_rows)
+        if AppConfig.app_enterprise_suggest_backend == 'redis':
+            await cls._build_redis_index(infos)
+        else:
+            cls._keys = sorted(key for ent_id, info in infos.items() for key in cls.get_index_keys(ent_id, info))
+            cls._infos = infos
+
+        return len(infos)
+
+    @classmethod
+    async def update_index(cls, ent_ids: Iterable[int], ent_rows: Sequence[Any]) -> None:
+        """
+        以给定的企业最新信息增量更新联想索引
+
+        :param ent_ids: 变化的企业ID列表，其中不在企业信息列表中的企业视为已删除
+        :param ent_rows: 变化的企业在数据库中的最新信息（ent_id, enterprise_name, taxpayer_id, ent_type）列表
+        :return:
+        """
+        new_infos = cls._get_suggest_infos(ent_rows)
+        changed_ent_ids = set(ent_ids) | new_infos.keys()
+        if AppConfig.app_enterprise_suggest_backend == 'redis':
+            await cls._apply_redis_changes(changed_ent_ids, new_infos)
+        else:
+            cls._apply_memory_changes(changed_ent_ids, new_infos)
+
+    @classmethod
+    def _get_suggest_infos(cls, ent_rows: Sequence[Any]) -> dict[int, SuggestInfo]:
+        """
+        将企业信息转换为企业联想信息
+
+        :param ent_rows: 企业信息（ent_id, enterprise_name, taxpayer_id, ent_type）列表
+        :return: 企业ID与企业联想信息的映射字典
+        """
+        return {
+            ent_row.ent_id: (ent_row.enterprise_name or '', ent_row.taxpayer_id or '', ent_row.ent_type)
+            for ent_row in ent_rows
+        }
+
+    @classmethod
+    def _suggest_from_memory(cls, prefix: str, limit: int, ent_type: Optional[int]) -> list[tuple[int, SuggestInfo]]:
+        """
+        在进程内的有序数组中按前缀查询联想的企业
+
+        :param prefix: 规范化后的前缀
+        :param limit: 返回的最大条数
+        :param ent_type: 企业类型
+        :return: (企业ID, 企业联想信息)列表
+        """
+        keys, infos = cls._keys, cls._infos
+        matched_infos: dict[int, SuggestInfo] = {}
+        start = bisect_left(keys, prefix)
+        for key in keys[start : start + cls.MAX_SCAN_COUNT]:
+            if not key.startswith(prefix):
+                break
+            ent_id = int(key.rsplit(cls.KEY_SEPARATOR, 1)[1])
+            info = infos.get(ent_id)
+            if info and (ent_type is None or info[2] == ent_type):
+                matched_infos.setdefault(ent_id, info)
+                if len(matched_infos) >= limit:
+                    break
+
+        return list(matched_infos.items())
+
+    @classmethod
+    async def _suggest_from_redis(
+        cls, prefix: str, limit: int, ent_type: Optional[int]
+    ) -> list[tuple[int, SuggestInfo]]:
+        """
+        以有序集合的字典序范围查询联想的企业
+
+        :param prefix: 规范化后的前缀
+        :param limit: 返回的最大条数
+        :param ent_type: 企业类型
+        :return: (企业ID, 企业联想信息)列表
+        """
+        # UTF-8编码中不会出现0xff字节，以其作为前缀范围的开区间上界
+        min_value, max_value = f'[{prefix}'.encode(), f'({prefix}'.encode() + b'\xff'
+        batch_size = limit * 2
+        matched_infos: dict[int, SuggestInfo] = {}
+        for offset in range(0, cls.MAX_SCAN_COUNT, batch_size):
+            keys = await cls._redis.zrangebylex(cls.get_index_key(), min_value, max_value, offset, batch_size)
+            ent_ids = [int(key.rsplit(cls.KEY_SEPARATOR, 1)[1]) for key in keys]
+            info_values = await cls._redis.hmget(cls.get_info_key(), ent_ids) if ent_ids else []
+            for ent_id, info_value in zip(ent_ids, info_values):
+                info = tuple(json.loads(info_value)) if info_value else None
+                if info and (ent_type is None or info[2] == ent_type):
+                    matched_infos.setdefault(ent_id, info)
+                    if len(matched_infos) >= limit:
+                        return list(matched_infos.items())
+            if len(keys) < batch_size:
+                break
+
+        return list(matched_infos.items())
+
+    @classmethod
+    async def _build_redis_index(cls, infos: dict[int, SuggestInfo]) -> None:
+        """
+        在临时键中写入全部企业的索引后原子替换正式键
+
+        :param infos: 企业ID与企业联想信息的映射字典
+        :return:
+        """
+        index_key, info_key = cls.get_index_key(), cls.get_info_key()
+        building_index_key, building_info_key = f'{index_key}:building', f'{info_key}:building'
+        await cls._redis.delete(building_index_key, building_info_key)
+        items = list(infos.items())
+        for start in range(0, len(items), cls.REDIS_BUILD_BATCH_SIZE):
+            batch_items = items[start : start + cls.REDIS_BUILD_BATCH_SIZE]
+            async with cls._redis.pipeline(transaction=False) as pipe:
+                pipe.zadd(
+                    building_index_key,
+                    {key: 0 for ent_id, info in batch_items for key in cls.get_index_keys(ent_id, info)},
+                )
+                pipe.hset(
+                    building_info_key,
+                    mapping={ent_id: json.dumps(info, ensure_ascii=False) for ent_id, info in batch_items},
+                )
+                await pipe.execute()
+        async with cls._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(index_key, info_key)
+            if items:
+                pipe.rename(building_index_key, index_key)
+                pipe.rename(building_info_key, info_key)
+            pipe.set(cls.get_build_time_key(), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            await pipe.execute()
+
+    @classmethod
+    def _discard_recorded_changes(cls, session: Session) -> None:
+        """
+        事务回滚后丢弃已记录的企业变化
+
+        :param session: 同步会话对象
+        :return:
+        """
+        session.info.pop('enterprise_suggest_ent_ids', None)
+        session.info.pop('enterprise_suggest_taxpayer_ids', None)
+
+    @classmethod
+    def _apply_committed_changes(cls, session: Session) -> None:
+        """
+        事务提交后异步将已记录的企业变化同步至联想索引
+
+        :param session: 同步会话对象
+        :return:
+        """
+        ent_ids = session.info.pop('enterprise_suggest_ent_ids', None)
+        taxpayer_ids = session.info.pop('enterprise_suggest_taxpayer_ids', None)
+        if not (ent_ids or taxpayer_ids) or cls._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cls._apply_changes(ent_ids or set(), taxpayer_ids or set()))
+        cls._pending_tasks.add(task)
+        task.add_done_callback(cls._pending_tasks.discard)
+
+    @classmethod
+    async def _apply_changes(cls, ent_ids: set[int], taxpayer_ids: set[str]) -> None:
+        """
+        按数据库中的最新数据更新变化的企业在联想索引中的键，数据库中已不存在的企业从索引中移除
+
+        :param ent_ids: 变化的企业ID集合
+        :param taxpayer_ids: 变化的企业纳税人识别号集合
+        :return:
+        """
+        try:
+            async with AsyncSessionLocal() as session:
+                ent_rows = await EnterpriseDao.get_ent_suggest_rows(session, list(ent_ids), list(taxpayer_ids))
+            await cls.update_index(ent_ids, ent_rows)
+        except Exception as e:
+            logger.warning(f'企业名称联想索引更新失败，将在下次全量构建时校正，详细错误信息：{e}')
+
+    @classmethod
+    def _apply_memory_changes(cls, changed_ent_ids: set[int], new_infos: dict[int, SuggestInfo]) -> None:
+        """
+        更新进程内有序数组中变化的企业
+
+        :param changed_ent_ids: 变化的企业ID集合
+        :param new_infos: 数据库中仍存在的企业ID与最新企业联想信息的映射字典
+        :return:
+        """
+        for ent_id in changed_ent_ids:
+            old_info = cls._infos.pop(ent_id, None)
+            old_keys = cls.get_index_keys(ent_id, old_info) if old_info else set()
+            new_keys = cls.get_index_keys(ent_id, new_infos[ent_id]) if ent_id in new_infos else set()
+            for key in old_keys - new_keys:
+                index = bisect_left(cls._keys, key)
+                if index < len(cls._keys) and cls._keys[index] == key:
+                    del cls._keys[index]
+            for key in new_keys - old_keys:
+                insort(cls._keys, key)
+            if ent_id in new_infos:
+                cls._infos[ent_id] = new_infos[ent_id]
+
+    @classmethod
+    async def _apply_redis_changes(cls, changed_ent_ids: set[int], new_infos: dict[int, SuggestInfo]) -> None:
+        """
+        更新有序集合中变化的企业
+
+        :param changed_ent_ids: 变化的企业ID集合
+        :param new_infos: 数据库中仍存在的企业ID与最新企业联想信息的映射字典
+        :return:
+        """
+        ent_id_list = list(changed_ent_ids)
+        old_info_values = await cls._redis.hmget(cls.get_info_key(), ent_id_list)
+        async with cls._redis.pipeline(transaction=True) as pipe:
+            for ent_id, old_info_value in zip(ent_id_list, old_info_values):
+                old_keys = cls.get_index_keys(ent_id, tuple(json.loads(old_info_value))) if old_info_value else set()
+                new_keys = cls.get_index_keys(ent_id, new_infos[ent_id]) if ent_id in new_infos else set()
+                if old_keys - new_keys:
+                    pipe.zrem(cls.get_index_key(), *(old_keys - new_keys))
+                if new_keys:
+                    pipe.zadd(cls.get_index_key(), dict.fromkeys(new_keys, 0))
+                if ent_id in new_infos:
+                    pipe.hset(cls.get_info_key(), ent_id, json.dumps(new_infos[ent_id], ensure_ascii=False))
+                else:
+                    pipe.hdel(cls.get_info_key(), ent_id)
+            await pipe.execute()
@@ -0,0 +1,129 @@
+import asyncio
+import os
+import time
+from collections.abc import Awaitable
+from typing import Callable, Union
+
+from config.env import AppConfig, UploadConfig
+from utils.log_util import logger
+
+
+class ExportWorkerUtil:
+    """
+    后台导出任务执行相关方法
+
+    导出任务在进程内的后台任务中执行，通过信号量限制同时执行的任务数，避免占满数据库连接池；
+    排队及执行中的任务数达到 APP_EXPORT_QUEUE_SIZE 时拒绝提交，后台清理任务定期删除过期的导出文件
+    """
+
+    # 导出文件存放目录名称（位于下载目录下）
+    EXPORT_DIR_NAME = 'export'
+    # 过期导出文件清理间隔的上限（单位：秒）
+    CLEANUP_MAX_INTERVAL = 600
+
+    _semaphore: Union[asyncio.Semaphore, None] = None
+    _cleaner: Union['asyncio.Task[None]', None] = None
+    _tasks: set['asyncio.Task[None]'] = set()
+
+    @classmethod
+    async def init_export_worker(cls) -> None:
+        """
+        应用启动时初始化导出任务信号量及过期文件清理任务
+
+        :return:
+        """
+        os.makedirs(cls.get_export_path(), exist_ok=True)
+        cls._semaphore = asyncio.Semaphore(AppConfig.app_export_max_workers)
+        cls._cleaner = asyncio.create_task(cls._cleanup_loop(), name='export-cleaner')
+        logger.info('✅️ 后台导出任务池启动成功')
+
+    @classmethod
+    async def close_export_worker(cls) -> None:
+        """
+        应用关闭时取消过期文件清理任务及未完成的导出任务
+
+        :return:
+        """
+        if cls._semaphore is None:
+            return
+        cls._semaphore = None
+        pending_tasks = [*cls._tasks, cls._cleaner] if cls._cleaner is not None else [*cls._tasks]
+        for task in pending_tasks:
+            task.cancel()
+        await asyncio.gather(*pending_tasks, return_exceptions=True)
+        cls._cleaner = None
+        logger.info('✅️ 后台导出任务池关闭成功')
+
+    @classmethod
+    def get_export_path(cls) -> str:
+        """
+        获取导出文件存放目录
+
+        :return: 导出文件存放目录
+        """
+        return os.path.join(UploadConfig.DOWNLOAD_PATH, cls.EXPORT_DIR_NAME)
+
+    @classmethod
+    def is_full(cls) -> bool:
+        """
+        判断排队及执行中的导出任务数是否已达上限
+
+        :return: 是否已达上限
+        """
+        return len(cls._tasks) >= AppConfig.app_export_queue_size
+
+    @classmethod
+    def submit_export_task(cls, task_id: str, export_job: Callable[[], Awaitable[None]]) -> bool:
+        """
+        提交导出任务，任务获取信号量后开始执行
+
+        :param task_id: 任务编号
+        :param export_job: 导出任务执行方法
+        :return: 是否提交成功
+        """
+        if cls._semaphore is None or cls.is_full():
+            return False
+        semaphore = cls._semaphore
+
+        async def _run() -> None:
+            async with semaphore:
+                await export_job()
+
+        task = asyncio.create_task(_run(), name=f'export-{task_id}')
+        cls._tasks.add(task)
+        task.add_done_callback(cls._tasks.discard)
+        return True
+
+    @classmethod
+    async def _cleanup_loop(cls) -> None:
+        """
+        后台清理任务：定期删除超过保留时间的导出文件
+
+        :return:
+        """
+        interval = max(1, min(AppConfig.app_export_file_ttl, cls.CLEANUP_MAX_INTERVAL))
+        while True:
+            try:
+                removed_count = await asyncio.to_thread(cls.clean_expired_files)
+                if removed_count:
+                    logger.info(f'已清理{removed_count}个过期的导出文件')
+            except Exception as e:
+                logger.warning(f'过期导出文件清理失败，详细错误信息：{e}')
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def clean_expired_files(cls) -> int:
+        """
+        删除超过保留时间的导出文件
+
+        :return: 删除的文件数量
+        """
+        expire_before = time.time() - AppConfig.app_export_file_ttl
+        removed_count = 0
+        with os.scandir(cls.get_export_path()) as entries:
+            for entry in entries:
+                if entry.is_file() and entry.stat().st_mtime < expire_before:
+                    os.remove(entry.path)
+                    removed_count += 1
+
+        return removed_count
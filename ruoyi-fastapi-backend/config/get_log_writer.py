@@ -0,0 +1,235 @@
+import asyncio
+import time
+from typing import Union
+
+from config.database import AsyncSessionLocal
+from config.env import AppConfig
+from module_admin.dao.log_dao import LoginLogDao, OperationLogDao
+from module_admin.entity.vo.log_vo import LogininforModel, OperLogModel
+from module_admin.entity.vo.server_vo import LogQueueInfo
+from utils.log_util import logger
+
+LogItem = Union[OperLogModel, LogininforModel]
+
+
+class LogWriterUtil:
+    """
+    日志异步批量写入相关方法
+
+    Log装饰器产生的操作日志及登录日志先放入有界队列，由后台任务按条数或时间批量写入数据库；
+    队列已满时按 APP_LOG_OVERFLOW_POLICY 配置的策略处理，应用关闭时等待队列写入完成
+    """
+
+    # 丢弃日志告警的最小间隔（单位：秒）
+    DROP_WARNING_INTERVAL = 60
+
+    _queue: Union['asyncio.Queue[Union[LogItem, None]]', None] = None
+    _flusher: Union['asyncio.Task[None]', None] = None
+    _enqueued_count = 0
+    _written_count = 0
+    _dropped_count = 0
+    _failed_count = 0
+    _batch_count = 0
+    _last_drop_warning_time = 0.0
+
+    @classmethod
+    async def init_log_writer(cls) -> None:
+        """
+        应用启动时初始化日志写入队列及后台写入任务
+
+        :return:
+        """
+        if not AppConfig.app_log_async_enabled:
+            return
+        cls._queue = asyncio.Queue(maxsize=AppConfig.app_log_queue_size)
+        cls._flusher = asyncio.create_task(cls._flush_loop(), name='log-writer')
+        logger.info('✅️ 日志异步写入任务启动成功')
+
+    @classmethod
+    async def close_log_writer(cls) -> None:
+        """
+        应用关闭时停止接收新日志，并在限定时间内等待队列中的日志写入完成
+
+        :return:
+        """
+        if cls._queue is None or cls._flusher is None:
+            return
+        queue, flusher = cls._queue, cls._flusher
+        # 先置空队列，关闭期间产生的日志改为同步写入
+        cls._queue = None
+
+        async def _stop() -> None:
+            await queue.put(None)
+            await flusher
+
+        try:
+            await asyncio.wait_for(_stop(), timeout=AppConfig.app_log_drain_timeout)
+        except asyncio.TimeoutError:
+            flusher.cancel()
+            logger.error(
+                f'日志队列未能在{AppConfig.app_log_drain_timeout}秒内写入完成，剩余{queue.qsize()}条日志被丢弃'
+            )
+            cls._dropped_count += queue.qsize()
+        cls._flusher = None
+        logger.info('✅️ 日志异步写入任务关闭成功')
+
+    @classmethod
+    async def submit_log(cls, log_item: LogItem) -> bool:
+        """
+        提交日志至写入队列，队列已满时按配置的溢出策略处理
+
+        :param log_item: 操作日志或登录日志对象
+        :return: 是否已进入队列
+        """
+        if cls._queue is None:
+            return False
+        queue = cls._queue
+        try:
+            queue.put_nowait(log_item)
+        except asyncio.QueueFull:
+            if AppConfig.app_log_overflow_policy == 'drop_new':
+                cls._record_dropped()
+                return True
+            if AppConfig.app_log_overflow_policy == 'drop_oldest':
+                try:
+                    queue.get_nowait()
+                    cls._record_dropped()
+                except asyncio.QueueEmpty:
+                    pass
+                queue.put_nowait(log_item)
+            else:
+                # block策略：等待队列空闲形成背压，超时仍未入队则丢弃
+                try:
+                    await asyncio.wait_for(queue.put(log_item), timeout=AppConfig.app_log_block_timeout)
+                except asyncio.TimeoutError:
+                    cls._record_dropped()
+                    return True
+        cls._enqueued_count += 1
+        return True
+
+    @classmethod
+    def get_log_queue_info(cls) -> LogQueueInfo:
+        """
+        获取日志写入队列的运行指标
+
+        :return: 日志写入队列运行指标
+        """
+        return LogQueueInfo(
+            running=cls._queue is not None,
+            queueDepth=cls._queue.qsize() if cls._queue is not None else 0,
+            queueSize=AppConfig.app_log_queue_size,
+            overflowPolicy=AppConfig.app_log_overflow_policy,
+            enqueued=cls._enqueued_count,
+            written=cls._written_count,
+            dropped=cls._dropped_count,
+            failed=cls._failed_count,
+            batches=cls._batch_count,
+        )
+
+    @classmethod
+    def _record_dropped(cls, count: int = 1) -> None:
+        """
+        记录被丢弃的日志数量，并按固定间隔输出告警
+
+        :param count: 丢弃数量
+        :return:
+        """
+        cls._dropped_count += count
+        now = time.monotonic()
+        if now - cls._last_drop_warning_time >= cls.DROP_WARNING_INTERVAL:
+            cls._last_drop_warning_time = now
+            logger.warning(f'日志写入队列已满，已累计丢弃{cls._dropped_count}条日志')
+
+    @classmethod
+    async def _flush_loop(cls) -> None:
+        """
+        后台写入任务：凑满批量条数或到达等待时间后批量写入，收到结束标记后写入剩余日志并退出
+
+        :return:
+        """
+        queue = cls._queue
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            log_item = await queue.get()
+            if log_item is None:
+                break
+            batch = [log_item]
+            deadline = loop.time() + AppConfig.app_log_flush_interval
+            while len(batch) < AppConfig.app_log_batch_size:
+                try:
+                    log_item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    timeout = deadline - loop.time()
+                    if timeout <= 0:
+                        break
+                    try:
+                        log_item = await asyncio.wait_for(queue.get(), timeout=timeout)
+                    except asyncio.TimeoutError:
+                        break
+                if log_item is None:
+                    stopping = True
+                    break
+                batch.append(log_item)
+            await cls._write_batch(batch)
+        # 结束标记之后不再有新日志入队，写入剩余日志
+        batch = [log_item for log_item in cls._drain_queue(queue) if log_item is not None]
+        for index in range(0, len(batch), AppConfig.app_log_batch_size):
+            await cls._write_batch(batch[index : index + AppConfig.app_log_batch_size])
+
+    @classmethod
+    def _drain_queue(cls, queue: 'asyncio.Queue[Union[LogItem, None]]') -> list[Union[LogItem, None]]:
+        """
+        非阻塞地取出队列中剩余的全部元素
+
+        :param queue: 日志写入队列
+        :return: 队列剩余元素
+        """
+        return [queue.get_nowait() for _ in range(queue.qsize())]
+
+    @classmethod
+    async def _write_batch(cls, batch: list[LogItem]) -> None:
+        """
+        批量写入一批日志，批量写入失败时逐条重试以隔离异常数据
+
+        :param batch: 日志对象列表
+        :return:
+        """
+        operation_log_list = [log_item for log_item in batch if isinstance(log_item, OperLogModel)]
+        login_log_list = [log_item for log_item in batch if isinstance(log_item, LogininforModel)]
+        try:
+            await cls._insert_logs(operation_log_list, login_log_list)
+            cls._written_count += len(batch)
+        except Exception as e:
+            logger.warning(f'日志批量写入失败，将逐条重试，详细错误信息：{e}')
+            for log_item in batch:
+                try:
+                    if isinstance(log_item, OperLogModel):
+                        await cls._insert_logs([log_item], [])
+                    else:
+                        await cls._insert_logs([], [log_item])
+                    cls._written_count += 1
+                except Exception as item_error:  # noqa: PERF203
+                    cls._failed_count += 1
+                    logger.error(f'日志写入失败，详细错误信息：{item_error}')
+        cls._batch_count += 1
+
+    @classmethod
+    async def _insert_logs(cls, operation_log_list: list[OperLogModel], login_log_list: list[LogininforModel]) -> None:
+        """
+        在独立的数据库会话中插入日志
+
+        :param operation_log_list: 操作日志对象列表
+        :param login_log_list: 登录日志对象列表
+        :return:
+        """
+        async with AsyncSessionLocal() as session:
+            try:
+                if operation_log_list:
+                    await OperationLogDao.add_operation_log_batch_dao(session, operation_log_list)
+                if login_log_list:
+                    await LoginLogDao.add_login_log_batch_dao(session, login_log_list)
+                await session.commit()
+            except Exception as e:
+                await session.rollback()
+                raise e
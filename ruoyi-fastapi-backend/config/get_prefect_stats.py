@@ -0,0 +1,291 @@
+import asyncio
+from collections import Counter
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional, Union
+
+from redis import asyncio as aioredis
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+from sqlalchemy.orm import Session
+
+from common.enums import RedisInitKeyConfig
+from config.database import AsyncSessionLocal
+from config.env import AppConfig
+from module_admin.dao.project_dao import ProjectDao
+from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM
+from module_admin.entity.vo.project_prefect_vo import PrefectStatsModel
+from utils.log_util import logger
+
+
+class PrefectStatsUtil:
+    """
+    项目流程状态计数相关方法
+
+    各流程状态的项目数以 prefect_stats:status 哈希维护，项目负责人各流程状态的项目数以 prefect_stats:user 哈希维护
+    （字段为 负责人ID:流程状态）；流转、新增、编辑及删除项目时在会话中记录计数变化，事务提交后自增计数，回滚时丢弃；
+    后台对账任务每隔 APP_PREFECT_STATS_RECONCILE_INTERVAL 秒以数据库统计结果校正计数，多个进程间仅由一个进程执行
+    """
+
+    _redis: Union[aioredis.Redis, None] = None
+    _session_maker: async_sessionmaker = AsyncSessionLocal
+    _reconciler: Union['asyncio.Task[None]', None] = None
+    _pending_tasks: set['asyncio.Task[None]'] = set()
+
+    @classmethod
+    async def init_prefect_stats(
+        cls, redis: aioredis.Redis, session_maker: async_sessionmaker = AsyncSessionLocal
+    ) -> None:
+        """
+        应用启动时注册事务提交监听，并启动计数对账任务
+
+        :param redis: redis对象
+        :param session_maker: 对账时统计项目数使用的异步会话工厂
+        :return:
+        """
+        cls._redis = redis
+        cls._session_maker = session_maker
+        if not event.contains(Session, 'after_commit', cls._apply_committed_changes):
+            event.listen(Session, 'after_commit', cls._apply_committed_changes)
+            event.listen(Session, 'after_rollback', cls._discard_recorded_changes)
+        cls._reconciler = asyncio.create_task(cls._reconcile_loop(), name='prefect-stats-reconciler')
+        logger.info('✅️ 项目流程状态计数任务启动成功')
+
+    @classmethod
+    async def close_prefect_stats(cls) -> None:
+        """
+        应用关闭时取消计数对账任务
+
+        :return:
+        """
+        if cls._reconciler is None:
+            return
+        cls._reconciler.cancel()
+        await asyncio.gather(cls._reconciler, *cls._pending_tasks, return_exceptions=True)
+        cls._reconciler = None
+        cls._redis = None
+        logger.info('✅️ 项目流程状态计数任务关闭成功')
+
+    @classmethod
+    def get_status_key(cls) -> str:
+        """
+        获取各流程状态项目数的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.PREFECT_STATS.key}:status'
+
+    @classmethod
+    def get_user_key(cls) -> str:
+        """
+        获取项目负责人各流程状态项目数的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.PREFECT_STATS.key}:user'
+
+    @classmethod
+    def get_reconcile_time_key(cls) -> str:
+        """
+        获取最近一次对账时间的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.PREFECT_STATS.key}:reconcile_time'
+
+    @classmethod
+    def get_reconcile_lock_key(cls) -> str:
+        """
+        获取对账任务锁的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.PREFECT_STATS.key}:lock'
+
+    @classmethod
+    def record_status_change(
+        cls,
+        db: AsyncSession,
+        from_status: Optional[str],
+        to_status: Optional[str],
+        project_count: int,
+        user_ids: Iterable[int] = (),
+    ) -> None:
+        """
+        在会话中记录项目流程状态的变化，事务提交后同步至计数
+
+        :param db: orm对象
+        :param from_status: 变化前的流程状态，新增项目时为None
+        :param to_status: 变化后的流程状态，删除项目时为None
+        :param project_count: 状态变化的项目数
+        :param user_ids: 状态变化的项目的负责人ID列表
+        :return:
+        """
+        if project_count <= 0:
+            return
+        status_changes: Counter[str] = db.info.setdefault('prefect_stats_status_changes', Counter())
+        user_changes: Counter[str] = db.info.setdefault('prefect_stats_user_changes', Counter())
+        user_counter = Counter(user_ids)
+        if from_status:
+            status_changes[from_status] -= project_count
+            for user_id, count in user_counter.items():
+                user_changes[f'{user_id}:{from_status}'] -= count
+        if to_status:
+            status_changes[to_status] += project_count
+            for user_id, count in user_counter.items():
+                user_changes[f'{user_id}:{to_status}'] += count
+
+    @classmethod
+    async def get_prefect_stats(cls, user_id: int) -> PrefectStatsModel:
+        """
+        获取各流程状态及当前用户负责的项目数，计数尚未初始化时先执行对账
+
+        :param user_id: 当前用户ID
+        :return: 流程状态计数
+        """
+        if not await cls._redis.exists(cls.get_reconcile_time_key()):
+            await cls.reconcile(force=True)
+        elif cls._pending_tasks:
+            # 等待本进程已提交事务的计数自增完成，避免刚流转的项目未计入
+            await asyncio.gather(*cls._pending_tasks, return_exceptions=True)
+        statuses = list(PREFECT_STATUS_ENUM.values())
+        async with cls._redis.pipeline(transaction=False) as pipe:
+            pipe.hmget(cls.get_status_key(), statuses)
+            pipe.hmget(cls.get_user_key(), [f'{user_id}:{status}' for status in statuses])
+            pipe.get(cls.get_reconcile_time_key())
+            status_values, user_values, reconcile_time = await pipe.execute()
+        status_counts = {status: max(int(value or 0), 0) for status, value in zip(statuses, status_values)}
+        user_counts = {status: max(int(value or 0), 0) for status, value in zip(statuses, user_values)}
+
+        return PrefectStatsModel(
+            statusCounts=status_counts,
+            userCounts=user_counts,
+            total=sum(status_counts.values()),
+            reconcileTime=reconcile_time,
+        )
+
+    @classmethod
+    async def reconcile(cls, force: bool = False) -> Optional[dict[str, int]]:
+        """
+        以数据库统计结果校正缓存的计数
+
+        :param force: 是否忽略对账间隔立即执行（用于计数初始化，不记录偏差告警）
+        :return: 校正前的计数偏差（字段与数据库统计值之差），其他进程已在本周期内对账时返回None
+        """
+        if not force and not await cls._redis.set(
+            cls.get_reconcile_lock_key(), 1, nx=True, ex=AppConfig.app_prefect_stats_reconcile_interval
+        ):
+            return None
+        if cls._pending_tasks:
+            # 本进程已提交事务的计数自增须在统计前完成，否则统计后才自增的变化会被重复计入
+            await asyncio.gather(*cls._pending_tasks, return_exceptions=True)
+        async with cls._session_maker() as session:
+            status_counts = await ProjectDao.get_prefect_status_count_dao(session)
+            user_counts = {
+                f'{user_id}:{status}': count
+                for (user_id, status), count in (await ProjectDao.get_user_prefect_status_count_dao(session)).items()
+            }
+        cached_status_counts = await cls._redis.hgetall(cls.get_status_key())
+        cached_user_counts = await cls._redis.hgetall(cls.get_user_key())
+        drift = {
+            **cls._get_drift(status_counts, cached_status_counts),
+            **{f'user:{field}': value for field, value in cls._get_drift(user_counts, cached_user_counts).items()},
+        }
+        async with cls._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(cls.get_status_key(), cls.get_user_key())
+            if status_counts:
+                pipe.hset(cls.get_status_key(), mapping=status_counts)
+            if user_counts:
+                pipe.hset(cls.get_user_key(), mapping=user_counts)
+            pipe.set(cls.get_reconcile_time_key(), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            await pipe.execute()
+        if drift and cached_status_counts and not force:
+            logger.warning(f'项目流程状态计数已校正，校正前偏差：{drift}')
+
+        return drift
+
+    @classmethod
+    def _get_drift(cls, actual_counts: dict[str, int], cached_counts: dict[str, Any]) -> dict[str, int]:
+        """
+        计算缓存计数与数据库统计值之差
+
+        :param actual_counts: 数据库统计值
+        :param cached_counts: 缓存计数
+        :return: 存在偏差的字段与偏差值的映射字典
+        """
+        drift = {}
+        for field in actual_counts.keys() | cached_counts.keys():
+            difference = int(cached_counts.get(field) or 0) - actual_counts.get(field, 0)
+            if difference:
+                drift[field] = difference
+
+        return drift
+
+    @classmethod
+    async def _reconcile_loop(cls) -> None:
+        """
+        后台对账任务：启动时及每隔对账间隔执行一次对账
+
+        :return:
+        """
+        interval = max(1, AppConfig.app_prefect_stats_reconcile_interval)
+        while True:
+            try:
+                await cls.reconcile()
+            except Exception as e:
+                logger.warning(f'项目流程状态计数对账失败，详细错误信息：{e}')
+            await asyncio.sleep(interval)
+
+    @classmethod
+    def _discard_recorded_changes(cls, session: Session) -> None:
+        """
+        事务回滚后丢弃已记录的状态变化
+
+        :param session: 同步会话对象
+        :return:
+        """
+        session.info.pop('prefect_stats_status_changes', None)
+        session.info.pop('prefect_stats_user_changes', None)
+
+    @classmethod
+    def _apply_committed_changes(cls, session: Session) -> None:
+        """
+        事务提交后异步将已记录的状态变化同步至计数
+
+        :param session: 同步会话对象
+        :return:
+        """
+        status_changes = session.info.pop('prefect_stats_status_changes', None)
+        user_changes = session.info.pop('prefect_stats_user_changes', None)
+        if not (status_changes or user_changes) or cls._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cls._apply_changes(status_changes, user_changes))
+        cls._pending_tasks.add(task)
+        task.add_done_callback(cls._pending_tasks.discard)
+
+    @classmethod
+    async def _apply_changes(
+        cls, status_changes: Optional['Counter[str]'], user_changes: Optional['Counter[str]']
+    ) -> None:
+        """
+        自增流程状态计数
+
+        :param status_changes: 各流程状态的项目数变化
+        :param user_changes: 项目负责人各流程状态的项目数变化
+        :return:
+        """
+        try:
+            async with cls._redis.pipeline(transaction=True) as pipe:
+                for field, change in (status_changes or {}).items():
+                    if change:
+                        pipe.hincrby(cls.get_status_key(), field, change)
+                for field, change in (user_changes or {}).items():
+                    if change:
+                        pipe.hincrby(cls.get_user_key(), field, change)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f'项目流程状态计数更新失败，将在下次对账时校正，详细错误信息：{e}')
@@ -7,6 +7,7 @@ from config.database import AsyncSessionLocal
 from config.env import RedisConfig
 from module_admin.service.config_service import ConfigService
 from module_admin.service.dict_service import DictDataService
+from module_admin.service.online_service import OnlineService
 from utils.log_util import logger
 
 
@@ -78,3 +79,13 @@ class RedisUtil:
         """
         async with AsyncSessionLocal() as session:
             await ConfigService.init_cache_sys_config_services(session, redis)
+
+    @classmethod
+    async def init_online_session(cls, redis: aioredis.Redis) -> None:
+        """
+        应用启动时回填在线会话索引
+
+        :param redis: redis对象
+        :return:
+        """
+        await OnlineService.init_online_session_index_services(redis)
@@ -41,6 +41,16 @@ class ServiceException(Exception):
         self.message = message
 
 
+class ConflictException(Exception):
+    """
+    自定义资源冲突异常ConflictException
+    """
+
+    def __init__(self, data: Optional[str] = None, message: Optional[str] = None) -> None:
+        self.data = data
+        self.message = message
+
+
 class ServiceWarning(Exception):
     """
     自定义服务警告ServiceWarning
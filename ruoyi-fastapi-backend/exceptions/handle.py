@@ -4,6 +4,7 @@ from pydantic_validation_decorator import FieldValidationError
 
 from exceptions.exception import (
     AuthException,
+    ConflictException,
     LoginException,
     ModelValidatorException,
     PermissionException,
@@ -52,6 +53,12 @@ def handle_exception(app: FastAPI) -> None:
         logger.error(exc.message)
         return ResponseUtil.error(data=exc.data, msg=exc.message)
 
+    # 自定义资源冲突异常
+    @app.exception_handler(ConflictException)
+    async def conflict_exception_handler(request: Request, exc: ConflictException) -> Response:
+        logger.warning(exc.message)
+        return ResponseUtil.conflict(data=exc.data, msg=exc.message)
+
     # 自定义服务警告
     @app.exception_handler(ServiceWarning)
     async def service_warning_handler(request: Request, exc: ServiceWarning) -> Response:
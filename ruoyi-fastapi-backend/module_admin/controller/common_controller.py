@@ -1,13 +1,16 @@
 from typing import Annotated
 
-from fastapi import BackgroundTasks, File, Query, Request, Response, UploadFile
+from fastapi import BackgroundTasks, File, Path, Query, Request, Response, UploadFile
 from fastapi.responses import StreamingResponse
 
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.router import APIRouterPro
 from common.vo import DynamicResponseModel
 from module_admin.entity.vo.common_vo import UploadResponseModel
+from module_admin.entity.vo.export_task_vo import ExportTaskModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.common_service import CommonService
+from module_admin.service.export_task_service import ExportTaskService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -72,3 +75,45 @@ async def common_download_resource(request: Request, resource: Annotated[str, Qu
     logger.info(download_resource_result.message)
 
     return ResponseUtil.streaming(data=download_resource_result.result)
+
+
+@common_controller.get(
+    '/export/{task_id}',
+    summary='获取后台导出任务状态接口',
+    description='用于获取当前用户创建的后台导出任务的状态及进度',
+    response_model=DynamicResponseModel[ExportTaskModel],
+)
+async def get_export_task(
+    request: Request,
+    task_id: Annotated[str, Path(description='导出任务编号')],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_task_result = await ExportTaskService.get_export_task_services(request, task_id, current_user)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(model_content=export_task_result)
+
+
+@common_controller.get(
+    '/export/{task_id}/download',
+    summary='下载后台导出文件接口',
+    description='用于下载当前用户创建的已完成后台导出任务生成的文件',
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            'description': '流式返回导出文件',
+            'content': {
+                'application/octet-stream': {},
+            },
+        }
+    },
+)
+async def download_export_task(
+    request: Request,
+    task_id: Annotated[str, Path(description='导出任务编号')],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    download_result = await ExportTaskService.download_export_task_services(request, task_id, current_user)
+    logger.info('下载成功')
+
+    return ResponseUtil.streaming(data=download_result)
@@ -16,7 +16,6 @@ from common.vo import DataResponseModel, PageResponseModel, ResponseBaseModel
 from module_admin.entity.vo.config_vo import ConfigModel, ConfigPageQueryModel, DeleteConfigModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.config_service import ConfigService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -183,9 +182,8 @@ async def export_system_config_list(
     config_page_query: Annotated[ConfigPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    # 获取全量数据
-    config_query_result = await ConfigService.get_config_list_services(query_db, config_page_query, is_page=False)
-    config_export_result = await ConfigService.export_config_list_services(config_query_result)
+    # 分批读取查询结果并写入Excel文件后流式返回
+    config_export_result = await ConfigService.export_config_list_services(query_db, config_page_query)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(config_export_result))
+    return ResponseUtil.streaming(data=config_export_result)
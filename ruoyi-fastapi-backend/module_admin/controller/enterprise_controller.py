@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import Path, Query, Request, Response
+from fastapi import File, Path, Query, Request, Response, UploadFile
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -11,11 +11,13 @@ from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
-from common.vo import DataResponseModel, ResponseBaseModel
+from common.vo import DataResponseModel, DynamicResponseModel, ImportResultModel, ResponseBaseModel
 from module_admin.entity.vo.enterprise_info_vo import (
     DeleteEnterpriseModel,
     EnterpriseModel,
     EnterprisePageModel,
+    EnterpriseSuggestModel,
+    EnterpriseSuggestQueryModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.enterprise_service import EnterpriseService
@@ -45,6 +47,33 @@ async def get_system_menu_list(
     return ResponseUtil.success(data=menu_query_result)
 
 
+@menu_controller.get(
+    '/suggest',
+    summary='单位联想接口',
+    description='用于填写项目、合同时按单位名称或纳税人识别号的前缀联想单位',
+    response_model=DataResponseModel[list[EnterpriseSuggestModel]],
+    dependencies=[
+        UserInterfaceAuthDependency(
+            [
+                'project:ent:list',
+                'project:register:add',
+                'project:register:update',
+                'project:contract:add',
+                'project:contract:edit',
+            ]
+        )
+    ],
+)
+async def get_system_ent_suggest(
+    request: Request,
+    suggest_query: Annotated[EnterpriseSuggestQueryModel, Query()],
+) -> Response:
+    suggest_result = await EnterpriseService.get_ent_suggest_services(suggest_query)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=suggest_result)
+
+
 @menu_controller.post(
     '',
     summary='新增单位接口',
@@ -113,6 +142,27 @@ async def delete_system_menu(
     return ResponseUtil.success(msg=delete_menu_result.message)
 
 
+@menu_controller.post(
+    '/import',
+    summary='批量导入单位接口',
+    description='用于按纳税人识别号批量新增或更新单位，dryRun为true时仅校验并返回结果，不写入数据',
+    response_model=DynamicResponseModel[ImportResultModel],
+    dependencies=[UserInterfaceAuthDependency('project:ent:import')],
+)
+@Log(title='单位管理', business_type=BusinessType.IMPORT)
+async def import_system_ent(
+    request: Request,
+    file: Annotated[UploadFile, File(...)],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    dry_run: Annotated[bool, Query(alias='dryRun')] = False,
+) -> Response:
+    import_result = await EnterpriseService.import_ent_services(query_db, file, dry_run, current_user)
+    logger.info(import_result.message)
+
+    return ResponseUtil.success(msg=import_result.message, model_content=import_result.result)
+
+
 @menu_controller.get(
     '/{ent_id}',
     summary='获取单位详情接口',
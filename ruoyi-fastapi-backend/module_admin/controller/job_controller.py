@@ -25,7 +25,6 @@ from module_admin.entity.vo.job_vo import (
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from module_admin.service.job_log_service import JobLogService
 from module_admin.service.job_service import JobService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -206,12 +205,11 @@ async def export_system_job_list(
     job_page_query: Annotated[JobPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    # 获取全量数据
-    job_query_result = await JobService.get_job_list_services(query_db, job_page_query, is_page=False)
-    job_export_result = await JobService.export_job_list_services(request, job_query_result)
+    # 分批读取查询结果并写入Excel文件后流式返回
+    job_export_result = await JobService.export_job_list_services(request, query_db, job_page_query)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_export_result))
+    return ResponseUtil.streaming(data=job_export_result)
 
 
 @job_controller.get(
@@ -294,9 +292,8 @@ async def export_system_job_log_list(
     job_log_page_query: Annotated[JobLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    # 获取全量数据
-    job_log_query_result = await JobLogService.get_job_log_list_services(query_db, job_log_page_query, is_page=False)
-    job_log_export_result = await JobLogService.export_job_log_list_services(request, job_log_query_result)
+    # 分批读取查询结果并写入Excel文件后流式返回
+    job_log_export_result = await JobLogService.export_job_log_list_services(request, query_db, job_log_page_query)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(job_log_export_result))
+    return ResponseUtil.streaming(data=job_log_export_result)
@@ -7,10 +7,11 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from common.annotation.log_annotation import Log
 from common.aspect.db_seesion import DBSessionDependency
 from common.aspect.interface_auth import UserInterfaceAuthDependency
-from common.aspect.pre_auth import PreAuthDependency
+from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
-from common.vo import PageResponseModel, ResponseBaseModel
+from common.vo import DynamicResponseModel, PageResponseModel, ResponseBaseModel
+from module_admin.entity.vo.export_task_vo import ExportTaskModel
 from module_admin.entity.vo.log_vo import (
     DeleteLoginLogModel,
     DeleteOperLogModel,
@@ -20,8 +21,9 @@ from module_admin.entity.vo.log_vo import (
     OperLogPageQueryModel,
     UnlockUser,
 )
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.export_task_service import ExportTaskService
 from module_admin.service.log_service import LoginLogService, OperationLogService
-from utils.common_util import bytes2file_response
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
 
@@ -111,16 +113,38 @@ async def export_system_operation_log_list(
     operation_log_page_query: Annotated[OperLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    # 获取全量数据
-    operation_log_query_result = await OperationLogService.get_operation_log_list_services(
-        query_db, operation_log_page_query, is_page=False
-    )
+    # 分批读取查询结果并写入Excel文件后流式返回
     operation_log_export_result = await OperationLogService.export_operation_log_list_services(
-        request, operation_log_query_result
+        request, query_db, operation_log_page_query
     )
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(operation_log_export_result))
+    return ResponseUtil.streaming(data=operation_log_export_result)
+
+
+@log_controller.post(
+    '/operlog/export/task',
+    summary='创建操作日志后台导出任务接口',
+    description='用于创建后台导出任务，导出文件生成后通过导出任务下载接口获取',
+    response_model=DynamicResponseModel[ExportTaskModel],
+    dependencies=[UserInterfaceAuthDependency('monitor:operlog:export')],
+)
+@Log(title='操作日志', business_type=BusinessType.EXPORT)
+async def create_system_operation_log_export_task(
+    request: Request,
+    operation_log_page_query: Annotated[OperLogPageQueryModel, Form()],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_params = await OperationLogService.get_operation_log_export_params_services(
+        request, operation_log_page_query
+    )
+    export_task_result = await ExportTaskService.create_export_task_services(
+        request, '操作日志', export_params, current_user
+    )
+    logger.info('导出任务创建成功')
+
+    return ResponseUtil.success(msg='导出任务创建成功', model_content=export_task_result)
 
 
 @log_controller.get(
@@ -222,11 +246,8 @@ async def export_system_login_log_list(
     login_log_page_query: Annotated[LoginLogPageQueryModel, Form()],
     query_db: Annotated[AsyncSession, DBSessionDependency()],
 ) -> Response:
-    # 获取全量数据
-    login_log_query_result = await LoginLogService.get_login_log_list_services(
-        query_db, login_log_page_query, is_page=False
-    )
-    login_log_export_result = await LoginLogService.export_login_log_list_services(login_log_query_result)
+    # 分批读取查询结果并写入Excel文件后流式返回
+    login_log_export_result = await LoginLogService.export_login_log_list_services(query_db, login_log_page_query)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(login_log_export_result))
+    return ResponseUtil.streaming(data=login_log_export_result)
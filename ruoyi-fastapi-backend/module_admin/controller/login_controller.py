@@ -14,8 +14,11 @@ from common.router import APIRouterPro
 from common.vo import CrudResponseModel, DataResponseModel, DynamicResponseModel, ResponseBaseModel
 from config.env import AppConfig, JwtConfig
 from module_admin.entity.vo.login_vo import RouterModel, Token, UserLogin, UserRegister
+from module_admin.entity.vo.online_vo import OnlineModel
 from module_admin.entity.vo.user_vo import CurrentUserModel, EditUserModel
 from module_admin.service.login_service import CustomOAuth2PasswordRequestForm, LoginService, oauth2_scheme
+from module_admin.service.online_service import OnlineService
+from module_admin.service.user_cache_service import UserCacheService
 from module_admin.service.user_service import UserService
 from utils.log_util import logger
 from utils.response_util import ResponseUtil
@@ -59,21 +62,28 @@ async def login(
         },
         expires_delta=access_token_expires,
     )
-    if AppConfig.app_same_time_login:
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
-    else:
-        # 此方法可实现同一账号同一时间只能登录一次
-        await request.app.state.redis.set(
-            f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{result[0].user_id}',
-            access_token,
-            ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-        )
+    # 不允许账号同时登录时以用户id作为令牌编号，可实现同一账号同一时间只能登录一次
+    token_id = session_id if AppConfig.app_same_time_login else str(result[0].user_id)
+    await OnlineService.set_online_session_services(
+        request.app.state.redis,
+        token_id,
+        access_token,
+        OnlineModel(
+            tokenId=token_id,
+            userName=result[0].user_name,
+            deptName=result[1].dept_name if result[1] else None,
+            ipaddr=user.login_info.get('ipaddr'),
+            loginLocation=user.login_info.get('loginLocation'),
+            browser=user.login_info.get('browser'),
+            os=user.login_info.get('os'),
+            loginTime=user.login_info.get('loginTime'),
+        ),
+    )
+    # 不允许账号同时登录时令牌编号不变，清除该会话此前的登录用户信息缓存
+    if not AppConfig.app_same_time_login:
+        await UserCacheService.clear_session_cache_services(request.app.state.redis, result[0].user_id, token_id)
     await UserService.edit_user_services(
-        query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
+        request, query_db, EditUserModel(userId=result[0].user_id, loginDate=datetime.now(), type='status')
     )
     logger.info('登录成功')
     # 判断请求是否来自于api文档，如果是返回指定格式的结果，用于修复api文档认证成功后token显示undefined的bug
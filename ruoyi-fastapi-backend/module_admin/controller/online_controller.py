@@ -31,12 +31,12 @@ async def get_monitor_online_list(
     request: Request,
     online_page_query: Annotated[OnlineQueryModel, Query()],
 ) -> Response:
-    # 获取全量数据
+    # 传入分页参数时由服务端分页，否则获取全量数据
     online_query_result = await OnlineService.get_online_list_services(request, online_page_query)
     logger.info('获取成功')
 
     return ResponseUtil.success(
-        model_content=OnlinePageResponseModel(rows=online_query_result, total=len(online_query_result))
+        model_content=OnlinePageResponseModel(rows=online_query_result.rows, total=online_query_result.total)
     )
 
 
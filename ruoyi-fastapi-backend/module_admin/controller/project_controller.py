@@ -1,8 +1,8 @@
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import Path, Query, Request
-from fastapi.responses import Response
+from fastapi import File, Form, Path, Query, Request, UploadFile
+from fastapi.responses import Response, StreamingResponse
 from pydantic_validation_decorator import ValidateFields
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -12,8 +12,14 @@ from common.aspect.interface_auth import UserInterfaceAuthDependency
 from common.aspect.pre_auth import CurrentUserDependency, PreAuthDependency
 from common.enums import BusinessType
 from common.router import APIRouterPro
-from common.vo import DataResponseModel, DynamicResponseModel, ResponseBaseModel
-from module_admin.entity.vo.project_prefect_vo import BatchUpdatePrefectStatusModel, UpdatePrefectStatusModel
+from common.vo import DataResponseModel, DynamicResponseModel, ImportResultModel, ResponseBaseModel
+from module_admin.entity.vo.export_task_vo import ExportTaskModel
+from module_admin.entity.vo.project_prefect_vo import (
+    BatchUpdatePrefectStatusModel,
+    PrefectStatsModel,
+    PrefectTransitionResultModel,
+    UpdatePrefectStatusModel,
+)
 from module_admin.entity.vo.project_vo import (
     AddProjectModel,
     DeleteProjectModel,
@@ -23,6 +29,7 @@ from module_admin.entity.vo.project_vo import (
     ProjectPageModel,
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.export_task_service import ExportTaskService
 from module_admin.service.project_prefect_opinion_service import ProjectPrefectOpinionService
 from module_admin.service.project_prefect_service import ProjectPrefectService
 
@@ -139,6 +146,78 @@ async def get_system_menu_list(
     return ResponseUtil.success(data=menu_query_result)
 
 
+@project_controller.post(
+    '/export',
+    summary='导出项目列表接口',
+    description='用于导出当前符合查询条件的项目列表数据',
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            'description': '流式返回项目列表excel文件',
+            'content': {
+                'application/octet-stream': {},
+            },
+        }
+    },
+    dependencies=[UserInterfaceAuthDependency('project:register:export')],
+)
+@Log(title='项目管理', business_type=BusinessType.EXPORT)
+async def export_project_list(
+    request: Request,
+    project_page_query: Annotated[ProjectPageModel, Form()],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+) -> Response:
+    # 分批读取查询结果并写入Excel文件后流式返回
+    project_export_result = await ProjectService.export_project_list_services(query_db, project_page_query)
+    logger.info('导出成功')
+
+    return ResponseUtil.streaming(data=project_export_result)
+
+
+@project_controller.post(
+    '/export/task',
+    summary='创建项目列表后台导出任务接口',
+    description='用于创建后台导出任务，导出文件生成后通过导出任务下载接口获取',
+    response_model=DynamicResponseModel[ExportTaskModel],
+    dependencies=[UserInterfaceAuthDependency('project:register:export')],
+)
+@Log(title='项目管理', business_type=BusinessType.EXPORT)
+async def create_project_export_task(
+    request: Request,
+    project_page_query: Annotated[ProjectPageModel, Form()],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_params = ProjectService.get_project_export_params_services(project_page_query)
+    export_task_result = await ExportTaskService.create_export_task_services(
+        request, '项目数据', export_params, current_user
+    )
+    logger.info('导出任务创建成功')
+
+    return ResponseUtil.success(msg='导出任务创建成功', model_content=export_task_result)
+
+
+@project_controller.post(
+    '/import',
+    summary='批量导入项目接口',
+    description='用于按项目编号批量新增或更新项目，dryRun为true时仅校验并返回结果，不写入数据',
+    response_model=DynamicResponseModel[ImportResultModel],
+    dependencies=[UserInterfaceAuthDependency('project:register:import')],
+)
+@Log(title='项目管理', business_type=BusinessType.IMPORT)
+async def import_project(
+    request: Request,
+    file: Annotated[UploadFile, File(...)],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+    dry_run: Annotated[bool, Query(alias='dryRun')] = False,
+) -> Response:
+    import_result = await ProjectService.import_project_services(query_db, file, dry_run, current_user)
+    logger.info(import_result.message)
+
+    return ResponseUtil.success(msg=import_result.message, model_content=import_result.result)
+
+
 # @project_controller.get(
 #     '/{pro_id}',
 #     summary='获取单位列表接口',
@@ -279,8 +358,8 @@ async def third_review(
 @project_controller.put(
     '/prefect/second-review/batch',
     summary='二级复审批量操作',
-    description='仅二级复核可操作，同步记录复审意见',
-    response_model=ResponseBaseModel,
+    description='仅二级复核可操作，同步记录复审意见，流程状态已变化的项目跳过并在结果中返回',
+    response_model=DynamicResponseModel[PrefectTransitionResultModel],
     dependencies=[
         UserInterfaceAuthDependency('project:prefect:second-review'),
     ],
@@ -293,14 +372,14 @@ async def batch_second_review(
     current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
 ) -> Response:
     result = await ProjectPrefectService.batch_second_review_services(query_db, batch, current_user)
-    return ResponseUtil.success(msg=result.message)
+    return ResponseUtil.success(msg=result.message, model_content=result.result)
 
 
 @project_controller.put(
     '/prefect/third-review/batch',
     summary='三级复审批量操作',
-    description='仅三级复核可操作，同步记录复审意见',
-    response_model=ResponseBaseModel,
+    description='仅三级复核可操作，同步记录复审意见，流程状态已变化的项目跳过并在结果中返回',
+    response_model=DynamicResponseModel[PrefectTransitionResultModel],
     dependencies=[
         UserInterfaceAuthDependency('project:prefect:third-review'),
     ],
@@ -313,7 +392,25 @@ async def batch_third_review(
     current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
 ) -> Response:
     result = await ProjectPrefectService.batch_third_review_services(query_db, batch, current_user)
-    return ResponseUtil.success(msg=result.message)
+    return ResponseUtil.success(msg=result.message, model_content=result.result)
+
+
+# 流程状态计数
+@project_controller.get(
+    '/prefect/stats',
+    summary='获取流程状态计数',
+    description='获取各流程状态的项目数及当前用户负责的项目在各流程状态的数量',
+    response_model=DataResponseModel[PrefectStatsModel],
+    dependencies=[UserInterfaceAuthDependency('project:register:list')],
+)
+async def get_prefect_stats(
+    request: Request,
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    prefect_stats_result = await ProjectPrefectService.get_prefect_stats_services(current_user)
+    logger.info('获取成功')
+
+    return ResponseUtil.success(data=prefect_stats_result)
 
 
 # 5. 归档人员查询待归档项目
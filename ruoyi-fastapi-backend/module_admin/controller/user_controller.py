@@ -21,6 +21,7 @@ from config.env import UploadConfig
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.dept_vo import DeptModel, DeptTreeModel
+from module_admin.entity.vo.export_task_vo import ExportTaskModel
 from module_admin.entity.vo.user_vo import (
     AddUserModel,
     AvatarModel,
@@ -40,6 +41,7 @@ from module_admin.entity.vo.user_vo import (
     UserRowModel, UserQueryModel,
 )
 from module_admin.service.dept_service import DeptService
+from module_admin.service.export_task_service import ExportTaskService
 from module_admin.service.role_service import RoleService
 from module_admin.service.user_service import UserService
 from utils.common_util import bytes2file_response
@@ -134,7 +136,7 @@ async def add_system_user(
         await RoleService.check_role_data_scope_services(
             query_db, ','.join([str(item) for item in add_user.role_ids]), role_data_scope_sql
         )
-    add_user.password = PwdUtil.get_password_hash(add_user.password)
+    add_user.password = await PwdUtil.get_password_hash_async(add_user.password)
     add_user.create_by = current_user.user.user_name
     add_user.create_time = datetime.now()
     add_user.update_by = current_user.user.user_name
@@ -172,7 +174,7 @@ async def edit_system_user(
         )
     edit_user.update_by = current_user.user.user_name
     edit_user.update_time = datetime.now()
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -204,7 +206,7 @@ async def delete_system_user(
             if not current_user.user.admin:
                 await UserService.check_user_data_scope_services(query_db, int(user_id), data_scope_sql)
     delete_user = DeleteUserModel(userIds=user_ids, updateBy=current_user.user.user_name, updateTime=datetime.now())
-    delete_user_result = await UserService.delete_user_services(query_db, delete_user)
+    delete_user_result = await UserService.delete_user_services(request, query_db, delete_user)
     logger.info(delete_user_result.message)
 
     return ResponseUtil.success(msg=delete_user_result.message)
@@ -230,13 +232,13 @@ async def reset_system_user_pwd(
         await UserService.check_user_data_scope_services(query_db, reset_user.user_id, data_scope_sql)
     edit_user = EditUserModel(
         userId=reset_user.user_id,
-        password=PwdUtil.get_password_hash(reset_user.password),
+        password=await PwdUtil.get_password_hash_async(reset_user.password),
         pwdUpdateDate=datetime.now(),
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
         type='pwd',
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -267,7 +269,7 @@ async def change_system_user_status(
         updateTime=datetime.now(),
         type='status',
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -352,7 +354,7 @@ async def change_system_user_profile_avatar(
             updateTime=datetime.now(),
             type='avatar',
         )
-        edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+        edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
         logger.info(edit_user_result.message)
 
         return ResponseUtil.success(model_content=AvatarModel(imgUrl=edit_user.avatar), msg=edit_user_result.message)
@@ -382,7 +384,7 @@ async def change_system_user_profile_info(
         postIds=current_user.user.post_ids.split(',') if current_user.user.post_ids else [],
         role=current_user.user.role,
     )
-    edit_user_result = await UserService.edit_user_services(query_db, edit_user)
+    edit_user_result = await UserService.edit_user_services(request, query_db, edit_user)
     logger.info(edit_user_result.message)
 
     return ResponseUtil.success(msg=edit_user_result.message)
@@ -409,7 +411,7 @@ async def reset_system_user_password(
         updateBy=current_user.user.user_name,
         updateTime=datetime.now(),
     )
-    reset_user_result = await UserService.reset_user_services(query_db, reset_user)
+    reset_user_result = await UserService.reset_user_services(request, query_db, reset_user)
     logger.info(reset_user_result.message)
 
     return ResponseUtil.success(msg=reset_user_result.message)
@@ -486,14 +488,35 @@ async def export_system_user_list(
     query_db: Annotated[AsyncSession, DBSessionDependency()],
     data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysUser)],
 ) -> Response:
-    # 获取全量数据
-    user_query_result = await UserService.get_user_list_services(
-        query_db, user_page_query, data_scope_sql, is_page=False
-    )
-    user_export_result = await UserService.export_user_list_services(user_query_result)
+    # 分批读取查询结果并写入Excel文件后流式返回
+    user_export_result = await UserService.export_user_list_services(query_db, user_page_query, data_scope_sql)
     logger.info('导出成功')
 
-    return ResponseUtil.streaming(data=bytes2file_response(user_export_result))
+    return ResponseUtil.streaming(data=user_export_result)
+
+
+@user_controller.post(
+    '/export/task',
+    summary='创建用户列表后台导出任务接口',
+    description='用于创建后台导出任务，导出文件生成后通过导出任务下载接口获取',
+    response_model=DynamicResponseModel[ExportTaskModel],
+    dependencies=[UserInterfaceAuthDependency('system:user:export')],
+)
+@Log(title='用户管理', business_type=BusinessType.EXPORT)
+async def create_system_user_export_task(
+    request: Request,
+    user_page_query: Annotated[UserPageQueryModel, Form()],
+    query_db: Annotated[AsyncSession, DBSessionDependency()],
+    data_scope_sql: Annotated[ColumnElement, DataScopeDependency(SysUser)],
+    current_user: Annotated[CurrentUserModel, CurrentUserDependency()],
+) -> Response:
+    export_params = UserService.get_user_export_params_services(user_page_query, data_scope_sql)
+    export_task_result = await ExportTaskService.create_export_task_services(
+        request, '用户数据', export_params, current_user
+    )
+    logger.info('导出任务创建成功')
+
+    return ResponseUtil.success(msg='导出任务创建成功', model_content=export_task_result)
 
 
 @user_controller.get(
@@ -538,7 +561,7 @@ async def update_system_role_user(
         await UserService.check_user_data_scope_services(query_db, user_id, user_data_scope_sql)
         await RoleService.check_role_data_scope_services(query_db, role_ids, role_data_scope_sql)
     add_user_role_result = await UserService.add_user_role_services(
-        query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
+        request, query_db, CrudUserRoleModel(userId=user_id, roleIds=role_ids)
     )
     logger.info(add_user_role_result.message)
 
@@ -1,7 +1,7 @@
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Select, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -53,18 +53,14 @@ class ConfigDao:
         return config_info
 
     @classmethod
-    async def get_config_list(
-        cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_config_list_query(cls, query_object: ConfigPageQueryModel) -> Select:
         """
-        根据查询参数获取参数配置列表信息
+        根据查询参数构造参数配置列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 参数配置列表信息对象
+        :return: 参数配置列表查询语句
         """
-        query = (
+        return (
             select(SysConfig)
             .where(
                 SysConfig.config_name.like(f'%{query_object.config_name}%') if query_object.config_name else True,
@@ -80,6 +76,20 @@ class ConfigDao:
             .order_by(SysConfig.config_id)
             .distinct()
         )
+
+    @classmethod
+    async def get_config_list(
+        cls, db: AsyncSession, query_object: ConfigPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取参数配置列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 参数配置列表信息对象
+        """
+        query = cls.get_config_list_query(query_object)
         config_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
@@ -7,6 +7,7 @@ from common.vo import PageModel
 from module_admin.entity.do.contract_do import Contract
 from module_admin.entity.vo.contract_vo import ContractModel, ContractPageQueryModel
 from utils.page_util import PageUtil
+from utils.search_util import SearchUtil
 
 
 class ContractDao:
@@ -31,14 +32,20 @@ class ContractDao:
         获取合同分页列表
         """
 
+        contract_name_condition, contract_name_relevance = SearchUtil.get_keyword_search(
+            db.bind.dialect.name, Contract.contract_name, page_object.contract_name
+        )
+        # 使用全文索引搜索时按相关度降序排列，查询主表主键无需DISTINCT去重
         query = (
             select(Contract)
             .where(
-                Contract.contract_name.like(f'%{page_object.contract_name}%') if page_object.contract_name else True,
+                contract_name_condition,
                 Contract.contract_type == page_object.contract_type if page_object.contract_type else True,
             )
-            .order_by(Contract.create_time.desc())
-            .distinct()
+            .order_by(
+                *([contract_name_relevance.desc()] if contract_name_relevance is not None else []),
+                Contract.create_time.desc(),
+            )
         )
         contract_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, page_object.page_num, page_object.page_size, is_page
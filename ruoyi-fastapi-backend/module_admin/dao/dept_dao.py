@@ -1,11 +1,13 @@
 from collections.abc import Sequence
 from typing import Union
 
-from sqlalchemy import ColumnElement, bindparam, func, select, update
+from sqlalchemy import ColumnElement, Select, bindparam, delete, func, insert, literal, or_, select, true, union, update
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from sqlalchemy.util import immutabledict
 
-from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
+from module_admin.entity.do.role_do import SysRoleDept
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.dept_vo import DeptModel
 
@@ -88,9 +90,7 @@ class DeptDao:
                     select(SysDept)
                     .where(
                         SysDept.dept_id != dept_info.dept_id,
-                        ~SysDept.dept_id.in_(
-                            select(SysDept.dept_id).where(func.find_in_set(dept_info.dept_id, SysDept.ancestors))
-                        ),
+                        ~SysDept.dept_id.in_(cls.get_descendant_dept_id_sql(dept_info.dept_id)),
                         SysDept.del_flag == '0',
                         SysDept.status == '0',
                         data_scope_sql,
@@ -115,11 +115,57 @@ class DeptDao:
         :return: 子部门信息列表
         """
         dept_result = (
-            (await db.execute(select(SysDept).where(func.find_in_set(dept_id, SysDept.ancestors)))).scalars().all()
+            (
+                await db.execute(
+                    select(SysDept)
+                    .join(SysDeptClosure, SysDeptClosure.descendant_id == SysDept.dept_id)
+                    .where(SysDeptClosure.ancestor_id == dept_id, SysDeptClosure.depth > 0)
+                )
+            )
+            .scalars()
+            .all()
         )
 
         return dept_result
 
+    @classmethod
+    def get_descendant_dept_id_sql(cls, dept_id: int, include_self: bool = False) -> Select:
+        """
+        获取查询部门所有子部门id的子查询，通过部门闭包表的主键索引完成子树查询
+
+        :param dept_id: 部门id
+        :param include_self: 是否包含部门自身
+        :return: 子部门id子查询
+        """
+        return select(SysDeptClosure.descendant_id).where(
+            SysDeptClosure.ancestor_id == dept_id,
+            SysDeptClosure.depth >= 0 if include_self else SysDeptClosure.depth > 0,
+        )
+
+    @classmethod
+    async def get_data_scope_dept_ids_dao(
+        cls, db: AsyncSession, role_id_list: list[int], dept_id: Union[int, None], with_child: bool
+    ) -> list[int]:
+        """
+        根据自定义数据权限角色及所属部门查询可见部门id列表
+
+        :param db: orm对象
+        :param role_id_list: 自定义数据权限的角色id列表
+        :param dept_id: 用户所属部门id，为None表示不包含所属部门
+        :param with_child: 是否包含所属部门的子部门
+        :return: 可见部门id列表
+        """
+        query_list = []
+        if role_id_list:
+            query_list.append(select(SysRoleDept.dept_id).where(SysRoleDept.role_id.in_(role_id_list)))
+        if dept_id is not None and with_child:
+            query_list.append(cls.get_descendant_dept_id_sql(dept_id, include_self=True))
+        dept_id_set = set((await db.execute(union(*query_list))).scalars().all()) if query_list else set()
+        if dept_id is not None:
+            dept_id_set.add(dept_id)
+
+        return sorted(dept_id_set)
+
     @classmethod
     async def get_dept_list_for_tree(
         cls, db: AsyncSession, dept_info: DeptModel, data_scope_sql: ColumnElement
@@ -152,6 +198,34 @@ class DeptDao:
 
         return dept_result
 
+    @classmethod
+    async def get_dept_id_list_by_data_scope(
+        cls, db: AsyncSession, dept_id_list: list[int], data_scope_sql: ColumnElement
+    ) -> list[int]:
+        """
+        从部门id列表中筛选当前数据权限可访问的部门id
+
+        :param db: orm对象
+        :param dept_id_list: 部门id列表
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 可访问的部门id列表
+        """
+        if not dept_id_list:
+            return []
+        dept_id_result = (
+            (
+                await db.execute(
+                    select(SysDept.dept_id)
+                    .where(SysDept.del_flag == '0', SysDept.dept_id.in_(dept_id_list), data_scope_sql)
+                    .distinct()
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+        return list(dept_id_result)
+
     @classmethod
     async def get_dept_list(
         cls, db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement
@@ -233,6 +307,119 @@ class DeptDao:
             execution_options=immutabledict({'synchronize_session': None}),
         )
 
+    @classmethod
+    async def add_dept_closure_dao(cls, db: AsyncSession, dept_id: int, parent_id: int) -> None:
+        """
+        新增部门闭包关系数据库操作，复制父部门的祖先关系并追加自身关系
+
+        :param db: orm对象
+        :param dept_id: 部门id
+        :param parent_id: 父部门id
+        :return:
+        """
+        await db.execute(
+            insert(SysDeptClosure).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                select(SysDeptClosure.ancestor_id, literal(dept_id), SysDeptClosure.depth + 1).where(
+                    SysDeptClosure.descendant_id == parent_id
+                ),
+            )
+        )
+        await db.execute(insert(SysDeptClosure).values(ancestor_id=dept_id, descendant_id=dept_id, depth=0))
+
+    @classmethod
+    async def move_dept_closure_dao(cls, db: AsyncSession, dept_id: int, parent_id: int) -> None:
+        """
+        移动部门子树闭包关系数据库操作，断开子树与原祖先的关系后挂接到新父部门下
+
+        :param db: orm对象
+        :param dept_id: 被移动的部门id
+        :param parent_id: 新的父部门id
+        :return:
+        """
+        # 先查出子树及原祖先部门id，避免MySQL不允许在删除语句的子查询中引用目标表
+        subtree_dept_ids = (
+            (await db.execute(cls.get_descendant_dept_id_sql(dept_id, include_self=True))).scalars().all()
+        )
+        old_ancestor_ids = (
+            (
+                await db.execute(
+                    select(SysDeptClosure.ancestor_id).where(
+                        SysDeptClosure.descendant_id == dept_id, SysDeptClosure.depth > 0
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+        if old_ancestor_ids:
+            await db.execute(
+                delete(SysDeptClosure).where(
+                    SysDeptClosure.descendant_id.in_(subtree_dept_ids), SysDeptClosure.ancestor_id.in_(old_ancestor_ids)
+                )
+            )
+        parent_closure = aliased(SysDeptClosure)
+        subtree_closure = aliased(SysDeptClosure)
+        await db.execute(
+            insert(SysDeptClosure).from_select(
+                ['ancestor_id', 'descendant_id', 'depth'],
+                select(
+                    parent_closure.ancestor_id,
+                    subtree_closure.descendant_id,
+                    parent_closure.depth + subtree_closure.depth + 1,
+                )
+                .select_from(parent_closure)
+                .join(subtree_closure, true())
+                .where(parent_closure.descendant_id == parent_id, subtree_closure.ancestor_id == dept_id),
+            )
+        )
+
+    @classmethod
+    async def delete_dept_closure_dao(cls, db: AsyncSession, dept_id: int) -> None:
+        """
+        删除部门闭包关系数据库操作
+
+        :param db: orm对象
+        :param dept_id: 部门id
+        :return:
+        """
+        await db.execute(
+            delete(SysDeptClosure).where(
+                or_(SysDeptClosure.ancestor_id == dept_id, SysDeptClosure.descendant_id == dept_id)
+            )
+        )
+
+    @classmethod
+    async def rebuild_dept_closure_dao(cls, db: AsyncSession) -> int:
+        """
+        根据部门表祖级列表重建部门闭包表数据库操作，用于历史数据回填
+
+        :param db: orm对象
+        :return: 重建的闭包关系数量
+        """
+        await db.execute(delete(SysDeptClosure))
+        dept_rows = (await db.execute(select(SysDept.dept_id, SysDept.ancestors))).all()
+        closure_rows = []
+        for dept_id, ancestors in dept_rows:
+            closure_rows.append({'ancestor_id': dept_id, 'descendant_id': dept_id, 'depth': 0})
+            ancestor_ids = [int(item) for item in (ancestors or '').split(',') if item and item != '0']
+            for depth, ancestor_id in enumerate(reversed(ancestor_ids), start=1):
+                closure_rows.append({'ancestor_id': ancestor_id, 'descendant_id': dept_id, 'depth': depth})
+        for index in range(0, len(closure_rows), 1000):
+            await db.execute(insert(SysDeptClosure), closure_rows[index : index + 1000])
+
+        return len(closure_rows)
+
+    @classmethod
+    async def count_dept_closure_dao(cls, db: AsyncSession) -> Union[int, None]:
+        """
+        查询部门闭包关系数量
+
+        :param db: orm对象
+        :return: 部门闭包关系数量
+        """
+        return (await db.execute(select(func.count('*')).select_from(SysDeptClosure))).scalar()
+
     @classmethod
     async def update_dept_status_normal_dao(cls, db: AsyncSession, dept_id_list: list) -> None:
         """
@@ -272,7 +459,13 @@ class DeptDao:
             await db.execute(
                 select(func.count('*'))
                 .select_from(SysDept)
-                .where(SysDept.status == '0', SysDept.del_flag == '0', func.find_in_set(dept_id, SysDept.ancestors))
+                .join(SysDeptClosure, SysDeptClosure.descendant_id == SysDept.dept_id)
+                .where(
+                    SysDeptClosure.ancestor_id == dept_id,
+                    SysDeptClosure.depth > 0,
+                    SysDept.status == '0',
+                    SysDept.del_flag == '0',
+                )
             )
         ).scalar()
 
@@ -2,7 +2,7 @@ from collections.abc import Sequence
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import Select, and_, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -67,18 +67,14 @@ class DictTypeDao:
         return list_format_datetime(dict_type_info)
 
     @classmethod
-    async def get_dict_type_list(
-        cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_dict_type_list_query(cls, query_object: DictTypePageQueryModel) -> Select:
         """
-        根据查询参数获取字典类型列表信息
+        根据查询参数构造字典类型列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 字典类型列表信息对象
+        :return: 字典类型列表查询语句
         """
-        query = (
+        return (
             select(SysDictType)
             .where(
                 SysDictType.dict_name.like(f'%{query_object.dict_name}%') if query_object.dict_name else True,
@@ -94,6 +90,20 @@ class DictTypeDao:
             .order_by(SysDictType.dict_id)
             .distinct()
         )
+
+    @classmethod
+    async def get_dict_type_list(
+        cls, db: AsyncSession, query_object: DictTypePageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取字典类型列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 字典类型列表信息对象
+        """
+        query = cls.get_dict_type_list_query(query_object)
         dict_type_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
@@ -184,18 +194,14 @@ class DictDataDao:
         return dict_data_info
 
     @classmethod
-    async def get_dict_data_list(
-        cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_dict_data_list_query(cls, query_object: DictDataPageQueryModel) -> Select:
         """
-        根据查询参数获取字典数据列表信息
+        根据查询参数构造字典数据列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 字典数据列表信息对象
+        :return: 字典数据列表查询语句
         """
-        query = (
+        return (
             select(SysDictData)
             .where(
                 SysDictData.dict_type == query_object.dict_type if query_object.dict_type else True,
@@ -205,6 +211,20 @@ class DictDataDao:
             .order_by(SysDictData.dict_sort)
             .distinct()
         )
+
+    @classmethod
+    async def get_dict_data_list(
+        cls, db: AsyncSession, query_object: DictDataPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取字典数据列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 字典数据列表信息对象
+        """
+        query = cls.get_dict_data_list_query(query_object)
         dict_data_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
@@ -1,12 +1,14 @@
-from typing import Any, Union
+from collections.abc import Sequence
+from typing import Any, Optional, Union
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Row, delete, insert, or_, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
 from module_admin.entity.do.enterprise_info_do import Enterprise
 from module_admin.entity.vo.enterprise_info_vo import EnterpriseModel, EnterprisePageModel
 from utils.page_util import PageUtil
+from utils.search_util import SearchUtil
 
 
 class EnterpriseDao:
@@ -52,31 +54,73 @@ class EnterpriseDao:
 
         return enterprise_info
 
+    @classmethod
+    async def get_ent_dict_by_taxpayer_ids(cls, db: AsyncSession, taxpayer_id_list: list[str]) -> dict[str, Row[Any]]:
+        """
+        根据纳税人识别号列表批量获取企业id
+
+        :param db: orm对象
+        :param taxpayer_id_list: 纳税人识别号列表
+        :return: 纳税人识别号与企业信息（taxpayer_id, ent_id）的映射字典
+        """
+        if not taxpayer_id_list:
+            return {}
+        ent_rows = (
+            await db.execute(
+                select(Enterprise.taxpayer_id, Enterprise.ent_id).where(Enterprise.taxpayer_id.in_(taxpayer_id_list))
+            )
+        ).all()
+
+        return {ent_row.taxpayer_id: ent_row for ent_row in ent_rows}
+
     @classmethod
     async def get_ent_list(
         cls, db: AsyncSession, page_object: EnterprisePageModel, is_page: bool = True
     ) -> Union[PageModel, list[dict[str, Any]]]:
+        enterprise_name_condition, enterprise_name_relevance = SearchUtil.get_keyword_search(
+            db.bind.dialect.name, Enterprise.enterprise_name, page_object.enterprise_name
+        )
+        contact_person_condition, contact_person_relevance = SearchUtil.get_keyword_search(
+            db.bind.dialect.name, Enterprise.contact_person, page_object.contact_person
+        )
+        # 使用全文索引搜索时按相关度降序排列，查询主表主键无需DISTINCT去重
+        relevance = SearchUtil.get_total_relevance(enterprise_name_relevance, contact_person_relevance)
         enterprise_info_list = (
             select(Enterprise)
             .where(
-                Enterprise.enterprise_name.like(f'%{page_object.enterprise_name}%')
-                if page_object.enterprise_name
-                else True,
-                Enterprise.contact_person.like(f'%{page_object.contact_person}%')
-                if page_object.contact_person
-                else True,
+                enterprise_name_condition,
+                contact_person_condition,
                 Enterprise.contact_phone == page_object.contact_phone if page_object.contact_phone else True,
                 Enterprise.ent_type == page_object.ent_type if page_object.ent_type else True,
                 Enterprise.bank_account == page_object.bank_account if page_object.taxpayer_id else True,
             )
-            .order_by(Enterprise.create_time.desc())
-            .distinct()
+            .order_by(*([relevance.desc()] if relevance is not None else []), Enterprise.create_time.desc())
         )
         post_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, enterprise_info_list, page_object.page_num, page_object.page_size, is_page
         )
         return post_list
 
+    @classmethod
+    async def get_ent_suggest_rows(
+        cls, db: AsyncSession, ent_ids: Optional[list[int]] = None, taxpayer_ids: Optional[list[str]] = None
+    ) -> Sequence[Row[Any]]:
+        """
+        获取构建企业名称联想索引所需的企业信息
+
+        :param db: orm对象
+        :param ent_ids: 企业ID列表，与纳税人识别号列表均为None时获取全部企业
+        :param taxpayer_ids: 纳税人识别号列表
+        :return: 企业信息（ent_id, enterprise_name, taxpayer_id, ent_type）列表
+        """
+        query = select(Enterprise.ent_id, Enterprise.enterprise_name, Enterprise.taxpayer_id, Enterprise.ent_type)
+        if ent_ids is not None or taxpayer_ids is not None:
+            query = query.where(
+                or_(Enterprise.ent_id.in_(ent_ids or []), Enterprise.taxpayer_id.in_(taxpayer_ids or []))
+            )
+
+        return (await db.execute(query)).all()
+
     @classmethod
     async def add_ent_dao(cls, db: AsyncSession, enterprise_info: EnterpriseModel) -> Enterprise:
         """
@@ -103,6 +147,28 @@ class EnterpriseDao:
         """
         await db.execute(update(Enterprise), [enterprise_info])
 
+    @classmethod
+    async def batch_add_ent_dao(cls, db: AsyncSession, ent_list: list[dict[str, Any]]) -> None:
+        """
+        批量新增企业数据库操作
+
+        :param db: orm对象
+        :param ent_list: 企业字典列表
+        :return:
+        """
+        await db.execute(insert(Enterprise), ent_list)
+
+    @classmethod
+    async def batch_edit_ent_dao(cls, db: AsyncSession, ent_list: list[dict[str, Any]]) -> None:
+        """
+        批量编辑企业数据库操作
+
+        :param db: orm对象
+        :param ent_list: 需要更新的企业字典列表，每个字典需包含ent_id
+        :return:
+        """
+        await db.execute(update(Enterprise), ent_list)
+
     @classmethod
     async def delete_ent_dao(cls, db: AsyncSession, ent: EnterpriseModel) -> None:
         """
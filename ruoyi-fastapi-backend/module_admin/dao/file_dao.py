@@ -1,6 +1,6 @@
 from typing import Any, Optional
 
-from sqlalchemy import and_, desc, func, insert, select, update
+from sqlalchemy import and_, desc, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -87,11 +87,7 @@ class FileDao:
         page_result = await PageUtil.paginate(db, query, query_params.page_num, query_params.page_size)
         return page_result
 
-    # 6. 软删除文件（修改状态）
+    # 6. 软删除文件（修改状态，文件表不记录更新人及更新时间）
     @classmethod
-    async def delete_file_dao(cls, db: AsyncSession, file_id: int, update_user_id: int) -> None:
-        await db.execute(
-            update(SysFile)
-            .where(SysFile.id == file_id)
-            .values(status=FILE_STATUS_ENUM['DELETE'], update_time=func.now(), update_by=update_user_id)
-        )
+    async def delete_file_dao(cls, db: AsyncSession, file_id: int) -> None:
+        await db.execute(update(SysFile).where(SysFile.id == file_id).values(status=FILE_STATUS_ENUM['DELETE']))
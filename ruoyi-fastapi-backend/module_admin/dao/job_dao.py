@@ -1,7 +1,7 @@
 from collections.abc import Sequence
 from typing import Any, Union
 
-from sqlalchemy import delete, select, update
+from sqlalchemy import Select, delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -58,18 +58,14 @@ class JobDao:
         return job_info
 
     @classmethod
-    async def get_job_list(
-        cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_job_list_query(cls, query_object: JobPageQueryModel) -> Select:
         """
-        根据查询参数获取定时任务列表信息
+        根据查询参数构造定时任务列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 定时任务列表信息对象
+        :return: 定时任务列表查询语句
         """
-        query = (
+        return (
             select(SysJob)
             .where(
                 SysJob.job_name.like(f'%{query_object.job_name}%') if query_object.job_name else True,
@@ -79,6 +75,20 @@ class JobDao:
             .order_by(SysJob.job_id)
             .distinct()
         )
+
+    @classmethod
+    async def get_job_list(
+        cls, db: AsyncSession, query_object: JobPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取定时任务列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 定时任务列表信息对象
+        """
+        query = cls.get_job_list_query(query_object)
         job_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
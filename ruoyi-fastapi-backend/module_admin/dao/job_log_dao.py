@@ -1,7 +1,7 @@
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import delete, desc, select
+from sqlalchemy import Select, delete, desc, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
@@ -17,18 +17,14 @@ class JobLogDao:
     """
 
     @classmethod
-    async def get_job_log_list(
-        cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_job_log_list_query(cls, query_object: JobLogPageQueryModel) -> Select:
         """
-        根据查询参数获取定时任务日志列表信息
+        根据查询参数构造定时任务日志列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 定时任务日志列表信息对象
+        :return: 定时任务日志列表查询语句
         """
-        query = (
+        return (
             select(SysJobLog)
             .where(
                 SysJobLog.job_name.like(f'%{query_object.job_name}%') if query_object.job_name else True,
@@ -44,6 +40,20 @@ class JobLogDao:
             .order_by(desc(SysJobLog.create_time))
             .distinct()
         )
+
+    @classmethod
+    async def get_job_log_list(
+        cls, db: AsyncSession, query_object: JobLogPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取定时任务日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 定时任务日志列表信息对象
+        """
+        query = cls.get_job_log_list_query(query_object)
         job_log_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
@@ -1,8 +1,9 @@
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import asc, delete, desc, select
+from sqlalchemy import Select, asc, delete, desc, insert, select
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from common.vo import PageModel
 from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
@@ -18,26 +19,28 @@ class OperationLogDao:
     """
 
     @classmethod
-    async def get_operation_log_list(
-        cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_operation_log_list_sort_column(cls, query_object: OperLogPageQueryModel) -> InstrumentedAttribute:
         """
-        根据查询参数获取操作日志列表信息
+        根据查询参数获取操作日志列表排序字段
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 操作日志列表信息对象
+        :return: 排序字段
         """
-        if query_object.is_asc == 'ascending':
-            order_by_column = asc(getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None))
-        elif query_object.is_asc == 'descending':
-            order_by_column = desc(
-                getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
-            )
-        else:
-            order_by_column = desc(SysOperLog.oper_time)
-        query = (
+        if query_object.is_asc in ('ascending', 'descending'):
+            return getattr(SysOperLog, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+        return SysOperLog.oper_time
+
+    @classmethod
+    def get_operation_log_list_query(cls, query_object: OperLogPageQueryModel) -> Select:
+        """
+        根据查询参数构造操作日志列表查询语句
+
+        :param query_object: 查询参数对象
+        :return: 操作日志列表查询语句
+        """
+        sort_column = cls.get_operation_log_list_sort_column(query_object)
+        order_by_column = asc(sort_column) if query_object.is_asc == 'ascending' else desc(sort_column)
+        return (
             select(SysOperLog)
             .where(
                 SysOperLog.title.like(f'%{query_object.title}%') if query_object.title else True,
@@ -54,8 +57,34 @@ class OperationLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+
+    @classmethod
+    async def get_operation_log_list(
+        cls, db: AsyncSession, query_object: OperLogPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取操作日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 操作日志列表信息对象
+        """
+        sort_column = cls.get_operation_log_list_sort_column(query_object)
+        query = cls.get_operation_log_list_query(query_object)
+        if is_page and query_object.page_mode == 'keyset':
+            # 游标分页以排序字段及主键作为排序键，深度翻页无需OFFSET及COUNT
+            is_desc = query_object.is_asc != 'ascending'
+            return await PageUtil.paginate_keyset(
+                db,
+                query,
+                [(sort_column, is_desc), (SysOperLog.oper_id, is_desc)],
+                query_object.page_size,
+                query_object.cursor,
+            )
+        # 日志表数据量大且只增不改，超过阈值后返回估算总数
         operation_log_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, count_mode='estimated'
         )
 
         return operation_log_list
@@ -75,6 +104,20 @@ class OperationLogDao:
 
         return db_operation_log
 
+    @classmethod
+    async def add_operation_log_batch_dao(cls, db: AsyncSession, operation_log_list: list[OperLogModel]) -> None:
+        """
+        批量新增操作日志数据库操作
+
+        :param db: orm对象
+        :param operation_log_list: 操作日志对象列表
+        :return:
+        """
+        await db.execute(
+            insert(SysOperLog),
+            [operation_log.model_dump(exclude={'oper_id'}) for operation_log in operation_log_list],
+        )
+
     @classmethod
     async def delete_operation_log_dao(cls, db: AsyncSession, operation_log: OperLogModel) -> None:
         """
@@ -103,28 +146,28 @@ class LoginLogDao:
     """
 
     @classmethod
-    async def get_login_log_list(
-        cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_login_log_list_sort_column(cls, query_object: LoginLogPageQueryModel) -> InstrumentedAttribute:
         """
-        根据查询参数获取登录日志列表信息
+        根据查询参数获取登录日志列表排序字段
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 登录日志列表信息对象
+        :return: 排序字段
         """
-        if query_object.is_asc == 'ascending':
-            order_by_column = asc(
-                getattr(SysLogininfor, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
-            )
-        elif query_object.is_asc == 'descending':
-            order_by_column = desc(
-                getattr(SysLogininfor, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
-            )
-        else:
-            order_by_column = desc(SysLogininfor.login_time)
-        query = (
+        if query_object.is_asc in ('ascending', 'descending'):
+            return getattr(SysLogininfor, SnakeCaseUtil.camel_to_snake(query_object.order_by_column), None)
+        return SysLogininfor.login_time
+
+    @classmethod
+    def get_login_log_list_query(cls, query_object: LoginLogPageQueryModel) -> Select:
+        """
+        根据查询参数构造登录日志列表查询语句
+
+        :param query_object: 查询参数对象
+        :return: 登录日志列表查询语句
+        """
+        sort_column = cls.get_login_log_list_sort_column(query_object)
+        order_by_column = asc(sort_column) if query_object.is_asc == 'ascending' else desc(sort_column)
+        return (
             select(SysLogininfor)
             .where(
                 SysLogininfor.ipaddr.like(f'%{query_object.ipaddr}%') if query_object.ipaddr else True,
@@ -140,8 +183,34 @@ class LoginLogDao:
             .distinct()
             .order_by(order_by_column)
         )
+
+    @classmethod
+    async def get_login_log_list(
+        cls, db: AsyncSession, query_object: LoginLogPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取登录日志列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 登录日志列表信息对象
+        """
+        sort_column = cls.get_login_log_list_sort_column(query_object)
+        query = cls.get_login_log_list_query(query_object)
+        if is_page and query_object.page_mode == 'keyset':
+            # 游标分页以排序字段及主键作为排序键，深度翻页无需OFFSET及COUNT
+            is_desc = query_object.is_asc != 'ascending'
+            return await PageUtil.paginate_keyset(
+                db,
+                query,
+                [(sort_column, is_desc), (SysLogininfor.info_id, is_desc)],
+                query_object.page_size,
+                query_object.cursor,
+            )
+        # 日志表数据量大且只增不改，超过阈值后返回估算总数
         login_log_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, query_object.page_num, query_object.page_size, is_page
+            db, query, query_object.page_num, query_object.page_size, is_page, count_mode='estimated'
         )
 
         return login_log_list
@@ -161,6 +230,20 @@ class LoginLogDao:
 
         return db_login_log
 
+    @classmethod
+    async def add_login_log_batch_dao(cls, db: AsyncSession, login_log_list: list[LogininforModel]) -> None:
+        """
+        批量新增登录日志数据库操作
+
+        :param db: orm对象
+        :param login_log_list: 登录日志对象列表
+        :return:
+        """
+        await db.execute(
+            insert(SysLogininfor),
+            [login_log.model_dump(exclude={'info_id'}) for login_log in login_log_list],
+        )
+
     @classmethod
     async def delete_login_log_dao(cls, db: AsyncSession, login_log: LogininforModel) -> None:
         """
@@ -1,6 +1,6 @@
 from typing import Any, Union
 
-from sqlalchemy import delete, func, select, update
+from sqlalchemy import Select, delete, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -71,18 +71,14 @@ class PostDao:
         return post_info
 
     @classmethod
-    async def get_post_list(
-        cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_post_list_query(cls, query_object: PostPageQueryModel) -> Select:
         """
-        根据查询参数获取岗位列表信息
+        根据查询参数构造岗位列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
-        :param is_page: 是否开启分页
-        :return: 岗位列表信息对象
+        :return: 岗位列表查询语句
         """
-        query = (
+        return (
             select(SysPost)
             .where(
                 SysPost.post_code.like(f'%{query_object.post_code}%') if query_object.post_code else True,
@@ -92,6 +88,20 @@ class PostDao:
             .order_by(SysPost.post_sort)
             .distinct()
         )
+
+    @classmethod
+    async def get_post_list(
+        cls, db: AsyncSession, query_object: PostPageQueryModel, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取岗位列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param is_page: 是否开启分页
+        :return: 岗位列表信息对象
+        """
+        query = cls.get_post_list_query(query_object)
         post_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
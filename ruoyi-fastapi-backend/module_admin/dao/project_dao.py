@@ -1,12 +1,13 @@
 from collections.abc import Sequence
 from typing import Any, Union
 
-from sqlalchemy import Row, RowMapping, and_, delete, func, insert, select, update
+from sqlalchemy import Row, RowMapping, Select, and_, delete, func, insert, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
+from config.env import DataBaseConfig
 from module_admin.entity.do.menu_do import SysMenu
-from module_admin.entity.do.project_do import Project
+from module_admin.entity.do.project_do import Project, ProjectUser
 from module_admin.entity.do.project_prefect_do import ProjectPrefect
 from module_admin.entity.do.role_do import SysRole
 from module_admin.entity.do.user_do import SysUser, SysUserRole
@@ -14,13 +15,44 @@ from module_admin.entity.vo.project_vo import (
     ProjectModel,
     ProjectPageModel,
 )
-from utils.common_util import CamelCaseUtil
+from utils.count_util import CountUtil
 from utils.page_util import PageUtil
+from utils.search_util import SearchUtil
 
 
 class ProjectDao:
     """项目主表数据访问层"""
 
+    @classmethod
+    def get_project_list1_query(
+        cls, page_object: ProjectPageModel, dialect_name: str = DataBaseConfig.db_type
+    ) -> Select:
+        """
+        根据查询参数构造项目列表查询语句
+
+        :param page_object: 查询参数对象
+        :param dialect_name: 数据库方言名称，用于构造关键字搜索条件
+        :return: 项目列表查询语句
+        """
+        # 游标分页以创建时间为排序键，此处仅使用全文索引过滤，不按相关度排序
+        project_name_condition, _ = SearchUtil.get_keyword_search(
+            dialect_name, Project.project_name, page_object.project_name
+        )
+        project_code_condition, _ = SearchUtil.get_keyword_search(
+            dialect_name, Project.project_code, page_object.project_code
+        )
+        return (
+            select(Project)
+            .where(
+                project_name_condition,
+                project_code_condition,
+                # Project.prefect_status == page_object.prefect_status if page_object.prefect_status else True,
+                Project.payment_received == page_object.payment_received if page_object.payment_received else True
+            )
+            .order_by(Project.create_time.desc())
+            .distinct()
+        )
+
     @classmethod
     async def get_project_list1(cls, db: AsyncSession, page_object: ProjectPageModel, is_page: bool = False
                                ) -> Union[PageModel, list[dict[str, Any]]]:
@@ -33,34 +65,25 @@ class ProjectDao:
             :return: 岗位列表信息对象
         """
 
-        query = (
-            select(Project)
-            .where(
-                Project.project_name.like(
-                    f'%{page_object.project_name}%') if page_object.project_name else True,
-                Project.project_code.like(
-                    f'%{page_object.project_code}%') if page_object.project_code else True,
-                # Project.prefect_status == page_object.prefect_status if page_object.prefect_status else True,
-                Project.payment_received == page_object.payment_received if page_object.payment_received else True
+        query = cls.get_project_list1_query(page_object, db.bind.dialect.name)
+        if is_page and page_object.page_mode == 'keyset':
+            # 游标分页以创建时间及主键作为排序键，深度翻页无需OFFSET及COUNT
+            post_list = await PageUtil.paginate_keyset(
+                db,
+                query,
+                [(Project.create_time, True), (Project.pro_id, True)],
+                page_object.page_size,
+                page_object.cursor,
+            )
+        else:
+            post_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
+                db, query, page_object.page_num, page_object.page_size, is_page, count_mode='cached'
             )
-            .order_by(Project.create_time.desc())
-            .distinct()
-        )
-        post_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
-            db, query, page_object.page_num, page_object.page_size, is_page
-        )
         if is_page and isinstance(post_list, PageModel):
-            # 将 ORM 实例转为 ProjectModel（自动处理 Decimal）
-            pydantic_rows = [ProjectModel.model_validate(orm_obj) for orm_obj in post_list.rows]
-            # 转字典（Decimal 已被序列化）
-            post_list.rows = [row.model_dump() for row in pydantic_rows]
-            # 转换字段名为驼峰格式
-            post_list.rows = [CamelCaseUtil.transform_result(row_dict) for row_dict in post_list.rows]
+            # 经 ProjectModel 校验后按别名直接导出小驼峰形式字典，无需再逐键转换
+            post_list.rows = [ProjectModel.model_validate(row).model_dump(by_alias=True) for row in post_list.rows]
         else:
-            pydantic_list = [ProjectModel.model_validate(orm_obj) for orm_obj in post_list]
-            post_list = [row.model_dump() for row in pydantic_list]
-            # 转换字段名为驼峰格式
-            post_list = [CamelCaseUtil.transform_result(row_dict) for row_dict in post_list]
+            post_list = [ProjectModel.model_validate(row).model_dump(by_alias=True) for row in post_list]
 
         return post_list
 
@@ -83,6 +106,15 @@ class ProjectDao:
                 status_list = [s.strip() for s in page_object.prefect_status.split(',') if s.strip()]
             else:
                 status_list = [page_object.prefect_status]
+        project_name_condition, project_name_relevance = SearchUtil.get_keyword_search(
+            db.bind.dialect.name, Project.project_name, page_object.project_name
+        )
+        project_code_condition, project_code_relevance = SearchUtil.get_keyword_search(
+            db.bind.dialect.name, Project.project_code, page_object.project_code
+        )
+        # 使用全文索引搜索时按相关度降序排列，相关度需在查询列中以满足DISTINCT下的排序要求
+        relevance = SearchUtil.get_total_relevance(project_name_relevance, project_code_relevance)
+        relevance_columns = [relevance.label('search_relevance')] if relevance is not None else []
 
         query = (
             select(
@@ -90,6 +122,7 @@ class ProjectDao:
                 ProjectPrefect.current_status.label('review_status'),
                 ProjectPrefect.operator_name.label('reviewer'),
                 ProjectPrefect.update_time.label('review_time'),
+                *relevance_columns,
             )
             .outerjoin(
                 ProjectPrefect,
@@ -100,33 +133,33 @@ class ProjectDao:
             )
             .where(
                 Project.del_flag == '0',
-                Project.project_name.like(f'%{page_object.project_name}%') if page_object.project_name else True,
-                Project.project_code.like(f'%{page_object.project_code}%') if page_object.project_code else True,
+                project_name_condition,
+                project_code_condition,
                 Project.project_type.like(f'%{page_object.project_type}%') if page_object.project_type else True,
                 Project.prefect_status.in_(status_list) if status_list else True,
                 Project.payment_received == page_object.payment_received if page_object.payment_received else True,
             )
-            .order_by(Project.create_time.desc())
+            .order_by(*[column.desc() for column in relevance_columns], Project.create_time.desc())
             .distinct()
         )
 
         if is_page:
-            total = (await db.execute(select(func.count('*')).select_from(query.subquery()))).scalar() or 0
+            total, total_exact = await CountUtil.count(db, query, 'cached')
             query_result = await db.execute(
                 query.offset((page_object.page_num - 1) * page_object.page_size).limit(page_object.page_size)
             )
             rows: list[dict[str, Any]] = []
             for row in query_result:
                 project_obj = row[0]
-                project_dict = ProjectModel.model_validate(project_obj).model_dump(by_alias=False)
+                project_dict = ProjectModel.model_validate(project_obj).model_dump(by_alias=True)
                 project_dict.update(
                     {
-                        'review_status': row.review_status,
+                        'reviewStatus': row.review_status,
                         'reviewer': row.reviewer,
-                        'review_time': row.review_time,
+                        'reviewTime': row.review_time,
                     }
                 )
-                rows.append(CamelCaseUtil.transform_result(project_dict))
+                rows.append(project_dict)
 
             has_next = (total + page_object.page_size - 1) // page_object.page_size > page_object.page_num
             return PageModel[Any](
@@ -134,6 +167,7 @@ class ProjectDao:
                 pageNum=page_object.page_num,
                 pageSize=page_object.page_size,
                 total=total,
+                totalExact=total_exact,
                 hasNext=has_next,
             )
 
@@ -141,15 +175,15 @@ class ProjectDao:
         data_list: list[dict[str, Any]] = []
         for row in query_result:
             project_obj = row[0]
-            project_dict = ProjectModel.model_validate(project_obj).model_dump(by_alias=False)
+            project_dict = ProjectModel.model_validate(project_obj).model_dump(by_alias=True)
             project_dict.update(
                 {
-                    'review_status': row.review_status,
+                    'reviewStatus': row.review_status,
                     'reviewer': row.reviewer,
-                    'review_time': row.review_time,
+                    'reviewTime': row.review_time,
                 }
             )
-            data_list.append(CamelCaseUtil.transform_result(project_dict))
+            data_list.append(project_dict)
         return data_list
 
     # 1. 新增项目（项目创建人新建）
@@ -242,6 +276,36 @@ class ProjectDao:
         # 批量插入SQL（使用SQLAlchemy的insert批量操作）
         await db.execute(insert(Project), project_list)
 
+    @classmethod
+    async def batch_edit_project_dao(cls, db: AsyncSession, project_list: list[dict[str, Any]]) -> None:
+        """
+        批量编辑项目（按主键更新，每个字典需包含pro_id）
+        :param db: 数据库
+        :param project_list: 项目字典列表（每个字典对应一条项目数据）
+        """
+        if not project_list:
+            return
+        await db.execute(update(Project), project_list)
+
+    @classmethod
+    async def get_project_dict_by_codes(cls, db: AsyncSession, project_codes: list[str]) -> dict[str, Row[Any]]:
+        """
+        根据项目编号列表批量获取项目，包含已删除的项目（项目编号的唯一约束同样作用于已删除的项目）
+        :param db: 数据库
+        :param project_codes: 项目编号列表
+        :return: 项目编号与项目信息（project_code, pro_id, prefect_status, del_flag）的映射字典
+        """
+        if not project_codes:
+            return {}
+        project_rows = (
+            await db.execute(
+                select(Project.project_code, Project.pro_id, Project.prefect_status, Project.del_flag).where(
+                    Project.project_code.in_(project_codes)
+                )
+            )
+        ).all()
+        return {project_row.project_code: project_row for project_row in project_rows}
+
     # ------------------------------
     # 新增：批量初始化流程（与批量项目对应）
     # ------------------------------
@@ -279,3 +343,87 @@ class ProjectDao:
             .all()
         )
         return result  # 返回已存在的项目编号列表
+
+    @classmethod
+    async def get_prefect_status_count_dao(cls, db: AsyncSession) -> dict[str, int]:
+        """
+        按流程状态统计未删除的项目数
+
+        :param db: orm对象
+        :return: 流程状态与项目数的映射字典
+        """
+        count_rows = (
+            await db.execute(
+                select(Project.prefect_status, func.count())
+                .where(Project.del_flag == '0', Project.prefect_status.isnot(None))
+                .group_by(Project.prefect_status)
+            )
+        ).all()
+        return dict(count_rows)
+
+    @classmethod
+    async def get_user_prefect_status_count_dao(cls, db: AsyncSession) -> dict[tuple[int, str], int]:
+        """
+        按项目负责人及流程状态统计未删除的项目数
+
+        :param db: orm对象
+        :return: (负责人ID, 流程状态)与项目数的映射字典
+        """
+        count_rows = (
+            await db.execute(
+                select(ProjectUser.user_id, Project.prefect_status, func.count())
+                .join(Project, Project.pro_id == ProjectUser.pro_id)
+                .where(
+                    ProjectUser.user_id.isnot(None),
+                    Project.del_flag == '0',
+                    Project.prefect_status.isnot(None),
+                )
+                .group_by(ProjectUser.user_id, Project.prefect_status)
+            )
+        ).all()
+        return {(user_id, prefect_status): count for user_id, prefect_status, count in count_rows}
+
+    @classmethod
+    async def get_project_user_ids(cls, db: AsyncSession, project_ids: list[int]) -> list[int]:
+        """
+        根据项目ID列表获取各项目的负责人ID，未分配负责人的项目不返回
+
+        :param db: orm对象
+        :param project_ids: 项目ID列表
+        :return: 负责人ID列表（与项目一一对应，可能重复）
+        """
+        if not project_ids:
+            return []
+        return list(
+            (
+                await db.execute(
+                    select(ProjectUser.user_id).where(
+                        ProjectUser.pro_id.in_(project_ids), ProjectUser.user_id.isnot(None)
+                    )
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    @classmethod
+    async def get_project_status_dict_for_update(
+        cls, db: AsyncSession, project_ids: list[int]
+    ) -> dict[int, Union[str, None]]:
+        """
+        批量获取并锁定未删除项目的流程状态，用于在删除、编辑项目时计算流程状态计数的变化
+
+        :param db: orm对象
+        :param project_ids: 项目ID列表
+        :return: 项目ID与流程状态的映射字典
+        """
+        if not project_ids:
+            return {}
+        status_rows = (
+            await db.execute(
+                select(Project.pro_id, Project.prefect_status)
+                .where(Project.pro_id.in_(project_ids), Project.del_flag == '0')
+                .with_for_update()
+            )
+        ).all()
+        return dict(status_rows)
@@ -1,6 +1,6 @@
 from typing import Any
 
-from sqlalchemy import and_, delete, desc, func, select, update
+from sqlalchemy import Row, Update, and_, delete, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -32,15 +32,22 @@ class ProjectPrefectDao:
         """
         await db.execute(delete(ProjectPrefect).where(ProjectPrefect.id.in_([prefect.id])))
 
+    @classmethod
+    def get_show_invoice_seal(cls, target_status: str) -> str:
+        """
+        获取流转至目标状态后是否显示开票用章按钮，二级/三级复审时显示，其他节点不显示
+
+        :param target_status: 目标状态
+        :return: 是否显示开票用章按钮（0-不显示/1-显示）
+        """
+        return (
+            '1' if target_status in [PREFECT_STATUS_ENUM['SECOND_REVIEW'], PREFECT_STATUS_ENUM['THIRD_REVIEW']] else '0'
+        )
+
     # 2. 更新流程状态（含"开票/用章"按钮显示控制）
     @classmethod
     async def update_prefect_status_dao(cls, db: AsyncSession, prefect: UpdatePrefectStatusModel) -> None:
-        # 二级/三级复审时显示开票用章按钮，其他节点不显示
-        show_invoice_seal = (
-            '1'
-            if prefect.target_status in [PREFECT_STATUS_ENUM['SECOND_REVIEW'], PREFECT_STATUS_ENUM['THIRD_REVIEW']]
-            else '0'
-        )
+        show_invoice_seal = cls.get_show_invoice_seal(prefect.target_status)
         await db.execute(
             update(ProjectPrefect)
             .where(and_(ProjectPrefect.pro_id == prefect.pro_id, ProjectPrefect.del_flag == '0'))
@@ -58,6 +65,100 @@ class ProjectPrefectDao:
             .values(prefect_status=prefect.target_status, update_time=func.now())
         )
 
+    @classmethod
+    async def transition_prefect_status_dao(
+        cls,
+        db: AsyncSession,
+        project_ids: list[int],
+        expected_status: str,
+        target_status: str,
+        operator_id: int,
+        operator_name: str,
+    ) -> list[int]:
+        """
+        以比较并设置的方式流转流程状态：流程表的条件更新同时作为并发校验，仅流转当前状态仍为预期状态的项目，
+        无需预先查询或锁定流程，随后同步更新项目表的流程状态
+
+        :param db: orm对象
+        :param project_ids: 项目ID列表
+        :param expected_status: 预期的当前状态
+        :param target_status: 目标状态
+        :param operator_id: 操作人ID
+        :param operator_name: 操作人名称
+        :return: 流转成功的项目ID列表
+        """
+        if not project_ids:
+            return []
+        if db.bind.dialect.update_returning:
+            transition_rows = await db.execute(
+                cls._get_transition_update(
+                    project_ids, expected_status, target_status, operator_id, operator_name
+                ).returning(ProjectPrefect.pro_id)
+            )
+            transition_id_set = set(transition_rows.scalars())
+            transition_ids = [project_id for project_id in project_ids if project_id in transition_id_set]
+        elif len(project_ids) == 1:
+            transition_rows = await db.execute(
+                cls._get_transition_update(project_ids, expected_status, target_status, operator_id, operator_name)
+            )
+            transition_ids = project_ids if transition_rows.rowcount else []
+        else:
+            # 数据库不支持UPDATE ... RETURNING时，批量流转无法从影响行数区分各项目的结果，先锁定流程筛选可流转的项目，
+            # 行锁未生效（如SQLite忽略FOR UPDATE）时筛选结果可能已被并发流转改变，仍以各项目条件更新的影响行数为准
+            prefect_dict = await cls.get_prefect_status_dict_for_update(db, project_ids)
+            transition_ids = []
+            for project_id in project_ids:
+                if project_id not in prefect_dict or prefect_dict[project_id].current_status != expected_status:
+                    continue
+                transition_rows = await db.execute(
+                    cls._get_transition_update([project_id], expected_status, target_status, operator_id, operator_name)
+                )
+                if transition_rows.rowcount:
+                    transition_ids.append(project_id)
+        if transition_ids:
+            await db.execute(
+                update(Project)
+                .where(Project.pro_id.in_(transition_ids), Project.prefect_status == expected_status)
+                .values(prefect_status=target_status, update_time=func.now())
+                .execution_options(synchronize_session=False)
+            )
+
+        return transition_ids
+
+    @classmethod
+    def _get_transition_update(
+        cls, project_ids: list[int], expected_status: str, target_status: str, operator_id: int, operator_name: str
+    ) -> Update:
+        """
+        获取流转流程状态的条件更新语句，已删除的项目不流转
+
+        :param project_ids: 项目ID列表
+        :param expected_status: 预期的当前状态
+        :param target_status: 目标状态
+        :param operator_id: 操作人ID
+        :param operator_name: 操作人名称
+        :return: 条件更新语句
+        """
+        return (
+            update(ProjectPrefect)
+            .where(
+                ProjectPrefect.pro_id.in_(project_ids),
+                ProjectPrefect.current_status == expected_status,
+                ProjectPrefect.del_flag == '0',
+                ProjectPrefect.pro_id.in_(
+                    select(Project.pro_id).where(Project.pro_id.in_(project_ids), Project.del_flag == '0')
+                ),
+            )
+            .values(
+                current_status=target_status,
+                show_invoice_seal=cls.get_show_invoice_seal(target_status),
+                operator_id=operator_id,
+                operator_name=operator_name,
+                update_time=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+
     # # 3. 按项目ID查询当前流程状态
     @classmethod
     async def get_prefect_by_project_id(cls, db: AsyncSession, project_id: int) -> ProjectPrefect | None:
@@ -95,6 +196,31 @@ class ProjectPrefectDao:
                 prefect_map[row.pro_id] = row
         return prefect_map
 
+    @classmethod
+    async def get_prefect_status_dict_for_update(cls, db: AsyncSession, project_ids: list[int]) -> dict[int, Row[Any]]:
+        """
+        批量获取并锁定项目的当前流程，同一项目存在多条流程时取最近更新的一条
+
+        :param db: orm对象
+        :param project_ids: 项目ID列表
+        :return: 项目ID与流程信息（pro_id, id, current_status）的映射字典
+        """
+        if not project_ids:
+            return {}
+        prefect_rows = (
+            await db.execute(
+                select(ProjectPrefect.pro_id, ProjectPrefect.id, ProjectPrefect.current_status)
+                .where(ProjectPrefect.pro_id.in_(project_ids), ProjectPrefect.del_flag == '0')
+                .order_by(desc(ProjectPrefect.update_time))
+                .with_for_update()
+            )
+        ).all()
+        prefect_dict: dict[int, Row[Any]] = {}
+        for prefect_row in prefect_rows:
+            prefect_dict.setdefault(prefect_row.pro_id, prefect_row)
+
+        return prefect_dict
+
     # 4. 分页查询待归档项目（归档人员专用）
     @classmethod
     async def get_to_archive_projects_dao(
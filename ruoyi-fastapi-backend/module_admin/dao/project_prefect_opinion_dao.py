@@ -1,8 +1,10 @@
+from datetime import datetime
 from typing import Any
 
-from sqlalchemy import and_, delete, desc, select
+from sqlalchemy import and_, delete, desc, func, insert, literal, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from module_admin.entity.do.project_prefect_do import ProjectPrefect
 from module_admin.entity.do.project_prefect_opinion_do import ProjectPrefectOpinion
 from module_admin.entity.vo.project_prefect_opinion_vo import ProjectPrefectOpinionModel
 
@@ -16,6 +18,42 @@ class ProjectPrefectOpinionDao:
         db_opinion = ProjectPrefectOpinion(**opinion)
         db.add(db_opinion)
 
+    @classmethod
+    async def add_transition_opinion_dao(
+        cls, db: AsyncSession, project_ids: list[int], target_status: str, opinion: dict[str, Any]
+    ) -> None:
+        """
+        为已流转的项目批量新增审核意见，关联的流程ID在插入语句中直接从流程表获取，无需额外查询；
+        同一项目存在多条已流转的流程时仅关联ID最大的一条，每个项目只新增一条审核意见
+
+        :param db: orm对象
+        :param project_ids: 已流转的项目ID列表
+        :param target_status: 流转后的流程状态
+        :param opinion: 审核意见公共字段字典
+        :return:
+        """
+        opinion = {**opinion, 'create_time': datetime.now(), 'del_flag': '0'}
+        await db.execute(
+            insert(ProjectPrefectOpinion).from_select(
+                ['project_id', 'prefect_id', *opinion],
+                select(
+                    ProjectPrefect.pro_id,
+                    ProjectPrefect.id,
+                    *(literal(value, ProjectPrefectOpinion.__table__.c[key].type) for key, value in opinion.items()),
+                ).where(
+                    ProjectPrefect.id.in_(
+                        select(func.max(ProjectPrefect.id))
+                        .where(
+                            ProjectPrefect.pro_id.in_(project_ids),
+                            ProjectPrefect.current_status == target_status,
+                            ProjectPrefect.del_flag == '0',
+                        )
+                        .group_by(ProjectPrefect.pro_id)
+                    )
+                ),
+            )
+        )
+
     @classmethod
     async def delete_ent_dao(cls, db: AsyncSession, opinion: ProjectPrefectOpinionModel) -> None:
         """
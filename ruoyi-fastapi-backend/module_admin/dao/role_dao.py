@@ -2,7 +2,7 @@ from collections.abc import Sequence
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import ColumnElement, and_, delete, desc, func, select, update
+from sqlalchemy import ColumnElement, Select, and_, delete, desc, func, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
@@ -130,19 +130,15 @@ class RoleDao:
         return role_info
 
     @classmethod
-    async def get_role_list(
-        cls, db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
-    ) -> Union[PageModel, list[dict[str, Any]]]:
+    def get_role_list_query(cls, query_object: RolePageQueryModel, data_scope_sql: ColumnElement) -> Select:
         """
-        根据查询参数获取角色列表信息
+        根据查询参数构造角色列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
-        :param is_page: 是否开启分页
-        :return: 角色列表信息对象
+        :return: 角色列表查询语句
         """
-        query = (
+        return (
             select(SysRole)
             .join(SysUserRole, SysUserRole.role_id == SysRole.role_id, isouter=True)
             .join(SysUser, SysUser.user_id == SysUserRole.user_id, isouter=True)
@@ -164,6 +160,21 @@ class RoleDao:
             .order_by(SysRole.role_sort)
             .distinct()
         )
+
+    @classmethod
+    async def get_role_list(
+        cls, db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
+    ) -> Union[PageModel, list[dict[str, Any]]]:
+        """
+        根据查询参数获取角色列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param is_page: 是否开启分页
+        :return: 角色列表信息对象
+        """
+        query = cls.get_role_list_query(query_object, data_scope_sql)
         role_list: Union[PageModel, list[dict[str, Any]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
@@ -2,10 +2,24 @@ from collections.abc import Sequence
 from datetime import datetime, time
 from typing import Any, Union
 
-from sqlalchemy import ColumnElement, and_, delete, desc, func, or_, select, update
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    String,
+    and_,
+    delete,
+    desc,
+    insert,
+    literal,
+    or_,
+    select,
+    union_all,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import PageModel
+from module_admin.dao.dept_dao import DeptDao
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.post_do import SysPost
@@ -115,94 +129,90 @@ class UserDao:
         return query_user_info
 
     @classmethod
-    async def get_user_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
+    async def get_user_id_dict_by_user_names(cls, db: AsyncSession, user_name_list: list[str]) -> dict[str, int]:
         """
-        根据user_id获取用户信息
+        根据用户账号列表批量获取用户id，同一账号存在多个用户时取最新创建的用户
+
+        :param db: orm对象
+        :param user_name_list: 用户账号列表
+        :return: 用户账号与用户id的映射字典
+        """
+        if not user_name_list:
+            return {}
+        # 以账号列表构造派生表与用户表关联，账号按数据库的排序规则匹配，与逐个账号查询的结果一致
+        user_name_table = union_all(
+            *[select(literal(user_name, String).label('user_name')) for user_name in dict.fromkeys(user_name_list)]
+        ).subquery()
+        user_rows = (
+            await db.execute(
+                select(user_name_table.c.user_name, SysUser.user_id)
+                .join(SysUser, SysUser.user_name == user_name_table.c.user_name)
+                .where(SysUser.del_flag == '0')
+                .order_by(desc(SysUser.create_time))
+            )
+        ).all()
+        user_id_dict: dict[str, int] = {}
+        for user_name, user_id in user_rows:
+            user_id_dict.setdefault(user_name, user_id)
+
+        return user_id_dict
+
+    @classmethod
+    async def get_user_profile_by_id(
+        cls, db: AsyncSession, user_id: int, normal_only: bool = True, with_menu: bool = True
+    ) -> dict[str, Any]:
+        """
+        根据user_id一次性获取用户基本信息、部门、角色、岗位及菜单权限信息
+
+        用户、部门、角色、岗位通过一条外连接语句查询后在内存中去重；菜单权限在已知角色id后按需再查询一次，
+        因此最多只需两次数据库往返
 
         :param db: orm对象
         :param user_id: 用户id
+        :param normal_only: 是否只查询状态正常的用户
+        :param with_menu: 是否查询菜单权限信息
         :return: 当前user_id的用户信息对象
         """
-        query_user_basic_info = (
-            (
-                await db.execute(
-                    select(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
+        query_user_rows = (
+            await db.execute(
+                select(SysUser, SysDept, SysRole, SysPost)
+                .where(
+                    SysUser.del_flag == '0',
+                    SysUser.user_id == user_id,
+                    SysUser.status == '0' if normal_only else True,
                 )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
-            (
-                await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                    )
-                    .distinct()
+                .join(
+                    SysDept,
+                    and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
+                    isouter=True,
                 )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                    isouter=True,
                 )
+                .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
+                .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'), isouter=True)
             )
-            .scalars()
-            .all()
-        )
+        ).all()
+        query_user_basic_info = query_user_rows[0][0] if query_user_rows else None
+        query_user_dept_info = query_user_rows[0][1] if query_user_rows else None
+        query_user_role_info = list({row[2].role_id: row[2] for row in query_user_rows if row[2] is not None}.values())
+        query_user_post_info = list({row[3].post_id: row[3] for row in query_user_rows if row[3] is not None}.values())
         role_id_list = [item.role_id for item in query_user_role_info]
-        if 1 in role_id_list:
+        query_user_menu_info = []
+        if with_menu and 1 in role_id_list:
             query_user_menu_info = (
                 (await db.execute(select(SysMenu).where(SysMenu.status == '0').distinct())).scalars().all()
             )
-        else:
+        elif with_menu and role_id_list:
             query_user_menu_info = (
                 (
                     await db.execute(
                         select(SysMenu)
-                        .select_from(SysUser)
-                        .where(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
-                        .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                        .join(
-                            SysRole,
-                            and_(
-                                SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'
-                            ),
-                            isouter=True,
-                        )
-                        .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                        .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
+                        .join(SysRoleMenu, SysRoleMenu.menu_id == SysMenu.menu_id)
+                        .where(SysRoleMenu.role_id.in_(role_id_list), SysMenu.status == '0')
                         .order_by(SysMenu.order_num)
                         .distinct()
                     )
@@ -221,6 +231,17 @@ class UserDao:
 
         return results
 
+    @classmethod
+    async def get_user_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
+        """
+        根据user_id获取用户信息
+
+        :param db: orm对象
+        :param user_id: 用户id
+        :return: 当前user_id的用户信息对象
+        """
+        return await cls.get_user_profile_by_id(db, user_id, normal_only=True, with_menu=True)
+
     @classmethod
     async def get_user_detail_by_id(cls, db: AsyncSession, user_id: int) -> dict[str, Any]:
         """
@@ -230,111 +251,22 @@ class UserDao:
         :param user_id: 用户id
         :return: 当前user_id的用户信息对象
         """
-        query_user_basic_info = (
-            (await db.execute(select(SysUser).where(SysUser.del_flag == '0', SysUser.user_id == user_id).distinct()))
-            .scalars()
-            .first()
-        )
-        query_user_dept_info = (
-            (
-                await db.execute(
-                    select(SysDept)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(
-                        SysDept,
-                        and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'),
-                    )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .first()
-        )
-        query_user_role_info = (
-            (
-                await db.execute(
-                    select(SysRole)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                    )
-                    .distinct()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_post_info = (
-            (
-                await db.execute(
-                    select(SysPost)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
-                    .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
-                    .distinct()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        query_user_menu_info = (
-            (
-                await db.execute(
-                    select(SysMenu)
-                    .select_from(SysUser)
-                    .where(SysUser.del_flag == '0', SysUser.user_id == user_id)
-                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
-                    .join(
-                        SysRole,
-                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
-                        isouter=True,
-                    )
-                    .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
-                    .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
-                    .distinct()
-                )
-            )
-            .scalars()
-            .all()
-        )
-        results = {
-            'user_basic_info': query_user_basic_info,
-            'user_dept_info': query_user_dept_info,
-            'user_role_info': query_user_role_info,
-            'user_post_info': query_user_post_info,
-            'user_menu_info': query_user_menu_info,
-        }
-
-        return results
+        return await cls.get_user_profile_by_id(db, user_id, normal_only=False, with_menu=True)
 
     @classmethod
-    async def get_user_list(
-        cls, db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
-    ) -> Union[PageModel, list[list[dict[str, Any]]]]:
+    def get_user_list_query(cls, query_object: UserPageQueryModel, data_scope_sql: ColumnElement) -> Select:
         """
-        根据查询参数获取用户列表信息
+        根据查询参数构造用户列表查询语句
 
-        :param db: orm对象
         :param query_object: 查询参数对象
         :param data_scope_sql: 数据权限对应的查询sql语句
-        :param is_page: 是否开启分页
-        :return: 用户列表信息对象
+        :return: 用户列表查询语句
         """
-        query = (
+        return (
             select(SysUser, SysDept)
             .where(
                 SysUser.del_flag == '0',
-                or_(
-                    SysUser.dept_id == query_object.dept_id,
-                    SysUser.dept_id.in_(
-                        select(SysDept.dept_id).where(func.find_in_set(query_object.dept_id, SysDept.ancestors))
-                    ),
-                )
+                SysUser.dept_id.in_(DeptDao.get_descendant_dept_id_sql(query_object.dept_id, include_self=True))
                 if query_object.dept_id
                 else True,
                 SysUser.user_id == query_object.user_id if query_object.user_id is not None else True,
@@ -360,12 +292,46 @@ class UserDao:
             .order_by(SysUser.user_id)
             .distinct()
         )
+
+    @classmethod
+    async def get_user_list(
+        cls, db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement, is_page: bool = False
+    ) -> Union[PageModel, list[list[dict[str, Any]]]]:
+        """
+        根据查询参数获取用户列表信息
+
+        :param db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :param is_page: 是否开启分页
+        :return: 用户列表信息对象
+        """
+        query = cls.get_user_list_query(query_object, data_scope_sql)
         user_list: Union[PageModel, list[list[dict[str, Any]]]] = await PageUtil.paginate(
             db, query, query_object.page_num, query_object.page_size, is_page
         )
 
         return user_list
 
+    @classmethod
+    async def get_user_id_list_by_data_scope(
+        cls, db: AsyncSession, user_id_list: list[int], data_scope_sql: ColumnElement
+    ) -> list[int]:
+        """
+        从用户id列表中筛选当前数据权限可访问的用户id
+
+        :param db: orm对象
+        :param user_id_list: 用户id列表
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 可访问的用户id列表
+        """
+        if not user_id_list:
+            return []
+        query = cls.get_user_list_query(UserPageQueryModel(), data_scope_sql).where(SysUser.user_id.in_(user_id_list))
+        user_id_result = (await db.execute(query.with_only_columns(SysUser.user_id))).scalars().all()
+
+        return list(user_id_result)
+
     @classmethod
     async def add_user_dao(cls, db: AsyncSession, user: UserModel) -> SysUser:
         """
@@ -392,6 +358,28 @@ class UserDao:
         """
         await db.execute(update(SysUser), [user])
 
+    @classmethod
+    async def add_user_batch_dao(cls, db: AsyncSession, user_list: list[UserModel]) -> None:
+        """
+        批量新增用户数据库操作
+
+        :param db: orm对象
+        :param user_list: 用户对象列表
+        :return:
+        """
+        await db.execute(insert(SysUser), [user.model_dump(exclude={'user_id', 'admin'}) for user in user_list])
+
+    @classmethod
+    async def edit_user_batch_dao(cls, db: AsyncSession, user_list: list[dict]) -> None:
+        """
+        批量编辑用户数据库操作
+
+        :param db: orm对象
+        :param user_list: 需要更新的用户字典列表
+        :return:
+        """
+        await db.execute(update(SysUser), user_list)
+
     @classmethod
     async def delete_user_dao(cls, db: AsyncSession, user: UserModel) -> None:
         """
@@ -425,8 +413,6 @@ class UserDao:
                     .where(
                         SysRole.del_flag == '0',
                         SysRole.role_id != 1,
-                        SysRole.role_name == query_object.role_name if query_object.role_name else True,
-                        SysRole.role_key == query_object.role_key if query_object.role_key else True,
                         SysRole.role_id.in_(
                             select(SysUserRole.role_id).where(SysUserRole.user_id == query_object.user_id)
                         ),
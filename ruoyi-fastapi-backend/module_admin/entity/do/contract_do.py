@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy import DECIMAL, Column, Date, DateTime, Integer, String
 
 from config.database import Base
+from utils.search_util import SearchUtil
 
 
 class Contract(Base):
@@ -11,7 +12,11 @@ class Contract(Base):
     """
 
     __tablename__ = 'contract'
-    __table_args__ = {'comment': '合同表'}
+    __table_args__ = (
+        # 全文索引：合同名称，用于合同列表按关键字搜索
+        SearchUtil.get_search_index('ft_contract_name', 'contract_name'),
+        {'comment': '合同表'},
+    )
 
     contract_id = Column(Integer, primary_key=True, autoincrement=True, comment='合同ID')
     contract_name = Column(String(255), nullable=True, comment='合同名称')
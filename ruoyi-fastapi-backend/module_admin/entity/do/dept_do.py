@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import CHAR, BigInteger, Column, DateTime, Integer, String
+from sqlalchemy import CHAR, BigInteger, Column, DateTime, Index, Integer, String
 
 from config.database import Base
 from config.env import DataBaseConfig
@@ -44,3 +44,20 @@ class SysDept(Base):
     create_time = Column(DateTime, nullable=True, default=datetime.now(), comment='创建时间')
     update_by = Column(String(64), nullable=True, server_default="''", comment='更新者')
     update_time = Column(DateTime, nullable=True, default=datetime.now(), comment='更新时间')
+
+
+class SysDeptClosure(Base):
+    """
+    部门闭包表
+    """
+
+    __tablename__ = 'sys_dept_closure'
+    __table_args__ = (
+        # 普通索引：后代部门id，用于查询部门的所有祖先部门
+        Index('idx_sys_dept_closure_descendant', 'descendant_id', 'depth'),
+        {'comment': '部门闭包表'},
+    )
+
+    ancestor_id = Column(BigInteger, primary_key=True, nullable=False, comment='祖先部门id')
+    descendant_id = Column(BigInteger, primary_key=True, nullable=False, comment='后代部门id')
+    depth = Column(Integer, nullable=False, server_default='0', comment='层级距离（0表示自身）')
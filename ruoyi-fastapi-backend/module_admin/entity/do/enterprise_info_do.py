@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy import BigInteger, Column, DateTime, Index, Integer, String, UniqueConstraint
 
 from config.database import Base
+from utils.search_util import SearchUtil
 
 
 class Enterprise(Base):
@@ -16,6 +17,9 @@ class Enterprise(Base):
         UniqueConstraint('taxpayer_id', name='uk_taxpayer_id'),
         # 普通索引：企业名称
         Index('idx_enterprise_name', 'enterprise_name'),
+        # 全文索引：企业名称、联系人，用于企业列表按关键字搜索
+        SearchUtil.get_search_index('ft_enterprise_name', 'enterprise_name'),
+        SearchUtil.get_search_index('ft_contact_person', 'contact_person'),
         {'comment': '企业基本信息表'},
     )
 
@@ -1,15 +1,26 @@
 from datetime import datetime
 
-from sqlalchemy import CHAR, FLOAT, Column, DateTime, Integer, String, Text
+from sqlalchemy import CHAR, FLOAT, Column, DateTime, Index, Integer, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 
+from utils.search_util import SearchUtil
+
 # 声明基类（根据你的项目实际导入方式调整）
 Base = declarative_base()
 
 
 class Project(Base):
     __tablename__ = 'project'
-    __table_args__ = {'comment': '项目主表', 'mysql_charset': 'utf8mb4', 'mysql_collate': 'utf8mb4_general_ci'}
+    __table_args__ = (
+        # 普通索引：流程状态及创建时间，用于按流程状态筛选并按创建时间排序的项目列表及流程状态统计
+        Index('idx_project_del_status_time', 'del_flag', 'prefect_status', 'create_time'),
+        # 普通索引：创建时间，用于不筛选流程状态时按创建时间排序的项目列表及游标分页
+        Index('idx_project_create_time', 'create_time'),
+        # 全文索引：项目名称、项目编码，用于项目列表按关键字搜索
+        SearchUtil.get_search_index('ft_project_name', 'project_name'),
+        SearchUtil.get_search_index('ft_project_code', 'project_code'),
+        {'comment': '项目主表', 'mysql_charset': 'utf8mb4', 'mysql_collate': 'utf8mb4_general_ci'},
+    )
 
     # 基础字段（保留示例中的核心基础字段）
     pro_id = Column(Integer, primary_key=True, autoincrement=True, comment='项目ID（主键）')
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import CHAR, BigInteger, Column, DateTime, String
+from sqlalchemy import CHAR, BigInteger, Column, DateTime, Index, String
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -20,7 +20,13 @@ PREFECT_STATUS_ENUM = {
 # 2. 项目流程表（关联项目主表，记录流程状态）
 class ProjectPrefect(Base):
     __tablename__ = 'project_prefect'
-    __table_args__ = {'comment': '项目流程管理表', 'mysql_charset': 'utf8mb4', 'mysql_collate': 'utf8mb4_general_ci'}
+    __table_args__ = (
+        # 普通索引：项目ID，用于与项目表关联、按项目查询当前流程及流转流程状态
+        Index('idx_project_prefect_pro', 'pro_id', 'del_flag', 'update_time'),
+        # 普通索引：流程状态，用于按流程状态查询待处理的流程（如待归档列表）
+        Index('idx_project_prefect_status', 'current_status', 'del_flag', 'update_time'),
+        {'comment': '项目流程管理表', 'mysql_charset': 'utf8mb4', 'mysql_collate': 'utf8mb4_general_ci'},
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, comment='流程ID')
     pro_id = Column(BigInteger, nullable=False, comment='关联项目ID（外键→sys_project.id）')
@@ -1,6 +1,6 @@
 from datetime import datetime
 
-from sqlalchemy import CHAR, BigInteger, Column, DateTime, String, Text
+from sqlalchemy import CHAR, BigInteger, Column, DateTime, Index, String, Text
 from sqlalchemy.ext.declarative import declarative_base
 
 Base = declarative_base()
@@ -9,11 +9,15 @@ Base = declarative_base()
 # 项目流程意见表（独立存储各节点审核意见，支持回溯）
 class ProjectPrefectOpinion(Base):
     __tablename__ = 'project_prefect_opinion'
-    __table_args__ = {
-        'comment': '项目流程审核意见表',
-        'mysql_charset': 'utf8mb4',
-        'mysql_collate': 'utf8mb4_general_ci',
-    }
+    __table_args__ = (
+        # 普通索引：项目ID，用于按项目查询审核意见并按填写时间排序
+        Index('idx_project_opinion_project', 'project_id', 'del_flag', 'create_time'),
+        {
+            'comment': '项目流程审核意见表',
+            'mysql_charset': 'utf8mb4',
+            'mysql_collate': 'utf8mb4_general_ci',
+        },
+    )
 
     id = Column(BigInteger, primary_key=True, autoincrement=True, comment='意见ID')
     project_id = Column(BigInteger, nullable=False, comment='关联项目ID')
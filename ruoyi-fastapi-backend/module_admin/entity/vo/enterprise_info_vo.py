@@ -109,6 +109,31 @@ class EnterpriseQueryModel(EnterpriseModel):
     end_time: Optional[str] = Field(default=None, description='结束时间')
 
 
+class EnterpriseSuggestQueryModel(BaseModel):
+    """
+    企业名称联想查询模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    keyword: str = Field(description='企业名称或纳税人识别号的前缀')
+    ent_type: Optional[int] = Field(default=None, description='企业类型')
+    limit: int = Field(default=10, ge=1, le=50, description='返回的最大条数')
+
+
+class EnterpriseSuggestModel(BaseModel):
+    """
+    企业名称联想结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    ent_id: int = Field(description='主键ID')
+    enterprise_name: str = Field(description='企业名称')
+    taxpayer_id: str = Field(description='纳税人识别号')
+    ent_type: Optional[int] = Field(default=None, description='企业类型')
+
+
 class DeleteEnterpriseModel(BaseModel):
     """
     删除企业信息请求模型
@@ -0,0 +1,29 @@
+from datetime import datetime
+from typing import Literal, Optional
+
+from pydantic import BaseModel, ConfigDict, Field
+from pydantic.alias_generators import to_camel
+
+
+class ExportTaskModel(BaseModel):
+    """
+    后台导出任务对应pydantic模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    task_id: str = Field(description='任务编号')
+    task_name: str = Field(description='任务名称')
+    user_id: int = Field(description='创建用户ID')
+    status: Literal['pending', 'running', 'success', 'failed'] = Field(
+        default='pending', description='任务状态（pending排队中 running执行中 success已完成 failed失败）'
+    )
+    total_rows: Optional[int] = Field(default=None, description='预计导出行数')
+    processed_rows: int = Field(default=0, description='已导出行数')
+    progress: int = Field(default=0, description='导出进度（0-100）')
+    file_name: Optional[str] = Field(default=None, description='导出文件名称')
+    error_msg: Optional[str] = Field(default=None, description='失败原因')
+    create_time: Optional[datetime] = Field(default=None, description='创建时间')
+    start_time: Optional[datetime] = Field(default=None, description='开始执行时间')
+    finish_time: Optional[datetime] = Field(default=None, description='结束时间')
+    expire_time: Optional[datetime] = Field(default=None, description='导出文件过期时间')
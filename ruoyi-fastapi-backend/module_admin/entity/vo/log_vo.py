@@ -75,6 +75,10 @@ class OperLogPageQueryModel(OperLogQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    page_mode: Literal['offset', 'keyset'] = Field(
+        default='offset', description='分页方式（offset页码分页 keyset游标分页）'
+    )
+    cursor: Optional[str] = Field(default=None, description='游标分页时上一页返回的nextCursor，为空时查询第一页')
 
 
 class DeleteOperLogModel(BaseModel):
@@ -107,6 +111,10 @@ class LoginLogPageQueryModel(LoginLogQueryModel):
 
     page_num: int = Field(default=1, description='当前页码')
     page_size: int = Field(default=10, description='每页记录数')
+    page_mode: Literal['offset', 'keyset'] = Field(
+        default='offset', description='分页方式（offset页码分页 keyset游标分页）'
+    )
+    cursor: Optional[str] = Field(default=None, description='游标分页时上一页返回的nextCursor，为空时查询第一页')
 
 
 class DeleteLoginLogModel(BaseModel):
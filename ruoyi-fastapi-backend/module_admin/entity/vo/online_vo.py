@@ -29,6 +29,8 @@ class OnlineQueryModel(OnlineModel):
 
     begin_time: Optional[str] = Field(default=None, description='开始时间')
     end_time: Optional[str] = Field(default=None, description='结束时间')
+    page_num: Optional[int] = Field(default=None, description='当前页码，为空时返回全部数据')
+    page_size: Optional[int] = Field(default=None, description='每页记录数，为空时返回全部数据')
 
 
 class OnlinePageResponseModel(BaseModel):
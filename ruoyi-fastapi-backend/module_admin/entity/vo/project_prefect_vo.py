@@ -91,6 +91,26 @@ class BatchUpdatePrefectStatusModel(BaseModel):
         return self
 
 
+class PrefectTransitionResultModel(BaseModel):
+    """流程状态流转结果模型"""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    success_ids: list[int] = Field(default=[], description='流转成功的项目ID列表')
+    skipped_ids: list[int] = Field(default=[], description='流程状态已变化或未初始化流程而跳过的项目ID列表')
+
+
+class PrefectStatsModel(BaseModel):
+    """流程状态计数响应模型"""
+
+    model_config = ConfigDict(alias_generator=to_camel, populate_by_name=True)
+
+    status_counts: dict[str, int] = Field(default={}, description='各流程状态的项目数')
+    user_counts: dict[str, int] = Field(default={}, description='当前用户负责的项目在各流程状态的数量')
+    total: int = Field(default=0, description='项目总数')
+    reconcile_time: Optional[datetime] = Field(default=None, description='最近一次对账时间')
+
+
 # 响应模型（流程详情）
 class PrefectDetailModel(BaseModel):
     """流程详情响应模型"""
@@ -1,4 +1,4 @@
-from typing import Optional
+from typing import Literal, Optional
 
 from pydantic import BaseModel, ConfigDict, Field
 from pydantic.alias_generators import to_camel
@@ -54,6 +54,22 @@ class SysFiles(BaseModel):
     usage: Optional[str] = Field(default=None, description='资源的使用率')
 
 
+class LogQueueInfo(BaseModel):
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    running: Optional[bool] = Field(default=None, description='是否开启日志异步写入')
+    queue_depth: Optional[int] = Field(default=None, description='队列中等待写入的日志数')
+    queue_size: Optional[int] = Field(default=None, description='队列容量')
+    overflow_policy: Optional[Literal['block', 'drop_new', 'drop_oldest']] = Field(
+        default=None, description='队列已满时的处理策略'
+    )
+    enqueued: Optional[int] = Field(default=None, description='累计入队日志数')
+    written: Optional[int] = Field(default=None, description='累计写入日志数')
+    dropped: Optional[int] = Field(default=None, description='累计丢弃日志数')
+    failed: Optional[int] = Field(default=None, description='累计写入失败日志数')
+    batches: Optional[int] = Field(default=None, description='累计批量写入次数')
+
+
 class ServerMonitorModel(BaseModel):
     """
     服务监控对应pydantic模型
@@ -66,3 +82,4 @@ class ServerMonitorModel(BaseModel):
     mem: Optional[MemoryInfo] = Field(description='內存相关信息')
     sys: Optional[SysInfo] = Field(description='服务器相关信息')
     sys_files: Optional[list[SysFiles]] = Field(description='磁盘相关信息')
+    log_queue: Optional[LogQueueInfo] = Field(default=None, description='日志写入队列相关信息')
@@ -1,8 +1,9 @@
 import re
+import sys
 from datetime import datetime
-from typing import Literal, Optional, Union
+from typing import Any, Literal, Optional, Union
 
-from pydantic import BaseModel, ConfigDict, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
 from pydantic.alias_generators import to_camel
 from pydantic_validation_decorator import Network, NotBlank, Size, Xss
 
@@ -137,6 +138,66 @@ class CurrentUserModel(BaseModel):
     is_default_modify_pwd: bool = Field(default=False, description='是否初始密码修改提醒')
     is_password_expired: bool = Field(default=False, description='密码是否过期提醒')
 
+    # 权限及角色索引，构建后随模型缓存复用，不参与序列化
+    _permission_set: frozenset[str] = PrivateAttr(default=frozenset())
+    _permission_wildcard_set: frozenset[str] = PrivateAttr(default=frozenset())
+    _role_key_set: frozenset[str] = PrivateAttr(default=frozenset())
+
+    def model_post_init(self, context: Any) -> None:
+        """
+        模型初始化后构建权限标识及角色标识索引
+
+        :param context: 模型校验上下文
+        :return:
+        """
+        permission_set = frozenset(sys.intern(perm) for perm in self.permissions if perm)
+        self._permission_set = permission_set
+        # 以:*结尾的通配权限（如system:user:*）按前缀建立索引
+        self._permission_wildcard_set = frozenset(
+            sys.intern(perm[:-2]) for perm in permission_set if perm.endswith(':*')
+        )
+        self._role_key_set = frozenset(
+            sys.intern(role.role_key) for role in (self.user.role if self.user else []) if role and role.role_key
+        )
+
+    def has_permission(self, perm: str) -> bool:
+        """
+        判断当前用户是否具有指定权限标识
+
+        :param perm: 权限标识
+        :return: 是否具有该权限
+        """
+        if '*:*:*' in self._permission_set or perm in self._permission_set:
+            return True
+        if self._permission_wildcard_set:
+            prefix_end = perm.rfind(':')
+            while prefix_end > 0:
+                if perm[:prefix_end] in self._permission_wildcard_set:
+                    return True
+                prefix_end = perm.rfind(':', 0, prefix_end)
+        return False
+
+    def has_role(self, role_key: str) -> bool:
+        """
+        判断当前用户是否具有指定角色标识
+
+        :param role_key: 角色标识
+        :return: 是否具有该角色
+        """
+        return role_key in self._role_key_set
+
+
+class UserDataScopeModel(BaseModel):
+    """
+    用户数据权限解析结果模型
+    """
+
+    model_config = ConfigDict(alias_generator=to_camel)
+
+    all_data: bool = Field(default=False, description='是否拥有全部数据权限')
+    dept_ids: Optional[list[int]] = Field(default=None, description='可见部门ID列表，为None表示不存在部门类数据权限')
+    self_data: bool = Field(default=False, description='是否拥有本人数据权限')
+
 
 class UserDetailModel(BaseModel):
     """
@@ -57,7 +57,9 @@ class CacheService:
         :param cache_name: 缓存名称
         :return: 缓存键名列表信息
         """
-        cache_keys: list[str] = await request.app.state.redis.keys(f'{cache_name}*')
+        cache_keys: list[str] = [
+            key async for key in request.app.state.redis.scan_iter(match=f'{cache_name}*', count=500)
+        ]
         cache_key_list = [key.split(':', 1)[1] for key in cache_keys if key.startswith(f'{cache_name}:')]
 
         return cache_key_list
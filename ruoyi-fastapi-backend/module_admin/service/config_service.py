@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
 from fastapi import Request
@@ -190,12 +191,15 @@ class ConfigService:
         return result
 
     @staticmethod
-    async def export_config_list_services(config_list: list) -> bytes:
+    async def export_config_list_services(
+        query_db: AsyncSession, query_object: ConfigPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出参数配置信息service
 
-        :param config_list: 参数配置信息列表
-        :return: 参数配置信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 参数配置信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -211,14 +215,16 @@ class ConfigService:
             'remark': '备注',
         }
 
-        for item in config_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('configType') == 'Y':
                 item['configType'] = '是'
             else:
                 item['configType'] = '否'
-        binary_data = ExcelUtil.export_list2excel(config_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, ConfigDao.get_config_list_query(query_object), mapping_dict, format_row
+        )
 
     @classmethod
     async def refresh_sys_config_services(cls, request: Request, query_db: AsyncSession) -> CrudResponseModel:
@@ -1,16 +1,22 @@
+import asyncio
 from collections.abc import Sequence
 from typing import Any
 
+from fastapi import Request
+from redis import asyncio as aioredis
 from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.constant import CommonConstant
+from common.enums import RedisInitKeyConfig
 from common.vo import CrudResponseModel
 from exceptions.exception import ServiceException, ServiceWarning
 from module_admin.dao.dept_dao import DeptDao
 from module_admin.entity.do.dept_do import SysDept
 from module_admin.entity.vo.dept_vo import DeleteDeptModel, DeptModel, DeptTreeModel
+from module_admin.service.user_cache_service import UserCacheService
 from utils.common_util import CamelCaseUtil
+from utils.log_util import logger
 
 
 class DeptService:
@@ -18,6 +24,11 @@ class DeptService:
     部门管理模块服务层
     """
 
+    # 部门闭包表重建锁的过期时间（单位：秒）
+    CLOSURE_REBUILD_LOCK_EXPIRE = 300
+    # 等待其他进程回填部门闭包表的轮询间隔（单位：秒）
+    CLOSURE_REBUILD_WAIT_INTERVAL = 0.5
+
     @classmethod
     async def get_dept_tree_services(
         cls, query_db: AsyncSession, page_object: DeptModel, data_scope_sql: ColumnElement
@@ -103,10 +114,13 @@ class DeptService:
         return CommonConstant.UNIQUE
 
     @classmethod
-    async def add_dept_services(cls, query_db: AsyncSession, page_object: DeptModel) -> CrudResponseModel:
+    async def add_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeptModel
+    ) -> CrudResponseModel:
         """
         新增部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增部门对象
         :return: 新增部门校验结果
@@ -118,18 +132,23 @@ class DeptService:
             raise ServiceException(message=f'部门{parent_info.dept_name}停用，不允许新增')
         page_object.ancestors = f'{parent_info.ancestors},{page_object.parent_id}'
         try:
-            await DeptDao.add_dept_dao(query_db, page_object)
+            add_dept = await DeptDao.add_dept_dao(query_db, page_object)
+            await DeptDao.add_dept_closure_dao(query_db, add_dept.dept_id, page_object.parent_id)
             await query_db.commit()
+            await UserCacheService.clear_all_data_scope_cache_services(request)
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def edit_dept_services(cls, query_db: AsyncSession, page_object: DeptModel) -> CrudResponseModel:
+    async def edit_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeptModel
+    ) -> CrudResponseModel:
         """
         编辑部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑部门对象
         :return: 编辑部门校验结果
@@ -151,6 +170,8 @@ class DeptService:
                 old_ancestors = old_dept.ancestors
                 page_object.ancestors = new_ancestors
                 await cls.update_dept_children(query_db, page_object.dept_id, new_ancestors, old_ancestors)
+                if old_dept.parent_id != new_parent_dept.dept_id:
+                    await DeptDao.move_dept_closure_dao(query_db, page_object.dept_id, new_parent_dept.dept_id)
             edit_dept = page_object.model_dump(exclude_unset=True)
             await DeptDao.edit_dept_dao(query_db, edit_dept)
             if (
@@ -160,16 +181,20 @@ class DeptService:
             ):
                 await cls.update_parent_dept_status_normal(query_db, page_object)
             await query_db.commit()
+            await UserCacheService.clear_all_user_cache_services(request)
             return CrudResponseModel(is_success=True, message='更新成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    async def delete_dept_services(cls, query_db: AsyncSession, page_object: DeleteDeptModel) -> CrudResponseModel:
+    async def delete_dept_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteDeptModel
+    ) -> CrudResponseModel:
         """
         删除部门信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除部门对象
         :return: 删除部门校验结果
@@ -184,7 +209,9 @@ class DeptService:
                         raise ServiceWarning(message='部门存在用户,不允许删除')
 
                     await DeptDao.delete_dept_dao(query_db, DeptModel(deptId=dept_id))
+                    await DeptDao.delete_dept_closure_dao(query_db, int(dept_id))
                 await query_db.commit()
+                await UserCacheService.clear_all_data_scope_cache_services(request)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -192,6 +219,79 @@ class DeptService:
         else:
             raise ServiceException(message='传入部门id为空')
 
+    @classmethod
+    def get_closure_lock_key(cls) -> str:
+        """
+        获取部门闭包表重建锁的缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.DEPT_CLOSURE.key}:lock'
+
+    @classmethod
+    async def init_dept_closure_services(cls, query_db: AsyncSession, redis: aioredis.Redis) -> None:
+        """
+        应用启动时初始化部门闭包表service，闭包表为空时根据部门表祖级列表回填；
+        多个进程同时启动时仅由获得锁的进程回填，其他进程等待回填完成后再继续启动，避免重复写入及使用空的闭包表
+
+        :param query_db: orm对象
+        :param redis: redis对象
+        :return:
+        """
+        if await DeptDao.count_dept_closure_dao(query_db):
+            return
+        if not await redis.set(cls.get_closure_lock_key(), 1, nx=True, ex=cls.CLOSURE_REBUILD_LOCK_EXPIRE):
+            logger.info('🔎 部门闭包表正在由其他进程回填，等待回填完成...')
+            for _ in range(int(cls.CLOSURE_REBUILD_LOCK_EXPIRE / cls.CLOSURE_REBUILD_WAIT_INTERVAL)):
+                if not await redis.exists(cls.get_closure_lock_key()):
+                    break
+                await asyncio.sleep(cls.CLOSURE_REBUILD_WAIT_INTERVAL)
+            return
+        try:
+            # 获得锁前其他进程可能已完成回填
+            if await DeptDao.count_dept_closure_dao(query_db):
+                return
+            closure_count = await cls._rebuild_dept_closure(query_db)
+            logger.info(f'✅️ 部门闭包表回填完成，共{closure_count}条关系')
+        finally:
+            await redis.delete(cls.get_closure_lock_key())
+
+    @classmethod
+    async def rebuild_dept_closure_services(cls, query_db: AsyncSession, redis: aioredis.Redis) -> int:
+        """
+        根据部门表祖级列表重建部门闭包表service，在一个事务中删除并重新写入全部闭包关系，完成后清除数据权限缓存
+
+        :param query_db: orm对象
+        :param redis: redis对象
+        :return: 重建的闭包关系数量
+        """
+        if not await redis.set(cls.get_closure_lock_key(), 1, nx=True, ex=cls.CLOSURE_REBUILD_LOCK_EXPIRE):
+            raise ServiceException(message='部门闭包表正在由其他进程重建，请稍后再试')
+        try:
+            closure_count = await cls._rebuild_dept_closure(query_db)
+        finally:
+            await redis.delete(cls.get_closure_lock_key())
+        await UserCacheService.clear_all_data_scope_cache_by_redis_services(redis)
+
+        return closure_count
+
+    @classmethod
+    async def _rebuild_dept_closure(cls, query_db: AsyncSession) -> int:
+        """
+        在一个事务中重建部门闭包表
+
+        :param query_db: orm对象
+        :return: 重建的闭包关系数量
+        """
+        try:
+            closure_count = await DeptDao.rebuild_dept_closure_dao(query_db)
+            await query_db.commit()
+        except Exception as e:
+            await query_db.rollback()
+            raise e
+
+        return closure_count
+
     @classmethod
     async def dept_detail_services(cls, query_db: AsyncSession, dept_id: int) -> DeptModel:
         """
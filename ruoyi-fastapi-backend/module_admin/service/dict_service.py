@@ -1,5 +1,5 @@
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncGenerator, Sequence
 from typing import Any, Union
 
 from fastapi import Request
@@ -178,12 +178,15 @@ class DictTypeService:
         return result
 
     @staticmethod
-    async def export_dict_type_list_services(dict_type_list: list) -> bytes:
+    async def export_dict_type_list_services(
+        query_db: AsyncSession, query_object: DictTypePageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出字典类型信息service
 
-        :param dict_type_list: 字典信息列表
-        :return: 字典信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 字典信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -198,14 +201,16 @@ class DictTypeService:
             'remark': '备注',
         }
 
-        for item in dict_type_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(dict_type_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, DictTypeDao.get_dict_type_list_query(query_object), mapping_dict, format_row
+        )
 
     @classmethod
     async def refresh_sys_dict_services(cls, request: Request, query_db: AsyncSession) -> CrudResponseModel:
@@ -425,12 +430,15 @@ class DictDataService:
         return result
 
     @staticmethod
-    async def export_dict_data_list_services(dict_data_list: list) -> bytes:
+    async def export_dict_data_list_services(
+        query_db: AsyncSession, query_object: DictDataPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出字典数据信息service
 
-        :param dict_data_list: 字典数据信息列表
-        :return: 字典数据信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 字典数据信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -450,7 +458,7 @@ class DictDataService:
             'remark': '备注',
         }
 
-        for item in dict_data_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -459,6 +467,8 @@ class DictDataService:
                 item['isDefault'] = '是'
             else:
                 item['isDefault'] = '否'
-        binary_data = ExcelUtil.export_list2excel(dict_data_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, DictDataDao.get_dict_data_list_query(query_object), mapping_dict, format_row
+        )
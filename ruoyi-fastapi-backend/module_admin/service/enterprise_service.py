@@ -1,15 +1,26 @@
+from datetime import datetime
 from typing import Any
 
+from fastapi import UploadFile
 from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.constant import CommonConstant
 from common.vo import CrudResponseModel
+from config.get_enterprise_suggest import EnterpriseSuggestUtil
 from exceptions.exception import ServiceException
 from module_admin.dao.enterprise_info_dao import EnterpriseDao
 from module_admin.entity.do.enterprise_info_do import Enterprise
-from module_admin.entity.vo.enterprise_info_vo import DeleteEnterpriseModel, EnterpriseModel, EnterprisePageModel
+from module_admin.entity.vo.enterprise_info_vo import (
+    DeleteEnterpriseModel,
+    EnterpriseModel,
+    EnterprisePageModel,
+    EnterpriseSuggestModel,
+    EnterpriseSuggestQueryModel,
+)
+from module_admin.entity.vo.user_vo import CurrentUserModel
 from utils.common_util import CamelCaseUtil
+from utils.excel_util import ExcelImporter
 
 
 class EnterpriseService:
@@ -33,6 +44,16 @@ class EnterpriseService:
 
         return CamelCaseUtil.transform_result(menu_list_result)
 
+    @classmethod
+    async def get_ent_suggest_services(cls, query_object: EnterpriseSuggestQueryModel) -> list[EnterpriseSuggestModel]:
+        """
+        按企业名称或纳税人识别号的前缀获取联想的单位service
+
+        :param query_object: 联想查询参数对象
+        :return: 联想的单位列表
+        """
+        return await EnterpriseSuggestUtil.suggest(query_object.keyword, query_object.limit, query_object.ent_type)
+
     @classmethod
     async def check_ent_name_unique_services(cls, query_db: AsyncSession, page_object: EnterpriseModel) -> bool:
         """
@@ -59,7 +80,8 @@ class EnterpriseService:
         """
         try:
             user_info = EnterpriseModel(**page_object.model_dump(by_alias=True))
-            await EnterpriseDao.add_ent_dao(query_db, user_info)
+            db_enterprise_info = await EnterpriseDao.add_ent_dao(query_db, user_info)
+            EnterpriseSuggestUtil.record_enterprise_change(query_db, [db_enterprise_info.ent_id])
             await query_db.commit()
             return CrudResponseModel(is_success=True, message='新增成功')
         except Exception as e:
@@ -93,6 +115,7 @@ class EnterpriseService:
 
                 try:
                     await EnterpriseDao.edit_ent_dao(query_db, edit_menu)
+                    EnterpriseSuggestUtil.record_enterprise_change(query_db, [page_object.ent_id])
                     await query_db.commit()
                     return CrudResponseModel(is_success=True, message='更新成功')
                 except Exception as e:
@@ -117,6 +140,7 @@ class EnterpriseService:
             try:
                 for ent_id in ent_id_list:
                     await EnterpriseDao.delete_ent_dao(query_db, EnterpriseModel(entId=ent_id))
+                EnterpriseSuggestUtil.record_enterprise_change(query_db, ent_id_list)
                 await query_db.commit()
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
@@ -125,6 +149,90 @@ class EnterpriseService:
         else:
             raise ServiceException(message='传入单位id为空')
 
+    @classmethod
+    async def import_ent_services(
+        cls, query_db: AsyncSession, file: UploadFile, dry_run: bool, current_user: CurrentUserModel
+    ) -> CrudResponseModel:
+        """
+        导入单位信息service，纳税人识别号不存在时新增，已存在时更新
+
+        :param query_db: orm对象
+        :param file: 单位Excel文件
+        :param dry_run: 是否仅校验不写入数据
+        :param current_user: 当前用户对象
+        :return: 导入结果
+        """
+        header_dict = {
+            '企业名称': 'enterprise_name',
+            '纳税人识别号': 'taxpayer_id',
+            '企业类型': 'ent_type',
+            '企业地址': 'address',
+            '联系人': 'contact_person',
+            '联系电话': 'contact_phone',
+            '开户行': 'bank_name',
+            '银行账号': 'bank_account',
+        }
+        importer = ExcelImporter(
+            EnterpriseModel,
+            header_dict,
+            'taxpayer_id',
+            'ent_id',
+            EnterpriseDao.get_ent_dict_by_taxpayer_ids,
+            cls._import_add_ent,
+            cls._import_edit_ent,
+        )
+        now = datetime.now()
+        update_values = {
+            'update_by': current_user.user.user_name,
+            'update_name': current_user.user.nick_name,
+            'update_time': now,
+        }
+        insert_values = {
+            'create_by': current_user.user.user_name,
+            'create_name': current_user.user.nick_name,
+            'create_time': now,
+            **update_values,
+        }
+        try:
+            import_result = await importer.import_file(query_db, file.file, insert_values, update_values, dry_run)
+            if dry_run:
+                await query_db.rollback()
+            else:
+                await query_db.commit()
+        except Exception as e:
+            await query_db.rollback()
+            raise e
+        finally:
+            await file.close()
+
+        return CrudResponseModel(
+            is_success=True, message=ExcelImporter.get_result_message(import_result), result=import_result
+        )
+
+    @classmethod
+    async def _import_add_ent(cls, query_db: AsyncSession, ent_list: list[dict[str, Any]]) -> None:
+        """
+        导入时批量新增单位，并记录新增的单位用于更新联想索引
+
+        :param query_db: orm对象
+        :param ent_list: 单位字典列表
+        :return:
+        """
+        await EnterpriseDao.batch_add_ent_dao(query_db, ent_list)
+        EnterpriseSuggestUtil.record_enterprise_change(query_db, taxpayer_ids=[ent['taxpayer_id'] for ent in ent_list])
+
+    @classmethod
+    async def _import_edit_ent(cls, query_db: AsyncSession, ent_list: list[dict[str, Any]]) -> None:
+        """
+        导入时批量更新单位，并记录更新的单位用于更新联想索引
+
+        :param query_db: orm对象
+        :param ent_list: 需要更新的单位字典列表，每个字典需包含ent_id
+        :return:
+        """
+        await EnterpriseDao.batch_edit_ent_dao(query_db, ent_list)
+        EnterpriseSuggestUtil.record_enterprise_change(query_db, [ent['ent_id'] for ent in ent_list])
+
     @classmethod
     async def ent_detail_services(cls, query_db: AsyncSession, ent_id: int) -> EnterpriseModel:
         """
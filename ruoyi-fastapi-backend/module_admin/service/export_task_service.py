@@ -0,0 +1,244 @@
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncGenerator
+from datetime import datetime, timedelta
+from typing import Union
+
+from fastapi import Request
+from pydantic import ValidationError
+from redis import asyncio as aioredis
+
+from common.enums import RedisInitKeyConfig
+from config.database import AsyncSessionLocal
+from config.env import AppConfig
+from config.get_export_worker import ExportWorkerUtil
+from exceptions.exception import ServiceException
+from module_admin.entity.vo.export_task_vo import ExportTaskModel
+from module_admin.entity.vo.user_vo import CurrentUserModel
+from utils.count_util import CountUtil
+from utils.excel_util import ExcelExportParams, ExcelUtil
+from utils.log_util import logger
+from utils.upload_util import UploadUtil
+
+
+class ExportTaskService:
+    """
+    后台导出任务模块服务层
+
+    任务状态以 export_task:{task_id} 存储，与导出文件一同在 APP_EXPORT_FILE_TTL 后过期；
+    集合 export_task:user:{user_id} 记录用户进行中的任务，用于限制单个用户同时进行的导出任务数
+    """
+
+    @classmethod
+    def get_task_key(cls, task_id: str) -> str:
+        """
+        获取导出任务状态缓存键名
+
+        :param task_id: 任务编号
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.EXPORT_TASK.key}:{task_id}'
+
+    @classmethod
+    def get_user_task_key(cls, user_id: int) -> str:
+        """
+        获取用户进行中导出任务集合的缓存键名
+
+        :param user_id: 用户id
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.EXPORT_TASK.key}:user:{user_id}'
+
+    @classmethod
+    async def create_export_task_services(
+        cls, request: Request, task_name: str, export_params: ExcelExportParams, current_user: CurrentUserModel
+    ) -> ExportTaskModel:
+        """
+        创建后台导出任务service
+
+        :param request: Request对象
+        :param task_name: 任务名称，同时作为导出文件名称前缀
+        :param export_params: 导出参数
+        :param current_user: 当前用户对象
+        :return: 导出任务信息
+        """
+        redis: aioredis.Redis = request.app.state.redis
+        user_id = current_user.user.user_id
+        if ExportWorkerUtil.is_full():
+            raise ServiceException(message='当前导出任务较多，请稍后再试')
+        task = ExportTaskModel(taskId=uuid.uuid4().hex, taskName=task_name, userId=user_id, createTime=datetime.now())
+        await cls._acquire_user_task_slot(redis, user_id, task.task_id)
+        await cls._save_task(redis, task)
+        if not ExportWorkerUtil.submit_export_task(
+            task.task_id, lambda: cls._run_export_task(redis, task, export_params)
+        ):
+            await redis.srem(cls.get_user_task_key(user_id), task.task_id)
+            await redis.delete(cls.get_task_key(task.task_id))
+            raise ServiceException(message='当前导出任务较多，请稍后再试')
+
+        return task
+
+    @classmethod
+    async def get_export_task_services(
+        cls, request: Request, task_id: str, current_user: CurrentUserModel
+    ) -> ExportTaskModel:
+        """
+        获取后台导出任务状态service
+
+        :param request: Request对象
+        :param task_id: 任务编号
+        :param current_user: 当前用户对象
+        :return: 导出任务信息
+        """
+        task = cls._parse_task(await request.app.state.redis.get(cls.get_task_key(task_id)))
+        if task is None or task.user_id != current_user.user.user_id:
+            raise ServiceException(message='导出任务不存在或已过期')
+
+        return task
+
+    @classmethod
+    async def download_export_task_services(
+        cls, request: Request, task_id: str, current_user: CurrentUserModel
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        下载后台导出任务生成的文件service
+
+        :param request: Request对象
+        :param task_id: 任务编号
+        :param current_user: 当前用户对象
+        :return: 导出文件的流式数据
+        """
+        task = await cls.get_export_task_services(request, task_id, current_user)
+        if task.status != 'success' or not task.file_name:
+            raise ServiceException(message='导出任务尚未完成')
+        file_path = os.path.join(ExportWorkerUtil.get_export_path(), task.file_name)
+        if not UploadUtil.check_file_exists(file_path):
+            raise ServiceException(message='导出文件不存在或已过期')
+
+        return UploadUtil.generate_file(file_path)
+
+    @classmethod
+    async def _acquire_user_task_slot(cls, redis: aioredis.Redis, user_id: int, task_id: str) -> None:
+        """
+        占用用户的导出任务名额，超过单个用户进行中任务数上限时抛出异常
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param task_id: 任务编号
+        :return:
+        """
+        user_task_key = cls.get_user_task_key(user_id)
+        # 先清理已结束或已过期的任务，避免异常退出的任务长期占用名额
+        active_task_ids = list(await redis.smembers(user_task_key))
+        if active_task_ids:
+            task_values = await redis.mget([cls.get_task_key(active_task_id) for active_task_id in active_task_ids])
+            finished_task_ids = [
+                active_task_id
+                for active_task_id, task_value in zip(active_task_ids, task_values)
+                if (active_task := cls._parse_task(task_value)) is None or active_task.status in ('success', 'failed')
+            ]
+            if finished_task_ids:
+                await redis.srem(user_task_key, *finished_task_ids)
+        async with redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(user_task_key, task_id)
+            pipe.scard(user_task_key)
+            pipe.expire(user_task_key, AppConfig.app_export_file_ttl)
+            _, active_count, _ = await pipe.execute()
+        if active_count > AppConfig.app_export_user_max_tasks:
+            await redis.srem(user_task_key, task_id)
+            raise ServiceException(
+                message=f'每个用户最多同时进行{AppConfig.app_export_user_max_tasks}个导出任务，请等待已有任务完成'
+            )
+
+    @classmethod
+    async def _run_export_task(
+        cls, redis: aioredis.Redis, task: ExportTaskModel, export_params: ExcelExportParams
+    ) -> None:
+        """
+        执行后台导出任务，将查询结果写入下载目录并记录导出进度
+
+        :param redis: redis对象
+        :param task: 导出任务信息
+        :param export_params: 导出参数
+        :return:
+        """
+        query, mapping_dict, row_handler = export_params
+        file_name = f'{task.task_name}_{task.task_id}.xlsx'
+        file_path = os.path.join(ExportWorkerUtil.get_export_path(), file_name)
+        task.status = 'running'
+        task.start_time = datetime.now()
+        await cls._save_task(redis, task)
+
+        async def update_progress(row_count: int) -> None:
+            task.processed_rows = row_count
+            if task.total_rows:
+                # 总数可能为估算值，完成前进度最多显示99
+                task.progress = min(99, row_count * 100 // task.total_rows)
+            await cls._save_task(redis, task)
+
+        try:
+            async with AsyncSessionLocal() as session:
+                task.total_rows, _ = await CountUtil.count(session, query, 'estimated')
+                await cls._save_task(redis, task)
+                task.processed_rows = await ExcelUtil.export_query2excel_file(
+                    session, query, mapping_dict, file_path, row_handler, update_progress
+                )
+            task.status = 'success'
+            task.progress = 100
+            task.file_name = file_name
+        except asyncio.CancelledError:
+            task.status = 'failed'
+            task.error_msg = '应用关闭，导出任务已取消'
+            cls._remove_file(file_path)
+            raise
+        except Exception as e:
+            logger.exception(e)
+            task.status = 'failed'
+            task.error_msg = str(e)
+            cls._remove_file(file_path)
+        finally:
+            task.finish_time = datetime.now()
+            task.expire_time = task.finish_time + timedelta(seconds=AppConfig.app_export_file_ttl)
+            await cls._save_task(redis, task)
+            await redis.srem(cls.get_user_task_key(task.user_id), task.task_id)
+
+    @classmethod
+    async def _save_task(cls, redis: aioredis.Redis, task: ExportTaskModel) -> None:
+        """
+        保存导出任务状态
+
+        :param redis: redis对象
+        :param task: 导出任务信息
+        :return:
+        """
+        await redis.set(
+            cls.get_task_key(task.task_id), task.model_dump_json(by_alias=True), ex=AppConfig.app_export_file_ttl
+        )
+
+    @classmethod
+    def _parse_task(cls, task_value: Union[str, None]) -> Union[ExportTaskModel, None]:
+        """
+        解析导出任务状态缓存
+
+        :param task_value: 任务状态缓存值
+        :return: 导出任务信息，缓存不存在或解析失败时返回None
+        """
+        if not task_value:
+            return None
+        try:
+            return ExportTaskModel.model_validate_json(task_value)
+        except ValidationError as e:
+            logger.warning(f'导出任务状态解析失败，详细错误信息：{e}')
+            return None
+
+    @classmethod
+    def _remove_file(cls, file_path: str) -> None:
+        """
+        删除未完成的导出文件
+
+        :param file_path: 文件路径
+        :return:
+        """
+        if os.path.exists(file_path):
+            os.remove(file_path)
@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
 from fastapi import Request
@@ -93,13 +94,16 @@ class JobLogService:
         return CrudResponseModel(**result)
 
     @staticmethod
-    async def export_job_log_list_services(request: Request, job_log_list: list) -> bytes:
+    async def export_job_log_list_services(
+        request: Request, query_db: AsyncSession, query_object: JobLogPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出定时任务日志信息service
 
         :param request: Request对象
-        :param job_log_list: 定时任务日志信息列表
-        :return: 定时任务日志信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 定时任务日志信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -130,7 +134,7 @@ class JobLogService:
         ]
         job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
 
-        for item in job_log_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -139,6 +143,8 @@ class JobLogService:
                 item['jobGroup'] = job_group_option_dict.get(str(item.get('jobGroup'))).get('label')
             if str(item.get('jobExecutor')) in job_executor_option_dict:
                 item['jobExecutor'] = job_executor_option_dict.get(str(item.get('jobExecutor'))).get('label')
-        binary_data = ExcelUtil.export_list2excel(job_log_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, JobLogDao.get_job_log_list_query(query_object), mapping_dict, format_row
+        )
@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
 from fastapi import Request
@@ -205,13 +206,16 @@ class JobService:
         return result
 
     @staticmethod
-    async def export_job_list_services(request: Request, job_list: list) -> bytes:
+    async def export_job_list_services(
+        request: Request, query_db: AsyncSession, query_object: JobPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出定时任务信息service
 
         :param request: Request对象
-        :param job_list: 定时任务信息列表
-        :return: 定时任务信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 定时任务信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -246,7 +250,7 @@ class JobService:
         ]
         job_executor_option_dict = {item.get('value'): item for item in job_executor_option}
 
-        for item in job_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -265,6 +269,8 @@ class JobService:
                 item['concurrent'] = '允许'
             else:
                 item['concurrent'] = '禁止'
-        binary_data = ExcelUtil.export_list2excel(job_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, JobDao.get_job_list_query(query_object), mapping_dict, format_row
+        )
@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
 from fastapi import Request
@@ -6,6 +7,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from common.vo import CrudResponseModel, PageModel
 from exceptions.exception import ServiceException
 from module_admin.dao.log_dao import LoginLogDao, OperationLogDao
+from module_admin.entity.do.log_do import SysLogininfor, SysOperLog
 from module_admin.entity.vo.log_vo import (
     DeleteLoginLogModel,
     DeleteOperLogModel,
@@ -16,7 +18,7 @@ from module_admin.entity.vo.log_vo import (
     UnlockUser,
 )
 from module_admin.service.dict_service import DictDataService
-from utils.excel_util import ExcelUtil
+from utils.excel_util import ExcelExportParams, ExcelUtil
 
 
 class OperationLogService:
@@ -36,6 +38,13 @@ class OperationLogService:
         :param is_page: 是否开启分页
         :return: 操作日志列表信息对象
         """
+        # 游标分页以游标中的排序字段取值定位，排序字段含空值时会跳过数据，仅允许按非空的操作时间排序
+        if (
+            is_page
+            and query_object.page_mode == 'keyset'
+            and OperationLogDao.get_operation_log_list_sort_column(query_object) is not SysOperLog.oper_time
+        ):
+            raise ServiceException(message='游标分页仅支持按操作时间排序')
         operation_log_list_result = await OperationLogDao.get_operation_log_list(query_db, query_object, is_page)
 
         return operation_log_list_result
@@ -98,13 +107,15 @@ class OperationLogService:
             raise e
 
     @classmethod
-    async def export_operation_log_list_services(cls, request: Request, operation_log_list: list) -> bytes:
+    async def get_operation_log_export_params_services(
+        cls, request: Request, query_object: OperLogPageQueryModel
+    ) -> ExcelExportParams:
         """
-        导出操作日志信息service
+        获取操作日志信息导出参数service
 
         :param request: Request对象
-        :param operation_log_list: 操作日志信息列表
-        :return: 操作日志信息对应excel的二进制数据
+        :param query_object: 查询参数对象
+        :return: 操作日志信息导出的查询语句、映射字典及导出行处理方法
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -134,16 +145,32 @@ class OperationLogService:
         ]
         operation_type_option_dict = {item.get('value'): item for item in operation_type_option}
 
-        for item in operation_log_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == 0:
                 item['status'] = '成功'
             else:
                 item['status'] = '失败'
             if str(item.get('businessType')) in operation_type_option_dict:
                 item['businessType'] = operation_type_option_dict.get(str(item.get('businessType'))).get('label')
-        binary_data = ExcelUtil.export_list2excel(operation_log_list, mapping_dict)
+            return item
 
-        return binary_data
+        return OperationLogDao.get_operation_log_list_query(query_object), mapping_dict, format_row
+
+    @classmethod
+    async def export_operation_log_list_services(
+        cls, request: Request, query_db: AsyncSession, query_object: OperLogPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        导出操作日志信息service
+
+        :param request: Request对象
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 操作日志信息对应excel文件的流式数据
+        """
+        query, mapping_dict, row_handler = await cls.get_operation_log_export_params_services(request, query_object)
+
+        return await ExcelUtil.export_query2excel(query_db, query, mapping_dict, row_handler)
 
 
 class LoginLogService:
@@ -163,6 +190,13 @@ class LoginLogService:
         :param is_page: 是否开启分页
         :return: 登录日志列表信息对象
         """
+        # 游标分页以游标中的排序字段取值定位，排序字段含空值时会跳过数据，仅允许按非空的访问时间排序
+        if (
+            is_page
+            and query_object.page_mode == 'keyset'
+            and LoginLogDao.get_login_log_list_sort_column(query_object) is not SysLogininfor.login_time
+        ):
+            raise ServiceException(message='游标分页仅支持按访问时间排序')
         operation_log_list_result = await LoginLogDao.get_login_log_list(query_db, query_object, is_page)
 
         return operation_log_list_result
@@ -233,12 +267,15 @@ class LoginLogService:
         raise ServiceException(message='该用户未锁定')
 
     @staticmethod
-    async def export_login_log_list_services(login_log_list: list) -> bytes:
+    async def export_login_log_list_services(
+        query_db: AsyncSession, query_object: LoginLogPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出登录日志信息service
 
-        :param login_log_list: 登录日志信息列表
-        :return: 登录日志信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 登录日志信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -253,11 +290,13 @@ class LoginLogService:
             'loginTime': '登录日期',
         }
 
-        for item in login_log_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '成功'
             else:
                 item['status'] = '失败'
-        binary_data = ExcelUtil.export_list2excel(login_log_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, LoginLogDao.get_login_log_list_query(query_object), mapping_dict, format_row
+        )
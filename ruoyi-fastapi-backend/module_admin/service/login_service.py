@@ -7,6 +7,7 @@ import jwt
 from fastapi import Depends, Form, Request
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from jwt.exceptions import InvalidTokenError
+from redis.commands.core import AsyncScript
 from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -24,6 +25,8 @@ from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.do.user_do import SysUser
 from module_admin.entity.vo.login_vo import MenuTreeModel, MetaModel, RouterModel, SmsCode, UserLogin, UserRegister
 from module_admin.entity.vo.user_vo import AddUserModel, CurrentUserModel, ResetUserModel, TokenData, UserInfoModel
+from module_admin.service.online_service import OnlineService
+from module_admin.service.user_cache_service import UserCacheService
 from module_admin.service.user_service import UserService
 from utils.common_util import CamelCaseUtil
 from utils.log_util import logger
@@ -68,6 +71,24 @@ class LoginService:
     登录模块服务层
     """
 
+    # 令牌与redis中的令牌一致时才滑动延长会话相关缓存的过期时间并读取用户信息缓存，令牌不一致时返回nil，
+    # 避免已失效或已被替换的令牌（不允许同时登录时令牌编号即用户id）延长当前会话
+    # KEYS：令牌、登录用户信息缓存、数据权限缓存、在线会话元数据、用户会话索引、在线会话过期时间索引；
+    # ARGV：令牌、过期时间（单位：秒）、令牌编号
+    REFRESH_SESSION_SCRIPT = """
+local ttl = tonumber(ARGV[2])
+if redis.call('GET', KEYS[1]) ~= ARGV[1] then
+    return false
+end
+redis.call('EXPIRE', KEYS[1], ttl)
+redis.call('EXPIRE', KEYS[4], ttl)
+redis.call('EXPIRE', KEYS[5], ttl)
+redis.call('ZADD', KEYS[6], 'XX', tonumber(redis.call('TIME')[1]) + ttl, ARGV[3])
+return {1, redis.call('GETEX', KEYS[2], 'EX', ttl), redis.call('GETEX', KEYS[3], 'EX', ttl)}
+"""
+
+    _refresh_session_script: Union[AsyncScript, None] = None
+
     @classmethod
     async def authenticate_user(
         cls, request: Request, query_db: AsyncSession, login_user: UserLogin
@@ -80,10 +101,14 @@ class LoginService:
         :param login_user: 登录用户对象
         :return: 校验结果
         """
-        await cls.__check_login_ip(request)
-        account_lock = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}'
+        # 黑名单、账号锁定、密码错误次数及验证码通过一次MGET获取，减少redis往返次数
+        black_ip_value, account_lock, cache_password_error_count, captcha_value = await request.app.state.redis.mget(
+            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList',
+            f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
+            f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}',
+            f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}',
         )
+        await cls.__check_login_ip(request, black_ip_value)
         if login_user.user_name == account_lock:
             logger.warning('账号已锁定，请稍后再试')
             raise LoginException(data='', message='账号已锁定，请稍后再试')
@@ -100,52 +125,52 @@ class LoginService:
         ):
             pass
         else:
-            await cls.__check_login_captcha(request, login_user)
+            await cls.__check_login_captcha(login_user, captcha_value)
         user = await login_by_account(query_db, login_user.user_name)
         if not user:
             logger.warning('用户不存在')
             raise LoginException(data='', message='用户不存在')
-        if not PwdUtil.verify_password(login_user.password, user[0].password):
-            cache_password_error_count = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
-            )
+        if not await PwdUtil.verify_password_async(login_user.password, user[0].password):
             password_error_counted = 0
             if cache_password_error_count:
                 password_error_counted = cache_password_error_count
             password_error_count = int(password_error_counted) + 1
+            if password_error_count > CommonConstant.PASSWORD_ERROR_COUNT:
+                async with request.app.state.redis.pipeline(transaction=False) as pipe:
+                    pipe.delete(f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}')
+                    pipe.set(
+                        f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
+                        login_user.user_name,
+                        ex=timedelta(minutes=10),
+                    )
+                    await pipe.execute()
+                logger.warning('10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
+                raise LoginException(data='', message='10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
             await request.app.state.redis.set(
                 f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}',
                 password_error_count,
                 ex=timedelta(minutes=10),
             )
-            if password_error_count > CommonConstant.PASSWORD_ERROR_COUNT:
-                await request.app.state.redis.delete(
-                    f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
-                )
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCOUNT_LOCK.key}:{login_user.user_name}',
-                    login_user.user_name,
-                    ex=timedelta(minutes=10),
-                )
-                logger.warning('10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
-                raise LoginException(data='', message='10分钟内密码已输错超过5次，账号已锁定，请10分钟后再试')
             logger.warning('密码错误')
             raise LoginException(data='', message='密码错误')
         if user[0].status == '1':
             logger.warning('用户已停用')
             raise LoginException(data='', message='用户已停用')
-        await request.app.state.redis.delete(f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}')
+        if cache_password_error_count:
+            await request.app.state.redis.delete(
+                f'{RedisInitKeyConfig.PASSWORD_ERROR_COUNT.key}:{login_user.user_name}'
+            )
         return user
 
     @classmethod
-    async def __check_login_ip(cls, request: Request) -> bool:
+    async def __check_login_ip(cls, request: Request, black_ip_value: Union[str, None]) -> bool:
         """
         校验用户登录ip是否在黑名单内
 
         :param request: Request对象
+        :param black_ip_value: 缓存中的登录IP黑名单配置
         :return: 校验结果
         """
-        black_ip_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.login.blackIPList')
         black_ip_list = black_ip_value.split(',') if black_ip_value else []
         if request.headers.get('X-Forwarded-For') in black_ip_list:
             logger.warning('当前IP禁止登录')
@@ -153,15 +178,14 @@ class LoginService:
         return True
 
     @classmethod
-    async def __check_login_captcha(cls, request: Request, login_user: UserLogin) -> bool:
+    async def __check_login_captcha(cls, login_user: UserLogin, captcha_value: Union[str, None]) -> bool:
         """
         校验用户登录验证码
 
-        :param request: Request对象
         :param login_user: 登录用户对象
+        :param captcha_value: 缓存中的验证码
         :return: 校验结果
         """
-        captcha_value = await request.app.state.redis.get(f'{RedisInitKeyConfig.CAPTCHA_CODES.key}:{login_user.uuid}')
         if not captcha_value:
             logger.warning('验证码已失效')
             raise LoginException(data='', message='验证码已失效')
@@ -217,91 +241,110 @@ class LoginService:
         except InvalidTokenError as e:
             logger.warning('用户token已失效，请重新登录')
             raise AuthException(data='', message='用户token已失效，请重新登录') from e
-        query_user = await UserDao.get_user_by_id(query_db, user_id=token_data.user_id)
-        if query_user.get('user_basic_info') is None:
-            logger.warning('用户token不合法')
-            raise AuthException(data='', message='用户token不合法')
-        if AppConfig.app_same_time_login:
-            redis_token = await request.app.state.redis.get(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}')
-        else:
-            # 此方法可实现同一账号同一时间只能登录一次
-            redis_token = await request.app.state.redis.get(
-                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}'
+        token_id = session_id if AppConfig.app_same_time_login else token_data.user_id
+        # 令牌校验与滑动过期、用户信息缓存读取及参数配置读取合并为一次redis往返
+        if cls._refresh_session_script is None:
+            cls._refresh_session_script = request.app.state.redis.register_script(cls.REFRESH_SESSION_SCRIPT)
+        async with request.app.state.redis.pipeline(transaction=False) as pipe:
+            await cls._refresh_session_script(
+                keys=[
+                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}',
+                    UserCacheService.get_cache_key(token_data.user_id, token_id),
+                    UserCacheService.get_data_scope_cache_key(token_data.user_id, token_id),
+                    OnlineService.get_online_session_key(token_id),
+                    UserCacheService.get_user_session_key(token_data.user_id),
+                    OnlineService.get_online_session_expire_key(),
+                ],
+                args=[token, int(timedelta(minutes=JwtConfig.jwt_redis_expire_minutes).total_seconds()), token_id],
+                client=pipe,
             )
-        if token == redis_token:
-            if AppConfig.app_same_time_login:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{session_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
-            else:
-                await request.app.state.redis.set(
-                    f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{query_user.get("user_basic_info").user_id}',
-                    redis_token,
-                    ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
-                )
-
-            role_id_list = [item.role_id for item in query_user.get('user_role_info')]
-            if 1 in role_id_list:  # noqa: SIM108
-                permissions = ['*:*:*']
-            else:
-                permissions = [row.perms for row in query_user.get('user_menu_info')]
-            post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
-            role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
-            roles = [row.role_key for row in query_user.get('user_role_info')]
-            is_default_modify_pwd = await cls.__init_password_is_modify(
-                request, query_user.get('user_basic_info').pwd_update_date
+            pipe.mget(
+                f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify',
+                f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays',
             )
-            is_password_expired = await cls.__password_is_expired(
-                request, query_user.get('user_basic_info').pwd_update_date
+            session_values, (init_password_modify, password_validate_days) = await pipe.execute()
+        if session_values is None:
+            logger.warning('用户token已失效，请重新登录')
+            raise AuthException(data='', message='用户token已失效，请重新登录')
+        _, cache_value, data_scope_cache_value = session_values
+        # 会话编号及数据权限缓存存储到request.state，供数据权限依赖按需使用
+        request.state.token_id = token_id
+        request.state.data_scope_cache_value = data_scope_cache_value
+        current_user = UserCacheService.parse_current_user_cache_services(token_data.user_id, token_id, cache_value)
+        if current_user is None:
+            current_user = await cls.__get_current_user_from_db(query_db, token_data.user_id)
+            await UserCacheService.set_current_user_cache_services(
+                request.app.state.redis, token_data.user_id, token_id, current_user
             )
-
-            current_user = CurrentUserModel(
-                permissions=permissions,
-                roles=roles,
-                user=UserInfoModel(
-                    **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
-                    postIds=post_ids,
-                    roleIds=role_ids,
-                    dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
-                    role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
+        current_user = current_user.model_copy(
+            update={
+                'is_default_modify_pwd': cls.__init_password_is_modify(
+                    init_password_modify, current_user.user.pwd_update_date
                 ),
-                isDefaultModifyPwd=is_default_modify_pwd,
-                isPasswordExpired=is_password_expired,
-            )
-            # 设置当前用户信息到上下文
-            RequestContext.set_current_user(current_user)
-            return current_user
-        logger.warning('用户token已失效，请重新登录')
-        raise AuthException(data='', message='用户token已失效，请重新登录')
+                'is_password_expired': cls.__password_is_expired(
+                    password_validate_days, current_user.user.pwd_update_date
+                ),
+            }
+        )
+        # 设置当前用户信息到上下文
+        RequestContext.set_current_user(current_user)
+        return current_user
+
+    @classmethod
+    async def __get_current_user_from_db(cls, query_db: AsyncSession, user_id: int) -> CurrentUserModel:
+        """
+        从数据库查询并组装当前用户信息
+
+        :param query_db: orm对象
+        :param user_id: 用户id
+        :return: 当前用户信息对象
+        :raise: 令牌异常AuthException
+        """
+        query_user = await UserDao.get_user_profile_by_id(query_db, user_id)
+        if query_user.get('user_basic_info') is None:
+            logger.warning('用户token不合法')
+            raise AuthException(data='', message='用户token不合法')
+        role_id_list = [item.role_id for item in query_user.get('user_role_info')]
+        if 1 in role_id_list:  # noqa: SIM108
+            permissions = ['*:*:*']
+        else:
+            permissions = [row.perms for row in query_user.get('user_menu_info')]
+        post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
+        role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
+        roles = [row.role_key for row in query_user.get('user_role_info')]
+
+        return CurrentUserModel(
+            permissions=permissions,
+            roles=roles,
+            user=UserInfoModel(
+                **CamelCaseUtil.transform_result(query_user.get('user_basic_info')),
+                postIds=post_ids,
+                roleIds=role_ids,
+                dept=CamelCaseUtil.transform_result(query_user.get('user_dept_info')),
+                role=CamelCaseUtil.transform_result(query_user.get('user_role_info')),
+            ),
+        )
 
     @classmethod
-    async def __init_password_is_modify(cls, request: Request, pwd_update_date: datetime) -> bool:
+    def __init_password_is_modify(cls, init_password_modify: Union[str, None], pwd_update_date: datetime) -> bool:
         """
         判断当前用户是否初始密码登录
 
-        :param request: Request对象
+        :param init_password_modify: 缓存中的初始密码修改策略配置
         :param pwd_update_date: 密码最后更新时间
         :return: 是否初始密码登录
         """
-        init_password_is_modify = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.initPasswordModify'
-        )
-        return init_password_is_modify == '1' and pwd_update_date is None
+        return init_password_modify == '1' and pwd_update_date is None
 
     @classmethod
-    async def __password_is_expired(cls, request: Request, pwd_update_date: datetime) -> bool:
+    def __password_is_expired(cls, password_validate_days: Union[str, None], pwd_update_date: datetime) -> bool:
         """
         判断当前用户密码是否过期
 
-        :param request: Request对象
+        :param password_validate_days: 缓存中的密码有效天数配置
         :param pwd_update_date: 密码最后更新时间
         :return: 密码是否过期
         """
-        password_validate_days = await request.app.state.redis.get(
-            f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.account.passwordValidateDays'
-        )
         if password_validate_days and int(password_validate_days) > 0:
             if pwd_update_date is None:
                 return True
@@ -319,7 +362,7 @@ class LoginService:
         :param query_db: orm对象
         :return: 当前用户路由信息对象
         """
-        query_user = await UserDao.get_user_by_id(query_db, user_id=user_id)
+        query_user = await UserDao.get_user_profile_by_id(query_db, user_id)
         user_router_menu = sorted(
             [
                 row
@@ -451,7 +494,7 @@ class LoginService:
                 add_user = AddUserModel(
                     userName=user_register.username,
                     nickName=user_register.username,
-                    password=PwdUtil.get_password_hash(user_register.password),
+                    password=await PwdUtil.get_password_hash_async(user_register.password),
                     pwdUpdateDate=datetime.now(),
                 )
                 result = await UserService.add_user_services(query_db, add_user)
@@ -502,9 +545,9 @@ class LoginService:
             f'{RedisInitKeyConfig.SMS_CODE.key}:{forget_user.session_id}'
         )
         if forget_user.sms_code == redis_sms_result:
-            forget_user.password = PwdUtil.get_password_hash(forget_user.password)
+            forget_user.password = await PwdUtil.get_password_hash_async(forget_user.password)
             forget_user.user_id = (await UserDao.get_user_by_name(query_db, forget_user.user_name)).user_id
-            edit_result = await UserService.reset_user_services(query_db, forget_user)
+            edit_result = await UserService.reset_user_services(request, query_db, forget_user)
             result = edit_result.dict()
         elif not redis_sms_result:
             result = {'is_success': False, 'message': '短信验证码已过期'}
@@ -523,7 +566,7 @@ class LoginService:
         :param token_id: 令牌编号
         :return: 退出登录结果
         """
-        await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+        await OnlineService.remove_online_session_services(request.app.state.redis, [str(token_id)])
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_access_token')
         # await request.app.state.redis.delete(f'{current_user.user.user_id}_session_id')
 
@@ -1,6 +1,7 @@
 from collections.abc import Sequence
 from typing import Any, Optional
 
+from fastapi import Request
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.constant import CommonConstant, MenuConstant
@@ -12,6 +13,7 @@ from module_admin.entity.do.menu_do import SysMenu
 from module_admin.entity.vo.menu_vo import DeleteMenuModel, MenuModel, MenuQueryModel, MenuTreeModel
 from module_admin.entity.vo.role_vo import RoleMenuQueryModel
 from module_admin.entity.vo.user_vo import CurrentUserModel
+from module_admin.service.user_cache_service import UserCacheService
 from utils.common_util import CamelCaseUtil
 from utils.string_util import StringUtil
 
@@ -118,10 +120,13 @@ class MenuService:
             raise e
 
     @classmethod
-    async def edit_menu_services(cls, query_db: AsyncSession, page_object: MenuModel) -> CrudResponseModel:
+    async def edit_menu_services(
+        cls, request: Request, query_db: AsyncSession, page_object: MenuModel
+    ) -> CrudResponseModel:
         """
         编辑菜单信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑部门对象
         :return: 编辑菜单校验结果
@@ -138,6 +143,7 @@ class MenuService:
             try:
                 await MenuDao.edit_menu_dao(query_db, edit_menu)
                 await query_db.commit()
+                await UserCacheService.clear_all_user_cache_services(request)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -1,23 +1,261 @@
-from typing import Any
+import json
+import time
+from datetime import timedelta
+from typing import Any, Optional, Union
 
 import jwt
 from fastapi import Request
+from jwt.exceptions import InvalidTokenError
+from pydantic import ValidationError
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
 
 from common.enums import RedisInitKeyConfig
-from common.vo import CrudResponseModel
+from common.vo import CrudResponseModel, PageModel
 from config.env import AppConfig, JwtConfig
 from exceptions.exception import ServiceException
-from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineQueryModel
-from utils.common_util import CamelCaseUtil
+from module_admin.entity.vo.online_vo import DeleteOnlineModel, OnlineModel, OnlineQueryModel
+from utils.log_util import logger
 
 
 class OnlineService:
     """
     在线用户管理模块服务层
+
+    会话元数据以 online_session:{token_id} 存储，与access_token同步过期；
+    有序集合 online_session_index 以登录时间为分值索引全部会话，online_session_index:user_name:{user_name} 及
+    online_session_index:ipaddr:{ipaddr} 按登录名称及主机索引会话，列表查询按索引分页后仅读取当前页的会话元数据；
+    有序集合 online_session_index:expire 记录会话的过期时间，随令牌滑动过期同步更新，列表查询前据此清理已过期会话的索引，
+    哈希 online_session_index:attrs 记录会话的登录名称及主机，用于定位清理时所在的索引
     """
 
+    # 批量读取会话元数据时每批的键数量
+    BATCH_SIZE = 500
+
+    @classmethod
+    def get_online_session_key(cls, token_id: Union[int, str]) -> str:
+        """
+        获取在线会话元数据缓存键名
+
+        :param token_id: 令牌编号
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}:{token_id}'
+
+    @classmethod
+    def get_online_session_index_key(cls, field: Optional[str] = None, value: Optional[str] = None) -> str:
+        """
+        获取在线会话索引缓存键名
+
+        :param field: 索引字段（user_name、ipaddr），为空时返回全部会话的索引
+        :param value: 索引字段的值
+        :return: 缓存键名
+        """
+        if field is None:
+            return f'{RedisInitKeyConfig.ONLINE_SESSION.key}_index'
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}_index:{field}:{value}'
+
+    @classmethod
+    def get_online_session_expire_key(cls) -> str:
+        """
+        获取在线会话过期时间索引缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}_index:expire'
+
+    @classmethod
+    def get_online_session_attrs_key(cls) -> str:
+        """
+        获取在线会话索引字段缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.ONLINE_SESSION.key}_index:attrs'
+
+    @classmethod
+    def _get_filter_index_keys(cls, user_name: Optional[str], ipaddr: Optional[str]) -> list[str]:
+        """
+        获取会话所在的按字段过滤的索引键名
+
+        :param user_name: 登录名称
+        :param ipaddr: 主机
+        :return: 索引键名列表
+        """
+        index_keys = []
+        if user_name:
+            index_keys.append(cls.get_online_session_index_key('user_name', user_name))
+        if ipaddr:
+            index_keys.append(cls.get_online_session_index_key('ipaddr', ipaddr))
+        return index_keys
+
+    @classmethod
+    def _index_online_session(cls, pipe: Pipeline, token_id: str, online_info: OnlineModel, login_at: float) -> None:
+        """
+        在pipeline中将会话写入各索引
+
+        :param pipe: redis pipeline对象
+        :param token_id: 令牌编号
+        :param online_info: 在线会话元数据
+        :param login_at: 登录时间戳
+        :return:
+        """
+        for index_key in [
+            cls.get_online_session_index_key(),
+            *cls._get_filter_index_keys(online_info.user_name, online_info.ipaddr),
+        ]:
+            pipe.zadd(index_key, {token_id: login_at})
+        pipe.zadd(
+            cls.get_online_session_expire_key(),
+            {token_id: time.time() + timedelta(minutes=JwtConfig.jwt_redis_expire_minutes).total_seconds()},
+        )
+        pipe.hset(cls.get_online_session_attrs_key(), token_id, json.dumps([online_info.user_name, online_info.ipaddr]))
+
+    @classmethod
+    async def _unindex_online_sessions(cls, redis: aioredis.Redis, token_id_list: list[str]) -> None:
+        """
+        将会话从各索引中移除
+
+        :param redis: redis对象
+        :param token_id_list: 令牌编号列表
+        :return:
+        """
+        attrs_values = await redis.hmget(cls.get_online_session_attrs_key(), token_id_list)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.zrem(cls.get_online_session_index_key(), *token_id_list)
+            pipe.zrem(cls.get_online_session_expire_key(), *token_id_list)
+            pipe.hdel(cls.get_online_session_attrs_key(), *token_id_list)
+            for token_id, attrs_value in zip(token_id_list, attrs_values):
+                user_name, ipaddr = json.loads(attrs_value) if attrs_value else (None, None)
+                for index_key in cls._get_filter_index_keys(user_name, ipaddr):
+                    pipe.zrem(index_key, token_id)
+            await pipe.execute()
+
+    @classmethod
+    async def _purge_expired_sessions(cls, redis: aioredis.Redis) -> None:
+        """
+        清理已过期会话的索引
+
+        :param redis: redis对象
+        :return:
+        """
+        expired_token_id_list = await redis.zrangebyscore(cls.get_online_session_expire_key(), '-inf', time.time())
+        for index in range(0, len(expired_token_id_list), cls.BATCH_SIZE):
+            await cls._unindex_online_sessions(redis, expired_token_id_list[index : index + cls.BATCH_SIZE])
+
+    @classmethod
+    async def set_online_session_services(
+        cls, redis: aioredis.Redis, token_id: Union[int, str], access_token: str, online_info: OnlineModel
+    ) -> None:
+        """
+        登录成功后保存令牌及在线会话元数据service
+
+        :param redis: redis对象
+        :param token_id: 令牌编号
+        :param access_token: 用户令牌
+        :param online_info: 在线会话元数据
+        :return:
+        """
+        # 不允许同时登录时令牌编号不变，先移除原会话在各索引中的记录
+        if not AppConfig.app_same_time_login:
+            await cls._unindex_online_sessions(redis, [str(token_id)])
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(
+                f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}',
+                access_token,
+                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+            )
+            pipe.set(
+                cls.get_online_session_key(token_id),
+                online_info.model_dump_json(by_alias=True),
+                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+            )
+            cls._index_online_session(pipe, str(token_id), online_info, time.time())
+            await pipe.execute()
+
+    @classmethod
+    async def remove_online_session_services(cls, redis: aioredis.Redis, token_id_list: list[str]) -> None:
+        """
+        删除令牌及在线会话元数据service，用于退出登录及强退
+
+        :param redis: redis对象
+        :param token_id_list: 令牌编号列表
+        :return:
+        """
+        if not token_id_list:
+            return
+        await redis.delete(
+            *[f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}' for token_id in token_id_list],
+            *[cls.get_online_session_key(token_id) for token_id in token_id_list],
+        )
+        await cls._unindex_online_sessions(redis, token_id_list)
+
     @classmethod
-    async def get_online_list_services(cls, request: Request, query_object: OnlineQueryModel) -> list[dict[str, Any]]:
+    async def init_online_session_index_services(cls, redis: aioredis.Redis) -> None:
+        """
+        应用启动时回填在线会话索引service，使用SCAN及MGET分批读取未建立索引的历史令牌
+
+        :param redis: redis对象
+        :return:
+        """
+        if await redis.exists(cls.get_online_session_expire_key()):
+            return
+        access_token_keys = [
+            access_token_key
+            async for access_token_key in redis.scan_iter(
+                match=f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:*', count=cls.BATCH_SIZE
+            )
+        ]
+        for index in range(0, len(access_token_keys), cls.BATCH_SIZE):
+            batch_keys = access_token_keys[index : index + cls.BATCH_SIZE]
+            access_token_values = await redis.mget(batch_keys)
+            async with redis.pipeline(transaction=False) as pipe:
+                for access_token_key, access_token in zip(batch_keys, access_token_values):
+                    online_info = cls._parse_access_token(access_token)
+                    if online_info is None:
+                        continue
+                    token_id = access_token_key.split(':', 1)[1]
+                    pipe.set(
+                        cls.get_online_session_key(token_id),
+                        online_info.model_dump_json(by_alias=True),
+                        ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+                    )
+                    cls._index_online_session(
+                        pipe,
+                        token_id,
+                        online_info,
+                        online_info.login_time.timestamp() if online_info.login_time else time.time(),
+                    )
+                await pipe.execute()
+
+    @classmethod
+    def _parse_access_token(cls, access_token: Union[str, None]) -> Union[OnlineModel, None]:
+        """
+        解析用户令牌中的在线会话元数据
+
+        :param access_token: 用户令牌
+        :return: 在线会话元数据，解析失败时返回None
+        """
+        if not access_token:
+            return None
+        try:
+            payload = jwt.decode(access_token, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
+        except InvalidTokenError:
+            return None
+        login_info = payload.get('login_info') or {}
+        return OnlineModel(
+            tokenId=payload.get('session_id') if AppConfig.app_same_time_login else payload.get('user_id'),
+            userName=payload.get('user_name'),
+            deptName=payload.get('dept_name'),
+            ipaddr=login_info.get('ipaddr'),
+            loginLocation=login_info.get('loginLocation'),
+            browser=login_info.get('browser'),
+            os=login_info.get('os'),
+            loginTime=login_info.get('loginTime'),
+        )
+
+    @classmethod
+    async def get_online_list_services(cls, request: Request, query_object: OnlineQueryModel) -> PageModel:
         """
         获取在线用户表信息service
 
@@ -25,41 +263,64 @@ class OnlineService:
         :param query_object: 查询参数对象
         :return: 在线用户列表信息
         """
-        access_token_keys = await request.app.state.redis.keys(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}*')
-        if not access_token_keys:
-            access_token_keys = []
-        access_token_values_list = [await request.app.state.redis.get(key) for key in access_token_keys]
-        online_info_list = []
-        for item in access_token_values_list:
-            payload = jwt.decode(item, JwtConfig.jwt_secret_key, algorithms=[JwtConfig.jwt_algorithm])
-            online_dict = {
-                'token_id': payload.get('session_id') if AppConfig.app_same_time_login else payload.get('user_id'),
-                'user_name': payload.get('user_name'),
-                'dept_name': payload.get('dept_name'),
-                'ipaddr': payload.get('login_info').get('ipaddr'),
-                'login_location': payload.get('login_info').get('loginLocation'),
-                'browser': payload.get('login_info').get('browser'),
-                'os': payload.get('login_info').get('os'),
-                'login_time': payload.get('login_info').get('loginTime'),
-            }
-            if query_object.user_name and not query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name'):
-                    online_info_list = [online_dict]
-                    break
-            elif not query_object.user_name and query_object.ipaddr:
-                if query_object.ipaddr == payload.get('login_info').get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            elif query_object.user_name and query_object.ipaddr:
-                if query_object.user_name == payload.get('user_name') and query_object.ipaddr == payload.get(
-                    'login_info'
-                ).get('ipaddr'):
-                    online_info_list = [online_dict]
-                    break
-            else:
-                online_info_list.append(online_dict)
-
-        return CamelCaseUtil.transform_result(online_info_list)
+        redis: aioredis.Redis = request.app.state.redis
+        await cls._purge_expired_sessions(redis)
+        index_keys = cls._get_filter_index_keys(query_object.user_name, query_object.ipaddr) or [
+            cls.get_online_session_index_key()
+        ]
+        is_page = bool(query_object.page_num and query_object.page_size)
+        start = (query_object.page_num - 1) * query_object.page_size if is_page else 0
+        stop = start + query_object.page_size - 1 if is_page else -1
+        # 按登录时间倒序读取索引中当前页的会话，同时按登录名称及主机过滤时取两个索引的交集
+        if len(index_keys) == 1:
+            async with redis.pipeline(transaction=False) as pipe:
+                pipe.zcard(index_keys[0])
+                pipe.zrevrange(index_keys[0], start, stop)
+                total, token_id_list = await pipe.execute()
+        else:
+            token_scores = sorted(await redis.zinter(index_keys, withscores=True), key=lambda item: -item[1])
+            total = len(token_scores)
+            token_id_list = [token_id for token_id, _ in token_scores[start : None if stop == -1 else stop + 1]]
+        online_info_list: list[dict[str, Any]] = []
+        for index in range(0, len(token_id_list), cls.BATCH_SIZE):
+            batch_token_ids = token_id_list[index : index + cls.BATCH_SIZE]
+            online_values = await redis.mget([cls.get_online_session_key(token_id) for token_id in batch_token_ids])
+            for online_value in online_values:
+                online_info = cls._parse_online_session(online_value)
+                if online_info is not None:
+                    online_info_list.append(online_info.model_dump(by_alias=True))
+        if is_page:
+            return PageModel[Any](
+                rows=online_info_list,
+                pageNum=query_object.page_num,
+                pageSize=query_object.page_size,
+                total=total,
+                hasNext=start + query_object.page_size < total,
+            )
+
+        return PageModel[Any](
+            rows=online_info_list,
+            pageNum=1,
+            pageSize=len(online_info_list),
+            total=len(online_info_list),
+            hasNext=False,
+        )
+
+    @classmethod
+    def _parse_online_session(cls, online_value: Union[str, None]) -> Union[OnlineModel, None]:
+        """
+        解析在线会话元数据缓存
+
+        :param online_value: 会话元数据缓存值
+        :return: 在线会话元数据，缓存不存在或解析失败时返回None
+        """
+        if not online_value:
+            return None
+        try:
+            return OnlineModel.model_validate_json(online_value)
+        except ValidationError as e:
+            logger.warning(f'在线会话元数据解析失败，详细错误信息：{e}')
+            return None
 
     @classmethod
     async def delete_online_services(cls, request: Request, page_object: DeleteOnlineModel) -> CrudResponseModel:
@@ -72,7 +333,6 @@ class OnlineService:
         """
         if page_object.token_ids:
             token_id_list = page_object.token_ids.split(',')
-            for token_id in token_id_list:
-                await request.app.state.redis.delete(f'{RedisInitKeyConfig.ACCESS_TOKEN.key}:{token_id}')
+            await cls.remove_online_session_services(request.app.state.redis, token_id_list)
             return CrudResponseModel(is_success=True, message='强退成功')
         raise ServiceException(message='传入session_id为空')
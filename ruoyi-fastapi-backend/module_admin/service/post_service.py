@@ -1,3 +1,4 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -149,12 +150,15 @@ class PostService:
         return result
 
     @staticmethod
-    async def export_post_list_services(post_list: list) -> bytes:
+    async def export_post_list_services(
+        query_db: AsyncSession, query_object: PostPageQueryModel
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出岗位信息service
 
-        :param post_list: 岗位信息列表
-        :return: 岗位信息对应excel的二进制数据
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :return: 岗位信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -170,11 +174,13 @@ class PostService:
             'remark': '备注',
         }
 
-        for item in post_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(post_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, PostDao.get_post_list_query(query_object), mapping_dict, format_row
+        )
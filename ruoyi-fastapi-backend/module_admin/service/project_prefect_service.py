@@ -1,13 +1,20 @@
-from typing import Any
+from typing import Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import CrudResponseModel
-from exceptions.exception import ServiceException
+from config.get_prefect_stats import PrefectStatsUtil
+from exceptions.exception import ConflictException, ServiceException
+from module_admin.dao.project_dao import ProjectDao
 from module_admin.dao.project_prefect_dao import ProjectPrefectDao
 from module_admin.dao.project_prefect_opinion_dao import ProjectPrefectOpinionDao
 from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM
-from module_admin.entity.vo.project_prefect_vo import BatchUpdatePrefectStatusModel, UpdatePrefectStatusModel
+from module_admin.entity.vo.project_prefect_vo import (
+    BatchUpdatePrefectStatusModel,
+    PrefectStatsModel,
+    PrefectTransitionResultModel,
+    UpdatePrefectStatusModel,
+)
 from module_admin.entity.vo.user_vo import CurrentUserModel
 
 
@@ -24,27 +31,19 @@ class ProjectPrefectService:
             if current_user.roles not in ('a_admin','admin') :
                 raise ServiceException(message='仅项目创建人可下发项目至工程师')
 
-            # 校验：当前流程状态（必须是"项目创建人新建"）
-            exist_prefect = await ProjectPrefectDao.get_prefect_by_project_id(db, prefect.pro_id)
-            if not exist_prefect or exist_prefect.current_status != PREFECT_STATUS_ENUM['CREATE']:
-                raise ServiceException(message='当前流程状态不允许下发，仅新建项目可下发')
-
-            # 1. 更新流程状态（目标状态：工程师修改）
-            prefect.target_status = PREFECT_STATUS_ENUM['ENGINEER_EDIT']
-            await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-            # 2. 新增审核意见（项目创建人下发意见）
-            opinion_data = {
-                'project_id': prefect.pro_id,
-                'prefect_id': exist_prefect.id,
-                'node_code': PREFECT_STATUS_ENUM['CREATE'],
-                'node_name': '项目创建人下发',
-                'opinion_content': prefect.opinion_content,
-                'operator_id': current_user.user.user_id,
-                'operator_name': current_user.user.nick_name,
-                'operator_role': 'a_admin',
-            }
-            await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 流转流程状态（新建→工程师修改）并新增下发意见，当前状态不是"项目创建人新建"时不流转
+            transition_result = await cls._transition_prefect_status(
+                db,
+                [prefect.pro_id],
+                PREFECT_STATUS_ENUM['CREATE'],
+                PREFECT_STATUS_ENUM['ENGINEER_EDIT'],
+                '项目创建人下发',
+                prefect.opinion_content,
+                'a_admin',
+                current_user,
+            )
+            if not transition_result.success_ids:
+                raise ConflictException(message='当前流程状态不允许下发，仅新建项目可下发')
 
             await db.commit()
             return CrudResponseModel(is_success=True, message='项目已下发至工程师')
@@ -63,27 +62,19 @@ class ProjectPrefectService:
                 # if current_user.roles[0] != "engineer" or current_user.roles[0] != 'admin':
                 raise ServiceException(message='仅工程师可提交审核')
 
-            # 校验：当前流程状态（必须是"工程师修改中"）
-            exist_prefect = await ProjectPrefectDao.get_prefect_by_project_id(db, prefect.pro_id)
-            if not exist_prefect or exist_prefect.current_status != PREFECT_STATUS_ENUM['ENGINEER_EDIT']:
-                raise ServiceException(message='当前流程状态不允许提交，仅工程师修改中可提交')
-
-            # 1. 更新流程状态（目标状态：二级复审，自动显示开票用章按钮）
-            prefect.target_status = PREFECT_STATUS_ENUM['SECOND_REVIEW']
-            await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-            # 2. 新增审核意见（工程师修改说明）
-            opinion_data = {
-                'project_id': prefect.pro_id,
-                'prefect_id': exist_prefect.id,
-                'node_code': PREFECT_STATUS_ENUM['ENGINEER_EDIT'],
-                'node_name': '工程师修改',
-                'opinion_content': prefect.opinion_content,
-                'operator_id': current_user.user.user_id,
-                'operator_name': current_user.user.nick_name,
-                'operator_role': 'engineer',
-            }
-            await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 流转流程状态（工程师修改→二级复审）并新增修改说明，当前状态不是"工程师修改中"时不流转
+            transition_result = await cls._transition_prefect_status(
+                db,
+                [prefect.pro_id],
+                PREFECT_STATUS_ENUM['ENGINEER_EDIT'],
+                PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+                '工程师修改',
+                prefect.opinion_content,
+                'engineer',
+                current_user,
+            )
+            if not transition_result.success_ids:
+                raise ConflictException(message='当前流程状态不允许提交，仅工程师修改中可提交')
 
             await db.commit()
             return CrudResponseModel(is_success=True, message='项目已提交至二级复审')
@@ -102,30 +93,23 @@ class ProjectPrefectService:
             if current_user.roles[0] not in ('ejfh', 'admin'):
                 raise ServiceException(message='仅二级复核可执行此操作')
 
-            # 校验：当前流程状态（必须是"二级复审"）
-            exist_prefect = await ProjectPrefectDao.get_prefect_by_project_id(db, prefect.pro_id)
-            if not exist_prefect or exist_prefect.current_status != PREFECT_STATUS_ENUM['SECOND_REVIEW']:
-                raise ServiceException(message='当前流程状态不允许复审，仅二级复审中可操作')
-
             # 校验：目标状态合法（仅允许三级复审/驳回至工程师）
             if prefect.target_status not in [PREFECT_STATUS_ENUM['THIRD_REVIEW'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]:
                 raise ServiceException(message='二级复审仅允许流转至三级复审或驳回至工程师')
 
-            # 1. 更新流程状态
-            await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-            # 2. 新增审核意见（二级复审意见）
-            opinion_data = {
-                'project_id': prefect.pro_id,
-                'prefect_id': exist_prefect.id,
-                'node_code': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
-                'node_name': '二级复审',
-                'opinion_content': prefect.opinion_content,
-                'operator_id': current_user.user.user_id,
-                'operator_name': current_user.user.nick_name,
-                'operator_role': current_user.roles[0],
-            }
-            await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 流转流程状态并新增二级复审意见，当前状态不是"二级复审"时不流转
+            transition_result = await cls._transition_prefect_status(
+                db,
+                [prefect.pro_id],
+                PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+                prefect.target_status,
+                '二级复审',
+                prefect.opinion_content,
+                current_user.roles[0],
+                current_user,
+            )
+            if not transition_result.success_ids:
+                raise ConflictException(message='当前流程状态不允许复审，仅二级复审中可操作')
 
             await db.commit()
             msg = (
@@ -148,30 +132,23 @@ class ProjectPrefectService:
             if current_user.roles[0] not in ('sjfh', 'admin'):
                 raise ServiceException(message='仅三级复核可执行此操作')
 
-            # 校验：当前流程状态（必须是"三级复审"）
-            exist_prefect = await ProjectPrefectDao.get_prefect_by_project_id(db, prefect.pro_id)
-            if not exist_prefect or exist_prefect.current_status != PREFECT_STATUS_ENUM['THIRD_REVIEW']:
-                raise ServiceException(message='当前流程状态不允许复审，仅三级复审中可操作')
-
             # 校验：目标状态合法（仅允许待归档/驳回至工程师）
             if prefect.target_status not in [PREFECT_STATUS_ENUM['TO_ARCHIVE'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]:
                 raise ServiceException(message='三级复审仅允许流转至待归档或驳回至工程师')
 
-            # 1. 更新流程状态
-            await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-            # 2. 新增审核意见（三级复审意见）
-            opinion_data = {
-                'project_id': prefect.pro_id,
-                'prefect_id': exist_prefect.id,
-                'node_code': PREFECT_STATUS_ENUM['THIRD_REVIEW'],
-                'node_name': '三级复审',
-                'opinion_content': prefect.opinion_content,
-                'operator_id': current_user.user.user_id,
-                'operator_name': current_user.user.nick_name,
-                'operator_role': current_user.roles[0],
-            }
-            await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 流转流程状态并新增三级复审意见，当前状态不是"三级复审"时不流转
+            transition_result = await cls._transition_prefect_status(
+                db,
+                [prefect.pro_id],
+                PREFECT_STATUS_ENUM['THIRD_REVIEW'],
+                prefect.target_status,
+                '三级复审',
+                prefect.opinion_content,
+                current_user.roles[0],
+                current_user,
+            )
+            if not transition_result.success_ids:
+                raise ConflictException(message='当前流程状态不允许复审，仅三级复审中可操作')
 
             await db.commit()
             msg = (
@@ -194,27 +171,19 @@ class ProjectPrefectService:
             if current_user.roles[0] not in ('archivist', 'admin'):
                 raise ServiceException(message='仅归档人员可执行归档操作')
 
-            # 校验：当前流程状态（必须是"待归档"）
-            exist_prefect = await ProjectPrefectDao.get_prefect_by_project_id(db, prefect.pro_id)
-            if not exist_prefect or exist_prefect.current_status != PREFECT_STATUS_ENUM['TO_ARCHIVE']:
-                raise ServiceException(message='当前流程状态不允许归档，仅待归档项目可操作')
-
-            # 1. 更新流程状态（目标状态：已归档）
-            prefect.target_status = PREFECT_STATUS_ENUM['ARCHIVED']
-            await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-            # 2. 新增审核意见（归档意见）
-            opinion_data = {
-                'project_id': prefect.pro_id,
-                'prefect_id': exist_prefect.id,
-                'node_code': PREFECT_STATUS_ENUM['TO_ARCHIVE'],
-                'node_name': '归档操作',
-                'opinion_content': prefect.opinion_content,
-                'operator_id': current_user.user.user_id,
-                'operator_name': current_user.user.nick_name,
-                'operator_role': current_user.roles[0],
-            }
-            await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 流转流程状态（待归档→已归档）并新增归档意见，当前状态不是"待归档"时不流转
+            transition_result = await cls._transition_prefect_status(
+                db,
+                [prefect.pro_id],
+                PREFECT_STATUS_ENUM['TO_ARCHIVE'],
+                PREFECT_STATUS_ENUM['ARCHIVED'],
+                '归档操作',
+                prefect.opinion_content,
+                current_user.roles[0],
+                current_user,
+            )
+            if not transition_result.success_ids:
+                raise ConflictException(message='当前流程状态不允许归档，仅待归档项目可操作')
 
             await db.commit()
             return CrudResponseModel(is_success=True, message='项目归档成功')
@@ -234,6 +203,16 @@ class ProjectPrefectService:
         to_archive_page = await ProjectPrefectDao.get_to_archive_projects_dao(db, page_num, page_size)
         return to_archive_page.model_dump(by_alias=True) if hasattr(to_archive_page, 'model_dump') else to_archive_page
 
+    @classmethod
+    async def get_prefect_stats_services(cls, current_user: CurrentUserModel) -> PrefectStatsModel:
+        """
+        获取各流程状态及当前用户负责的项目数service
+
+        :param current_user: 当前用户对象
+        :return: 流程状态计数
+        """
+        return await PrefectStatsUtil.get_prefect_stats(current_user.user.user_id)
+
     @classmethod
     async def batch_second_review_services(
         cls, db: AsyncSession, batch: BatchUpdatePrefectStatusModel, current_user: CurrentUserModel
@@ -248,42 +227,17 @@ class ProjectPrefectService:
             if batch.target_status not in [PREFECT_STATUS_ENUM['THIRD_REVIEW'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]:
                 raise ServiceException(message='二级复审仅允许流转至三级复审或驳回至工程师')
 
-            prefect_map = await ProjectPrefectDao.get_prefects_by_project_ids(db, batch.pro_ids)
-            missing_ids = [pid for pid in batch.pro_ids if pid not in prefect_map]
-            if missing_ids:
-                raise ServiceException(message=f'存在未初始化流程的项目：{missing_ids[:10]}')
-
-            invalid_ids = [
-                pid
-                for pid, prefect in prefect_map.items()
-                if prefect.current_status != PREFECT_STATUS_ENUM['SECOND_REVIEW']
-            ]
-            if invalid_ids:
-                raise ServiceException(message=f'存在非二级复审状态的项目：{invalid_ids[:10]}')
-
-            for pid in batch.pro_ids:
-                exist_prefect = prefect_map[pid]
-                prefect = UpdatePrefectStatusModel(
-                    pro_id=pid,
-                    current_status=batch.current_status,
-                    target_status=batch.target_status,
-                    opinion_content=batch.opinion_content,
-                )
-                prefect.operator_id = current_user.user.user_id
-                prefect.operator_name = current_user.user.nick_name
-                await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-                opinion_data = {
-                    'project_id': pid,
-                    'prefect_id': exist_prefect.id,
-                    'node_code': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
-                    'node_name': '二级复审',
-                    'opinion_content': batch.opinion_content,
-                    'operator_id': current_user.user.user_id,
-                    'operator_name': current_user.user.nick_name,
-                    'operator_role': current_user.roles[0],
-                }
-                await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 仅流转仍处于二级复审的项目，其余项目跳过并在结果中返回
+            transition_result = await cls._transition_prefect_status(
+                db,
+                batch.pro_ids,
+                PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+                batch.target_status,
+                '二级复审',
+                batch.opinion_content,
+                current_user.roles[0],
+                current_user,
+            )
 
             await db.commit()
             msg = (
@@ -291,7 +245,11 @@ class ProjectPrefectService:
                 if batch.target_status == PREFECT_STATUS_ENUM['THIRD_REVIEW']
                 else '批量二级复审驳回至工程师'
             )
-            return CrudResponseModel(is_success=True, message=msg)
+            return CrudResponseModel(
+                is_success=True,
+                message=cls._get_transition_message(msg, transition_result),
+                result=transition_result,
+            )
         except Exception as e:
             await db.rollback()
             raise e
@@ -310,42 +268,17 @@ class ProjectPrefectService:
             if batch.target_status not in [PREFECT_STATUS_ENUM['TO_ARCHIVE'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]:
                 raise ServiceException(message='三级复审仅允许流转至待归档或驳回至工程师')
 
-            prefect_map = await ProjectPrefectDao.get_prefects_by_project_ids(db, batch.pro_ids)
-            missing_ids = [pid for pid in batch.pro_ids if pid not in prefect_map]
-            if missing_ids:
-                raise ServiceException(message=f'存在未初始化流程的项目：{missing_ids[:10]}')
-
-            invalid_ids = [
-                pid
-                for pid, prefect in prefect_map.items()
-                if prefect.current_status != PREFECT_STATUS_ENUM['THIRD_REVIEW']
-            ]
-            if invalid_ids:
-                raise ServiceException(message=f'存在非三级复审状态的项目：{invalid_ids[:10]}')
-
-            for pid in batch.pro_ids:
-                exist_prefect = prefect_map[pid]
-                prefect = UpdatePrefectStatusModel(
-                    pro_id=pid,
-                    current_status=batch.current_status,
-                    target_status=batch.target_status,
-                    opinion_content=batch.opinion_content,
-                )
-                prefect.operator_id = current_user.user.user_id
-                prefect.operator_name = current_user.user.nick_name
-                await ProjectPrefectDao.update_prefect_status_dao(db, prefect)
-
-                opinion_data = {
-                    'project_id': pid,
-                    'prefect_id': exist_prefect.id,
-                    'node_code': PREFECT_STATUS_ENUM['THIRD_REVIEW'],
-                    'node_name': '三级复审',
-                    'opinion_content': batch.opinion_content,
-                    'operator_id': current_user.user.user_id,
-                    'operator_name': current_user.user.nick_name,
-                    'operator_role': current_user.roles[0],
-                }
-                await ProjectPrefectOpinionDao.add_opinion_dao(db, opinion_data)
+            # 仅流转仍处于三级复审的项目，其余项目跳过并在结果中返回
+            transition_result = await cls._transition_prefect_status(
+                db,
+                batch.pro_ids,
+                PREFECT_STATUS_ENUM['THIRD_REVIEW'],
+                batch.target_status,
+                '三级复审',
+                batch.opinion_content,
+                current_user.roles[0],
+                current_user,
+            )
 
             await db.commit()
             msg = (
@@ -353,7 +286,89 @@ class ProjectPrefectService:
                 if batch.target_status == PREFECT_STATUS_ENUM['TO_ARCHIVE']
                 else '批量三级复审驳回至工程师'
             )
-            return CrudResponseModel(is_success=True, message=msg)
+            return CrudResponseModel(
+                is_success=True,
+                message=cls._get_transition_message(msg, transition_result),
+                result=transition_result,
+            )
         except Exception as e:
             await db.rollback()
             raise e
+
+    @classmethod
+    async def _transition_prefect_status(
+        cls,
+        db: AsyncSession,
+        pro_ids: list[int],
+        expected_status: str,
+        target_status: str,
+        node_name: str,
+        opinion_content: Optional[str],
+        operator_role: str,
+        current_user: CurrentUserModel,
+    ) -> PrefectTransitionResultModel:
+        """
+        批量流转流程状态：以条件更新流转仍处于预期状态的项目，由更新结果判断各项目是否流转成功，并批量新增审核意见
+
+        :param db: orm对象
+        :param pro_ids: 项目ID列表
+        :param expected_status: 预期的当前状态，同时作为审核意见的节点编码
+        :param target_status: 目标状态
+        :param node_name: 审核意见的节点名称
+        :param opinion_content: 审核意见
+        :param operator_role: 操作人角色
+        :param current_user: 当前用户对象
+        :return: 流转结果
+        """
+        pro_id_list = list(dict.fromkeys(pro_ids))
+        success_ids = await ProjectPrefectDao.transition_prefect_status_dao(
+            db,
+            pro_id_list,
+            expected_status,
+            target_status,
+            current_user.user.user_id,
+            current_user.user.nick_name,
+        )
+        success_id_set = set(success_ids)
+        transition_result = PrefectTransitionResultModel(
+            successIds=success_ids,
+            skippedIds=[pro_id for pro_id in pro_id_list if pro_id not in success_id_set],
+        )
+        if success_ids:
+            await ProjectPrefectOpinionDao.add_transition_opinion_dao(
+                db,
+                success_ids,
+                target_status,
+                {
+                    'node_code': expected_status,
+                    'node_name': node_name,
+                    'opinion_content': opinion_content,
+                    'operator_id': current_user.user.user_id,
+                    'operator_name': current_user.user.nick_name,
+                    'operator_role': operator_role,
+                },
+            )
+            # 流程状态计数随事务提交同步更新
+            PrefectStatsUtil.record_status_change(
+                db,
+                expected_status,
+                target_status,
+                len(success_ids),
+                await ProjectDao.get_project_user_ids(db, success_ids),
+            )
+
+        return transition_result
+
+    @classmethod
+    def _get_transition_message(cls, message: str, transition_result: PrefectTransitionResultModel) -> str:
+        """
+        生成批量流转结果提示信息
+
+        :param message: 流转操作提示信息
+        :param transition_result: 流转结果
+        :return: 提示信息
+        """
+        message = f'{message}，成功{len(transition_result.success_ids)}个项目'
+        if transition_result.skipped_ids:
+            message += f'，{len(transition_result.skipped_ids)}个项目流程状态已变化或未初始化流程，已跳过'
+        return message
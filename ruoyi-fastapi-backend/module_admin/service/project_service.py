@@ -1,8 +1,14 @@
-from typing import Any
+from collections import Counter
+from collections.abc import AsyncGenerator
+from datetime import datetime
+from typing import Any, Optional
 
+from fastapi import UploadFile
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from common.vo import CrudResponseModel
+from config.get_prefect_stats import PrefectStatsUtil
 from exceptions.exception import ServiceException
 from module_admin.dao.enterprise_info_dao import EnterpriseDao
 from module_admin.dao.project_dao import ProjectDao
@@ -22,6 +28,7 @@ from module_admin.entity.vo.project_vo import (
 )
 from module_admin.entity.vo.user_vo import CurrentUserModel
 from utils.common_util import CamelCaseUtil
+from utils.excel_util import ExcelExportParams, ExcelImporter, ExcelUtil
 
 # from module_admin.service.dept_service import DeptService
 
@@ -41,9 +48,10 @@ class ProjectService:
         :param is_page: 是否分页查询
         :return: 单位列表信息对象
         """
+        # 数据层已返回小驼峰形式结果，无需再次转换
         menu_list_result = await ProjectDao.get_project_list(query_db, page_object, is_page)
 
-        return CamelCaseUtil.transform_result(menu_list_result)
+        return menu_list_result
 
     @classmethod
     async def get_project_list_services1(
@@ -62,9 +70,205 @@ class ProjectService:
         roles_list = current_user.roles
         user_id = current_user.user.user_id
 
+        # 数据层已返回小驼峰形式结果，无需再次转换
         menu_list_result = await ProjectDao.get_project_list1(query_db, page_object,is_page)
 
-        return CamelCaseUtil.transform_result(menu_list_result)
+        return menu_list_result
+
+    @classmethod
+    def get_project_export_params_services(cls, page_object: ProjectPageModel) -> ExcelExportParams:
+        """
+        获取项目信息导出参数service
+
+        :param page_object: 查询参数对象
+        :return: 项目信息导出的查询语句、映射字典及导出行处理方法
+        """
+        # 创建一个映射字典，将英文键映射到中文键
+        mapping_dict = {
+            'projectCode': '项目编码',
+            'projectName': '项目名称',
+            'projectType': '项目类型',
+            'entName': '业主单位',
+            'serviceContent': '服务内容',
+            'userCompany': '使用单位',
+            'projectManager': '项目负责人',
+            'coordinator': '项目配合人员',
+            'contractSigned': '合同签订状态',
+            'contractAmount': '合同金额（元）',
+            'settlementSubmitted': '结算送审金额（元）',
+            'settlementApproved': '结算审定金额（元）',
+            'invoiceIssuedAmount': '已开具发票金额（元）',
+            'paymentReceived': '业主是否已回款',
+            'paymentReceivedAmount': '已回款金额（元）',
+            'paymentRecoveryRate': '回款率',
+            'prefectStatus': '流程状态',
+            'createName': '创建人',
+            'createTime': '创建时间',
+            'remarks': '备注',
+        }
+        prefect_status_label_dict = {
+            PREFECT_STATUS_ENUM['CREATE']: '新建',
+            PREFECT_STATUS_ENUM['ENGINEER_EDIT']: '工程师修改中',
+            PREFECT_STATUS_ENUM['SECOND_REVIEW']: '二级复审',
+            PREFECT_STATUS_ENUM['THIRD_REVIEW']: '三级复审',
+            PREFECT_STATUS_ENUM['TO_ARCHIVE']: '待归档',
+            PREFECT_STATUS_ENUM['ARCHIVED']: '已归档',
+            PREFECT_STATUS_ENUM['REJECT_ENGINEER']: '驳回至工程师',
+        }
+
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
+            item['prefectStatus'] = prefect_status_label_dict.get(item.get('prefectStatus'), item.get('prefectStatus'))
+            return item
+
+        return ProjectDao.get_project_list1_query(page_object), mapping_dict, format_row
+
+    @classmethod
+    async def export_project_list_services(
+        cls, query_db: AsyncSession, page_object: ProjectPageModel
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        导出项目信息service
+
+        :param query_db: orm对象
+        :param page_object: 查询参数对象
+        :return: 项目信息对应excel文件的流式数据
+        """
+        query, mapping_dict, row_handler = cls.get_project_export_params_services(page_object)
+
+        return await ExcelUtil.export_query2excel(query_db, query, mapping_dict, row_handler)
+
+    @classmethod
+    async def import_project_services(
+        cls, query_db: AsyncSession, file: UploadFile, dry_run: bool, current_user: CurrentUserModel
+    ) -> CrudResponseModel:
+        """
+        导入项目信息service，项目编号不存在时新增并初始化流程，已存在时更新
+
+        :param query_db: orm对象
+        :param file: 项目Excel文件
+        :param dry_run: 是否仅校验不写入数据
+        :param current_user: 当前用户对象
+        :return: 导入结果
+        """
+        # 表头与项目导出文件一致，导出的文件修改后可直接导入
+        header_dict = {
+            '项目编码': 'project_code',
+            '项目名称': 'project_name',
+            '项目类型': 'project_type',
+            '业主单位': 'ent_name',
+            '服务内容': 'service_content',
+            '使用单位': 'user_company',
+            '项目负责人': 'project_manager',
+            '项目配合人员': 'coordinator',
+            '合同签订状态': 'contract_signed',
+            '合同金额（元）': 'contract_amount',
+            '结算送审金额（元）': 'settlement_submitted',
+            '结算审定金额（元）': 'settlement_approved',
+            '已开具发票金额（元）': 'invoice_issued_amount',
+            '业主是否已回款': 'payment_received',
+            '已回款金额（元）': 'payment_received_amount',
+            '回款率': 'payment_recovery_rate',
+            '备注': 'remarks',
+        }
+        importer = ExcelImporter(
+            AddProjectModel,
+            header_dict,
+            'project_code',
+            'pro_id',
+            ProjectDao.get_project_dict_by_codes,
+            cls._add_import_projects,
+            ProjectDao.batch_edit_project_dao,
+            cls._check_import_project,
+        )
+        now = datetime.now()
+        update_values = {
+            'update_by': current_user.user.user_id,
+            'update_name': current_user.user.nick_name,
+            'update_time': now,
+        }
+        insert_values = {
+            'create_by': current_user.user.user_id,
+            'create_name': current_user.user.nick_name,
+            'create_time': now,
+            **update_values,
+        }
+        try:
+            import_result = await importer.import_file(query_db, file.file, insert_values, update_values, dry_run)
+            if dry_run:
+                await query_db.rollback()
+            else:
+                await query_db.commit()
+        except Exception as e:
+            await query_db.rollback()
+            raise e
+        finally:
+            await file.close()
+
+        return CrudResponseModel(
+            is_success=True, message=ExcelImporter.get_result_message(import_result), result=import_result
+        )
+
+    @classmethod
+    async def _add_import_projects(cls, db: AsyncSession, project_list: list[dict[str, Any]]) -> None:
+        """
+        批量新增导入的项目，并同步初始化流程（状态：项目创建人新建）
+
+        :param db: orm对象
+        :param project_list: 项目字典列表
+        :return:
+        """
+        await ProjectDao.batch_add_project_dao(db, project_list)
+        project_dict = await ProjectDao.get_project_dict_by_codes(
+            db, [project['project_code'] for project in project_list]
+        )
+        await ProjectDao.batch_init_prefect_dao(
+            db,
+            [
+                {
+                    'pro_id': project_dict[project['project_code']].pro_id,
+                    'current_status': PREFECT_STATUS_ENUM['CREATE'],
+                    'operator_id': project['create_by'],
+                    'operator_name': project['create_name'],
+                }
+                for project in project_list
+            ],
+        )
+        for prefect_status, project_count in Counter(project.get('prefect_status') for project in project_list).items():
+            PrefectStatsUtil.record_status_change(db, None, prefect_status, project_count)
+
+    @classmethod
+    async def _record_prefect_status_changes(
+        cls, db: AsyncSession, status_changes: dict[int, tuple[Optional[str], Optional[str]]]
+    ) -> None:
+        """
+        按项目记录删除、编辑项目引起的流程状态变化，变化相同的项目合并记录
+
+        :param db: orm对象
+        :param status_changes: 项目ID与(变化前的流程状态, 变化后的流程状态)的映射字典，删除项目时变化后的流程状态为None
+        :return:
+        """
+        change_pro_ids: dict[tuple[Optional[str], Optional[str]], list[int]] = {}
+        for pro_id, status_change in status_changes.items():
+            if status_change[0] != status_change[1]:
+                change_pro_ids.setdefault(status_change, []).append(pro_id)
+        for (from_status, to_status), pro_ids in change_pro_ids.items():
+            PrefectStatsUtil.record_status_change(
+                db, from_status, to_status, len(pro_ids), await ProjectDao.get_project_user_ids(db, pro_ids)
+            )
+
+    @classmethod
+    def _check_import_project(cls, project_row: Row[Any]) -> Optional[str]:
+        """
+        校验导入时已存在的项目能否被更新
+
+        :param project_row: 已存在的项目信息
+        :return: 错误信息，可更新时返回None
+        """
+        if project_row.del_flag == '2':
+            return f'项目编号{project_row.project_code}已被已删除的项目占用'
+        if project_row.prefect_status == PREFECT_STATUS_ENUM['ARCHIVED']:
+            return '项目已归档，不可修改'
+        return None
 
     # 1. 项目创建人新建项目（同步初始化流程）
     @classmethod
@@ -98,6 +302,7 @@ class ProjectService:
             }
 
             await ProjectPrefectDao.init_prefect_dao(db, ProjectPrefectModel(**prefect_data))
+            PrefectStatsUtil.record_status_change(db, None, project_info.prefect_status, 1)
 
             await db.commit()
             return CrudResponseModel(is_success=True, message='项目新建成功')
@@ -213,7 +418,19 @@ class ProjectService:
                 raise ServiceException(message=f'项目编号{page_object.project_code}已存在')
 
             try:
+                status_dict = (
+                    await ProjectDao.get_project_status_dict_for_update(query_db, [page_object.pro_id])
+                    if 'prefect_status' in edit_menu
+                    else {}
+                )
                 await ProjectDao.edit_project_dao(query_db, edit_menu)
+                await cls._record_prefect_status_changes(
+                    query_db,
+                    {
+                        pro_id: (prefect_status, edit_menu['prefect_status'])
+                        for pro_id, prefect_status in status_dict.items()
+                    },
+                )
                 await query_db.commit()
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
@@ -237,6 +454,12 @@ class ProjectService:
         if page_object.pro_ids:
             ent_id_list = page_object.pro_ids.split(',')
             try:
+                status_dict = await ProjectDao.get_project_status_dict_for_update(
+                    query_db, [int(pro_id) for pro_id in ent_id_list]
+                )
+                await cls._record_prefect_status_changes(
+                    query_db, {pro_id: (prefect_status, None) for pro_id, prefect_status in status_dict.items()}
+                )
                 for pro_id in ent_id_list:
                     await ProjectDao.delete_pro_dao(query_db, ProjectModel(proId=pro_id))
 
@@ -1,5 +1,7 @@
+from collections.abc import AsyncGenerator
 from typing import Any, Union
 
+from fastapi import Request
 from sqlalchemy import ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -18,6 +20,7 @@ from module_admin.entity.vo.role_vo import (
     RolePageQueryModel,
 )
 from module_admin.entity.vo.user_vo import UserInfoModel, UserRolePageQueryModel
+from module_admin.service.user_cache_service import UserCacheService
 from utils.common_util import CamelCaseUtil
 from utils.excel_util import ExcelUtil
 
@@ -167,10 +170,13 @@ class RoleService:
             raise e
 
     @classmethod
-    async def edit_role_services(cls, query_db: AsyncSession, page_object: AddRoleModel) -> CrudResponseModel:
+    async def edit_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: AddRoleModel
+    ) -> CrudResponseModel:
         """
         编辑角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑角色对象
         :return: 编辑角色校验结果
@@ -197,6 +203,7 @@ class RoleService:
                                 query_db, RoleMenuModel(roleId=page_object.role_id, menuId=menu)
                             )
                 await query_db.commit()
+                await UserCacheService.clear_all_user_cache_services(request)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -205,10 +212,13 @@ class RoleService:
             raise ServiceException(message='角色不存在')
 
     @classmethod
-    async def role_datascope_services(cls, query_db: AsyncSession, page_object: AddRoleModel) -> CrudResponseModel:
+    async def role_datascope_services(
+        cls, request: Request, query_db: AsyncSession, page_object: AddRoleModel
+    ) -> CrudResponseModel:
         """
         分配角色数据权限service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 角色数据权限对象
         :return: 分配角色数据权限结果
@@ -225,6 +235,7 @@ class RoleService:
                             query_db, RoleDeptModel(roleId=page_object.role_id, deptId=dept)
                         )
                 await query_db.commit()
+                await UserCacheService.clear_all_user_cache_services(request)
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -279,12 +290,16 @@ class RoleService:
         return result
 
     @staticmethod
-    async def export_role_list_services(role_list: list) -> bytes:
+    async def export_role_list_services(
+        query_db: AsyncSession, query_object: RolePageQueryModel, data_scope_sql: ColumnElement
+    ) -> AsyncGenerator[bytes, None]:
         """
         导出角色列表信息service
 
-        :param role_list: 角色信息列表
-        :return: 角色列表信息对象
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 角色列表信息对应excel文件的流式数据
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -300,14 +315,16 @@ class RoleService:
             'remark': '备注',
         }
 
-        for item in role_list:
+        def format_row(item: dict[str, Any]) -> dict[str, Any]:
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
                 item['status'] = '停用'
-        binary_data = ExcelUtil.export_list2excel(role_list, mapping_dict)
+            return item
 
-        return binary_data
+        return await ExcelUtil.export_query2excel(
+            query_db, RoleDao.get_role_list_query(query_object, data_scope_sql), mapping_dict, format_row
+        )
 
     @classmethod
     async def get_role_user_allocated_list_services(
@@ -5,6 +5,7 @@ import time
 
 import psutil
 
+from config.get_log_writer import LogWriterUtil
 from module_admin.entity.vo.server_vo import CpuInfo, MemoryInfo, PyInfo, ServerMonitorModel, SysFiles, SysInfo
 from utils.common_util import bytes2human
 
@@ -97,6 +98,9 @@ class ServerService:
                 # 忽略所有异常，跳过有问题的磁盘
                 continue
 
-        result = ServerMonitorModel(cpu=cpu, mem=mem, sys=sys, py=py, sysFiles=sys_files)
+        # 日志写入队列信息
+        log_queue = LogWriterUtil.get_log_queue_info()
+
+        result = ServerMonitorModel(cpu=cpu, mem=mem, sys=sys, py=py, sysFiles=sys_files, logQueue=log_queue)
 
         return result
@@ -0,0 +1,323 @@
+import time
+from collections import OrderedDict
+from datetime import timedelta
+from typing import Union
+
+from fastapi import Request
+from pydantic import ValidationError
+from redis import asyncio as aioredis
+from redis.asyncio.client import Pipeline
+
+from common.enums import RedisInitKeyConfig
+from config.env import AppConfig, JwtConfig
+from module_admin.entity.vo.user_vo import CurrentUserModel, UserDataScopeModel
+from utils.log_util import logger
+
+
+class UserCacheService:
+    """
+    登录用户信息缓存服务层
+
+    缓存以会话为粒度，redis键为 current_user:{user_id}:{token_id}，与access_token同步过期；
+    数据权限解析结果按同样粒度缓存于 data_scope:{user_id}:{token_id}；
+    集合 user_session:{user_id} 记录用户已缓存的会话编号，集合 user_session_index 记录已缓存的用户，失效处理按索引精确删除，无需遍历redis键；
+    可选开启进程内LRU缓存，redis中的缓存值与进程内缓存一致时跳过反序列化
+    """
+
+    # 失效处理时每批读取会话索引的用户数量
+    BATCH_SIZE = 500
+
+    _local_cache: 'OrderedDict[tuple[str, str], tuple[float, str, CurrentUserModel]]' = OrderedDict()
+
+    @classmethod
+    def get_cache_key(cls, user_id: Union[int, str], token_id: Union[int, str]) -> str:
+        """
+        获取登录用户信息缓存键名
+
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.CURRENT_USER.key}:{user_id}:{token_id}'
+
+    @classmethod
+    def get_data_scope_cache_key(cls, user_id: Union[int, str], token_id: Union[int, str]) -> str:
+        """
+        获取用户数据权限缓存键名
+
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.DATA_SCOPE.key}:{user_id}:{token_id}'
+
+    @classmethod
+    def get_user_session_key(cls, user_id: Union[int, str]) -> str:
+        """
+        获取用户会话索引缓存键名
+
+        :param user_id: 用户id
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.USER_SESSION.key}:{user_id}'
+
+    @classmethod
+    def get_user_session_index_key(cls) -> str:
+        """
+        获取已缓存用户索引缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.USER_SESSION.key}_index'
+
+    @classmethod
+    def _get_local_cache(
+        cls, user_id: Union[int, str], token_id: Union[int, str], cache_value: str
+    ) -> Union[CurrentUserModel, None]:
+        """
+        从进程内缓存获取登录用户信息，仅当进程内缓存的原始值与redis中的缓存值一致时命中，
+        避免其他进程失效并重建缓存后本进程继续使用旧的登录用户信息
+
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :param cache_value: redis中的登录用户信息缓存值
+        :return: 登录用户信息
+        """
+        if AppConfig.app_user_cache_local_size <= 0:
+            return None
+        local_key = (str(user_id), str(token_id))
+        cache_item = cls._local_cache.get(local_key)
+        if cache_item is None:
+            return None
+        expire_at, local_value, current_user = cache_item
+        if expire_at < time.monotonic() or local_value != cache_value:
+            cls._local_cache.pop(local_key, None)
+            return None
+        cls._local_cache.move_to_end(local_key)
+        return current_user
+
+    @classmethod
+    def _set_local_cache(
+        cls, user_id: Union[int, str], token_id: Union[int, str], cache_value: str, current_user: CurrentUserModel
+    ) -> None:
+        """
+        设置进程内登录用户信息缓存
+
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :param cache_value: redis中的登录用户信息缓存值
+        :param current_user: 登录用户信息
+        :return:
+        """
+        if AppConfig.app_user_cache_local_size <= 0:
+            return
+        local_key = (str(user_id), str(token_id))
+        cls._local_cache[local_key] = (
+            time.monotonic() + AppConfig.app_user_cache_local_ttl,
+            cache_value,
+            current_user,
+        )
+        cls._local_cache.move_to_end(local_key)
+        while len(cls._local_cache) > AppConfig.app_user_cache_local_size:
+            cls._local_cache.popitem(last=False)
+
+    @classmethod
+    def _track_session(cls, pipe: Pipeline, user_id: Union[int, str], token_id: Union[int, str]) -> None:
+        """
+        在pipeline中将会话编号记录至用户会话索引，索引与缓存同步过期
+
+        :param pipe: redis pipeline对象
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :return:
+        """
+        pipe.sadd(cls.get_user_session_key(user_id), str(token_id))
+        pipe.expire(cls.get_user_session_key(user_id), timedelta(minutes=JwtConfig.jwt_redis_expire_minutes))
+        pipe.sadd(cls.get_user_session_index_key(), str(user_id))
+
+    @classmethod
+    def parse_current_user_cache_services(
+        cls, user_id: Union[int, str], token_id: Union[int, str], cache_value: Union[str, None]
+    ) -> Union[CurrentUserModel, None]:
+        """
+        解析登录用户信息缓存service，缓存值由调用方通过pipeline与令牌一并读取
+
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :param cache_value: redis中的登录用户信息缓存值
+        :return: 登录用户信息，未命中时返回None
+        """
+        if not cache_value:
+            return None
+        current_user = cls._get_local_cache(user_id, token_id, cache_value)
+        if current_user is not None:
+            return current_user
+        try:
+            current_user = CurrentUserModel.model_validate_json(cache_value)
+        except ValidationError as e:
+            logger.warning(f'登录用户信息缓存解析失败，将重新查询数据库，详细错误信息：{e}')
+            return None
+        cls._set_local_cache(user_id, token_id, cache_value, current_user)
+        return current_user
+
+    @classmethod
+    async def set_current_user_cache_services(
+        cls,
+        redis: aioredis.Redis,
+        user_id: Union[int, str],
+        token_id: Union[int, str],
+        current_user: CurrentUserModel,
+    ) -> None:
+        """
+        设置登录用户信息缓存service
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :param current_user: 登录用户信息
+        :return:
+        """
+        cache_value = current_user.model_dump_json(by_alias=True)
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(
+                cls.get_cache_key(user_id, token_id),
+                cache_value,
+                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+            )
+            cls._track_session(pipe, user_id, token_id)
+            await pipe.execute()
+        cls._set_local_cache(user_id, token_id, cache_value, current_user)
+
+    @classmethod
+    def parse_data_scope_cache_services(cls, cache_value: Union[str, None]) -> Union[UserDataScopeModel, None]:
+        """
+        解析用户数据权限缓存service，缓存值由调用方通过pipeline与令牌一并读取
+
+        :param cache_value: redis中的用户数据权限缓存值
+        :return: 用户数据权限，未命中时返回None
+        """
+        if not cache_value:
+            return None
+        try:
+            return UserDataScopeModel.model_validate_json(cache_value)
+        except ValidationError as e:
+            logger.warning(f'用户数据权限缓存解析失败，将重新查询数据库，详细错误信息：{e}')
+            return None
+
+    @classmethod
+    async def set_data_scope_cache_services(
+        cls,
+        redis: aioredis.Redis,
+        user_id: Union[int, str],
+        token_id: Union[int, str],
+        data_scope: UserDataScopeModel,
+    ) -> None:
+        """
+        设置用户数据权限缓存service
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :param data_scope: 用户数据权限
+        :return:
+        """
+        async with redis.pipeline(transaction=False) as pipe:
+            pipe.set(
+                cls.get_data_scope_cache_key(user_id, token_id),
+                data_scope.model_dump_json(by_alias=True),
+                ex=timedelta(minutes=JwtConfig.jwt_redis_expire_minutes),
+            )
+            cls._track_session(pipe, user_id, token_id)
+            await pipe.execute()
+
+    @classmethod
+    async def clear_session_cache_services(
+        cls, redis: aioredis.Redis, user_id: Union[int, str], token_id: Union[int, str]
+    ) -> None:
+        """
+        清除单个会话的登录用户信息缓存service，用于登录时复用令牌编号的会话
+
+        :param redis: redis对象
+        :param user_id: 用户id
+        :param token_id: 令牌编号
+        :return:
+        """
+        cls._local_cache.pop((str(user_id), str(token_id)), None)
+        await redis.delete(cls.get_cache_key(user_id, token_id), cls.get_data_scope_cache_key(user_id, token_id))
+
+    @classmethod
+    async def clear_user_cache_services(cls, request: Request, user_ids: list[Union[int, str]]) -> None:
+        """
+        清除指定用户所有会话的登录用户信息缓存service，用于用户信息、用户角色等变更后的失效处理
+
+        :param request: Request对象
+        :param user_ids: 用户id列表
+        :return:
+        """
+        user_id_set = {str(user_id) for user_id in user_ids if user_id is not None and str(user_id) != ''}
+        if not user_id_set:
+            return
+        for local_key in [key for key in cls._local_cache if key[0] in user_id_set]:
+            cls._local_cache.pop(local_key, None)
+        await cls._delete_session_cache(request.app.state.redis, list(user_id_set), True)
+
+    @classmethod
+    async def clear_all_user_cache_services(cls, request: Request) -> None:
+        """
+        清除所有登录用户信息缓存service，用于角色、菜单、部门等影响多个用户的变更后的失效处理
+
+        :param request: Request对象
+        :return:
+        """
+        cls._local_cache.clear()
+        redis: aioredis.Redis = request.app.state.redis
+        await cls._delete_session_cache(redis, list(await redis.smembers(cls.get_user_session_index_key())), True)
+
+    @classmethod
+    async def clear_all_data_scope_cache_services(cls, request: Request) -> None:
+        """
+        清除所有用户数据权限缓存service，用于部门新增、删除等仅影响数据权限范围的变更后的失效处理
+
+        :param request: Request对象
+        :return:
+        """
+        await cls.clear_all_data_scope_cache_by_redis_services(request.app.state.redis)
+
+    @classmethod
+    async def clear_all_data_scope_cache_by_redis_services(cls, redis: aioredis.Redis) -> None:
+        """
+        清除所有用户数据权限缓存service，用于脚本等无Request对象的场景
+
+        :param redis: redis对象
+        :return:
+        """
+        await cls._delete_session_cache(redis, list(await redis.smembers(cls.get_user_session_index_key())), False)
+
+    @classmethod
+    async def _delete_session_cache(
+        cls, redis: aioredis.Redis, user_id_list: list[str], with_current_user: bool
+    ) -> None:
+        """
+        按用户会话索引分批删除指定用户所有会话的缓存
+
+        :param redis: redis对象
+        :param user_id_list: 用户id列表
+        :param with_current_user: 是否同时删除登录用户信息缓存，否则仅删除数据权限缓存
+        :return:
+        """
+        for index in range(0, len(user_id_list), cls.BATCH_SIZE):
+            batch_user_ids = user_id_list[index : index + cls.BATCH_SIZE]
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id in batch_user_ids:
+                    pipe.smembers(cls.get_user_session_key(user_id))
+                token_id_sets = await pipe.execute()
+            async with redis.pipeline(transaction=False) as pipe:
+                for user_id, token_id_set in zip(batch_user_ids, token_id_sets):
+                    if not token_id_set:
+                        continue
+                    pipe.delete(*[cls.get_data_scope_cache_key(user_id, token_id) for token_id in token_id_set])
+                    if with_current_user:
+                        pipe.delete(*[cls.get_cache_key(user_id, token_id) for token_id in token_id_set])
+                        # 仅移除已读取的会话编号，保留期间新缓存的会话
+                        pipe.srem(cls.get_user_session_key(user_id), *token_id_set)
+                await pipe.execute()
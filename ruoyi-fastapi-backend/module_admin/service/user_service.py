@@ -1,4 +1,6 @@
 import io
+import unicodedata
+from collections.abc import AsyncGenerator
 from datetime import datetime
 from typing import Any, Union
 
@@ -10,6 +12,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 from common.constant import CommonConstant
 from common.vo import CrudResponseModel, PageModel
 from exceptions.exception import ServiceException
+from module_admin.dao.dept_dao import DeptDao
 from module_admin.dao.user_dao import UserDao
 from module_admin.entity.do.user_do import SysUserRole
 from module_admin.entity.vo.post_vo import PostPageQueryModel
@@ -33,11 +36,11 @@ from module_admin.entity.vo.user_vo import (
     UserRowModel,
 )
 from module_admin.service.config_service import ConfigService
-from module_admin.service.dept_service import DeptService
 from module_admin.service.post_service import PostService
 from module_admin.service.role_service import RoleService
+from module_admin.service.user_cache_service import UserCacheService
 from utils.common_util import CamelCaseUtil
-from utils.excel_util import ExcelUtil
+from utils.excel_util import ExcelExportParams, ExcelUtil
 from utils.pwd_util import PwdUtil
 
 
@@ -45,6 +48,12 @@ class UserService:
     """
     用户管理模块服务层
     """
+
+    # 批量导入用户时每批处理的行数
+    IMPORT_BATCH_SIZE = 500
+    # 登录时更新的最后登录信息字段
+    LOGIN_INFO_FIELDS = frozenset({'user_id', 'login_ip', 'login_date'})
+
     @classmethod
     async def get_system_user_engineer_list_services(cls, query_db: AsyncSession,
                                                      query_object: UserPageQueryModel,
@@ -219,10 +228,25 @@ class UserService:
             del edit_user['type']
 
     @classmethod
-    async def edit_user_services(cls, query_db: AsyncSession, page_object: EditUserModel) -> CrudResponseModel:
+    async def _clear_edit_user_cache(cls, request: Request, edit_user: dict[str, Any]) -> None:
+        """
+        编辑用户后清除该用户的登录用户信息缓存，登录时仅更新最后登录信息，不影响已缓存的登录用户信息，无需清除
+
+        :param request: Request对象
+        :param edit_user: 编辑用户字典
+        :return: None
+        """
+        if set(edit_user) - cls.LOGIN_INFO_FIELDS:
+            await UserCacheService.clear_user_cache_services(request, [edit_user.get('user_id')])
+
+    @classmethod
+    async def edit_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: EditUserModel
+    ) -> CrudResponseModel:
         """
         编辑用户信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 编辑用户对象
         :return: 编辑用户校验结果
@@ -254,6 +278,7 @@ class UserService:
                                 query_db, UserPostModel(userId=page_object.user_id, postId=post)
                             )
                 await query_db.commit()
+                await cls._clear_edit_user_cache(request, edit_user)
                 return CrudResponseModel(is_success=True, message='更新成功')
             except Exception as e:
                 await query_db.rollback()
@@ -262,10 +287,13 @@ class UserService:
             raise ServiceException(message='用户不存在')
 
     @classmethod
-    async def delete_user_services(cls, query_db: AsyncSession, page_object: DeleteUserModel) -> CrudResponseModel:
+    async def delete_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: DeleteUserModel
+    ) -> CrudResponseModel:
         """
         删除用户信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除用户对象
         :return: 删除用户校验结果
@@ -283,6 +311,7 @@ class UserService:
                     await UserDao.delete_user_post_dao(query_db, UserPostModel(**user_id_dict))
                     await UserDao.delete_user_dao(query_db, UserModel(**user_id_dict))
                 await query_db.commit()
+                await UserCacheService.clear_user_cache_services(request, user_id_list)
                 return CrudResponseModel(is_success=True, message='删除成功')
             except Exception as e:
                 await query_db.rollback()
@@ -302,7 +331,7 @@ class UserService:
         posts = await PostService.get_post_list_services(query_db, PostPageQueryModel(), is_page=False)
         roles = await RoleService.get_role_select_option_services(query_db)
         if user_id != '':
-            query_user = await UserDao.get_user_detail_by_id(query_db, user_id=user_id)
+            query_user = await UserDao.get_user_profile_by_id(query_db, user_id, normal_only=False, with_menu=False)
             post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
             post_ids_list = [row.post_id for row in query_user.get('user_post_info')]
             role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
@@ -333,7 +362,7 @@ class UserService:
         :param user_id: 用户id
         :return: 用户id对应的信息
         """
-        query_user = await UserDao.get_user_detail_by_id(query_db, user_id=user_id)
+        query_user = await UserDao.get_user_profile_by_id(query_db, user_id, normal_only=False, with_menu=False)
         post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
         post_group = ','.join([row.post_name for row in query_user.get('user_post_info')])
         role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
@@ -352,61 +381,70 @@ class UserService:
         )
 
     @classmethod
-    async def reset_user_services(cls, query_db: AsyncSession, page_object: ResetUserModel) -> CrudResponseModel:
+    async def reset_user_services(
+        cls, request: Request, query_db: AsyncSession, page_object: ResetUserModel
+    ) -> CrudResponseModel:
         """
         重置用户密码service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 重置用户对象
         :return: 重置用户校验结果
         """
         reset_user = page_object.model_dump(exclude_unset=True, exclude={'admin'})
         if page_object.old_password:
-            user = (await UserDao.get_user_detail_by_id(query_db, user_id=page_object.user_id)).get('user_basic_info')
-            if not PwdUtil.verify_password(page_object.old_password, user.password):
+            user = (
+                await UserDao.get_user_profile_by_id(query_db, page_object.user_id, normal_only=False, with_menu=False)
+            ).get('user_basic_info')
+            if not await PwdUtil.verify_password_async(page_object.old_password, user.password):
                 raise ServiceException(message='修改密码失败，旧密码错误')
-            if PwdUtil.verify_password(page_object.password, user.password):
+            if await PwdUtil.verify_password_async(page_object.password, user.password):
                 raise ServiceException(message='新密码不能与旧密码相同')
             del reset_user['old_password']
         if page_object.sms_code and page_object.session_id:
             del reset_user['sms_code']
             del reset_user['session_id']
         try:
-            reset_user['password'] = PwdUtil.get_password_hash(page_object.password)
+            reset_user['password'] = await PwdUtil.get_password_hash_async(page_object.password)
             await UserDao.edit_user_dao(query_db, reset_user)
             await query_db.commit()
+            await UserCacheService.clear_user_cache_services(request, [page_object.user_id])
             return CrudResponseModel(is_success=True, message='重置成功')
         except Exception as e:
             await query_db.rollback()
             raise e
 
     @classmethod
-    def _set_row_sex_value(cls, row: pd.Series) -> None:
+    def _set_sex_column_value(cls, df: pd.DataFrame) -> None:
         """
-        设置行性别值
+        设置性别列的值
 
-        :param row: 行数据
+        :param df: 导入数据
         :return: None
         """
-        if row['sex'] == '男':
-            row['sex'] = '0'
-        if row['sex'] == '女':
-            row['sex'] = '1'
-        if row['sex'] == '未知':
-            row['sex'] = '2'
+        df['sex'] = df['sex'].map(lambda sex: {'男': '0', '女': '1', '未知': '2'}.get(sex, sex))
 
     @classmethod
-    def _set_row_status_value(cls, row: pd.Series) -> None:
+    def _set_status_column_value(cls, df: pd.DataFrame) -> None:
         """
-        设置行状态值
+        设置状态列的值
 
-        :param row: 行数据
+        :param df: 导入数据
         :return: None
         """
-        if row['status'] == '正常':
-            row['status'] = '0'
-        if row['status'] == '停用':
-            row['status'] = '1'
+        df['status'] = df['status'].map(lambda status: {'正常': '0', '停用': '1'}.get(status, status))
+
+    @classmethod
+    def _get_user_name_match_key(cls, user_name: str) -> str:
+        """
+        获取用户账号的宽松匹配键，忽略大小写、重音及尾部空格，数据库排序规则下可能相同的账号匹配键一致
+
+        :param user_name: 用户账号
+        :return: 匹配键
+        """
+        normalized_user_name = unicodedata.normalize('NFKD', user_name)
+        return ''.join(char for char in normalized_user_name if not unicodedata.combining(char)).casefold().rstrip()
 
     @classmethod
     async def batch_import_user_services(
@@ -445,71 +483,214 @@ class UserService:
         await file.close()
         df.rename(columns=header_dict, inplace=True)
         add_error_result = []
-        count = 0
+        edit_user_id_list = []
         try:
-            for _index, row in df.iterrows():
-                count = count + 1
-                cls._set_row_sex_value(row)
-                cls._set_row_status_value(row)
-                add_user = UserModel(
-                    deptId=row['dept_id'],
-                    userName=row['user_name'],
-                    password=PwdUtil.get_password_hash(
-                        await ConfigService.query_config_list_from_cache_services(
-                            request.app.state.redis, 'sys.user.initPassword'
-                        )
-                    ),
-                    nickName=row['nick_name'],
-                    email=row['email'],
-                    phonenumber=str(row['phonenumber']),
-                    sex=row['sex'],
-                    status=row['status'],
-                    createBy=current_user.user.user_name,
-                    createTime=datetime.now(),
-                    updateBy=current_user.user.user_name,
-                    updateTime=datetime.now(),
+            cls._set_sex_column_value(df)
+            cls._set_status_column_value(df)
+            row_list = df.to_dict('records')
+            if row_list:
+                # 新增用户均使用相同的初始密码，只需读取配置并加密一次
+                init_password = await PwdUtil.get_password_hash_async(
+                    await ConfigService.query_config_list_from_cache_services(
+                        request.app.state.redis, 'sys.user.initPassword'
+                    )
                 )
-                user_info = await UserDao.get_user_by_info(query_db, UserModel(userName=row['user_name']))
-                if user_info:
-                    if update_support:
-                        edit_user_model = UserModel(
-                            userId=user_info.user_id,
-                            deptId=row['dept_id'],
-                            userName=row['user_name'],
-                            nickName=row['nick_name'],
-                            email=row['email'],
-                            phonenumber=str(row['phonenumber']),
-                            sex=row['sex'],
-                            status=row['status'],
-                            updateBy=current_user.user.user_name,
-                            updateTime=datetime.now(),
-                        )
-                        edit_user_model.validate_fields()
-                        await cls.check_user_allowed_services(edit_user_model)
-                        if not current_user.user.admin:
-                            await cls.check_user_data_scope_services(
-                                query_db, edit_user_model.user_id, user_data_scope_sql
-                            )
-                            await DeptService.check_dept_data_scope_services(
-                                query_db, edit_user_model.dept_id, dept_data_scope_sql
-                            )
-                        edit_user = edit_user_model.model_dump(exclude_unset=True)
-                        await UserDao.edit_user_dao(query_db, edit_user)
-                    else:
-                        add_error_result.append(f'{count}.用户账号{row["user_name"]}已存在')
-                else:
-                    add_user.validate_fields()
-                    if not current_user.user.admin:
-                        await DeptService.check_dept_data_scope_services(
-                            query_db, add_user.dept_id, dept_data_scope_sql
-                        )
-                    await UserDao.add_user_dao(query_db, add_user)
+                for index in range(0, len(row_list), cls.IMPORT_BATCH_SIZE):
+                    batch_error_result, batch_edit_user_id_list = await cls._import_user_batch(
+                        query_db,
+                        row_list[index : index + cls.IMPORT_BATCH_SIZE],
+                        index,
+                        init_password,
+                        update_support,
+                        current_user,
+                        user_data_scope_sql,
+                        dept_data_scope_sql,
+                    )
+                    add_error_result.extend(batch_error_result)
+                    edit_user_id_list.extend(batch_edit_user_id_list)
             await query_db.commit()
+            await UserCacheService.clear_user_cache_services(request, edit_user_id_list)
             return CrudResponseModel(is_success=True, message='\n'.join(add_error_result))
         except Exception as e:
             await query_db.rollback()
             raise e
 
+    @classmethod
+    async def _import_user_batch(
+        cls,
+        query_db: AsyncSession,
+        row_list: list[dict[str, Any]],
+        row_offset: int,
+        init_password: str,
+        update_support: bool,
+        current_user: CurrentUserModel,
+        user_data_scope_sql: ColumnElement,
+        dept_data_scope_sql: ColumnElement,
+    ) -> tuple[list[str], list[int]]:
+        """
+        导入一批用户数据，批量查询已存在的用户及数据权限，校验通过的数据在批次结束时批量写入
+
+        按行的处理顺序及报错与逐行导入一致：构造失败的行在处理到该行时才抛出异常；
+        账号可能与本批次尚未写入的账号重复时，先写入已处理的数据再重新查询该账号
+
+        :param query_db: orm对象
+        :param row_list: 本批次的行数据列表
+        :param row_offset: 本批次首行在导入文件中的偏移量
+        :param init_password: 加密后的初始密码
+        :param update_support: 用户存在时是否更新
+        :param current_user: 当前用户对象
+        :param user_data_scope_sql: 用户数据权限sql
+        :param dept_data_scope_sql: 部门数据权限sql
+        :return: (导入失败的提示信息列表, 更新的用户id列表)
+        """
+        add_user_list = cls._get_import_add_user_list(row_list, init_password, current_user)
+        valid_user_list = [add_user for add_user in add_user_list if isinstance(add_user, UserModel)]
+        user_id_dict = await UserDao.get_user_id_dict_by_user_names(
+            query_db, [add_user.user_name for add_user in valid_user_list]
+        )
+        allowed_user_id_set: set[int] = set()
+        allowed_dept_id_set: set[int] = set()
+        if not current_user.user.admin:
+            allowed_dept_id_set.update(
+                await DeptDao.get_dept_id_list_by_data_scope(
+                    query_db, list({add_user.dept_id for add_user in valid_user_list}), dept_data_scope_sql
+                )
+            )
+            if update_support:
+                allowed_user_id_set.update(
+                    await UserDao.get_user_id_list_by_data_scope(
+                        query_db, list(set(user_id_dict.values())), user_data_scope_sql
+                    )
+                )
+        add_error_result: list[str] = []
+        edit_user_id_list: list[int] = []
+        pending_add_user_list: list[UserModel] = []
+        pending_edit_user_list: list[dict] = []
+        pending_user_name_keys: set[str] = set()
+
+        async def write_pending_users() -> None:
+            if pending_add_user_list:
+                await UserDao.add_user_batch_dao(query_db, pending_add_user_list)
+                pending_add_user_list.clear()
+            if pending_edit_user_list:
+                await UserDao.edit_user_batch_dao(query_db, pending_edit_user_list)
+                pending_edit_user_list.clear()
+            pending_user_name_keys.clear()
+
+        for count, (row, add_user) in enumerate(zip(row_list, add_user_list), start=row_offset + 1):
+            if isinstance(add_user, Exception):
+                raise add_user
+            user_name_key = cls._get_user_name_match_key(add_user.user_name)
+            if user_name_key in pending_user_name_keys:
+                await write_pending_users()
+                user_id_dict.pop(add_user.user_name, None)
+                user_id_dict.update(await UserDao.get_user_id_dict_by_user_names(query_db, [add_user.user_name]))
+                user_id = user_id_dict.get(add_user.user_name)
+                if user_id is not None and update_support and not current_user.user.admin:
+                    # 该用户的部门可能已被本次导入修改，重新校验数据权限
+                    allowed_user_id_set.discard(user_id)
+                    allowed_user_id_set.update(
+                        await UserDao.get_user_id_list_by_data_scope(query_db, [user_id], user_data_scope_sql)
+                    )
+            user_id = user_id_dict.get(add_user.user_name)
+            if user_id is not None:
+                if update_support:
+                    pending_edit_user_list.append(
+                        await cls._get_import_edit_user(
+                            row, user_id, current_user, allowed_user_id_set, allowed_dept_id_set
+                        )
+                    )
+                    pending_user_name_keys.add(user_name_key)
+                    edit_user_id_list.append(user_id)
+                else:
+                    add_error_result.append(f'{count}.用户账号{row["user_name"]}已存在')
+            else:
+                add_user.validate_fields()
+                if not current_user.user.admin and add_user.dept_id not in allowed_dept_id_set:
+                    raise ServiceException(message='没有权限访问部门数据')
+                pending_add_user_list.append(add_user)
+                pending_user_name_keys.add(user_name_key)
+        await write_pending_users()
+
+        return add_error_result, edit_user_id_list
+
+    @classmethod
+    def _get_import_add_user_list(
+        cls, row_list: list[dict[str, Any]], init_password: str, current_user: CurrentUserModel
+    ) -> list[Union[UserModel, Exception]]:
+        """
+        根据导入的行数据构造新增用户模型，构造失败的行保留异常对象
+
+        :param row_list: 行数据列表
+        :param init_password: 加密后的初始密码
+        :param current_user: 当前用户对象
+        :return: 新增用户模型或构造异常的列表
+        """
+        add_user_list: list[Union[UserModel, Exception]] = []
+        for row in row_list:
+            try:
+                add_user_list.append(
+                    UserModel(
+                        deptId=row['dept_id'],
+                        userName=row['user_name'],
+                        password=init_password,
+                        nickName=row['nick_name'],
+                        email=row['email'],
+                        phonenumber=str(row['phonenumber']),
+                        sex=row['sex'],
+                        status=row['status'],
+                        createBy=current_user.user.user_name,
+                        createTime=datetime.now(),
+                        updateBy=current_user.user.user_name,
+                        updateTime=datetime.now(),
+                    )
+                )
+            except Exception as e:  # noqa: PERF203
+                add_user_list.append(e)
+
+        return add_user_list
+
+    @classmethod
+    async def _get_import_edit_user(
+        cls,
+        row: dict[str, Any],
+        user_id: int,
+        current_user: CurrentUserModel,
+        allowed_user_id_set: set[int],
+        allowed_dept_id_set: set[int],
+    ) -> dict:
+        """
+        根据导入的行数据构造需要更新的用户字典，并校验是否允许操作及数据权限
+
+        :param row: 行数据
+        :param user_id: 已存在的用户id
+        :param current_user: 当前用户对象
+        :param allowed_user_id_set: 有数据权限的用户id集合
+        :param allowed_dept_id_set: 有数据权限的部门id集合
+        :return: 需要更新的用户字典
+        """
+        edit_user_model = UserModel(
+            userId=user_id,
+            deptId=row['dept_id'],
+            userName=row['user_name'],
+            nickName=row['nick_name'],
+            email=row['email'],
+            phonenumber=str(row['phonenumber']),
+            sex=row['sex'],
+            status=row['status'],
+            updateBy=current_user.user.user_name,
+            updateTime=datetime.now(),
+        )
+        edit_user_model.validate_fields()
+        await cls.check_user_allowed_services(edit_user_model)
+        if not current_user.user.admin:
+            if edit_user_model.user_id not in allowed_user_id_set:
+                raise ServiceException(message='没有权限访问用户数据')
+            if edit_user_model.dept_id not in allowed_dept_id_set:
+                raise ServiceException(message='没有权限访问部门数据')
+
+        return edit_user_model.model_dump(exclude_unset=True)
+
     @staticmethod
     async def get_user_import_template_services() -> bytes:
         """
@@ -526,13 +707,16 @@ class UserService:
 
         return binary_data
 
-    @staticmethod
-    async def export_user_list_services(user_list: list) -> bytes:
+    @classmethod
+    def get_user_export_params_services(
+        cls, query_object: UserPageQueryModel, data_scope_sql: ColumnElement
+    ) -> ExcelExportParams:
         """
-        导出用户信息service
+        获取用户信息导出参数service
 
-        :param user_list: 用户信息列表
-        :return: 用户信息对应excel的二进制数据
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 用户信息导出的查询语句、映射字典及导出行处理方法
         """
         # 创建一个映射字典，将英文键映射到中文键
         mapping_dict = {
@@ -551,8 +735,9 @@ class UserService:
             'remark': '备注',
         }
 
-        for item in user_list:
-            item['deptName'] = item.get('dept').get('deptName')
+        def format_row(row: list[dict[str, Any]]) -> dict[str, Any]:
+            item, dept = row
+            item['deptName'] = dept.get('deptName') if dept else None
             if item.get('status') == '0':
                 item['status'] = '正常'
             else:
@@ -563,9 +748,25 @@ class UserService:
                 item['sex'] = '女'
             else:
                 item['sex'] = '未知'
-        binary_data = ExcelUtil.export_list2excel(user_list, mapping_dict)
+            return item
 
-        return binary_data
+        return UserDao.get_user_list_query(query_object, data_scope_sql), mapping_dict, format_row
+
+    @classmethod
+    async def export_user_list_services(
+        cls, query_db: AsyncSession, query_object: UserPageQueryModel, data_scope_sql: ColumnElement
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        导出用户信息service
+
+        :param query_db: orm对象
+        :param query_object: 查询参数对象
+        :param data_scope_sql: 数据权限对应的查询sql语句
+        :return: 用户信息对应excel文件的流式数据
+        """
+        query, mapping_dict, row_handler = cls.get_user_export_params_services(query_object, data_scope_sql)
+
+        return await ExcelUtil.export_query2excel(query_db, query, mapping_dict, row_handler)
 
     @classmethod
     async def get_user_role_allocated_list_services(
@@ -578,7 +779,9 @@ class UserService:
         :param page_object: 用户关联角色对象
         :return: 已分配角色列表
         """
-        query_user = await UserDao.get_user_detail_by_id(query_db, page_object.user_id)
+        query_user = await UserDao.get_user_profile_by_id(
+            query_db, page_object.user_id, normal_only=False, with_menu=False
+        )
         post_ids = ','.join([str(row.post_id) for row in query_user.get('user_post_info')])
         role_ids = ','.join([str(row.role_id) for row in query_user.get('user_role_info')])
         user = UserInfoModel(
@@ -600,10 +803,13 @@ class UserService:
         return result
 
     @classmethod
-    async def add_user_role_services(cls, query_db: AsyncSession, page_object: CrudUserRoleModel) -> CrudResponseModel:
+    async def add_user_role_services(
+        cls, request: Request, query_db: AsyncSession, page_object: CrudUserRoleModel
+    ) -> CrudResponseModel:
         """
         新增用户关联角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 新增用户关联角色对象
         :return: 新增用户关联角色校验结果
@@ -615,6 +821,7 @@ class UserService:
                 for role_id in role_id_list:
                     await UserDao.add_user_role_dao(query_db, UserRoleModel(userId=page_object.user_id, roleId=role_id))
                 await query_db.commit()
+                await UserCacheService.clear_user_cache_services(request, [page_object.user_id])
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -623,6 +830,7 @@ class UserService:
             try:
                 await UserDao.delete_user_role_by_user_and_role_dao(query_db, UserRoleModel(userId=page_object.user_id))
                 await query_db.commit()
+                await UserCacheService.clear_user_cache_services(request, [page_object.user_id])
                 return CrudResponseModel(is_success=True, message='分配成功')
             except Exception as e:
                 await query_db.rollback()
@@ -638,6 +846,7 @@ class UserService:
                         continue
                     await UserDao.add_user_role_dao(query_db, UserRoleModel(userId=user_id, roleId=page_object.role_id))
                 await query_db.commit()
+                await UserCacheService.clear_user_cache_services(request, user_id_list)
                 return CrudResponseModel(is_success=True, message='新增成功')
             except Exception as e:
                 await query_db.rollback()
@@ -647,11 +856,12 @@ class UserService:
 
     @classmethod
     async def delete_user_role_services(
-        cls, query_db: AsyncSession, page_object: CrudUserRoleModel
+        cls, request: Request, query_db: AsyncSession, page_object: CrudUserRoleModel
     ) -> CrudResponseModel:
         """
         删除用户关联角色信息service
 
+        :param request: Request对象
         :param query_db: orm对象
         :param page_object: 删除用户关联角色对象
         :return: 删除用户关联角色校验结果
@@ -663,6 +873,7 @@ class UserService:
                         query_db, UserRoleModel(userId=page_object.user_id, roleId=page_object.role_id)
                     )
                     await query_db.commit()
+                    await UserCacheService.clear_user_cache_services(request, [page_object.user_id])
                     return CrudResponseModel(is_success=True, message='删除成功')
                 except Exception as e:
                     await query_db.rollback()
@@ -675,6 +886,7 @@ class UserService:
                             query_db, UserRoleModel(userId=user_id, roleId=page_object.role_id)
                         )
                     await query_db.commit()
+                    await UserCacheService.clear_user_cache_services(request, user_id_list)
                     return CrudResponseModel(is_success=True, message='删除成功')
                 except Exception as e:
                     await query_db.rollback()
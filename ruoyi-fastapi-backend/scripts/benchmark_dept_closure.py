@@ -0,0 +1,184 @@
+"""
+部门子树查询的基准测试
+
+在SQLite数据库文件中写入指定数量部门的部门树，以 DeptDao.rebuild_dept_closure_dao 回填部门闭包表并输出耗时，
+再分别以原 find_in_set(dept_id, ancestors) 全表扫描及部门闭包表关联执行子部门列表及正常子部门数量查询，校验结果一致并输出耗时分位数。
+SQLite没有find_in_set函数，以Python实现的同名函数注册到连接上，其单行开销高于MySQL的内置函数，原方式的耗时仅供参考
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_dept_closure --depts 10000
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections.abc import Awaitable
+from typing import Any, Callable, Union
+
+from sqlalchemy import event, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import Base
+from module_admin.dao.dept_dao import DeptDao
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
+from scripts.benchmark_util import create_session_maker, create_sqlite_engine, get_quantiles
+
+# 每个部门的子部门数
+DEPT_CHILDREN = 10
+# 停用部门的比例
+DISABLED_DEPT_RATIO = 0.1
+INSERT_BATCH_SIZE = 5000
+
+
+def find_in_set(value: Any, value_set: Union[str, None]) -> int:
+    """
+    MySQL find_in_set函数的Python实现
+
+    :param value: 查找的值
+    :param value_set: 逗号分隔的值列表
+    :return: 值在列表中的位置（从1开始），不存在时返回0
+    """
+    if value is None or value_set is None:
+        return 0
+    items = value_set.split(',')
+    return items.index(str(value)) + 1 if str(value) in items else 0
+
+
+async def seed_depts(session: AsyncSession, dept_count: int) -> None:
+    """
+    建表并写入部门树：部门1为根部门，按广度优先顺序每个部门有固定数量的子部门
+
+    :param session: 异步会话
+    :param dept_count: 部门数
+    :return:
+    """
+    rng = random.Random(0)
+    await session.run_sync(
+        lambda sync_session: Base.metadata.create_all(
+            sync_session.connection(), tables=[SysDept.__table__, SysDeptClosure.__table__]
+        )
+    )
+    ancestors = {1: '0'}
+    dept_rows = [{'dept_id': 1, 'parent_id': 0, 'ancestors': '0', 'dept_name': '部门1', 'status': '0', 'del_flag': '0'}]
+    for dept_id in range(2, dept_count + 1):
+        parent_id = (dept_id - 2) // DEPT_CHILDREN + 1
+        ancestors[dept_id] = f'{ancestors[parent_id]},{parent_id}'
+        dept_rows.append(
+            {
+                'dept_id': dept_id,
+                'parent_id': parent_id,
+                'ancestors': ancestors[dept_id],
+                'dept_name': f'部门{dept_id}',
+                'status': '1' if rng.random() < DISABLED_DEPT_RATIO else '0',
+                'del_flag': '0',
+            }
+        )
+    for index in range(0, len(dept_rows), INSERT_BATCH_SIZE):
+        await session.execute(insert(SysDept), dept_rows[index : index + INSERT_BATCH_SIZE])
+    await session.commit()
+
+
+async def get_children_dept_legacy(db: AsyncSession, dept_id: int) -> list[int]:
+    """
+    原子部门列表查询：按祖级列表find_in_set全表扫描
+
+    :param db: orm对象
+    :param dept_id: 部门id
+    :return: 子部门id列表
+    """
+    return sorted(
+        (await db.execute(select(SysDept.dept_id).where(func.find_in_set(dept_id, SysDept.ancestors)))).scalars()
+    )
+
+
+async def get_children_dept_closure(db: AsyncSession, dept_id: int) -> list[int]:
+    """
+    部门闭包表子部门列表查询
+
+    :param db: orm对象
+    :param dept_id: 部门id
+    :return: 子部门id列表
+    """
+    return sorted(dept.dept_id for dept in await DeptDao.get_children_dept_dao(db, dept_id))
+
+
+async def count_normal_children_dept_legacy(db: AsyncSession, dept_id: int) -> Union[int, None]:
+    """
+    原正常子部门数量查询：按祖级列表find_in_set全表扫描
+
+    :param db: orm对象
+    :param dept_id: 部门id
+    :return: 正常子部门数量
+    """
+    return (
+        await db.execute(
+            select(func.count('*'))
+            .select_from(SysDept)
+            .where(SysDept.status == '0', SysDept.del_flag == '0', func.find_in_set(dept_id, SysDept.ancestors))
+        )
+    ).scalar()
+
+
+async def measure(
+    session: AsyncSession, query: Callable[[AsyncSession, int], Awaitable[Any]], dept_ids: list[int]
+) -> tuple[list[Any], list[float]]:
+    """
+    对每个部门执行一次查询并记录结果及耗时
+
+    :param session: 异步会话
+    :param query: 查询方法
+    :param dept_ids: 部门id列表
+    :return: (各次查询结果列表, 各次耗时毫秒列表)
+    """
+    results, elapsed = [], []
+    for dept_id in dept_ids:
+        start = time.perf_counter()
+        results.append(await query(session, dept_id))
+        elapsed.append((time.perf_counter() - start) * 1000)
+        session.expunge_all()
+
+    return results, elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='部门子树查询基准测试')
+    parser.add_argument('--depts', type=int, default=10000, help='部门数')
+    parser.add_argument('--queries', type=int, default=200, help='每种查询的执行次数')
+    args, _ = parser.parse_known_args()
+
+    rng = random.Random(1)
+    # 根部门及各层级的非叶子部门
+    dept_ids = [1] + [rng.randint(2, args.depts // DEPT_CHILDREN) for _ in range(args.queries - 1)]
+    query_pairs = [
+        ('子部门列表', get_children_dept_legacy, get_children_dept_closure),
+        ('正常子部门数量', count_normal_children_dept_legacy, DeptDao.count_normal_children_dept_dao),
+    ]
+    async with create_sqlite_engine('benchmark_dept_closure.db') as engine:
+        event.listen(
+            engine.sync_engine,
+            'connect',
+            lambda dbapi_connection, _: dbapi_connection.create_function('find_in_set', 2, find_in_set),
+        )
+        session_maker = create_session_maker(engine)
+        async with session_maker() as session:
+            await seed_depts(session, args.depts)
+            start = time.perf_counter()
+            closure_count = await DeptDao.rebuild_dept_closure_dao(session)
+            await session.commit()
+            print(f'{args.depts}个部门回填闭包表{closure_count}条关系耗时{time.perf_counter() - start:.2f}s')
+        async with session_maker() as session:
+            for query_name, legacy_query, closure_query in query_pairs:
+                legacy_results, legacy_elapsed = await measure(session, legacy_query, dept_ids)
+                closure_results, closure_elapsed = await measure(session, closure_query, dept_ids)
+                if legacy_results != closure_results:
+                    print(f'❌️ {query_name}：find_in_set与闭包表的查询结果不一致')
+                    return 1
+                print(f'{query_name} find_in_set（原方式）：{get_quantiles(legacy_elapsed)}')
+                print(f'{query_name} 部门闭包表：{get_quantiles(closure_elapsed)}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,114 @@
+"""
+企业名称联想索引的基准测试
+
+以随机生成的企业构建联想索引，按随机企业名称及纳税人识别号的前缀（1~6个字符）查询前10条联想结果，输出查询及单个企业增量更新的耗时分位数。
+默认测试memory方式；--backend redis 时使用配置文件中的Redis（会覆盖其中的 enterprise_suggest:* 键）
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_enterprise_suggest --count 500000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from collections import namedtuple
+
+from config.env import AppConfig
+from config.get_enterprise_suggest import EnterpriseSuggestUtil
+from config.get_redis import RedisUtil
+
+EntRow = namedtuple('EntRow', ['ent_id', 'enterprise_name', 'taxpayer_id', 'ent_type'])
+
+# 企业名称由 地区 + 字号 + 行业 + 组织形式 组成
+REGIONS = [
+    '北京', '上海', '广州', '深圳', '杭州', '南京', '苏州', '成都', '武汉', '西安', '天津', '重庆', '宁波', '合肥',
+]  # fmt: skip
+NAME_CHARS = '华盛泰达鑫源宏信恒通瑞丰嘉和中正天元金辉新创远博海誉安康永兴东方明德睿智锦程浩宇'
+INDUSTRIES = ['建设', '建筑工程', '工程咨询', '造价咨询', '市政工程', '园林绿化', '装饰工程', '科技', '置业', '设计']
+SUFFIXES = ['有限公司', '集团有限公司', '股份有限公司', '有限责任公司']
+TAXPAYER_CHARS = '0123456789ABCDEFGHJKLMNPQRTUWXY'
+SUGGEST_LIMIT = 10
+# 以企业名称前缀查询的比例，其余以纳税人识别号前缀查询
+NAME_KEYWORD_RATIO = 0.8
+UPDATE_SAMPLE_COUNT = 200
+
+
+def generate_ent_rows(count: int) -> list[EntRow]:
+    """
+    生成随机企业
+
+    :param count: 企业数
+    :return: 企业信息列表
+    """
+    rng = random.Random(0)
+    return [
+        EntRow(
+            ent_id,
+            f'{rng.choice(REGIONS)}{"".join(rng.sample(NAME_CHARS, rng.randint(2, 4)))}'
+            f'{rng.choice(INDUSTRIES)}{rng.choice(SUFFIXES)}',
+            f'91{"".join(rng.choices(TAXPAYER_CHARS, k=16))}',
+            rng.randint(1, 3),
+        )
+        for ent_id in range(1, count + 1)
+    ]
+
+
+def get_quantiles(elapsed: list[float]) -> str:
+    """
+    计算耗时分位数
+
+    :param elapsed: 各次耗时毫秒列表
+    :return: 分位数说明
+    """
+    quantiles = statistics.quantiles(elapsed, n=100, method='inclusive')
+
+    return f'p50 {quantiles[49]:.3f}ms  p95 {quantiles[94]:.3f}ms  p99 {quantiles[98]:.3f}ms  max {max(elapsed):.3f}ms'
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='企业名称联想索引基准测试')
+    parser.add_argument('--count', type=int, default=500000, help='企业数')
+    parser.add_argument('--queries', type=int, default=20000, help='查询次数')
+    parser.add_argument('--backend', choices=['memory', 'redis'], default='memory', help='联想索引的存储方式')
+    args, _ = parser.parse_known_args()
+
+    AppConfig.app_enterprise_suggest_backend = args.backend
+    if args.backend == 'redis':
+        EnterpriseSuggestUtil._redis = await RedisUtil.create_redis_pool()
+    ent_rows = generate_ent_rows(args.count)
+    start = time.perf_counter()
+    await EnterpriseSuggestUtil.build_index(ent_rows)
+    print(f'{args.backend}方式构建{args.count}家企业的联想索引耗时{time.perf_counter() - start:.2f}s')
+
+    rng = random.Random(1)
+    keywords = []
+    for _ in range(args.queries):
+        ent_row = rng.choice(ent_rows)
+        text = ent_row.enterprise_name if rng.random() < NAME_KEYWORD_RATIO else ent_row.taxpayer_id
+        keywords.append((text[: rng.randint(1, 6)], rng.choice([None, 1])))
+    elapsed, result_counts = [], []
+    for keyword, ent_type in keywords:
+        start = time.perf_counter()
+        suggest_result = await EnterpriseSuggestUtil.suggest(keyword, SUGGEST_LIMIT, ent_type)
+        elapsed.append((time.perf_counter() - start) * 1000)
+        result_counts.append(len(suggest_result))
+    print(
+        f'前{SUGGEST_LIMIT}条联想查询{args.queries}次：{get_quantiles(elapsed)}，平均返回{statistics.mean(result_counts):.1f}条'
+    )
+
+    update_elapsed = []
+    for ent_row in rng.sample(ent_rows, UPDATE_SAMPLE_COUNT):
+        edited_row = ent_row._replace(enterprise_name=f'{ent_row.enterprise_name}分公司')
+        start = time.perf_counter()
+        await EnterpriseSuggestUtil.update_index([ent_row.ent_id], [edited_row])
+        update_elapsed.append((time.perf_counter() - start) * 1000)
+    print(f'单个企业增量更新{UPDATE_SAMPLE_COUNT}次：{get_quantiles(update_elapsed)}')
+    await EnterpriseSuggestUtil.close_enterprise_suggest()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
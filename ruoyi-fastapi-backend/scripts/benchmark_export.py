@@ -0,0 +1,176 @@
+"""
+Excel导出内存占用的基准测试
+
+在SQLite数据库文件中写入指定数量的登录日志，分别以一次取回全部数据后经pandas生成内存中Excel的原导出方式
+及 LoginLogService.export_login_log_list_services（ExcelUtil.export_query2excel 以服务端游标分批读取并由
+ExcelStreamWriter 写入临时文件）导出，以tracemalloc记录导出期间的内存峰值，另在关闭tracemalloc时记录耗时，
+并校验两种方式导出文件的单元格内容逐行一致
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_export --rows 5000 50000
+"""
+
+import argparse
+import asyncio
+import io
+import sys
+import time
+import tracemalloc
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from openpyxl import load_workbook
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import Base
+from module_admin.dao.log_dao import LoginLogDao
+from module_admin.entity.do.log_do import SysLogininfor
+from module_admin.entity.vo.log_vo import LoginLogPageQueryModel
+from module_admin.service.log_service import LoginLogService
+from scripts.benchmark_util import create_session_maker, create_sqlite_engine
+from utils.excel_util import ExcelUtil
+
+INSERT_BATCH_SIZE = 5000
+
+
+async def seed_login_logs(session: AsyncSession, row_count: int) -> None:
+    """
+    清空并写入登录日志
+
+    :param session: 异步会话
+    :param row_count: 日志数
+    :return:
+    """
+    await session.execute(delete(SysLogininfor))
+    start_time = datetime(2024, 1, 1)
+    for batch_start in range(1, row_count + 1, INSERT_BATCH_SIZE):
+        await session.execute(
+            insert(SysLogininfor),
+            [
+                {
+                    'info_id': info_id,
+                    'user_name': f'user{info_id % 100}',
+                    'ipaddr': f'192.168.{info_id % 256}.{info_id % 251}',
+                    'login_location': '内网IP',
+                    'browser': 'Chrome 120',
+                    'os': 'Windows 10',
+                    'status': '0' if info_id % 10 else '1',
+                    'msg': '登录成功' if info_id % 10 else '密码错误',
+                    'login_time': start_time + timedelta(seconds=info_id),
+                }
+                for info_id in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, row_count + 1))
+            ],
+        )
+    await session.commit()
+
+
+async def export_legacy(session: AsyncSession) -> bytes:
+    """
+    原导出方式：一次取回全部登录日志并转换状态，再经pandas DataFrame在内存中生成Excel
+
+    :param session: 异步会话
+    :return: Excel文件内容
+    """
+    mapping_dict = {
+        'infoId': '访问编号',
+        'userName': '用户名称',
+        'ipaddr': '登录地址',
+        'loginLocation': '登录地点',
+        'browser': '浏览器',
+        'os': '操作系统',
+        'status': '登录状态',
+        'msg': '操作信息',
+        'loginTime': '登录日期',
+    }
+    login_log_list = await LoginLogDao.get_login_log_list(session, LoginLogPageQueryModel())
+    for item in login_log_list:
+        item['status'] = '成功' if item.get('status') == '0' else '失败'
+
+    return ExcelUtil.export_list2excel(login_log_list, mapping_dict)
+
+
+async def export_streaming(session: AsyncSession) -> bytes:
+    """
+    流式导出方式，与响应一致地逐块读取临时文件
+
+    :param session: 异步会话
+    :return: Excel文件内容
+    """
+    chunks = [
+        chunk async for chunk in await LoginLogService.export_login_log_list_services(session, LoginLogPageQueryModel())
+    ]
+
+    return b''.join(chunks)
+
+
+def read_cell_values(content: bytes) -> list[tuple[Any, ...]]:
+    """
+    读取Excel文件第一个工作表的全部单元格内容
+
+    :param content: Excel文件内容
+    :return: 各行单元格内容
+    """
+    workbook = load_workbook(io.BytesIO(content), read_only=True)
+    try:
+        return [tuple(row) for row in workbook.worksheets[0].iter_rows(values_only=True)]
+    finally:
+        workbook.close()
+
+
+async def measure(
+    session_maker: Callable[[], AsyncSession], export: Callable[[AsyncSession], Awaitable[bytes]]
+) -> tuple[bytes, float, float]:
+    """
+    执行一次导出并记录内存峰值，再执行一次导出并记录耗时
+
+    :param session_maker: 异步会话工厂
+    :param export: 导出方法
+    :return: (Excel文件内容, 内存峰值MiB, 耗时秒数)
+    """
+    tracemalloc.start()
+    try:
+        async with session_maker() as session:
+            content = await export(session)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    start = time.perf_counter()
+    async with session_maker() as session:
+        await export(session)
+    elapsed = time.perf_counter() - start
+
+    return content, peak / 1024 / 1024, elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='Excel导出内存占用基准测试')
+    parser.add_argument('--rows', type=int, nargs='+', default=[5000, 50000], help='导出行数，可指定多个')
+    args, _ = parser.parse_known_args()
+
+    async with create_sqlite_engine('benchmark_export.db') as engine:
+        session_maker = create_session_maker(engine)
+        async with session_maker() as session:
+            await session.run_sync(
+                lambda sync_session: Base.metadata.create_all(
+                    sync_session.connection(), tables=[SysLogininfor.__table__]
+                )
+            )
+        for row_count in args.rows:
+            async with session_maker() as session:
+                await seed_login_logs(session, row_count)
+            legacy_content, legacy_peak, legacy_elapsed = await measure(session_maker, export_legacy)
+            streaming_content, streaming_peak, streaming_elapsed = await measure(session_maker, export_streaming)
+            if read_cell_values(legacy_content) != read_cell_values(streaming_content):
+                print(f'❌️ {row_count}行：原导出方式与流式导出的单元格内容不一致')
+                return 1
+            print(
+                f'{row_count}行 pandas内存导出（原方式）：内存峰值{legacy_peak:.1f}MiB，耗时{legacy_elapsed:.2f}s；'
+                f'export_query2excel流式导出：内存峰值{streaming_peak:.1f}MiB，耗时{streaming_elapsed:.2f}s'
+            )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
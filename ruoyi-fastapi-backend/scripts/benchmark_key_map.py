@@ -0,0 +1,129 @@
+"""
+查询结果键名转换的基准测试
+
+在SQLite数据库文件中写入指定数量的操作日志，分别以模型对象、Row及字典形式取回全部结果，
+以逐键分割字符串的原转换方式及按模型类/Row字段组合缓存键名映射的 CamelCaseUtil.transform_result 转换为小驼峰形式，
+校验两者结果一致并输出每次转换全部结果的耗时分位数
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_key_map --rows 10000
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import Row, insert, select
+from sqlalchemy.orm.collections import InstrumentedList
+
+from config.database import Base
+from module_admin.entity.do.log_do import SysOperLog
+from scripts.benchmark_util import create_session_maker, create_sqlite_engine, get_quantiles
+from utils.common_util import CamelCaseUtil
+
+INSERT_BATCH_SIZE = 5000
+
+
+def legacy_base_to_dict(obj: Any) -> dict[str, Any]:
+    """
+    原模型对象及字典转换方式：复制__dict__后逐键分割字符串转换为小驼峰形式
+
+    :param obj: 模型对象或字典
+    :return: 字典结果
+    """
+    base_dict = obj.__dict__.copy() if isinstance(obj, Base) else obj.copy()
+    base_dict.pop('_sa_instance_state', None)
+    for name, value in base_dict.items():
+        if isinstance(value, InstrumentedList):
+            base_dict[name] = legacy_transform_result(value)
+    return {CamelCaseUtil.snake_to_camel(k): v for k, v in base_dict.items()}
+
+
+def legacy_transform_result(result: Any) -> Any:
+    """
+    原查询结果转换方式，Row先转换为字典再逐键分割字符串
+
+    :param result: sqlalchemy查询结果
+    :return: 转换后的结果
+    """
+    if isinstance(result, (Base, dict)):
+        return legacy_base_to_dict(result)
+    if isinstance(result, list):
+        return [legacy_transform_result(row) for row in result]
+    if isinstance(result, Row):
+        if all(isinstance(row, Base) for row in result):
+            return [legacy_base_to_dict(row) for row in result]
+        if any(isinstance(row, Base) for row in result):
+            return [legacy_transform_result(row) for row in result]
+        return {CamelCaseUtil.snake_to_camel(k): v for k, v in result._asdict().items()}
+    return result
+
+
+def measure(transform: Callable[[Any], Any], result: list[Any], repeat: int) -> tuple[Any, list[float]]:
+    """
+    多次转换全部结果并记录耗时
+
+    :param transform: 转换方法
+    :param result: 查询结果列表
+    :param repeat: 转换次数
+    :return: (转换后的结果, 各次耗时毫秒列表)
+    """
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        transformed = transform(result)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+    return transformed, elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='查询结果键名转换基准测试')
+    parser.add_argument('--rows', type=int, default=10000, help='结果行数')
+    parser.add_argument('--repeat', type=int, default=30, help='每种转换的执行次数')
+    args, _ = parser.parse_known_args()
+
+    start_time = datetime(2024, 1, 1)
+    async with create_sqlite_engine('benchmark_key_map.db') as engine:
+        session_maker = create_session_maker(engine)
+        async with session_maker() as session:
+            await session.run_sync(
+                lambda sync_session: Base.metadata.create_all(sync_session.connection(), tables=[SysOperLog.__table__])
+            )
+            for batch_start in range(1, args.rows + 1, INSERT_BATCH_SIZE):
+                await session.execute(
+                    insert(SysOperLog),
+                    [
+                        {
+                            'oper_id': oper_id,
+                            'title': f'模块{oper_id % 20}',
+                            'business_type': oper_id % 4,
+                            'oper_name': f'user{oper_id % 100}',
+                            'oper_url': '/system/user',
+                            'status': 0,
+                            'oper_time': start_time + timedelta(seconds=oper_id),
+                            'cost_time': oper_id % 50,
+                        }
+                        for oper_id in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, args.rows + 1))
+                    ],
+                )
+            await session.commit()
+            orm_result = list((await session.execute(select(SysOperLog))).scalars().all())
+            row_result = list((await session.execute(select(*SysOperLog.__table__.columns))).all())
+        dict_result = [row._asdict() for row in row_result]
+        for result_name, result in (('模型对象', orm_result), ('Row', row_result), ('字典', dict_result)):
+            legacy_transformed, legacy_elapsed = measure(legacy_transform_result, result, args.repeat)
+            transformed, elapsed = measure(CamelCaseUtil.transform_result, result, args.repeat)
+            if legacy_transformed != transformed:
+                print(f'❌️ {result_name}：原转换方式与缓存键名映射的转换结果不一致')
+                return 1
+            print(f'{args.rows}行{result_name} 逐键分割（原方式）：{get_quantiles(legacy_elapsed)}')
+            print(f'{args.rows}行{result_name} 缓存键名映射：{get_quantiles(elapsed)}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,112 @@
+"""
+登录风暴下其他接口延迟的基准测试
+
+以最小的FastAPI应用模拟登录接口（校验bcrypt密码）及普通接口，在同一事件循环中并发发起指定数量的登录请求，
+同时持续请求普通接口，分别测试在事件循环中直接校验密码（原方式）及 PwdUtil.verify_password_async 在专用线程池中校验密码时
+普通接口的延迟分位数及全部登录的完成耗时
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_login_storm --logins 100
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+import bcrypt
+import httpx
+from fastapi import FastAPI
+
+from config.env import AppConfig
+from scripts.benchmark_util import get_quantiles
+from utils.pwd_util import PwdUtil
+
+PLAIN_PASSWORD = 'admin123'
+# 普通接口的请求间隔（单位：秒）
+PING_INTERVAL = 0.005
+
+
+def create_app(hashed_password: str, use_executor: bool) -> FastAPI:
+    """
+    创建包含登录接口及普通接口的应用
+
+    :param hashed_password: 用户密码的bcrypt哈希
+    :param use_executor: 是否在专用线程池中校验密码，否则在事件循环中直接校验
+    :return: 应用对象
+    """
+    app = FastAPI()
+
+    @app.post('/login')
+    async def login() -> dict[str, bool]:
+        if use_executor:
+            verified = await PwdUtil.verify_password_async(PLAIN_PASSWORD, hashed_password)
+        else:
+            verified = PwdUtil.verify_password(PLAIN_PASSWORD, hashed_password)
+        return {'verified': verified}
+
+    @app.get('/ping')
+    async def ping() -> dict[str, bool]:
+        return {'ok': True}
+
+    return app
+
+
+async def run_storm(app: FastAPI, login_count: int) -> tuple[list[float], float]:
+    """
+    并发发起登录请求，并在全部登录完成前持续请求普通接口
+
+    :param app: 应用对象
+    :param login_count: 并发登录数
+    :return: (普通接口各次耗时毫秒列表, 全部登录的完成耗时秒数)
+    """
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url='http://benchmark') as client:
+        await client.get('/ping')
+        storm_done = asyncio.Event()
+        ping_elapsed: list[float] = []
+
+        async def probe() -> None:
+            # 按固定间隔计划发出请求，耗时自计划发出时刻起计算，事件循环被阻塞期间的等待同样计入延迟
+            scheduled_at = time.perf_counter()
+            while not storm_done.is_set():
+                await asyncio.sleep(max(scheduled_at - time.perf_counter(), 0))
+                await client.get('/ping')
+                ping_elapsed.append((time.perf_counter() - scheduled_at) * 1000)
+                scheduled_at = max(scheduled_at + PING_INTERVAL, time.perf_counter())
+
+        probe_task = asyncio.create_task(probe())
+        # 让普通接口先发出请求，使登录开始前已有延迟样本
+        await asyncio.sleep(PING_INTERVAL)
+        start = time.perf_counter()
+        responses = await asyncio.gather(*[client.post('/login') for _ in range(login_count)])
+        storm_elapsed = time.perf_counter() - start
+        storm_done.set()
+        await probe_task
+    if not all(response.json()['verified'] for response in responses):
+        raise RuntimeError('存在密码校验失败的登录请求')
+
+    return ping_elapsed, storm_elapsed
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='登录风暴下其他接口延迟基准测试')
+    parser.add_argument('--logins', type=int, default=100, help='并发登录数')
+    parser.add_argument('--rounds', type=int, default=10, help='bcrypt加密轮数（生产环境默认12）')
+    parser.add_argument('--workers', type=int, default=AppConfig.app_pwd_hash_workers, help='密码运算线程池大小')
+    args, _ = parser.parse_known_args()
+
+    AppConfig.app_pwd_hash_workers = args.workers
+    hashed_password = bcrypt.hashpw(PLAIN_PASSWORD.encode('utf-8'), bcrypt.gensalt(args.rounds)).decode('utf-8')
+    print(f'{args.logins}个并发登录，bcrypt轮数{args.rounds}，密码运算线程池大小{args.workers}')
+    for mode_name, use_executor in (('事件循环中校验（原方式）', False), ('专用线程池中校验', True)):
+        ping_elapsed, storm_elapsed = await run_storm(create_app(hashed_password, use_executor), args.logins)
+        print(
+            f'{mode_name}：登录全部完成耗时{storm_elapsed:.2f}s，期间普通接口请求{len(ping_elapsed)}次，'
+            f'{get_quantiles(ping_elapsed)}'
+        )
+    PwdUtil.shutdown_executor()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
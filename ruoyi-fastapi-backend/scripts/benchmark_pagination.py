@@ -0,0 +1,127 @@
+"""
+深度翻页的基准测试
+
+在SQLite数据库文件中写入指定数量的操作日志，以 OperationLogDao.get_operation_log_list 分别按页码分页（OFFSET及COUNT）
+及游标分页（keyset）查询第1页与指定深度页，校验两种方式在同一页返回的数据一致，输出每次查询执行的语句数及耗时分位数。
+游标分页的深度页游标由一次取回前序全部数据的查询得到，对应用户逐页翻到该页时持有的nextCursor
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_pagination --logs 200000 --page 10000
+"""
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import Base
+from module_admin.dao.log_dao import OperationLogDao
+from module_admin.entity.do.log_do import SysOperLog
+from module_admin.entity.vo.log_vo import OperLogPageQueryModel
+from scripts.benchmark_util import count_statements, create_session_maker, create_sqlite_engine, get_quantiles
+
+PAGE_SIZE = 10
+INSERT_BATCH_SIZE = 5000
+
+
+async def seed_logs(session: AsyncSession, log_count: int) -> None:
+    """
+    建表并写入操作日志，操作时间逐条递增
+
+    :param session: 异步会话
+    :param log_count: 日志数
+    :return:
+    """
+    await session.run_sync(
+        lambda sync_session: Base.metadata.create_all(sync_session.connection(), tables=[SysOperLog.__table__])
+    )
+    start_time = datetime(2024, 1, 1)
+    for batch_start in range(1, log_count + 1, INSERT_BATCH_SIZE):
+        await session.execute(
+            insert(SysOperLog),
+            [
+                {
+                    'oper_id': oper_id,
+                    'title': f'模块{oper_id % 20}',
+                    'business_type': oper_id % 4,
+                    'oper_name': f'user{oper_id % 100}',
+                    'oper_url': '/system/user',
+                    'oper_param': '{}',
+                    'json_result': '{"code": 200}',
+                    'status': 0,
+                    'oper_time': start_time + timedelta(seconds=oper_id),
+                    'cost_time': oper_id % 50,
+                }
+                for oper_id in range(batch_start, min(batch_start + INSERT_BATCH_SIZE, log_count + 1))
+            ],
+        )
+    await session.commit()
+
+
+def get_query_object(page_num: int, page_mode: str, cursor: Optional[str] = None) -> OperLogPageQueryModel:
+    """
+    构造按操作时间降序的操作日志分页查询参数
+
+    :param page_num: 当前页码
+    :param page_mode: 分页方式
+    :param cursor: 游标分页时上一页返回的nextCursor
+    :return: 查询参数对象
+    """
+    return OperLogPageQueryModel(pageNum=page_num, pageSize=PAGE_SIZE, pageMode=page_mode, cursor=cursor)
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='深度翻页基准测试')
+    parser.add_argument('--logs', type=int, default=200000, help='操作日志数')
+    parser.add_argument('--page', type=int, default=10000, help='深度页的页码')
+    parser.add_argument('--repeat', type=int, default=50, help='每种查询的执行次数')
+    args, _ = parser.parse_known_args()
+
+    if args.page * PAGE_SIZE > args.logs:
+        print(f'❌️ 操作日志数不足{args.page}页，请增大 --logs')
+        return 1
+    async with create_sqlite_engine('benchmark_pagination.db') as engine:
+        session_maker = create_session_maker(engine)
+        async with session_maker() as session:
+            await seed_logs(session, args.logs)
+        async with session_maker() as session:
+            # 一次取回前序全部数据，得到逐页翻到深度页时持有的游标
+            previous_pages = await OperationLogDao.get_operation_log_list(
+                session,
+                OperLogPageQueryModel(pageSize=(args.page - 1) * PAGE_SIZE, pageMode='keyset'),
+                is_page=True,
+            )
+            session.expunge_all()
+            cases = [
+                ('页码分页 第1页', get_query_object(1, 'offset')),
+                (f'页码分页 第{args.page}页', get_query_object(args.page, 'offset')),
+                ('游标分页 第1页', get_query_object(1, 'keyset')),
+                (f'游标分页 第{args.page}页', get_query_object(args.page, 'keyset', previous_pages.next_cursor)),
+            ]
+            page_rows: dict[str, list] = {}
+            for case_name, query_object in cases:
+                elapsed, statement_counts = [], []
+                for _ in range(args.repeat):
+                    with count_statements(engine) as statements:
+                        start = time.perf_counter()
+                        page = await OperationLogDao.get_operation_log_list(session, query_object, is_page=True)
+                        elapsed.append((time.perf_counter() - start) * 1000)
+                    statement_counts.append(len(statements))
+                    session.expunge_all()
+                page_rows[case_name] = [row['operId'] for row in page.rows]
+                print(f'{case_name}：每次{statistics.mean(statement_counts):.0f}条语句，{get_quantiles(elapsed)}')
+            for offset_case, keyset_case in ((cases[0], cases[2]), (cases[1], cases[3])):
+                if page_rows[offset_case[0]] != page_rows[keyset_case[0]]:
+                    print(f'❌️ {offset_case[0]}与{keyset_case[0]}返回的数据不一致')
+                    return 1
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,186 @@
+"""
+响应序列化的基准测试
+
+构造指定行数的项目分页响应内容及覆盖各类特殊类型的响应内容，分别以 JSONResponse(jsonable_encoder(...))（原方式）
+及 OrjsonResponse 序列化，校验两者输出的响应体逐字节一致，并输出分页响应内容每次序列化的耗时分位数
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_response_encoding --rows 10000
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from datetime import time as dt_time
+from decimal import Decimal
+from typing import Any, Callable
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from common.constant import HttpStatusConstant
+from common.enums import BusinessType
+from common.vo import PageModel
+from module_admin.entity.vo.project_vo import ProjectModel
+from scripts.benchmark_util import get_quantiles
+from utils.response_util import OrjsonResponse
+
+
+@dataclass
+class DataclassContent:
+    name: str
+    created_at: datetime
+
+
+def get_page_content(row_count: int) -> dict[str, Any]:
+    """
+    构造与 ResponseUtil.success(model_content=项目分页对象) 一致的项目分页响应内容
+
+    :param row_count: 项目行数
+    :return: 响应内容
+    """
+    rng = random.Random(0)
+    start_time = datetime(2024, 1, 1, 8, 30, 15, 123456)
+    rows = [
+        ProjectModel(
+            pro_id=pro_id,
+            project_code=f'XM{pro_id:08d}',
+            project_name=f'某某单位第{pro_id}号工程造价咨询项目',
+            project_type='研发项目',
+            ent_id=rng.randint(1, 500),
+            ent_name=f'企业{pro_id % 500}',
+            project_manager=f'负责人{pro_id % 30}',
+            coordinator='张三,李四',
+            contract_amount=round(rng.uniform(1000, 10000000), 2),
+            settlement_submitted=round(rng.uniform(0, 100000), 2),
+            invoice_date=start_time + timedelta(days=pro_id % 365),
+            payment_recovery_rate=round(rng.random(), 4),
+            remarks=None,
+            start_date=start_time,
+            end_date=start_time + timedelta(days=180),
+            prefect_status=f'0{pro_id % 9 + 1}',
+            create_time=start_time,
+            update_time=start_time + timedelta(seconds=pro_id),
+        ).model_dump(by_alias=True)
+        for pro_id in range(1, row_count + 1)
+    ]
+    page = PageModel[Any](rows=rows, pageNum=1, pageSize=row_count, total=row_count * 3, hasNext=True)
+
+    return {
+        'code': HttpStatusConstant.SUCCESS,
+        'msg': '查询成功',
+        **page.model_dump(by_alias=True),
+        'success': True,
+        'time': start_time,
+    }
+
+
+def get_edge_case_contents() -> list[tuple[str, Any]]:
+    """
+    构造覆盖 _orjson_default 各分支及orjson原生类型的响应内容
+
+    :return: (内容说明, 响应内容)列表
+    """
+    moment = datetime(2024, 2, 29, 23, 59, 59, 999999)
+    return [
+        ('日期时间', {'datetime': moment, 'date': date(2024, 2, 29), 'time': dt_time(8, 0, 1), 'whole': datetime(2024, 1, 1)}),
+        ('Decimal', {'int': Decimal('12'), 'scaled': Decimal('12.50'), 'small': Decimal('0.1'), 'negative': Decimal('-3')}),
+        ('浮点数', [0.1, 1.5, -2.25, 123456789.123, 0.0001, 1e15, 3.0]),
+        ('枚举及dataclass', {'enum': BusinessType.INSERT, 'dataclass': DataclassContent('名称', moment)}),
+        ('pydantic模型', {'page': PageModel[Any](rows=[{'a': 1}], pageNum=1, pageSize=10, total=1, hasNext=False)}),
+        ('非字符串键', {1: 'int', 2.5: 'float', False: 'bool', None: 'none'}),
+        ('集合及序列', {'set': {1}, 'frozenset': frozenset({'a'}), 'tuple': (1, 2), 'deque': deque([3, 4])}),
+        ('生成器及bytes', {'generator': (i for i in range(3)), 'bytes': b'abc'}),
+        ('非ASCII及转义字符', {'中文': '造价"咨询"\\项目\n\t', 'emoji': '✅️', 'control': '\x01\x1f'}),
+        ('空值及嵌套', {'none': None, 'empty': {}, 'list': [], 'nested': [[{'a': [None, True, False]}]]}),
+    ]  # fmt: skip
+
+
+def get_exponent_float_content() -> list[float]:
+    """
+    构造json.dumps以科学计数法输出的浮点数：json.dumps输出2.5e-05、1e+16，orjson输出0.000025、1e16，数值相同但字节不同
+
+    :return: 响应内容
+    """
+    return [1e-7, 2.5e-5, 1e16, -3.2e20]
+
+
+def render_legacy(content: Any) -> bytes:
+    """
+    原序列化方式：先经过jsonable_encoder递归转换，再由JSONResponse以json.dumps序列化
+
+    :param content: 响应内容
+    :return: 响应体
+    """
+    return JSONResponse(content=jsonable_encoder(content)).body
+
+
+def render_orjson(content: Any) -> bytes:
+    """
+    OrjsonResponse序列化方式
+
+    :param content: 响应内容
+    :return: 响应体
+    """
+    return OrjsonResponse(content=content).body
+
+
+def measure(render: Callable[[Any], bytes], content: Any, repeat: int) -> tuple[bytes, list[float]]:
+    """
+    多次序列化响应内容并记录耗时
+
+    :param render: 序列化方法
+    :param content: 响应内容
+    :param repeat: 序列化次数
+    :return: (响应体, 各次耗时毫秒列表)
+    """
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        body = render(content)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+    return body, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='响应序列化基准测试')
+    parser.add_argument('--rows', type=int, default=10000, help='分页响应的项目行数')
+    parser.add_argument('--repeat', type=int, default=20, help='每种序列化方式的执行次数')
+    args, _ = parser.parse_known_args()
+
+    failed = False
+    for content_name, content in get_edge_case_contents():
+        # 生成器只能迭代一次，每种方式分别构造
+        legacy_body = render_legacy(dict(get_edge_case_contents())[content_name])
+        orjson_body = render_orjson(content)
+        if legacy_body != orjson_body:
+            print(f'❌️ {content_name}：响应体不一致\n  原方式：{legacy_body!r}\n  orjson：{orjson_body!r}')
+            failed = True
+    exponent_content = get_exponent_float_content()
+    if json.loads(render_legacy(exponent_content)) != json.loads(render_orjson(exponent_content)):
+        print('❌️ 小于1e-4或不小于1e16的浮点数：解析后的数值不一致')
+        failed = True
+    if failed:
+        return 1
+    print('✅️ 特殊类型响应内容的响应体逐字节一致，小于1e-4或不小于1e16的浮点数仅写法不同，解析后数值一致')
+
+    page_content = get_page_content(args.rows)
+    legacy_body, legacy_elapsed = measure(render_legacy, page_content, args.repeat)
+    orjson_body, orjson_elapsed = measure(render_orjson, page_content, args.repeat)
+    if legacy_body != orjson_body:
+        print(f'❌️ {args.rows}行项目分页响应的响应体不一致')
+        return 1
+    print(f'{args.rows}行项目分页响应（{len(orjson_body) / 1024 / 1024:.1f}MB），响应体逐字节一致')
+    print(f'JSONResponse(jsonable_encoder(...))（原方式）：{get_quantiles(legacy_elapsed)}')
+    print(f'OrjsonResponse：{get_quantiles(orjson_elapsed)}')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+"""
+项目名称关键字搜索的基准测试
+
+在SQLite数据库文件中写入指定行数的项目，分别以LIKE全表扫描及FTS5 trigram全文索引（SearchUtil构造的本地测试后端）
+执行项目列表的关键字搜索（统计总数并按相关度取第一页），输出各关键字的匹配行数及耗时分位数。
+MySQL ngram FULLTEXT索引及PostgreSQL pg_trgm索引的加速效果与此类似，需在对应数据库上另行验证
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_search --rows 1000000
+"""
+
+import argparse
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Union
+
+from sqlalchemy import BigInteger, ColumnElement, Connection, create_engine, func, insert, select, text
+from sqlalchemy.ext.compiler import compiles
+
+from module_admin.entity.do.project_do import Project
+from utils.search_util import SearchUtil
+
+# 项目名称由以下词语随机组合而成
+NAME_WORDS = [
+    '城区', '新区', '幼儿园', '中学', '小学', '医院', '道路', '桥梁', '绿化', '管网', '排水', '供热', '老旧小区',
+    '改造', '提升', '新建', '扩建', '维修', '整治', '工程', '项目', '一期', '二期', '三期', '综合', '配套',
+]  # fmt: skip
+NAME_WORD_COUNT = 4
+# 不同选择性的搜索关键字
+SEARCH_KEYWORDS = ['幼儿园改造', '老旧小区', '桥梁维修一期', '供热管网', '项目编号不存在']
+INSERT_BATCH_SIZE = 50000
+PAGE_SIZE = 10
+
+
+@compiles(BigInteger, 'sqlite')
+def compile_big_integer(type_: BigInteger, compiler: Any, **kw: Any) -> str:
+    # SQLite仅INTEGER PRIMARY KEY自增，BigInteger主键按INTEGER建表
+    return 'INTEGER'
+
+
+def seed_projects(connection: Connection, row_count: int) -> None:
+    """
+    建表并写入样例项目，并创建全文索引对应的FTS5虚拟表
+
+    :param connection: SQLite数据库连接
+    :param row_count: 写入行数
+    :return:
+    """
+    rng = random.Random(0)
+    Project.metadata.create_all(connection, tables=[Project.__table__])
+    for start in range(1, row_count + 1, INSERT_BATCH_SIZE):
+        connection.execute(
+            insert(Project),
+            [
+                {
+                    'pro_id': pro_id,
+                    'project_code': f'XM{pro_id:08d}',
+                    'project_name': ''.join(rng.sample(NAME_WORDS, NAME_WORD_COUNT)),
+                    'del_flag': '0',
+                }
+                for pro_id in range(start, min(start + INSERT_BATCH_SIZE, row_count + 1))
+            ],
+        )
+    SearchUtil.create_sqlite_search_tables(connection, Project.__table__)
+    connection.execute(text('ANALYZE'))
+
+
+def run_search(connection: Connection, keyword: str, use_index: bool) -> int:
+    """
+    执行一次项目列表关键字搜索：统计总数并取第一页
+
+    :param connection: SQLite数据库连接
+    :param keyword: 关键字
+    :param use_index: 是否使用全文索引，否则使用LIKE查询
+    :return: 匹配行数
+    """
+    condition: Union[ColumnElement[bool], bool]
+    if use_index:
+        condition, relevance = SearchUtil.get_keyword_search('sqlite', Project.project_name, keyword)
+    else:
+        condition, relevance = Project.project_name.contains(keyword, autoescape=True), None
+    query = select(Project.pro_id).where(Project.del_flag == '0', condition)
+    total = connection.execute(select(func.count()).select_from(query.subquery())).scalar_one()
+    order_by = [relevance.desc()] if relevance is not None else []
+    connection.execute(query.order_by(*order_by, Project.create_time.desc()).limit(PAGE_SIZE)).all()
+
+    return total
+
+
+def measure(connection: Connection, keyword: str, use_index: bool, repeat: int) -> tuple[int, list[float]]:
+    """
+    多次执行搜索并记录耗时
+
+    :param connection: SQLite数据库连接
+    :param keyword: 关键字
+    :param use_index: 是否使用全文索引
+    :param repeat: 执行次数
+    :return: (匹配行数, 各次耗时毫秒列表)
+    """
+    total = run_search(connection, keyword, use_index)
+    elapsed = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        run_search(connection, keyword, use_index)
+        elapsed.append((time.perf_counter() - start) * 1000)
+
+    return total, elapsed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='项目名称关键字搜索基准测试')
+    parser.add_argument('--rows', type=int, default=1000000, help='样例项目行数')
+    parser.add_argument('--repeat', type=int, default=5, help='每个关键字的执行次数')
+    args, _ = parser.parse_known_args()
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_engine(f'sqlite:///{Path(temp_dir) / "benchmark_search.db"}')
+        with engine.begin() as connection:
+            start = time.perf_counter()
+            seed_projects(connection, args.rows)
+            print(f'写入{args.rows}行项目及全文索引耗时{time.perf_counter() - start:.1f}s')
+        with engine.connect() as connection:
+            print(f'{"关键字":<12}{"匹配行数":>10}{"LIKE p50":>12}{"LIKE p95":>12}{"索引 p50":>12}{"索引 p95":>12}')
+            for keyword in SEARCH_KEYWORDS:
+                like_total, like_elapsed = measure(connection, keyword, False, args.repeat)
+                index_total, index_elapsed = measure(connection, keyword, True, args.repeat)
+                if like_total != index_total:
+                    print(f'❌️ {keyword}：LIKE匹配{like_total}行，全文索引匹配{index_total}行')
+                    return 1
+                like_quantiles = statistics.quantiles(like_elapsed, n=20, method='inclusive')
+                index_quantiles = statistics.quantiles(index_elapsed, n=20, method='inclusive')
+                print(
+                    f'{keyword:<12}{like_total:>10}{like_quantiles[9]:>10.1f}ms{like_quantiles[18]:>10.1f}ms'
+                    f'{index_quantiles[9]:>10.1f}ms{index_quantiles[18]:>10.1f}ms'
+                )
+        engine.dispose()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
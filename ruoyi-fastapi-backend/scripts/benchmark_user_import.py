@@ -0,0 +1,282 @@
+"""
+用户批量导入的基准测试
+
+在SQLite数据库文件中写入部门及已存在的用户，生成指定行数的用户导入文件（半数登录名称已存在），以非超级管理员的部门数据权限
+分别执行逐行查询、加密及写入的原导入方式和 UserService.batch_import_user_services 的分批导入，均允许更新已存在的用户，
+校验两种方式导入后的用户数据及提示信息一致，并输出各行数下的导入耗时。
+原方式逐行以bcrypt加密初始密码，耗时随行数线性增长，仅以 --legacy-rows 指定的行数执行。
+使用进程内的fakeredis写入 sys.user.initPassword 参数（123456），导入完成后清除被更新用户的登录信息缓存同样只作用于fakeredis，不读写配置文件中的Redis
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_user_import --rows 200 5000 --legacy-rows 200
+"""
+
+import argparse
+import asyncio
+import io
+import random
+import sys
+import time
+from datetime import datetime
+from typing import Any
+
+import pandas as pd
+from fastapi import FastAPI, Request, UploadFile
+from sqlalchemy import ColumnElement, delete, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.enums import RedisInitKeyConfig
+from config.database import Base
+from exceptions.exception import ServiceException
+from module_admin.dao.user_dao import UserDao
+from module_admin.entity.do.dept_do import SysDept, SysDeptClosure
+from module_admin.entity.do.user_do import SysUser
+from module_admin.entity.vo.user_vo import CurrentUserModel, UserInfoModel, UserModel
+from module_admin.service.config_service import ConfigService
+from module_admin.service.dept_service import DeptService
+from module_admin.service.user_cache_service import UserCacheService
+from module_admin.service.user_service import UserService
+from scripts.benchmark_util import create_fake_redis, create_session_maker, create_sqlite_engine
+from utils.pwd_util import PwdUtil
+
+DEPT_COUNT = 20
+# 当前用户数据权限内的部门数，导入数据均属于这些部门
+ALLOWED_DEPT_COUNT = 15
+# 当前导入用户的用户id，用户1为超级管理员
+IMPORTER_USER_ID = 2
+INSERT_BATCH_SIZE = 5000
+USER_COMPARE_COLUMNS = [
+    SysUser.user_name,
+    SysUser.dept_id,
+    SysUser.nick_name,
+    SysUser.email,
+    SysUser.phonenumber,
+    SysUser.sex,
+    SysUser.status,
+]
+
+
+async def seed_users(session: AsyncSession, existing_user_names: list[str]) -> None:
+    """
+    清空并写入部门、导入用户及已存在的用户
+
+    :param session: 异步会话
+    :param existing_user_names: 已存在用户的登录名称列表
+    :return:
+    """
+    await session.execute(delete(SysUser))
+    await session.execute(delete(SysDept))
+    await session.execute(
+        insert(SysDept),
+        [
+            {'dept_id': dept_id, 'parent_id': 0, 'ancestors': '0', 'dept_name': f'部门{dept_id}', 'status': '0',
+             'del_flag': '0'}
+            for dept_id in range(1, DEPT_COUNT + 1)
+        ],
+    )  # fmt: skip
+    user_rows = [{'user_id': IMPORTER_USER_ID, 'dept_id': 1, 'user_name': 'importer', 'nick_name': '导入用户'}] + [
+        {'user_id': user_id, 'dept_id': user_id % ALLOWED_DEPT_COUNT + 1, 'user_name': user_name, 'nick_name': '原名称'}
+        for user_id, user_name in enumerate(existing_user_names, start=IMPORTER_USER_ID + 1)
+    ]
+    for index in range(0, len(user_rows), INSERT_BATCH_SIZE):
+        await session.execute(
+            insert(SysUser),
+            [{**row, 'status': '0', 'del_flag': '0'} for row in user_rows[index : index + INSERT_BATCH_SIZE]],
+        )
+    await session.commit()
+
+
+def get_import_file_content(row_count: int) -> tuple[bytes, list[str]]:
+    """
+    生成用户导入文件，偶数行的登录名称为已存在的用户
+
+    :param row_count: 导入行数
+    :return: (导入文件内容, 已存在用户的登录名称列表)
+    """
+    rng = random.Random(0)
+    user_names = [f'import{row_index}' for row_index in range(row_count)]
+    df = pd.DataFrame(
+        {
+            '部门编号': [rng.randint(1, ALLOWED_DEPT_COUNT) for _ in user_names],
+            '登录名称': user_names,
+            '用户名称': [f'导入用户{row_index}' for row_index in range(row_count)],
+            '用户邮箱': [f'{user_name}@example.com' for user_name in user_names],
+            '手机号码': [13800000000 + row_index for row_index in range(row_count)],
+            '用户性别': [rng.choice(['男', '女', '未知']) for _ in user_names],
+            '帐号状态': [rng.choice(['正常', '停用']) for _ in user_names],
+        }
+    )
+    binary_data = io.BytesIO()
+    df.to_excel(binary_data, index=False, engine='openpyxl')
+
+    return binary_data.getvalue(), user_names[::2]
+
+
+async def batch_import_user_legacy(
+    request: Request,
+    query_db: AsyncSession,
+    file: UploadFile,
+    current_user: CurrentUserModel,
+    user_data_scope_sql: ColumnElement,
+    dept_data_scope_sql: ColumnElement,
+) -> str:
+    """
+    原导入方式：逐行读取初始密码并加密、查询用户是否存在、校验数据权限并单条写入，已存在的用户均更新
+
+    :param request: Request对象
+    :param query_db: orm对象
+    :param file: 用户导入文件对象
+    :param current_user: 当前用户对象
+    :param user_data_scope_sql: 用户数据权限sql
+    :param dept_data_scope_sql: 部门数据权限sql
+    :return: 导入提示信息
+    """
+    header_dict = {
+        '部门编号': 'dept_id',
+        '登录名称': 'user_name',
+        '用户名称': 'nick_name',
+        '用户邮箱': 'email',
+        '手机号码': 'phonenumber',
+        '用户性别': 'sex',
+        '帐号状态': 'status',
+    }
+    df = pd.read_excel(io.BytesIO(await file.read()))
+    await file.close()
+    df.rename(columns=header_dict, inplace=True)
+    edit_user_id_list = []
+    for _index, row in df.iterrows():
+        row['sex'] = {'男': '0', '女': '1', '未知': '2'}.get(row['sex'], row['sex'])
+        row['status'] = {'正常': '0', '停用': '1'}.get(row['status'], row['status'])
+        add_user = UserModel(
+            deptId=row['dept_id'],
+            userName=row['user_name'],
+            password=await PwdUtil.get_password_hash_async(
+                await ConfigService.query_config_list_from_cache_services(
+                    request.app.state.redis, 'sys.user.initPassword'
+                )
+            ),
+            nickName=row['nick_name'],
+            email=row['email'],
+            phonenumber=str(row['phonenumber']),
+            sex=row['sex'],
+            status=row['status'],
+            createBy=current_user.user.user_name,
+            createTime=datetime.now(),
+            updateBy=current_user.user.user_name,
+            updateTime=datetime.now(),
+        )
+        user_info = await UserDao.get_user_by_info(query_db, UserModel(userName=row['user_name']))
+        if user_info:
+            edit_user_model = UserModel(
+                userId=user_info.user_id,
+                deptId=row['dept_id'],
+                userName=row['user_name'],
+                nickName=row['nick_name'],
+                email=row['email'],
+                phonenumber=str(row['phonenumber']),
+                sex=row['sex'],
+                status=row['status'],
+                updateBy=current_user.user.user_name,
+                updateTime=datetime.now(),
+            )
+            edit_user_model.validate_fields()
+            await UserService.check_user_allowed_services(edit_user_model)
+            await UserService.check_user_data_scope_services(query_db, edit_user_model.user_id, user_data_scope_sql)
+            await DeptService.check_dept_data_scope_services(query_db, edit_user_model.dept_id, dept_data_scope_sql)
+            await UserDao.edit_user_dao(query_db, edit_user_model.model_dump(exclude_unset=True))
+            edit_user_id_list.append(edit_user_model.user_id)
+        else:
+            add_user.validate_fields()
+            await DeptService.check_dept_data_scope_services(query_db, add_user.dept_id, dept_data_scope_sql)
+            await UserDao.add_user_dao(query_db, add_user)
+    await query_db.commit()
+    await UserCacheService.clear_user_cache_services(request, edit_user_id_list)
+
+    return ''
+
+
+async def run_import(
+    session: AsyncSession, request: Request, content: bytes, current_user: CurrentUserModel, use_legacy: bool
+) -> tuple[str, float, list[Any]]:
+    """
+    执行一次导入并记录耗时及导入后的用户数据
+
+    :param session: 异步会话
+    :param request: Request对象
+    :param content: 导入文件内容
+    :param current_user: 当前用户对象
+    :param use_legacy: 是否使用原导入方式
+    :return: (导入提示信息, 耗时秒数, 导入后的用户数据)
+    """
+    allowed_dept_ids = list(range(1, ALLOWED_DEPT_COUNT + 1))
+    user_data_scope_sql = SysUser.dept_id.in_(allowed_dept_ids)
+    dept_data_scope_sql = SysDept.dept_id.in_(allowed_dept_ids)
+    file = UploadFile(file=io.BytesIO(content), filename='user.xlsx')
+    start = time.perf_counter()
+    if use_legacy:
+        message = await batch_import_user_legacy(
+            request, session, file, current_user, user_data_scope_sql, dept_data_scope_sql
+        )
+    else:
+        message = (
+            await UserService.batch_import_user_services(
+                request, session, file, True, current_user, user_data_scope_sql, dept_data_scope_sql
+            )
+        ).message
+    elapsed = time.perf_counter() - start
+    users = (await session.execute(select(*USER_COMPARE_COLUMNS).order_by(SysUser.user_name))).all()
+
+    return message, elapsed, users
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='用户批量导入基准测试')
+    parser.add_argument('--rows', type=int, nargs='+', default=[200, 5000], help='分批导入的行数，可指定多个')
+    parser.add_argument('--legacy-rows', type=int, default=200, help='同时以原导入方式执行的行数，0表示不执行')
+    args, _ = parser.parse_known_args()
+
+    app = FastAPI()
+    redis = create_fake_redis()
+    app.state.redis = redis
+    request = Request({'type': 'http', 'app': app, 'headers': []})
+    init_password_key = f'{RedisInitKeyConfig.SYS_CONFIG.key}:sys.user.initPassword'
+    await redis.set(init_password_key, '123456')
+    current_user = CurrentUserModel(
+        permissions=['system:user:import'],
+        roles=['importer'],
+        user=UserInfoModel(userId=IMPORTER_USER_ID, deptId=1, userName='importer', admin=False),
+    )
+    try:
+        async with create_sqlite_engine('benchmark_user_import.db') as engine:
+            session_maker = create_session_maker(engine)
+            async with session_maker() as session:
+                await session.run_sync(
+                    lambda sync_session: Base.metadata.create_all(
+                        sync_session.connection(),
+                        tables=[SysUser.__table__, SysDept.__table__, SysDeptClosure.__table__],
+                    )
+                )
+            for row_count in sorted({*args.rows, *([args.legacy_rows] if args.legacy_rows else [])}):
+                content, existing_user_names = get_import_file_content(row_count)
+                results = {}
+                for mode_name, use_legacy in (('逐行导入（原方式）', True), ('分批导入', False)):
+                    if use_legacy and row_count != args.legacy_rows:
+                        continue
+                    async with session_maker() as session:
+                        await seed_users(session, existing_user_names)
+                        results[mode_name] = await run_import(session, request, content, current_user, use_legacy)
+                    print(f'{row_count}行 {mode_name}：耗时{results[mode_name][1]:.2f}s')
+                if len(results) > 1 and len({(message, tuple(users)) for message, _, users in results.values()}) > 1:
+                    print(f'❌️ {row_count}行：原导入方式与分批导入的用户数据或提示信息不一致')
+                    return 1
+    except ServiceException as e:
+        print(f'❌️ 导入失败：{e.message}')
+        return 1
+    finally:
+        PwdUtil.shutdown_executor()
+        await redis.aclose()
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,283 @@
+"""
+登录用户信息加载的基准测试
+
+在SQLite数据库文件中写入用户、部门、角色、岗位及菜单，分别以逐项查询的原加载方式（5条语句）及 UserDao.get_user_profile_by_id
+（最多2条语句）加载随机用户的信息，校验两者结果一致，输出每次加载执行的语句数及耗时分位数。
+SQLite在进程内执行，不含数据库网络往返，另按 --rtt 指定的单次往返耗时估算MySQL/PostgreSQL下的加载耗时
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.benchmark_user_profile --users 1000
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import Any, Callable
+
+from sqlalchemy import and_, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.database import Base
+from module_admin.dao.user_dao import UserDao
+from module_admin.entity.do.dept_do import SysDept
+from module_admin.entity.do.menu_do import SysMenu
+from module_admin.entity.do.post_do import SysPost
+from module_admin.entity.do.role_do import SysRole, SysRoleMenu
+from module_admin.entity.do.user_do import SysUser, SysUserPost, SysUserRole
+from scripts.benchmark_util import count_statements, create_session_maker, create_sqlite_engine, get_quantiles
+
+DEPT_COUNT = 100
+ROLE_COUNT = 20
+POST_COUNT = 10
+MENU_COUNT = 500
+# 每个用户的角色数及岗位数、每个角色的菜单数
+USER_ROLE_COUNT = 3
+USER_POST_COUNT = 2
+ROLE_MENU_COUNT = 150
+SEED_TABLES = [SysUser, SysDept, SysRole, SysPost, SysMenu, SysUserRole, SysUserPost, SysRoleMenu]
+
+
+async def seed_users(session: AsyncSession, user_count: int) -> None:
+    """
+    建表并写入样例用户、部门、角色、岗位及菜单，用户1为超级管理员
+
+    :param session: 异步会话
+    :param user_count: 用户数
+    :return:
+    """
+    rng = random.Random(0)
+    await session.run_sync(
+        lambda sync_session: Base.metadata.create_all(
+            sync_session.connection(), tables=[model.__table__ for model in SEED_TABLES]
+        )
+    )
+    await session.execute(
+        insert(SysDept),
+        [
+            {'dept_id': dept_id, 'dept_name': f'部门{dept_id}', 'status': '0', 'del_flag': '0'}
+            for dept_id in range(1, DEPT_COUNT + 1)
+        ],
+    )
+    await session.execute(
+        insert(SysRole),
+        [
+            {
+                'role_id': role_id,
+                'role_name': f'角色{role_id}',
+                'role_key': f'role{role_id}',
+                'role_sort': role_id,
+                'status': '0',
+                'del_flag': '0',
+            }
+            for role_id in range(1, ROLE_COUNT + 1)
+        ],
+    )
+    await session.execute(
+        insert(SysPost),
+        [
+            {'post_id': post_id, 'post_code': f'post{post_id}', 'post_name': f'岗位{post_id}', 'post_sort': post_id,
+             'status': '0'}
+            for post_id in range(1, POST_COUNT + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(SysMenu),
+        [
+            {'menu_id': menu_id, 'menu_name': f'菜单{menu_id}', 'order_num': menu_id, 'perms': f'system:menu:{menu_id}',
+             'status': '0'}
+            for menu_id in range(1, MENU_COUNT + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(SysRoleMenu),
+        [
+            {'role_id': role_id, 'menu_id': menu_id}
+            for role_id in range(2, ROLE_COUNT + 1)
+            for menu_id in rng.sample(range(1, MENU_COUNT + 1), ROLE_MENU_COUNT)
+        ],
+    )
+    await session.execute(
+        insert(SysUser),
+        [
+            {
+                'user_id': user_id,
+                'dept_id': rng.randint(1, DEPT_COUNT),
+                'user_name': f'user{user_id}',
+                'nick_name': f'用户{user_id}',
+                'status': '0',
+                'del_flag': '0',
+            }
+            for user_id in range(1, user_count + 1)
+        ],
+    )
+    await session.execute(
+        insert(SysUserRole),
+        [{'user_id': 1, 'role_id': 1}]
+        + [
+            {'user_id': user_id, 'role_id': role_id}
+            for user_id in range(2, user_count + 1)
+            for role_id in rng.sample(range(2, ROLE_COUNT + 1), USER_ROLE_COUNT)
+        ],
+    )
+    await session.execute(
+        insert(SysUserPost),
+        [
+            {'user_id': user_id, 'post_id': post_id}
+            for user_id in range(1, user_count + 1)
+            for post_id in rng.sample(range(1, POST_COUNT + 1), USER_POST_COUNT)
+        ],
+    )
+    await session.commit()
+
+
+async def get_user_by_id_legacy(db: AsyncSession, user_id: int) -> dict[str, Any]:
+    """
+    原登录用户信息加载方式：用户、部门、角色、岗位及菜单权限各执行一条语句
+
+    :param db: orm对象
+    :param user_id: 用户id
+    :return: 当前user_id的用户信息对象
+    """
+    user_condition = and_(SysUser.status == '0', SysUser.del_flag == '0', SysUser.user_id == user_id)
+    query_user_basic_info = (await db.execute(select(SysUser).where(user_condition).distinct())).scalars().first()
+    query_user_dept_info = (
+        (
+            await db.execute(
+                select(SysDept)
+                .select_from(SysUser)
+                .where(user_condition)
+                .join(SysDept, and_(SysUser.dept_id == SysDept.dept_id, SysDept.status == '0', SysDept.del_flag == '0'))
+                .distinct()
+            )
+        )
+        .scalars()
+        .first()
+    )
+    query_user_role_info = (
+        (
+            await db.execute(
+                select(SysRole)
+                .select_from(SysUser)
+                .where(user_condition)
+                .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                .join(
+                    SysRole,
+                    and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                )
+                .distinct()
+            )
+        )
+        .scalars()
+        .all()
+    )
+    query_user_post_info = (
+        (
+            await db.execute(
+                select(SysPost)
+                .select_from(SysUser)
+                .where(user_condition)
+                .join(SysUserPost, SysUser.user_id == SysUserPost.user_id, isouter=True)
+                .join(SysPost, and_(SysUserPost.post_id == SysPost.post_id, SysPost.status == '0'))
+                .distinct()
+            )
+        )
+        .scalars()
+        .all()
+    )
+    if 1 in [item.role_id for item in query_user_role_info]:
+        query_user_menu_info = (
+            (await db.execute(select(SysMenu).where(SysMenu.status == '0').distinct())).scalars().all()
+        )
+    else:
+        query_user_menu_info = (
+            (
+                await db.execute(
+                    select(SysMenu)
+                    .select_from(SysUser)
+                    .where(user_condition)
+                    .join(SysUserRole, SysUser.user_id == SysUserRole.user_id, isouter=True)
+                    .join(
+                        SysRole,
+                        and_(SysUserRole.role_id == SysRole.role_id, SysRole.status == '0', SysRole.del_flag == '0'),
+                        isouter=True,
+                    )
+                    .join(SysRoleMenu, SysRole.role_id == SysRoleMenu.role_id, isouter=True)
+                    .join(SysMenu, and_(SysRoleMenu.menu_id == SysMenu.menu_id, SysMenu.status == '0'))
+                    .order_by(SysMenu.order_num)
+                    .distinct()
+                )
+            )
+            .scalars()
+            .all()
+        )
+
+    return {
+        'user_basic_info': query_user_basic_info,
+        'user_dept_info': query_user_dept_info,
+        'user_role_info': query_user_role_info,
+        'user_post_info': query_user_post_info,
+        'user_menu_info': query_user_menu_info,
+    }
+
+
+def get_profile_summary(profile: dict[str, Any]) -> tuple[Any, ...]:
+    """
+    提取用户信息中用于比对的主键
+
+    :param profile: 用户信息对象
+    :return: (用户id, 部门id, 角色id集合, 岗位id集合, 菜单id集合)
+    """
+    return (
+        profile['user_basic_info'].user_id,
+        profile['user_dept_info'].dept_id if profile['user_dept_info'] else None,
+        {role.role_id for role in profile['user_role_info']},
+        {post.post_id for post in profile['user_post_info']},
+        {menu.menu_id for menu in profile['user_menu_info']},
+    )
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='登录用户信息加载基准测试')
+    parser.add_argument('--users', type=int, default=1000, help='样例用户数')
+    parser.add_argument('--repeat', type=int, default=2000, help='加载次数')
+    parser.add_argument('--rtt', type=float, default=0.5, help='估算所用的数据库单次往返耗时（单位：毫秒）')
+    args, _ = parser.parse_known_args()
+
+    loaders: dict[str, Callable[[AsyncSession, int], Any]] = {
+        '逐项查询（原方式）': get_user_by_id_legacy,
+        'get_user_profile_by_id': UserDao.get_user_profile_by_id,
+    }
+    rng = random.Random(1)
+    user_ids = [1] + [rng.randint(2, args.users) for _ in range(args.repeat - 1)]
+    async with create_sqlite_engine('benchmark_user_profile.db') as engine:
+        session_maker = create_session_maker(engine)
+        async with session_maker() as session:
+            await seed_users(session, args.users)
+        async with session_maker() as session:
+            for user_id in user_ids[:50]:
+                summaries = [get_profile_summary(await loader(session, user_id)) for loader in loaders.values()]
+                if summaries[0] != summaries[1]:
+                    print(f'❌️ 用户{user_id}的加载结果不一致：{summaries}')
+                    return 1
+            for loader_name, loader in loaders.items():
+                elapsed, statement_counts = [], []
+                for user_id in user_ids:
+                    with count_statements(engine) as statements:
+                        start = time.perf_counter()
+                        await loader(session, user_id)
+                        elapsed.append((time.perf_counter() - start) * 1000)
+                    statement_counts.append(len(statements))
+                    session.expunge_all()
+                mean_statements = statistics.mean(statement_counts)
+                print(
+                    f'{loader_name}：每次{mean_statements:.1f}条语句，{get_quantiles(elapsed)}，'
+                    f'按往返{args.rtt}ms估算p50 {statistics.median(elapsed) + mean_statements * args.rtt:.3f}ms'
+                )
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,101 @@
+"""
+基准测试及检查脚本的公共方法
+
+以SQLite数据库文件作为本地测试数据库，按模型建表并以aiosqlite驱动的异步会话执行DAO及service方法
+需要Redis的脚本使用进程内的fakeredis，不读写配置文件中的Redis
+aiosqlite及fakeredis不在应用依赖中，使用本模块的脚本运行前需在ruoyi-fastapi-backend目录下执行：pip3 install -r requirements-dev.txt
+"""
+
+import statistics
+import tempfile
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from pathlib import Path
+from typing import Any
+
+from fakeredis import FakeAsyncRedis
+from redis import asyncio as aioredis
+from sqlalchemy import BigInteger, event
+from sqlalchemy.dialects import mysql
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.ext.compiler import compiles
+
+
+@compiles(BigInteger, 'sqlite')
+@compiles(mysql.TINYINT, 'sqlite')
+def compile_integer(type_: Any, compiler: Any, **kw: Any) -> str:
+    # SQLite仅INTEGER PRIMARY KEY自增，BigInteger主键按INTEGER建表；MySQL方言的整数类型同样按INTEGER建表
+    return 'INTEGER'
+
+
+@compiles(mysql.LONGBLOB, 'sqlite')
+def compile_longblob(type_: mysql.LONGBLOB, compiler: Any, **kw: Any) -> str:
+    return 'BLOB'
+
+
+@asynccontextmanager
+async def create_sqlite_engine(db_name: str) -> AsyncIterator[AsyncEngine]:
+    """
+    在临时目录中创建SQLite数据库文件的异步引擎，退出时释放连接并删除数据库文件
+
+    :param db_name: 数据库文件名
+    :return: 异步引擎
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        engine = create_async_engine(f'sqlite+aiosqlite:///{Path(temp_dir) / db_name}')
+        try:
+            yield engine
+        finally:
+            # aiosqlite的连接线程未关闭时进程无法退出
+            await engine.dispose()
+
+
+def create_fake_redis() -> aioredis.Redis:
+    """
+    创建与应用一致（以utf-8解码响应）的进程内Redis连接，脚本写入及删除的键均不影响配置文件中的Redis
+
+    :return: Redis连接对象
+    """
+    return FakeAsyncRedis(decode_responses=True)
+
+
+def create_session_maker(engine: AsyncEngine) -> async_sessionmaker:
+    """
+    创建与应用一致（不自动flush）的异步会话工厂
+
+    :param engine: 异步引擎
+    :return: 异步会话工厂
+    """
+    return async_sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@contextmanager
+def count_statements(engine: AsyncEngine) -> Iterator[list[str]]:
+    """
+    记录期间在引擎上执行的SQL语句
+
+    :param engine: 异步引擎
+    :return: 执行的SQL语句列表
+    """
+    statements: list[str] = []
+
+    def before_cursor_execute(conn: Any, cursor: Any, statement: str, *args: Any) -> None:
+        statements.append(statement)
+
+    event.listen(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, 'before_cursor_execute', before_cursor_execute)
+
+
+def get_quantiles(elapsed: list[float]) -> str:
+    """
+    计算耗时分位数
+
+    :param elapsed: 各次耗时毫秒列表
+    :return: 分位数说明
+    """
+    quantiles = statistics.quantiles(elapsed, n=100, method='inclusive')
+
+    return f'p50 {quantiles[49]:.3f}ms  p95 {quantiles[94]:.3f}ms  p99 {quantiles[98]:.3f}ms  max {max(elapsed):.3f}ms'
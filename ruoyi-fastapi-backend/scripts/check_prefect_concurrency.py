@@ -0,0 +1,240 @@
+"""
+项目流程状态并发流转检查
+
+在SQLite数据库文件中写入处于二级复审的项目，以最小的FastAPI应用（注册全局异常处理）提供单个及批量二级复审接口，
+同一事件循环中每个项目由多个复核人员同时提交单个复审，另有复核人员同时提交覆盖全部项目的批量复审，
+分别在数据库支持 UPDATE ... RETURNING 及仅以影响行数判断（批量流转先锁定流程）两种方式下校验：
+每个项目恰好流转成功一次，单个复审中未成功的请求均返回409，每个项目恰好新增一条二级复审意见，
+且项目表与流程表的流程状态一致，任一项不满足时返回非0退出码
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.check_prefect_concurrency --projects 20 --reviewers 10
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from collections import Counter
+from collections.abc import AsyncGenerator
+from typing import Annotated, Any
+
+import httpx
+from fastapi import Depends, FastAPI
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from common.constant import HttpStatusConstant
+from config.database import Base
+from exceptions.handle import handle_exception
+from module_admin.entity.do.project_do import Project, ProjectUser
+from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM, ProjectPrefect
+from module_admin.entity.do.project_prefect_opinion_do import ProjectPrefectOpinion
+from module_admin.entity.vo.project_prefect_vo import BatchUpdatePrefectStatusModel, UpdatePrefectStatusModel
+from module_admin.entity.vo.user_vo import CurrentUserModel, UserInfoModel
+from module_admin.service.project_prefect_service import ProjectPrefectService
+from scripts.benchmark_util import create_session_maker, create_sqlite_engine
+from utils.log_util import logger
+
+SEED_TABLES = [Project, ProjectUser, ProjectPrefect, ProjectPrefectOpinion]
+# 同时提交批量复审的复核人员数
+BATCH_REVIEWER_COUNT = 5
+
+
+async def seed_projects(session: AsyncSession, project_count: int) -> None:
+    """
+    清空并写入处于二级复审的项目及流程
+
+    :param session: 异步会话
+    :param project_count: 项目数
+    :return:
+    """
+    for model in SEED_TABLES:
+        await session.execute(delete(model))
+    await session.execute(
+        insert(Project),
+        [
+            {'pro_id': pro_id, 'project_code': f'XM{pro_id:06d}', 'project_name': f'项目{pro_id}',
+             'prefect_status': PREFECT_STATUS_ENUM['SECOND_REVIEW'], 'del_flag': '0'}
+            for pro_id in range(1, project_count + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(ProjectPrefect),
+        [
+            {'id': pro_id, 'pro_id': pro_id, 'current_status': PREFECT_STATUS_ENUM['SECOND_REVIEW'], 'operator_id': 1,
+             'operator_name': 'admin', 'del_flag': '0'}
+            for pro_id in range(1, project_count + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(ProjectUser), [{'pro_id': pro_id, 'user_id': pro_id % 5 + 1} for pro_id in range(1, project_count + 1)]
+    )
+    await session.commit()
+
+
+def create_app(engine: AsyncEngine) -> FastAPI:
+    """
+    创建包含单个及批量二级复审接口的应用，复审结果经全局异常处理转换为响应
+
+    :param engine: 异步引擎
+    :return: 应用对象
+    """
+    app = FastAPI()
+    handle_exception(app)
+    session_maker = create_session_maker(engine)
+    current_user = CurrentUserModel(
+        permissions=['*:*:*'], roles=['ejfh'], user=UserInfoModel(userId=2, userName='ejfh', nickName='二级复核')
+    )
+
+    async def get_db() -> AsyncGenerator[AsyncSession, None]:
+        async with session_maker() as session:
+            yield session
+
+    @app.put('/second_review')
+    async def second_review(
+        prefect: UpdatePrefectStatusModel, db: Annotated[AsyncSession, Depends(get_db)]
+    ) -> dict[str, Any]:
+        result = await ProjectPrefectService.second_review_services(db, prefect, current_user)
+        return {'code': HttpStatusConstant.SUCCESS, 'msg': result.message}
+
+    @app.put('/batch_second_review')
+    async def batch_second_review(
+        batch: BatchUpdatePrefectStatusModel, db: Annotated[AsyncSession, Depends(get_db)]
+    ) -> dict[str, Any]:
+        result = await ProjectPrefectService.batch_second_review_services(db, batch, current_user)
+        return {'code': HttpStatusConstant.SUCCESS, 'msg': result.message, 'result': result.result.model_dump()}
+
+    return app
+
+
+async def check_concurrent_review(
+    engine: AsyncEngine, project_count: int, reviewer_count: int
+) -> tuple[list[str], Counter[str]]:
+    """
+    并发提交单个及批量二级复审，校验流转结果、响应及审核意见
+
+    :param engine: 异步引擎
+    :param project_count: 项目数
+    :param reviewer_count: 每个项目同时提交单个复审的复核人员数
+    :return: (校验失败信息列表, 各类结果的数量)
+    """
+    session_maker = create_session_maker(engine)
+    async with session_maker() as session:
+        await seed_projects(session, project_count)
+    target_status = PREFECT_STATUS_ENUM['THIRD_REVIEW']
+    pro_ids = list(range(1, project_count + 1))
+    single_bodies = [
+        {'proId': pro_id, 'targetStatus': target_status, 'opinionContent': f'复核人员{reviewer}通过'}
+        for reviewer in range(reviewer_count)
+        for pro_id in pro_ids
+    ]
+    batch_body = {
+        'proIds': pro_ids,
+        'currentStatus': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+        'targetStatus': target_status,
+        'opinionContent': '批量复审通过',
+    }
+    # 单个及批量复审请求打乱顺序后同时提交
+    requests = [('/second_review', body) for body in single_bodies] + [
+        ('/batch_second_review', batch_body) for _ in range(BATCH_REVIEWER_COUNT)
+    ]
+    random.Random(0).shuffle(requests)
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app=create_app(engine)), base_url='http://check'
+    ) as client:
+        responses = await asyncio.gather(*[client.put(url, json=body) for url, body in requests])
+    single_results = [
+        (body, response.json()) for (url, body), response in zip(requests, responses) if url == '/second_review'
+    ]
+    batch_responses = [response.json() for (url, _), response in zip(requests, responses) if url != '/second_review']
+    errors = [
+        f'请求失败：{response}'
+        for response in [response for _, response in single_results] + batch_responses
+        if response['code'] not in (HttpStatusConstant.SUCCESS, HttpStatusConstant.CONFLICT)
+    ]
+    success_counter: Counter[int] = Counter(
+        body['proId'] for body, response in single_results if response['code'] == HttpStatusConstant.SUCCESS
+    )
+    single_success_count = sum(success_counter.values())
+    conflict_count = sum(response['code'] == HttpStatusConstant.CONFLICT for _, response in single_results)
+    for response in batch_responses:
+        if response['code'] == HttpStatusConstant.SUCCESS:
+            success_counter.update(response['result']['success_ids'])
+    result_counter = Counter(
+        {
+            '单个复审成功': single_success_count,
+            '单个复审返回409': conflict_count,
+            '批量复审成功': sum(success_counter.values()) - single_success_count,
+        }
+    )
+    errors += [
+        f'项目{pro_id}流转成功{success_counter[pro_id]}次，应为1次'
+        for pro_id in pro_ids
+        if success_counter[pro_id] != 1
+    ]
+    if conflict_count != len(single_bodies) - single_success_count or errors:
+        errors.append(f'单个复审{len(single_bodies)}个请求中成功{single_success_count}个，409共{conflict_count}个')
+    async with session_maker() as session:
+        opinion_counts = dict(
+            (
+                await session.execute(
+                    select(ProjectPrefectOpinion.project_id, func.count())
+                    .where(ProjectPrefectOpinion.node_code == PREFECT_STATUS_ENUM['SECOND_REVIEW'])
+                    .group_by(ProjectPrefectOpinion.project_id)
+                )
+            ).all()
+        )
+        status_rows = (
+            await session.execute(
+                select(Project.pro_id, Project.prefect_status, ProjectPrefect.current_status).join(
+                    ProjectPrefect, ProjectPrefect.pro_id == Project.pro_id
+                )
+            )
+        ).all()
+    errors += [
+        f'项目{pro_id}新增二级复审意见{opinion_counts.get(pro_id, 0)}条，应为1条'
+        for pro_id in pro_ids
+        if opinion_counts.get(pro_id, 0) != 1
+    ]
+    errors += [
+        f'项目{pro_id}流程状态不一致：项目表{prefect_status}，流程表{current_status}，应为{target_status}'
+        for pro_id, prefect_status, current_status in status_rows
+        if not prefect_status == current_status == target_status
+    ]
+
+    return errors, result_counter
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='项目流程状态并发流转检查')
+    parser.add_argument('--projects', type=int, default=20, help='处于二级复审的项目数')
+    parser.add_argument('--reviewers', type=int, default=10, help='每个项目同时提交单个复审的复核人员数')
+    args, _ = parser.parse_known_args()
+
+    # 未成功的单个复审均由全局异常处理记录告警日志，检查期间不输出
+    logger.disable('exceptions.handle')
+    failed_count = 0
+    async with create_sqlite_engine('check_prefect_concurrency.db') as engine:
+        async with engine.begin() as connection:
+            await connection.run_sync(
+                lambda sync_connection: Base.metadata.create_all(
+                    sync_connection, tables=[model.__table__ for model in SEED_TABLES]
+                )
+            )
+        for mode_name, update_returning in (('UPDATE ... RETURNING', True), ('影响行数', False)):
+            engine.sync_engine.dialect.update_returning = update_returning
+            errors, result_counter = await check_concurrent_review(engine, args.projects, args.reviewers)
+            print(
+                f'{"❌️" if errors else "✅️"} {mode_name}：{args.projects}个项目，'
+                f'{args.projects * args.reviewers}个单个复审及{BATCH_REVIEWER_COUNT}个批量复审同时提交，'
+                f'{"，".join(f"{name}：{count}个" for name, count in result_counter.items())}'
+            )
+            for error in errors:
+                print(f'    {error}')
+            failed_count += bool(errors)
+
+    return 1 if failed_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,303 @@
+"""
+项目流程状态计数偏差检查
+
+在SQLite数据库文件中写入处于二级及三级复审的项目及负责人，以进程内的fakeredis维护计数（不读写配置文件中的Redis），
+依次执行：同一事件循环中并发提交单个及批量的二级、三级复审，流转后回滚，删除项目（含已删除的项目），编辑项目流程状态（含置空），
+每一步后以 PrefectStatsUtil.reconcile 校验计数与数据库统计值的偏差为0；
+最后直接修改缓存计数注入偏差，校验对账返回的偏差与注入值一致且对账后偏差为0，任一项不满足时返回非0退出码
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.check_prefect_stats_drift --projects 40 --reviewers 5
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+from collections.abc import Awaitable
+from typing import Any, Callable
+
+from redis import asyncio as aioredis
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from config.database import Base
+from config.env import AppConfig
+from config.get_prefect_stats import PrefectStatsUtil
+from exceptions.exception import ConflictException
+from module_admin.entity.do.project_do import Project, ProjectUser
+from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM, ProjectPrefect
+from module_admin.entity.do.project_prefect_opinion_do import ProjectPrefectOpinion
+from module_admin.entity.vo.project_prefect_vo import BatchUpdatePrefectStatusModel, UpdatePrefectStatusModel
+from module_admin.entity.vo.project_vo import DeleteProjectModel, EditProjectModel
+from module_admin.entity.vo.user_vo import CurrentUserModel, UserInfoModel
+from module_admin.service.project_prefect_service import ProjectPrefectService
+from module_admin.service.project_service import ProjectService
+from scripts.benchmark_util import create_fake_redis, create_session_maker, create_sqlite_engine
+
+SEED_TABLES = [Project, ProjectUser, ProjectPrefect, ProjectPrefectOpinion]
+# 同时提交批量复审的复核人员数
+BATCH_REVIEWER_COUNT = 3
+# 负责人数，项目ID为该数的倍数时不分配负责人
+USER_COUNT = 4
+CURRENT_USER = CurrentUserModel(
+    permissions=['*:*:*'], roles=['admin'], user=UserInfoModel(userId=1, userName='admin', nickName='管理员')
+)
+
+
+def get_seed_status(pro_id: int) -> str:
+    """
+    获取项目写入时的流程状态：奇数项目处于二级复审，偶数项目处于三级复审
+
+    :param pro_id: 项目ID
+    :return: 流程状态
+    """
+    return PREFECT_STATUS_ENUM['SECOND_REVIEW'] if pro_id % 2 else PREFECT_STATUS_ENUM['THIRD_REVIEW']
+
+
+async def seed_projects(session: AsyncSession, project_count: int) -> None:
+    """
+    清空并写入项目、流程及负责人，最后一个项目为已删除的项目
+
+    :param session: 异步会话
+    :param project_count: 项目数
+    :return:
+    """
+    for model in SEED_TABLES:
+        await session.execute(delete(model))
+    await session.execute(
+        insert(Project),
+        [
+            {'pro_id': pro_id, 'project_code': f'XM{pro_id:06d}', 'project_name': f'项目{pro_id}',
+             'prefect_status': get_seed_status(pro_id), 'del_flag': '2' if pro_id == project_count else '0'}
+            for pro_id in range(1, project_count + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(ProjectPrefect),
+        [
+            {'id': pro_id, 'pro_id': pro_id, 'current_status': get_seed_status(pro_id), 'operator_id': 1,
+             'operator_name': 'admin', 'del_flag': '0'}
+            for pro_id in range(1, project_count + 1)
+        ],
+    )  # fmt: skip
+    await session.execute(
+        insert(ProjectUser),
+        [
+            {'pro_id': pro_id, 'user_id': pro_id % USER_COUNT + 1}
+            for pro_id in range(1, project_count + 1)
+            if pro_id % USER_COUNT
+        ],
+    )
+    await session.commit()
+
+
+async def run_service(session_maker: async_sessionmaker, service: Callable[[AsyncSession], Awaitable[Any]]) -> bool:
+    """
+    以新会话执行一次流转，流程状态已变化时返回False
+
+    :param session_maker: 异步会话工厂
+    :param service: 流转方法
+    :return: 是否流转成功
+    """
+    async with session_maker() as session:
+        try:
+            await service(session)
+        except ConflictException:
+            return False
+    return True
+
+
+async def transition_concurrently(session_maker: async_sessionmaker, pro_ids: list[int], reviewer_count: int) -> str:
+    """
+    同时提交单个及批量的二级、三级复审，复审结果在通过与驳回至工程师间随机选择
+
+    :param session_maker: 异步会话工厂
+    :param pro_ids: 项目ID列表
+    :param reviewer_count: 每个项目同时提交单个复审的复核人员数
+    :return: 执行说明
+    """
+    rng = random.Random(0)
+    second_ids = [pro_id for pro_id in pro_ids if get_seed_status(pro_id) == PREFECT_STATUS_ENUM['SECOND_REVIEW']]
+    third_ids = [pro_id for pro_id in pro_ids if get_seed_status(pro_id) == PREFECT_STATUS_ENUM['THIRD_REVIEW']]
+    second_targets = [PREFECT_STATUS_ENUM['THIRD_REVIEW'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]
+    third_targets = [PREFECT_STATUS_ENUM['TO_ARCHIVE'], PREFECT_STATUS_ENUM['ENGINEER_EDIT']]
+    services: list[Callable[[AsyncSession], Awaitable[Any]]] = []
+    for _ in range(reviewer_count):
+        for pro_id in second_ids:
+            prefect = UpdatePrefectStatusModel(
+                proId=pro_id, targetStatus=rng.choice(second_targets), opinionContent='复核意见'
+            )
+            services.append(
+                lambda db, prefect=prefect: ProjectPrefectService.second_review_services(db, prefect, CURRENT_USER)
+            )
+        for pro_id in third_ids:
+            prefect = UpdatePrefectStatusModel(
+                proId=pro_id, targetStatus=rng.choice(third_targets), opinionContent='复核意见'
+            )
+            services.append(
+                lambda db, prefect=prefect: ProjectPrefectService.third_review_services(db, prefect, CURRENT_USER)
+            )
+    for _ in range(BATCH_REVIEWER_COUNT):
+        second_batch = BatchUpdatePrefectStatusModel(
+            proIds=second_ids,
+            currentStatus=PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+            targetStatus=rng.choice(second_targets),
+            opinionContent='批量复核意见',
+        )
+        services.append(
+            lambda db, batch=second_batch: ProjectPrefectService.batch_second_review_services(db, batch, CURRENT_USER)
+        )
+        third_batch = BatchUpdatePrefectStatusModel(
+            proIds=third_ids,
+            currentStatus=PREFECT_STATUS_ENUM['THIRD_REVIEW'],
+            targetStatus=rng.choice(third_targets),
+            opinionContent='批量复核意见',
+        )
+        services.append(
+            lambda db, batch=third_batch: ProjectPrefectService.batch_third_review_services(db, batch, CURRENT_USER)
+        )
+    rng.shuffle(services)
+    results = await asyncio.gather(*[run_service(session_maker, service) for service in services])
+
+    return f'并发提交{len(services)}个复审，{sum(results)}个成功，{len(services) - sum(results)}个返回409'
+
+
+async def transition_and_rollback(session_maker: async_sessionmaker, pro_ids: list[int]) -> str:
+    """
+    流转已驳回至工程师的项目并记录计数变化后回滚
+
+    :param session_maker: 异步会话工厂
+    :param pro_ids: 项目ID列表
+    :return: 执行说明
+    """
+    async with session_maker() as session:
+        transition_result = await ProjectPrefectService._transition_prefect_status(
+            session,
+            pro_ids,
+            PREFECT_STATUS_ENUM['ENGINEER_EDIT'],
+            PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+            '工程师提交',
+            None,
+            'admin',
+            CURRENT_USER,
+        )
+        await session.rollback()
+
+    return f'流转{len(transition_result.success_ids)}个项目后回滚'
+
+
+async def delete_projects(session_maker: async_sessionmaker, pro_ids: list[int]) -> str:
+    """
+    删除项目
+
+    :param session_maker: 异步会话工厂
+    :param pro_ids: 项目ID列表
+    :return: 执行说明
+    """
+    async with session_maker() as session:
+        await ProjectService.delete_project_services(
+            session, DeleteProjectModel(proIds=','.join(str(pro_id) for pro_id in pro_ids))
+        )
+
+    return f'删除{len(pro_ids)}个项目'
+
+
+async def edit_project_status(session_maker: async_sessionmaker, status_dict: dict[int, Any]) -> str:
+    """
+    编辑项目的流程状态
+
+    :param session_maker: 异步会话工厂
+    :param status_dict: 项目ID与编辑后流程状态的映射字典
+    :return: 执行说明
+    """
+    async with session_maker() as session:
+        for pro_id, prefect_status in status_dict.items():
+            await ProjectService.edit_project_services(
+                session, EditProjectModel(proId=pro_id, projectCode=f'XM{pro_id:06d}', prefectStatus=prefect_status)
+            )
+
+    return f'编辑{len(status_dict)}个项目的流程状态'
+
+
+async def inject_drift(redis: aioredis.Redis) -> dict[str, int]:
+    """
+    直接修改缓存计数注入偏差
+
+    :param redis: redis对象
+    :return: 注入的偏差（与对账返回的偏差格式一致）
+    """
+    status_field = PREFECT_STATUS_ENUM['TO_ARCHIVE']
+    user_field = f'1:{PREFECT_STATUS_ENUM["ENGINEER_EDIT"]}'
+    await redis.hincrby(PrefectStatsUtil.get_status_key(), status_field, 3)
+    await redis.hincrby(PrefectStatsUtil.get_user_key(), user_field, -2)
+
+    return {status_field: 3, f'user:{user_field}': -2}
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser(description='项目流程状态计数偏差检查')
+    parser.add_argument('--projects', type=int, default=40, help='项目数')
+    parser.add_argument('--reviewers', type=int, default=5, help='每个项目同时提交单个复审的复核人员数')
+    args, _ = parser.parse_known_args()
+
+    redis = create_fake_redis()
+    failed_count = 0
+    try:
+        async with create_sqlite_engine('check_prefect_stats_drift.db') as engine:
+            session_maker = create_session_maker(engine)
+            async with engine.begin() as connection:
+                await connection.run_sync(
+                    lambda sync_connection: Base.metadata.create_all(
+                        sync_connection, tables=[model.__table__ for model in SEED_TABLES]
+                    )
+                )
+            async with session_maker() as session:
+                await seed_projects(session, args.projects)
+            # 持有对账锁使后台对账任务视为其他进程已对账，检查期间仅由检查流程对账
+            await redis.set(
+                PrefectStatsUtil.get_reconcile_lock_key(), 1, ex=AppConfig.app_prefect_stats_reconcile_interval
+            )
+            await PrefectStatsUtil.init_prefect_stats(redis, session_maker)
+            await PrefectStatsUtil.reconcile(force=True)
+
+            pro_ids = list(range(1, args.projects + 1))
+            steps: list[tuple[str, Callable[[], Awaitable[str]]]] = [
+                ('并发流转', lambda: transition_concurrently(session_maker, pro_ids, args.reviewers)),
+                ('回滚', lambda: transition_and_rollback(session_maker, pro_ids)),
+                ('删除项目', lambda: delete_projects(session_maker, [*pro_ids[:5], pro_ids[-1]])),
+                (
+                    '编辑流程状态',
+                    lambda: edit_project_status(
+                        session_maker,
+                        {
+                            pro_ids[5]: PREFECT_STATUS_ENUM['ARCHIVED'],
+                            pro_ids[6]: PREFECT_STATUS_ENUM['CREATE'],
+                            pro_ids[7]: None,
+                        },
+                    ),
+                ),
+            ]
+            for step_name, step in steps:
+                description = await step()
+                drift = await PrefectStatsUtil.reconcile(force=True)
+                print(f'{"❌️" if drift else "✅️"} {step_name}：{description}，计数偏差{drift or 0}')
+                failed_count += bool(drift)
+
+            injected_drift = await inject_drift(redis)
+            drift = await PrefectStatsUtil.reconcile(force=True)
+            reconciled_drift = await PrefectStatsUtil.reconcile(force=True)
+            detected = drift == injected_drift and not reconciled_drift
+            print(
+                f'{"✅️" if detected else "❌️"} 注入偏差：注入{injected_drift}，对账返回{drift}，'
+                f'对账后偏差{reconciled_drift or 0}'
+            )
+            failed_count += not detected
+            await PrefectStatsUtil.close_prefect_stats()
+    finally:
+        await redis.aclose()
+
+    return 1 if failed_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
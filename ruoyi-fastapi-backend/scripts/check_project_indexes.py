@@ -0,0 +1,259 @@
+"""
+项目、项目流程及审核意见DAO查询的索引使用检查
+
+在内存SQLite数据库中按模型建表（含模型中声明的索引）并写入样例数据，逐个执行DAO方法，
+以EXPLAIN QUERY PLAN校验各语句访问上述数据表时均使用预期的索引，出现全表扫描或未预期的索引时返回非0退出码
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.check_project_indexes
+"""
+
+import asyncio
+import sys
+from collections.abc import Awaitable
+from datetime import datetime, timedelta
+from typing import Any, Callable
+
+from sqlalchemy import BigInteger, Engine, create_engine, insert, text
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from module_admin.dao.project_dao import ProjectDao
+from module_admin.dao.project_prefect_dao import ProjectPrefectDao
+from module_admin.dao.project_prefect_opinion_dao import ProjectPrefectOpinionDao
+from module_admin.entity.do.project_do import Project, ProjectUser
+from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM, ProjectPrefect
+from module_admin.entity.do.project_prefect_opinion_do import ProjectPrefectOpinion
+from module_admin.entity.vo.project_vo import ProjectPageModel
+from utils.query_plan_util import QueryPlanSession, QueryPlanUtil
+
+# 样例项目数
+SEED_PROJECT_COUNT = 2000
+# 需要校验索引使用的数据表
+CHECKED_TABLES = {'project', 'project_prefect', 'project_prefect_opinion'}
+# (检查项名称, DAO调用, 各数据表允许使用的索引)，按主键访问始终允许
+IndexCheckCase = tuple[str, Callable[[QueryPlanSession], Awaitable[Any]], dict[str, set[str]]]
+
+
+@compiles(BigInteger, 'sqlite')
+def compile_big_integer(type_: BigInteger, compiler: Any, **kw: Any) -> str:
+    # SQLite仅INTEGER PRIMARY KEY自增，BigInteger主键按INTEGER建表
+    return 'INTEGER'
+
+
+INDEX_CHECK_CASES: list[IndexCheckCase] = [
+    (
+        'ProjectDao.get_project_list（按流程状态筛选）',
+        lambda db: ProjectDao.get_project_list(
+            db, ProjectPageModel(prefectStatus=PREFECT_STATUS_ENUM['SECOND_REVIEW']), is_page=True
+        ),
+        {'project': {'idx_project_del_status_time'}, 'project_prefect': {'idx_project_prefect_pro'}},
+    ),
+    (
+        'ProjectDao.get_project_list（多个流程状态）',
+        lambda db: ProjectDao.get_project_list(
+            db,
+            ProjectPageModel(
+                prefectStatus=f'{PREFECT_STATUS_ENUM["SECOND_REVIEW"]},{PREFECT_STATUS_ENUM["THIRD_REVIEW"]}'
+            ),
+            is_page=True,
+        ),
+        # 多个状态时可按创建时间索引顺序扫描，取满一页即停止
+        {
+            'project': {'idx_project_create_time', 'idx_project_del_status_time'},
+            'project_prefect': {'idx_project_prefect_pro'},
+        },
+    ),
+    (
+        'ProjectDao.get_project_list（不筛选）',
+        lambda db: ProjectDao.get_project_list(db, ProjectPageModel(), is_page=True),
+        {
+            'project': {'idx_project_create_time', 'idx_project_del_status_time'},
+            'project_prefect': {'idx_project_prefect_pro'},
+        },
+    ),
+    (
+        'ProjectDao.get_project_list1（游标分页）',
+        lambda db: ProjectDao.get_project_list1(db, ProjectPageModel(pageMode='keyset'), is_page=True),
+        {'project': {'idx_project_create_time'}},
+    ),
+    (
+        'ProjectDao.get_prefect_status_count_dao',
+        ProjectDao.get_prefect_status_count_dao,
+        {'project': {'idx_project_del_status_time'}},
+    ),
+    (
+        'ProjectDao.get_user_prefect_status_count_dao',
+        ProjectDao.get_user_prefect_status_count_dao,
+        {'project': {'idx_project_del_status_time'}},
+    ),
+    (
+        'ProjectDao.get_project_user_ids',
+        lambda db: ProjectDao.get_project_user_ids(db, [1, 2, 3]),
+        {},
+    ),
+    (
+        'ProjectPrefectDao.transition_prefect_status_dao',
+        lambda db: ProjectPrefectDao.transition_prefect_status_dao(
+            db, [1, 2, 3], PREFECT_STATUS_ENUM['SECOND_REVIEW'], PREFECT_STATUS_ENUM['THIRD_REVIEW'], 1, 'admin'
+        ),
+        {'project_prefect': {'idx_project_prefect_pro'}},
+    ),
+    (
+        'ProjectPrefectDao.get_prefect_status_dict_for_update',
+        lambda db: ProjectPrefectDao.get_prefect_status_dict_for_update(db, [1, 2, 3]),
+        {'project_prefect': {'idx_project_prefect_pro'}},
+    ),
+    (
+        'ProjectPrefectDao.get_prefect_by_project_id',
+        lambda db: ProjectPrefectDao.get_prefect_by_project_id(db, 1),
+        {'project_prefect': {'idx_project_prefect_pro'}},
+    ),
+    (
+        'ProjectPrefectDao.get_to_archive_projects_dao',
+        lambda db: ProjectPrefectDao.get_to_archive_projects_dao(db, 1, 10),
+        {'project_prefect': {'idx_project_prefect_status'}},
+    ),
+    (
+        'ProjectPrefectOpinionDao.add_transition_opinion_dao',
+        lambda db: ProjectPrefectOpinionDao.add_transition_opinion_dao(
+            db,
+            [1, 2, 3],
+            PREFECT_STATUS_ENUM['THIRD_REVIEW'],
+            {
+                'node_code': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+                'node_name': '二级复审',
+                'opinion_content': None,
+                'operator_id': 1,
+                'operator_name': 'admin',
+                'operator_role': 'admin',
+            },
+        ),
+        {'project_prefect': {'idx_project_prefect_pro'}},
+    ),
+    (
+        'ProjectPrefectOpinionDao.get_opinions_by_project_id',
+        lambda db: ProjectPrefectOpinionDao.get_opinions_by_project_id(db, 1),
+        {'project_prefect_opinion': {'idx_project_opinion_project'}},
+    ),
+    (
+        'ProjectPrefectOpinionDao.get_opinions_by_node',
+        lambda db: ProjectPrefectOpinionDao.get_opinions_by_node(db, 1, PREFECT_STATUS_ENUM['SECOND_REVIEW']),
+        {'project_prefect_opinion': {'idx_project_opinion_project'}},
+    ),
+]
+
+
+def create_seeded_engine() -> Engine:
+    """
+    创建内存SQLite数据库，按模型建表并写入样例数据
+
+    :return: 数据库引擎
+    """
+    engine = create_engine('sqlite://')
+    statuses = list(PREFECT_STATUS_ENUM.values())
+    now = datetime.now()
+    with engine.begin() as connection:
+        for model in (Project, ProjectPrefect, ProjectPrefectOpinion):
+            model.metadata.create_all(connection, tables=[model.__table__])
+        ProjectUser.metadata.create_all(connection, tables=[ProjectUser.__table__])
+        connection.execute(
+            insert(Project),
+            [
+                {
+                    'pro_id': pro_id,
+                    'project_code': f'XM{pro_id:06d}',
+                    'project_name': f'项目{pro_id}',
+                    'prefect_status': statuses[pro_id % len(statuses)],
+                    'create_time': now - timedelta(minutes=pro_id),
+                    'del_flag': '2' if pro_id % 50 == 0 else '0',
+                }
+                for pro_id in range(1, SEED_PROJECT_COUNT + 1)
+            ],
+        )
+        connection.execute(
+            insert(ProjectPrefect),
+            [
+                {
+                    'id': pro_id,
+                    'pro_id': pro_id,
+                    'current_status': statuses[pro_id % len(statuses)],
+                    'operator_id': 1,
+                    'operator_name': 'admin',
+                    'update_time': now - timedelta(minutes=pro_id),
+                    'del_flag': '0',
+                }
+                for pro_id in range(1, SEED_PROJECT_COUNT + 1)
+            ],
+        )
+        connection.execute(
+            insert(ProjectPrefectOpinion),
+            [
+                {
+                    'id': opinion_id,
+                    'project_id': opinion_id % SEED_PROJECT_COUNT + 1,
+                    'prefect_id': opinion_id % SEED_PROJECT_COUNT + 1,
+                    'node_code': statuses[opinion_id % len(statuses)],
+                    'node_name': '样例节点',
+                    'operator_id': 1,
+                    'operator_name': 'admin',
+                    'operator_role': 'admin',
+                    'del_flag': '0',
+                }
+                for opinion_id in range(1, SEED_PROJECT_COUNT * 3 + 1)
+            ],
+        )
+        connection.execute(
+            insert(ProjectUser),
+            [{'pro_id': pro_id, 'user_id': pro_id % 20 + 1} for pro_id in range(1, SEED_PROJECT_COUNT + 1, 2)],
+        )
+        # 收集统计信息，使SQLite按数据分布选择索引
+        connection.execute(text('ANALYZE'))
+
+    return engine
+
+
+async def check_case(engine: Engine, case: IndexCheckCase) -> list[str]:
+    """
+    执行DAO方法并校验其中各语句的索引使用情况
+
+    :param engine: 数据库引擎
+    :param case: 检查项
+    :return: 校验失败信息列表
+    """
+    name, dao_call, allowed_indexes = case
+    errors = []
+    with Session(engine) as session:
+        db = QueryPlanSession(session)
+        await dao_call(db)
+        connection = session.connection()
+        for statement in filter(QueryPlanUtil.is_explainable, db.statements):
+            query_plan = QueryPlanUtil.get_sqlite_query_plan(connection, statement)
+            for table_name, index_name in QueryPlanUtil.get_table_access(query_plan):
+                if table_name not in CHECKED_TABLES or index_name in ('PRIMARY KEY', 'INTEGER PRIMARY KEY'):
+                    continue
+                if index_name is None:
+                    errors.append(f'{name}：全表扫描{table_name}，执行计划：{query_plan}')
+                elif index_name not in allowed_indexes.get(table_name, set()):
+                    errors.append(f'{name}：{table_name}使用了未预期的索引{index_name}，执行计划：{query_plan}')
+        session.rollback()
+
+    return errors
+
+
+async def main() -> int:
+    engine = create_seeded_engine()
+    failed_count = 0
+    for case in INDEX_CHECK_CASES:
+        errors = await check_case(engine, case)
+        print(f'{"❌️" if errors else "✅️"} {case[0]}')
+        for error in errors:
+            print(f'    {error}')
+        failed_count += bool(errors)
+    engine.dispose()
+    print(f'共{len(INDEX_CHECK_CASES)}项，失败{failed_count}项')
+
+    return 1 if failed_count else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,669 @@
+"""
+DAO查询执行计划回归检查
+
+导入全部DAO模块，按参数名称及类型为每个DAO方法构造有代表性的参数，在写入样例数据的内存SQLite数据库上执行，
+记录执行过的每条语句编译为MySQL及PostgreSQL方言的SQL、EXPLAIN QUERY PLAN执行计划及估算读取行数，并与已提交的快照比对：
+DAO方法执行失败、数据表访问由索引变为全表扫描、估算读取行数增长超过阈值、原可编译的语句编译失败时返回非0退出码，
+执行失败的DAO方法需修复或加入SKIPPED_METHODS，不写入快照
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：
+    python -m scripts.check_query_plans             与快照比对
+    python -m scripts.check_query_plans --update    更新快照（确认执行计划变化符合预期后提交）
+"""
+
+import argparse
+import asyncio
+import importlib
+import inspect
+import json
+import pkgutil
+import sys
+import typing
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Callable, Optional, Union
+
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import (
+    BigInteger,
+    ColumnElement,
+    Engine,
+    Executable,
+    MetaData,
+    Table,
+    UniqueConstraint,
+    create_engine,
+    insert,
+    or_,
+    text,
+)
+from sqlalchemy.dialects import mysql, postgresql
+from sqlalchemy.engine import Dialect
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import Session
+
+from exceptions.exception import ModelValidatorException
+from module_admin.entity.do.project_prefect_do import PREFECT_STATUS_ENUM
+from module_admin.entity.vo.contract_vo import ContractPageQueryModel
+from module_admin.entity.vo.enterprise_info_vo import EnterprisePageModel
+from module_admin.entity.vo.log_vo import OperLogPageQueryModel
+from module_admin.entity.vo.project_vo import ProjectPageModel
+from module_admin.entity.vo.role_vo import RoleModel
+from module_admin.entity.vo.user_vo import UserPageQueryModel, UserRoleQueryModel
+from utils.query_plan_util import QueryPlanSession, QueryPlanUtil
+from utils.search_util import SearchUtil
+
+# 快照目录，每个DAO模块一个文件
+SNAPSHOT_DIR = Path(__file__).parent / 'query_plan_snapshots'
+# 包含DAO及数据表模型的业务模块
+DAO_PACKAGES = ['module_admin.dao', 'module_generator.dao']
+DO_PACKAGES = ['module_admin.entity.do', 'module_generator.entity.do']
+# 每张表写入的样例数据行数
+SEED_ROW_COUNT = 1000
+# 外键类字段（*_id）及普通字符串字段的取值种数，决定样例数据的选择性
+SEED_ID_CARDINALITY = 100
+SEED_STRING_CARDINALITY = 100
+# 长度不超过该值的字符串字段视为状态、标志类字段，每10行中有SEED_FLAG_DEFAULT_ROWS行取默认值'0'
+SEED_FLAG_MAX_LENGTH = 4
+SEED_FLAG_DEFAULT_ROWS = 8
+# 部门样例数据中每个部门的子部门数
+SEED_DEPT_CHILDREN = 10
+SEED_BASE_TIME = datetime(2026, 1, 1)
+# 估算读取行数增长超过快照值的倍数且增长量超过最小行数时视为回归
+DEFAULT_ROW_GROWTH_THRESHOLD = 2.0
+ROW_GROWTH_MIN_ROWS = 100
+# 编译SQL快照所用的方言
+COMPILE_DIALECTS = {'mysql': mysql.dialect(), 'postgresql': postgresql.dialect()}
+# 仅写入数据的方法前缀，插入语句无执行计划，除下方指定参数的方法外不执行
+INSERT_ONLY_PREFIXES = ('add_', 'batch_add_', 'init_', 'batch_init_')
+# 不执行的DAO方法及原因
+SKIPPED_METHODS = {
+    'GenTableDao.create_table_by_sql_dao': '执行建表语句',
+    'GenTableDao.get_gen_db_table_list': '查询information_schema，仅支持MySQL及PostgreSQL',
+    'GenTableDao.get_gen_db_table_list_by_names': '查询information_schema，仅支持MySQL及PostgreSQL',
+    'GenTableColumnDao.get_gen_db_table_columns_by_name': '查询information_schema，仅支持MySQL及PostgreSQL',
+}
+# 按参数名称取值的代表性参数，未列出的参数按类型构造
+REPRESENTATIVE_PARAMS: dict[str, Any] = {
+    'data_scope_sql': or_(True),
+    'expected_status': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+    'target_status': PREFECT_STATUS_ENUM['THIRD_REVIEW'],
+    'node_code': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+    'table_name': 'sys_user',
+    'table_names': ['sys_user', 'sys_dept'],
+    'page_num': 1,
+    'page_size': 10,
+}
+# 指定参数的检查项：检查项名称 -> (方法, 覆盖的参数)，检查项名称与方法名称相同时覆盖该方法默认检查项的参数
+CASE_PARAMS: dict[str, tuple[str, dict[str, Any]]] = {
+    'DeptDao.add_dept_closure_dao': ('DeptDao.add_dept_closure_dao', {'dept_id': SEED_ROW_COUNT + 1}),
+    'ProjectPrefectOpinionDao.add_transition_opinion_dao': (
+        'ProjectPrefectOpinionDao.add_transition_opinion_dao',
+        {
+            'opinion': {
+                'node_code': PREFECT_STATUS_ENUM['SECOND_REVIEW'],
+                'node_name': '二级复审',
+                'opinion_content': None,
+                'operator_id': 1,
+                'operator_name': 'admin',
+                'operator_role': 'admin',
+            }
+        },
+    ),
+    'MenuDao.get_menu_list_for_tree': ('MenuDao.get_menu_list_for_tree', {'role': [RoleModel(roleId=2)]}),
+    'MenuDao.get_menu_list': ('MenuDao.get_menu_list', {'role': [RoleModel(roleId=2)]}),
+    'ProjectDao.get_project_list[prefect_status]': (
+        'ProjectDao.get_project_list',
+        {'page_object': ProjectPageModel(prefectStatus=PREFECT_STATUS_ENUM['SECOND_REVIEW'])},
+    ),
+    'ProjectDao.get_project_list[project_name]': (
+        'ProjectDao.get_project_list',
+        {'page_object': ProjectPageModel(projectName='project_name_1')},
+    ),
+    'EnterpriseDao.get_ent_list[enterprise_name]': (
+        'EnterpriseDao.get_ent_list',
+        {'page_object': EnterprisePageModel(enterpriseName='enterprise_name_1')},
+    ),
+    'EnterpriseDao.get_ent_suggest_rows[ent_ids]': (
+        'EnterpriseDao.get_ent_suggest_rows',
+        {'ent_ids': [1, 2, 3], 'taxpayer_ids': ['taxpayer_id_1']},
+    ),
+    'ContractDao.get_contract_list[contract_name]': (
+        'ContractDao.get_contract_list',
+        {'page_object': ContractPageQueryModel(contractName='contract_name_1')},
+    ),
+    'OperationLogDao.get_operation_log_list[title]': (
+        'OperationLogDao.get_operation_log_list',
+        {'query_object': OperLogPageQueryModel(title='title_1', operName='oper_name_1')},
+    ),
+    'UserDao.get_user_list[dept_id]': ('UserDao.get_user_list', {'query_object': UserPageQueryModel(deptId=1)}),
+    'UserDao.get_system_user_engineer_list[dept_id]': (
+        'UserDao.get_system_user_engineer_list',
+        {'query_object': UserPageQueryModel(deptId=1)},
+    ),
+    'UserDao.get_user_role_allocated_list_by_user_id': (
+        'UserDao.get_user_role_allocated_list_by_user_id',
+        {'query_object': UserRoleQueryModel(userId=1)},
+    ),
+    'DeptDao.get_data_scope_dept_ids_dao[with_child]': (
+        'DeptDao.get_data_scope_dept_ids_dao',
+        {'with_child': True},
+    ),
+}
+# 按字段名称生成的样例数据
+SEED_COLUMN_VALUES: dict[str, Callable[[int], Any]] = {
+    'ancestors': lambda row_no: f'0,{row_no // SEED_DEPT_CHILDREN}' if row_no >= SEED_DEPT_CHILDREN else '0',
+}
+# 按字段类型生成的样例数据，整数及字符串字段另按字段名称及约束生成
+SEED_TYPE_VALUES: dict[type, Callable[[int], Any]] = {
+    bool: lambda row_no: row_no % 2 == 0,
+    bytes: lambda row_no: b'',
+    float: float,
+    Decimal: Decimal,
+    datetime: lambda row_no: SEED_BASE_TIME - timedelta(minutes=row_no),
+    date: lambda row_no: SEED_BASE_TIME.date() - timedelta(days=row_no % 365),
+}
+# 列表查询条件参数，默认不设置筛选条件以检查列表首页查询
+QUERY_OBJECT_PARAMS = {'query_object', 'page_object', 'query_params'}
+
+
+@compiles(BigInteger, 'sqlite')
+@compiles(mysql.TINYINT, 'sqlite')
+def compile_integer(type_: Any, compiler: Any, **kw: Any) -> str:
+    # SQLite仅INTEGER PRIMARY KEY自增，BigInteger主键按INTEGER建表；MySQL方言的整数类型同样按INTEGER建表
+    return 'INTEGER'
+
+
+@compiles(mysql.LONGBLOB, 'sqlite')
+def compile_longblob(type_: mysql.LONGBLOB, compiler: Any, **kw: Any) -> str:
+    return 'BLOB'
+
+
+class UnsupportedParamError(Exception):
+    """
+    无法构造代表性参数
+    """
+
+
+def iter_package_modules(package_names: list[str]) -> Iterator[Any]:
+    """
+    导入并遍历包下的全部模块
+
+    :param package_names: 包名列表
+    :return: 模块对象
+    """
+    for package_name in package_names:
+        package = importlib.import_module(package_name)
+        for module_info in sorted(pkgutil.iter_modules(package.__path__), key=lambda item: item.name):
+            yield importlib.import_module(f'{package_name}.{module_info.name}')
+
+
+def discover_dao_methods() -> dict[str, tuple[str, Callable[..., Any]]]:
+    """
+    获取全部DAO类中执行查询的异步类方法
+
+    :return: 方法名称（类名.方法名）与(模块名, 方法)的映射字典
+    """
+    dao_methods = {}
+    for module in iter_package_modules(DAO_PACKAGES):
+        for class_name, dao_class in vars(module).items():
+            if not (inspect.isclass(dao_class) and dao_class.__module__ == module.__name__):
+                continue
+            for method_name, method in vars(dao_class).items():
+                if (
+                    isinstance(method, classmethod)
+                    and not method_name.startswith('_')
+                    and inspect.iscoroutinefunction(method.__func__)
+                ):
+                    dao_methods[f'{class_name}.{method_name}'] = (module.__name__, getattr(dao_class, method_name))
+
+    return dao_methods
+
+
+def get_metadata_list() -> list[MetaData]:
+    """
+    获取全部数据表模型的元数据，部分业务模型使用独立的declarative_base
+
+    :return: 元数据列表
+    """
+    metadata_list = []
+    for module in iter_package_modules(DO_PACKAGES):
+        for model in vars(module).values():
+            metadata = getattr(getattr(model, '__table__', None), 'metadata', None)
+            if metadata is not None and all(metadata is not item for item in metadata_list):
+                metadata_list.append(metadata)
+
+    return metadata_list
+
+
+def get_seed_value(table: Table, column_name: str, row_no: int, unique_columns: set[str]) -> Any:
+    """
+    按字段类型生成样例数据
+
+    :param table: 数据表
+    :param column_name: 字段名
+    :param row_no: 行号
+    :param unique_columns: 唯一约束或主键包含的字段
+    :return: 字段值
+    """
+    if column_name in SEED_COLUMN_VALUES:
+        return SEED_COLUMN_VALUES[column_name](row_no)
+    column = table.c[column_name]
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = str
+    if python_type is int:
+        if column_name in unique_columns:
+            return row_no
+        return (row_no - 1) % SEED_ID_CARDINALITY + 1 if column_name.endswith('_id') else row_no % 10
+    if python_type is str:
+        return get_seed_string(column_name, getattr(column.type, 'length', None), row_no, column_name in unique_columns)
+    seed_type_value = SEED_TYPE_VALUES.get(python_type)
+
+    return seed_type_value(row_no) if seed_type_value else None
+
+
+def get_seed_string(column_name: str, length: Optional[int], row_no: int, unique: bool) -> str:
+    """
+    生成字符串字段的样例数据
+
+    :param column_name: 字段名
+    :param length: 字段长度
+    :param row_no: 行号
+    :param unique: 字段是否唯一
+    :return: 字段值
+    """
+    if unique:
+        value = f'{column_name}_{row_no}'
+        return value[-length:] if length else value
+    if length and length <= SEED_FLAG_MAX_LENGTH:
+        flag = row_no % 10
+        return (
+            '0'.zfill(length) if flag < SEED_FLAG_DEFAULT_ROWS else str(flag - SEED_FLAG_DEFAULT_ROWS + 1).zfill(length)
+        )
+    value = f'{column_name}_{row_no % SEED_STRING_CARDINALITY}'
+
+    return value[:length] if length else value
+
+
+def create_seeded_engine() -> Engine:
+    """
+    创建内存SQLite数据库，按模型建表并写入样例数据
+
+    :return: 数据库引擎
+    """
+    engine = create_engine('sqlite://')
+    with engine.begin() as connection:
+        for metadata in get_metadata_list():
+            for table in metadata.tables.values():
+                # SQLite不支持联合主键自增，样例数据显式写入主键
+                if len(table.primary_key.columns) > 1:
+                    for column in table.primary_key.columns:
+                        column.autoincrement = False
+            metadata.create_all(connection)
+            for table in metadata.sorted_tables:
+                unique_columns = {column.name for column in table.primary_key.columns}
+                for constraint in table.constraints:
+                    if isinstance(constraint, UniqueConstraint):
+                        unique_columns.update(column.name for column in constraint.columns)
+                for index in table.indexes:
+                    if index.unique:
+                        unique_columns.update(column.name for column in index.columns)
+                unique_columns.update(column.name for column in table.columns if column.unique)
+                connection.execute(
+                    insert(table),
+                    [
+                        {
+                            column.name: get_seed_value(table, column.name, row_no, unique_columns)
+                            for column in table.columns
+                        }
+                        for row_no in range(1, SEED_ROW_COUNT + 1)
+                    ],
+                )
+                # 以FTS5虚拟表模拟可搜索字段的全文索引
+                SearchUtil.create_sqlite_search_tables(connection, table)
+        # 收集统计信息，使SQLite按数据分布选择索引并估算读取行数
+        connection.execute(text('ANALYZE'))
+
+    return engine
+
+
+def get_param_value(param_name: str, annotation: Any, for_query_object: bool) -> Any:
+    """
+    按参数名称及类型构造代表性参数值
+
+    :param param_name: 参数名称
+    :param annotation: 参数类型注解
+    :param for_query_object: 是否为列表查询条件参数
+    :return: 参数值
+    """
+    if param_name in REPRESENTATIVE_PARAMS:
+        return REPRESENTATIVE_PARAMS[param_name]
+    origin, args = typing.get_origin(annotation), typing.get_args(annotation)
+    if origin is Union:
+        return get_param_value(param_name, next(arg for arg in args if arg is not type(None)), for_query_object)
+    if annotation is int:
+        return 1
+    if annotation is str:
+        return f'{param_name}_1'
+    if annotation is bool:
+        return False
+    if annotation is ColumnElement:
+        return or_(True)
+    if inspect.isclass(annotation) and issubclass(annotation, BaseModel):
+        return get_model_param_value(param_name, annotation, for_query_object)
+    if (origin is list or annotation is list) and param_name.endswith(('_ids', '_id_list')):
+        return [1, 2, 3]
+    if origin is list and args == (str,):
+        column_name = param_name.removesuffix('_list').removesuffix('s')
+        return [f'{column_name}_{row_no}' for row_no in (1, 2, 3)]
+    raise UnsupportedParamError(f'参数{param_name}为写入数据，由调用方构造')
+
+
+def get_model_param_value(param_name: str, model: type[BaseModel], for_query_object: bool) -> BaseModel:
+    """
+    构造pydantic模型参数，列表查询条件不设置筛选条件，其他模型设置id类字段
+
+    :param param_name: 参数名称
+    :param model: pydantic模型
+    :param for_query_object: 是否为列表查询条件参数
+    :return: 模型对象
+    """
+    field_values = {}
+    if not for_query_object:
+        for field_name, field in model.model_fields.items():
+            if field_name.endswith('_id') and int in (field.annotation, *typing.get_args(field.annotation)):
+                field_values[field.alias or field_name] = 1
+    try:
+        return model(**field_values)
+    except ValidationError as e:
+        raise UnsupportedParamError(f'参数{param_name}无法构造：{e.errors()[0]["msg"]}') from e
+    except ModelValidatorException as e:
+        raise UnsupportedParamError(f'参数{param_name}无法构造：{e.message}') from e
+
+
+def build_arguments(method: Callable[..., Any], overrides: dict[str, Any]) -> dict[str, Any]:
+    """
+    构造DAO方法除数据库会话外的代表性参数
+
+    :param method: DAO方法
+    :param overrides: 覆盖的参数
+    :return: 参数字典
+    """
+    arguments = {}
+    type_hints = typing.get_type_hints(method)
+    for index, (param_name, param) in enumerate(inspect.signature(method).parameters.items()):
+        if index == 0:
+            continue
+        if param_name in overrides:
+            arguments[param_name] = overrides[param_name]
+        elif param_name == 'is_page':
+            arguments[param_name] = True
+        elif param.default is not inspect.Parameter.empty:
+            continue
+        else:
+            arguments[param_name] = get_param_value(
+                param_name, type_hints.get(param_name, param.annotation), param_name in QUERY_OBJECT_PARAMS
+            )
+
+    return arguments
+
+
+def compile_statement(statement: Executable) -> dict[str, str]:
+    """
+    将语句编译为各方言的SQL
+
+    :param statement: sqlalchemy语句
+    :return: 方言名称与SQL的映射字典，编译失败时记录失败原因
+    """
+    return {dialect_name: compile_for_dialect(statement, dialect) for dialect_name, dialect in COMPILE_DIALECTS.items()}
+
+
+def compile_for_dialect(statement: Executable, dialect: Dialect) -> str:
+    """
+    将语句编译为指定方言的SQL
+
+    :param statement: sqlalchemy语句
+    :param dialect: 方言
+    :return: SQL，编译失败时返回失败原因
+    """
+    try:
+        return str(statement.compile(dialect=dialect, compile_kwargs={'render_postcompile': True}))
+    except Exception as e:
+        return f'编译失败：{e.__class__.__name__}: {str(e).splitlines()[0]}'
+
+
+def describe_statement(
+    session: Session, statement: Executable, table_stats: dict[str, dict[Optional[str], list[int]]]
+) -> dict[str, Any]:
+    """
+    获取语句的SQL、执行计划及估算读取行数
+
+    :param session: 数据库会话
+    :param statement: sqlalchemy语句
+    :param table_stats: 统计信息
+    :return: 语句分析结果
+    """
+    plan_rows = QueryPlanUtil.get_sqlite_query_plan_rows(session.connection(), statement)
+    table_aliases = QueryPlanUtil.get_table_aliases(statement)
+    table_access = []
+    # 同一父节点下的数据表访问为嵌套循环，内层读取行数按外层行数累乘
+    loop_rows: dict[int, int] = {}
+    estimated_rows = 0
+    for _, parent_id, detail in plan_rows:
+        matched = QueryPlanUtil.TABLE_ACCESS_PATTERN.match(detail.strip())
+        table_name = table_aliases.get(matched.group('table')) if matched else None
+        if table_name is None:
+            continue
+        # 访问方式：SEARCH 索引名（按索引查找）、SCAN 索引名（按索引顺序读取全部数据）、SCAN（全表扫描）
+        index_name = matched.group('index') or matched.group('pk')
+        access = f'{matched.group("access")} {index_name}' if index_name else 'SCAN'
+        rows = QueryPlanUtil.estimate_access_rows(detail, table_stats.get(table_name, {})) or 0
+        loop_rows[parent_id] = loop_rows.get(parent_id, 1) * max(rows, 1)
+        estimated_rows += loop_rows[parent_id]
+        table_access.append({'table': table_name, 'access': access, 'rows': rows})
+
+    return {
+        'sql': compile_statement(statement),
+        'plan': [detail for _, _, detail in plan_rows],
+        'tables': table_access,
+        'estimated_rows': estimated_rows,
+    }
+
+
+async def analyze_case(
+    engine: Engine,
+    table_stats: dict[str, dict[Optional[str], list[int]]],
+    method: Callable[..., Any],
+    overrides: dict[str, Any],
+) -> dict[str, Any]:
+    """
+    执行DAO方法并分析其中的各条语句
+
+    :param engine: 数据库引擎
+    :param table_stats: 统计信息
+    :param method: DAO方法
+    :param overrides: 覆盖的参数
+    :return: 检查项分析结果
+    """
+    try:
+        arguments = build_arguments(method, overrides)
+    except UnsupportedParamError as e:
+        return {'skipped': str(e)}
+    with Session(engine) as session:
+        db = QueryPlanSession(session)
+        try:
+            await method(db, **arguments)
+            statements = [
+                describe_statement(session, statement, table_stats)
+                for statement in db.statements
+                if QueryPlanUtil.is_explainable(statement)
+            ]
+        except Exception as e:
+            # 仅记录异常类型，异常信息可能随运行变化（如集合的迭代顺序）
+            return {'error': e.__class__.__name__}
+        finally:
+            session.rollback()
+
+    return {'statements': statements}
+
+
+def compare_case(
+    case_name: str, expected: dict[str, Any], actual: dict[str, Any], threshold: float
+) -> tuple[list[str], list[str]]:
+    """
+    比对检查项的分析结果与快照
+
+    :param case_name: 检查项名称
+    :param expected: 快照中的分析结果
+    :param actual: 本次分析结果
+    :param threshold: 估算读取行数增长倍数阈值
+    :return: (回归信息列表, 快照过期信息列表)
+    """
+    regressions, outdated = [], []
+    if 'error' in actual:
+        regressions.append(f'{case_name}：执行失败，{actual["error"]}')
+        return regressions, outdated
+    if expected != actual:
+        outdated.append(f'{case_name}：分析结果与快照不一致')
+    expected_statements, actual_statements = expected.get('statements', []), actual.get('statements', [])
+    if len(expected_statements) != len(actual_statements):
+        outdated.append(f'{case_name}：语句数由{len(expected_statements)}变为{len(actual_statements)}')
+    for index, (expected_statement, actual_statement) in enumerate(zip(expected_statements, actual_statements), 1):
+        expected_tables = {
+            item['table'] for item in expected_statement['tables'] if item['access'].startswith('SEARCH')
+        }
+        for table_name in sorted(expected_tables):
+            actual_access = [item['access'] for item in actual_statement['tables'] if item['table'] == table_name]
+            if not any(access.startswith('SEARCH') for access in actual_access):
+                regressions.append(
+                    f'{case_name}：第{index}条语句访问{table_name}由索引查找变为扫描（{"、".join(actual_access)}）'
+                )
+        expected_rows, actual_rows = expected_statement['estimated_rows'], actual_statement['estimated_rows']
+        if actual_rows > expected_rows * threshold and actual_rows - expected_rows > ROW_GROWTH_MIN_ROWS:
+            regressions.append(f'{case_name}：第{index}条语句估算读取行数由{expected_rows}增长至{actual_rows}')
+        for dialect_name, sql in actual_statement['sql'].items():
+            if sql.startswith('编译失败') and not expected_statement['sql'].get(dialect_name, '').startswith(
+                '编译失败'
+            ):
+                regressions.append(f'{case_name}：第{index}条语句{dialect_name}方言{sql}')
+
+    return regressions, outdated
+
+
+def update_snapshots(results: dict[str, dict[str, Any]], case_count: int, statement_count: int) -> int:
+    """
+    以本次分析结果更新快照，存在执行失败的检查项时不更新，执行失败的结果不作为快照基准
+
+    :param results: 模块名与{检查项名称: 分析结果}的映射字典
+    :param case_count: 检查项数
+    :param statement_count: 语句数
+    :return: 退出码
+    """
+    failed_cases = [
+        f'{case_name}：执行失败，{result["error"]}'
+        for cases in results.values()
+        for case_name, result in cases.items()
+        if 'error' in result
+    ]
+    if failed_cases:
+        for message in failed_cases:
+            print(f'❌️ {message}')
+        print(f'{len(failed_cases)}项执行失败，请修复DAO方法或将其加入SKIPPED_METHODS后再更新快照')
+        return 1
+    save_snapshots(results)
+    print(f'已更新{len(results)}个模块的快照，共{case_count}项、{statement_count}条语句')
+
+    return 0
+
+
+def load_snapshots() -> dict[str, dict[str, Any]]:
+    """
+    读取已提交的快照
+
+    :return: 模块名与{检查项名称: 分析结果}的映射字典
+    """
+    return {
+        snapshot_file.stem: json.loads(snapshot_file.read_text(encoding='utf-8'))
+        for snapshot_file in sorted(SNAPSHOT_DIR.glob('*.json'))
+    }
+
+
+def save_snapshots(snapshots: dict[str, dict[str, Any]]) -> None:
+    """
+    写入快照
+
+    :param snapshots: 模块名与{检查项名称: 分析结果}的映射字典
+    :return:
+    """
+    SNAPSHOT_DIR.mkdir(exist_ok=True)
+    for snapshot_file in SNAPSHOT_DIR.glob('*.json'):
+        if snapshot_file.stem not in snapshots:
+            snapshot_file.unlink()
+    for module_name, cases in snapshots.items():
+        (SNAPSHOT_DIR / f'{module_name}.json').write_text(
+            json.dumps(cases, ensure_ascii=False, indent=2, sort_keys=True) + '\n', encoding='utf-8'
+        )
+
+
+async def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description='DAO查询执行计划回归检查')
+    parser.add_argument('--env', type=str, default='', help='运行环境')
+    parser.add_argument('--update', action='store_true', help='以本次分析结果更新快照')
+    parser.add_argument(
+        '--threshold', type=float, default=DEFAULT_ROW_GROWTH_THRESHOLD, help='估算读取行数增长倍数阈值'
+    )
+    args = parser.parse_args(argv)
+
+    dao_methods = discover_dao_methods()
+    cases: dict[str, tuple[str, str, dict[str, Any]]] = {
+        method_key: (method_key, module_name, {}) for method_key, (module_name, _) in dao_methods.items()
+    }
+    for case_name, (method_key, overrides) in CASE_PARAMS.items():
+        cases[case_name] = (method_key, dao_methods[method_key][0], overrides)
+    engine = create_seeded_engine()
+    with engine.connect() as connection:
+        table_stats = QueryPlanUtil.get_sqlite_table_stats(connection)
+    results: dict[str, dict[str, Any]] = {}
+    for case_name, (method_key, module_name, overrides) in sorted(cases.items()):
+        if method_key in SKIPPED_METHODS:
+            result = {'skipped': SKIPPED_METHODS[method_key]}
+        elif method_key.split('.')[-1].startswith(INSERT_ONLY_PREFIXES) and case_name not in CASE_PARAMS:
+            result = {'skipped': '仅新增数据，无需分析执行计划'}
+        else:
+            result = await analyze_case(engine, table_stats, dao_methods[method_key][1], overrides)
+        results.setdefault(module_name, {})[case_name] = result
+    engine.dispose()
+
+    statement_count = sum(len(result.get('statements', [])) for cases in results.values() for result in cases.values())
+    case_count = sum(len(cases) for cases in results.values())
+    if args.update:
+        return update_snapshots(results, case_count, statement_count)
+
+    snapshots = load_snapshots()
+    regressions, outdated = [], []
+    for module_name, module_cases in results.items():
+        for case_name, actual in module_cases.items():
+            expected = snapshots.get(module_name, {}).get(case_name)
+            if expected is None:
+                outdated.append(f'{case_name}：快照中不存在')
+                continue
+            case_regressions, case_outdated = compare_case(case_name, expected, actual, args.threshold)
+            regressions.extend(case_regressions)
+            outdated.extend(case_outdated)
+    for message in outdated:
+        print(f'⚠️ {message}')
+    for message in regressions:
+        print(f'❌️ {message}')
+    print(f'共{case_count}项、{statement_count}条语句，回归{len(regressions)}处，快照过期{len(outdated)}处')
+    if outdated and not regressions:
+        print('执行计划变化未超出阈值，确认符合预期后请使用 --update 更新快照')
+
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
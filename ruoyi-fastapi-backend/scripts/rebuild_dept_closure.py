@@ -0,0 +1,37 @@
+"""
+重建部门闭包表
+
+根据部门表的祖级列表在一个事务中删除并重新写入全部部门闭包关系，完成后清除所有用户的数据权限缓存，
+用于历史数据修复或直接修改部门表后的校正；与应用启动时的回填共用redis锁，其他进程正在重建时退出
+
+使用方法（在ruoyi-fastapi-backend目录下执行）：python -m scripts.rebuild_dept_closure --env=prod
+"""
+
+import asyncio
+import sys
+
+from config.database import AsyncSessionLocal, async_engine
+from config.get_redis import RedisUtil
+from exceptions.exception import ServiceException
+from module_admin.service.dept_service import DeptService
+from utils.log_util import logger
+
+
+async def main() -> int:
+    redis = await RedisUtil.create_redis_pool()
+    try:
+        async with AsyncSessionLocal() as session:
+            closure_count = await DeptService.rebuild_dept_closure_services(session, redis)
+    except ServiceException as e:
+        logger.error(f'❌️ {e.message}')
+        return 1
+    finally:
+        await redis.aclose()
+        await async_engine.dispose()
+    logger.info(f'✅️ 部门闭包表重建完成，共{closure_count}条关系')
+
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(asyncio.run(main()))
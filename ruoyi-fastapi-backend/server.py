@@ -7,14 +7,20 @@ from fastapi.responses import HTMLResponse
 
 from common.router import auto_register_routers
 from config.env import AppConfig
-from config.get_db import init_create_table
+from config.get_db import init_create_table, init_dept_closure
+from config.get_enterprise_suggest import EnterpriseSuggestUtil
+from config.get_export_worker import ExportWorkerUtil
+from config.get_log_writer import LogWriterUtil
+from config.get_prefect_stats import PrefectStatsUtil
 from config.get_redis import RedisUtil
 from config.get_scheduler import SchedulerUtil
 from exceptions.handle import handle_exception
 from middlewares.handle import handle_middleware
 from sub_applications.handle import handle_sub_applications
 from utils.common_util import worship
+from utils.count_util import CountUtil
 from utils.log_util import logger
+from utils.pwd_util import PwdUtil
 
 
 # 生命周期事件
@@ -24,13 +30,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     worship()
     await init_create_table()
     app.state.redis = await RedisUtil.create_redis_pool()
+    await init_dept_closure(app.state.redis)
+    CountUtil.init_count_util(app.state.redis)
     await RedisUtil.init_sys_dict(app.state.redis)
     await RedisUtil.init_sys_config(app.state.redis)
+    await RedisUtil.init_online_session(app.state.redis)
     await SchedulerUtil.init_system_scheduler()
+    await LogWriterUtil.init_log_writer()
+    await ExportWorkerUtil.init_export_worker()
+    await PrefectStatsUtil.init_prefect_stats(app.state.redis)
+    await EnterpriseSuggestUtil.init_enterprise_suggest(app.state.redis)
     logger.info(f'🚀 {AppConfig.app_name}启动成功')
     yield
+    await EnterpriseSuggestUtil.close_enterprise_suggest()
+    await PrefectStatsUtil.close_prefect_stats()
+    await ExportWorkerUtil.close_export_worker()
+    await LogWriterUtil.close_log_writer()
     await RedisUtil.close_redis_pool(app)
     await SchedulerUtil.close_system_scheduler()
+    PwdUtil.shutdown_executor()
 
 
 def setup_docs_static_resources(
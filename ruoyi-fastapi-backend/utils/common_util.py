@@ -2,7 +2,8 @@ import io
 import os
 import re
 from collections.abc import Generator, Sequence
-from typing import Any, Literal, Union, overload
+from functools import lru_cache
+from typing import Any, Callable, Literal, Union, overload
 
 import pandas as pd
 from openpyxl import Workbook
@@ -49,6 +50,27 @@ class SqlalchemyUtil:
     sqlalchemy工具类
     """
 
+    # 按ORM模型类及转换形式缓存的键名映射
+    _base_key_map_cache: dict[tuple[type, str], dict[str, str]] = {}
+    # 按Row字段组合及转换形式缓存的转换后字段名
+    _row_fields_cache: dict[tuple[tuple[str, ...], str], tuple[str, ...]] = {}
+
+    @classmethod
+    def get_key_converter(
+        cls, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake']
+    ) -> Union[Callable[[str], str], None]:
+        """
+        获取带缓存的键名转换方法
+
+        :param transform_case: 转换得到的结果形式
+        :return: 键名转换方法，不转换时返回None
+        """
+        if transform_case == 'snake_to_camel':
+            return _cached_snake_to_camel
+        if transform_case == 'camel_to_snake':
+            return _cached_camel_to_snake
+        return None
+
     @classmethod
     def base_to_dict(
         cls, obj: Union[Base, dict], transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake'] = 'no_case'
@@ -60,21 +82,52 @@ class SqlalchemyUtil:
         :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
         :return: 字典结果
         """
+        converter = cls.get_key_converter(transform_case)
         if isinstance(obj, Base):
-            base_dict = obj.__dict__.copy()
-            base_dict.pop('_sa_instance_state', None)
-            for name, value in base_dict.items():
-                if isinstance(value, InstrumentedList):
-                    base_dict[name] = cls.serialize_result(value, 'snake_to_camel')
-        elif isinstance(obj, dict):
+            # 模型对象按类缓存键名映射，单次遍历完成取值及键名转换
+            key_map = cls._base_key_map_cache.get((type(obj), transform_case))
+            if key_map is None:
+                key_map = cls._base_key_map_cache.setdefault((type(obj), transform_case), {})
+            base_dict = {}
+            for name, value in obj.__dict__.items():
+                if name == '_sa_instance_state':
+                    continue
+                key = name
+                if converter is not None:
+                    key = key_map.get(name)
+                    if key is None:
+                        key = key_map[name] = converter(name)
+                base_dict[key] = (
+                    cls.serialize_result(value, 'snake_to_camel') if isinstance(value, InstrumentedList) else value
+                )
+            return base_dict
+        if converter is None:
             base_dict = obj.copy()
             base_dict.pop('_sa_instance_state', None)
-        if transform_case == 'snake_to_camel':
-            return {CamelCaseUtil.snake_to_camel(k): v for k, v in base_dict.items()}
-        if transform_case == 'camel_to_snake':
-            return {SnakeCaseUtil.camel_to_snake(k): v for k, v in base_dict.items()}
+            return base_dict
 
-        return base_dict
+        return {converter(k): v for k, v in obj.items() if k != '_sa_instance_state'}
+
+    @classmethod
+    def row_to_dict(
+        cls, row: Row, transform_case: Literal['no_case', 'snake_to_camel', 'camel_to_snake'] = 'no_case'
+    ) -> dict:
+        """
+        将不包含模型对象的sqlalchemy查询结果行转换为字典，按字段组合缓存转换后的字段名
+
+        :param row: sqlalchemy查询结果行
+        :param transform_case: 转换得到的结果形式，可选的有'no_case'(不转换)、'snake_to_camel'(下划线转小驼峰)、'camel_to_snake'(小驼峰转下划线)，默认为'no_case'
+        :return: 字典结果
+        """
+        fields = row._fields
+        cache_key = (fields, transform_case)
+        converted_fields = cls._row_fields_cache.get(cache_key)
+        if converted_fields is None:
+            converter = cls.get_key_converter(transform_case)
+            converted_fields = tuple(converter(field) for field in fields) if converter else fields
+            cls._row_fields_cache[cache_key] = converted_fields
+
+        return dict(zip(converted_fields, row))
 
     @classmethod
     @overload
@@ -144,12 +197,7 @@ class SqlalchemyUtil:
                 return [cls.base_to_dict(row, transform_case) for row in result]
             if any(isinstance(row, Base) for row in result):
                 return [cls.serialize_result(row, transform_case) for row in result]
-            result_dict = result._asdict()
-            if transform_case == 'snake_to_camel':
-                return {CamelCaseUtil.snake_to_camel(k): v for k, v in result_dict.items()}
-            if transform_case == 'camel_to_snake':
-                return {SnakeCaseUtil.camel_to_snake(k): v for k, v in result_dict.items()}
-            return result_dict
+            return cls.row_to_dict(result, transform_case)
         return result
 
     @classmethod
@@ -287,6 +335,28 @@ class SnakeCaseUtil:
         return SqlalchemyUtil.serialize_result(result=result, transform_case='camel_to_snake')
 
 
+@lru_cache(maxsize=4096)
+def _cached_snake_to_camel(snake_str: str) -> str:
+    """
+    带缓存的下划线形式转小驼峰形式方法，每个键名仅转换一次
+
+    :param snake_str: 下划线形式字符串
+    :return: 小驼峰形式字符串
+    """
+    return CamelCaseUtil.snake_to_camel(snake_str)
+
+
+@lru_cache(maxsize=4096)
+def _cached_camel_to_snake(camel_str: str) -> str:
+    """
+    带缓存的小驼峰形式转下划线形式方法，每个键名仅转换一次
+
+    :param camel_str: 小驼峰形式字符串
+    :return: 下划线形式字符串
+    """
+    return SnakeCaseUtil.camel_to_snake(camel_str)
+
+
 def bytes2human(n: int, format_str: str = '%(value).1f%(symbol)s') -> str:
     """Used by various scripts. See:
     http://goo.gl/zeJZl
@@ -0,0 +1,245 @@
+import asyncio
+import hashlib
+import json
+from typing import Any, Literal, Optional, Union
+
+from redis import asyncio as aioredis
+from sqlalchemy import Select, event, func, select, text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import ORMExecuteState, Session
+from sqlalchemy.sql.util import find_tables
+
+from common.enums import RedisInitKeyConfig
+from config.env import AppConfig
+from utils.log_util import logger
+
+# 分页总数统计方式：exact精确统计 cached缓存精确统计结果 estimated超过阈值的大表使用执行计划估算
+# cached模式在同一进程内写入提交后的统计会等待表版本号自增完成，读到的总数与提交后的数据一致；
+# 其他工作进程在版本号自增的一次redis往返期间仍可能读到旧总数，自增失败时旧总数最多保留缓存有效期（app_page_count_cache_ttl）
+CountMode = Literal['exact', 'cached', 'estimated']
+
+
+class CountUtil:
+    """
+    分页总数统计工具类
+
+    cached模式以 page_count:{hash} 缓存统计结果，hash由查询语句、参数及所涉及表的版本号计算，
+    表发生写入并提交后版本号自增，使相关缓存自然失效；estimated模式在表统计行数超过阈值时
+    使用EXPLAIN估算行数，未超过阈值时按cached模式处理
+    """
+
+    _redis: Union[aioredis.Redis, None] = None
+    _pending_tasks: set['asyncio.Task[None]'] = set()
+
+    @classmethod
+    def init_count_util(cls, redis: aioredis.Redis) -> None:
+        """
+        应用启动时初始化统计缓存所用的redis连接，并注册表写入监听以维护表版本号
+
+        :param redis: redis对象
+        :return:
+        """
+        cls._redis = redis
+        if not event.contains(Session, 'after_flush', cls._collect_flushed_tables):
+            event.listen(Session, 'after_flush', cls._collect_flushed_tables)
+            event.listen(Session, 'do_orm_execute', cls._collect_executed_tables)
+            event.listen(Session, 'after_commit', cls._bump_committed_tables)
+            event.listen(Session, 'after_rollback', cls._discard_collected_tables)
+
+    @classmethod
+    def get_table_version_key(cls) -> str:
+        """
+        获取表版本号缓存键名
+
+        :return: 缓存键名
+        """
+        return f'{RedisInitKeyConfig.PAGE_COUNT.key}:version'
+
+    @classmethod
+    async def count(cls, db: AsyncSession, query: Select, count_mode: CountMode = 'exact') -> tuple[int, bool]:
+        """
+        按指定方式统计查询语句的结果总数
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param count_mode: 统计方式
+        :return: (结果总数, 是否为精确值)
+        """
+        if count_mode == 'estimated':
+            estimated_total = await cls._get_estimated_count(db, query)
+            if estimated_total is not None:
+                return estimated_total, False
+            count_mode = 'cached'
+        if count_mode == 'cached' and cls._redis is not None:
+            return await cls._get_cached_count(db, query), True
+
+        return await cls._get_exact_count(db, query), True
+
+    @classmethod
+    async def _get_exact_count(cls, db: AsyncSession, query: Select) -> int:
+        """
+        精确统计查询语句的结果总数
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :return: 结果总数
+        """
+        return (await db.execute(select(func.count('*')).select_from(query.order_by(None).subquery()))).scalar() or 0
+
+    @classmethod
+    async def _get_cached_count(cls, db: AsyncSession, query: Select) -> int:
+        """
+        读取缓存的统计结果，未命中时精确统计并写入缓存
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :return: 结果总数
+        """
+        if cls._pending_tasks:
+            # 等待本进程已提交写入的表版本号自增完成，避免写入后的列表查询命中旧版本号下缓存的总数
+            await asyncio.gather(*cls._pending_tasks, return_exceptions=True)
+        table_names = sorted({table.name for table in find_tables(query, include_joins=True)})
+        table_versions = await cls._redis.hmget(cls.get_table_version_key(), table_names) if table_names else []
+        compiled = query.order_by(None).compile(dialect=db.bind.dialect, compile_kwargs={'render_postcompile': True})
+        fingerprint = json.dumps(
+            [str(compiled), sorted(compiled.params.items()), table_names, table_versions],
+            default=str,
+            ensure_ascii=False,
+        )
+        cache_key = f'{RedisInitKeyConfig.PAGE_COUNT.key}:{hashlib.sha1(fingerprint.encode("utf-8")).hexdigest()}'
+        cache_value = await cls._redis.get(cache_key)
+        if cache_value is not None:
+            return int(cache_value)
+        total = await cls._get_exact_count(db, query)
+        await cls._redis.set(cache_key, total, ex=AppConfig.app_page_count_cache_ttl)
+
+        return total
+
+    @classmethod
+    async def _get_estimated_count(cls, db: AsyncSession, query: Select) -> Optional[int]:
+        """
+        主表统计行数超过阈值时，使用EXPLAIN估算查询语句的结果总数
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :return: 估算的结果总数，数据库不支持或未超过阈值时返回None
+        """
+        dialect_name = db.bind.dialect.name
+        entity = query.column_descriptions[0].get('entity') if query.column_descriptions else None
+        table = getattr(entity, '__table__', None)
+        if dialect_name not in ('mysql', 'postgresql') or table is None:
+            return None
+        if dialect_name == 'mysql':
+            table_rows = (
+                await db.execute(
+                    text(
+                        'SELECT TABLE_ROWS FROM information_schema.TABLES '
+                        'WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = :table_name'
+                    ),
+                    {'table_name': table.name},
+                )
+            ).scalar()
+        else:
+            table_rows = (
+                await db.execute(
+                    text('SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(:table_name)'),
+                    {'table_name': table.name},
+                )
+            ).scalar()
+        if table_rows is None or table_rows < AppConfig.app_page_count_estimate_threshold:
+            return None
+        compiled = query.order_by(None).compile(dialect=db.bind.dialect, compile_kwargs={'render_postcompile': True})
+        parameters: Any = (
+            tuple(compiled.params[name] for name in compiled.positiontup) if compiled.positional else compiled.params
+        )
+        try:
+            # 在保存点内执行，估算失败时不影响当前事务
+            async with db.begin_nested():
+                connection = await db.connection()
+                if dialect_name == 'mysql':
+                    # 以驱动表的预估扫描行数及过滤比例估算结果总数
+                    explain_row = (
+                        (await connection.exec_driver_sql(f'EXPLAIN {compiled}', parameters)).mappings().first()
+                    )
+                    return int((explain_row['rows'] or 0) * (explain_row['filtered'] or 100) / 100)
+                explain_result = (
+                    await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}', parameters)
+                ).scalar()
+                explain_plan = json.loads(explain_result) if isinstance(explain_result, str) else explain_result
+                return int(explain_plan[0]['Plan']['Plan Rows'])
+        except Exception as e:
+            logger.warning(f'执行计划估算总数失败，将改为精确统计，详细错误信息：{e}')
+            return None
+
+    @classmethod
+    def _collect_flushed_tables(cls, session: Session, flush_context: Any) -> None:
+        """
+        记录本次flush写入的表
+
+        :param session: 同步会话对象
+        :param flush_context: flush上下文
+        :return:
+        """
+        tables: set[str] = session.info.setdefault('count_dirty_tables', set())
+        for instance in (*session.new, *session.dirty, *session.deleted):
+            table = getattr(instance, '__table__', None)
+            if table is not None:
+                tables.add(table.name)
+
+    @classmethod
+    def _collect_executed_tables(cls, orm_execute_state: ORMExecuteState) -> None:
+        """
+        记录通过insert/update/delete语句写入的表
+
+        :param orm_execute_state: 语句执行状态
+        :return:
+        """
+        if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+            table = getattr(orm_execute_state.statement, 'table', None)
+            if table is not None and getattr(table, 'name', None):
+                orm_execute_state.session.info.setdefault('count_dirty_tables', set()).add(table.name)
+
+    @classmethod
+    def _discard_collected_tables(cls, session: Session) -> None:
+        """
+        事务回滚后丢弃已记录的写入表
+
+        :param session: 同步会话对象
+        :return:
+        """
+        session.info.pop('count_dirty_tables', None)
+
+    @classmethod
+    def _bump_committed_tables(cls, session: Session) -> None:
+        """
+        事务提交后异步自增写入表的版本号
+
+        :param session: 同步会话对象
+        :return:
+        """
+        tables = session.info.pop('count_dirty_tables', None)
+        if not tables or cls._redis is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(cls._bump_table_version(sorted(tables)))
+        cls._pending_tasks.add(task)
+        task.add_done_callback(cls._pending_tasks.discard)
+
+    @classmethod
+    async def _bump_table_version(cls, table_names: list[str]) -> None:
+        """
+        自增表版本号
+
+        :param table_names: 表名列表
+        :return:
+        """
+        try:
+            async with cls._redis.pipeline(transaction=False) as pipe:
+                for table_name in table_names:
+                    pipe.hincrby(cls.get_table_version_key(), table_name, 1)
+                await pipe.execute()
+        except Exception as e:
+            logger.warning(f'分页统计缓存表版本号更新失败，详细错误信息：{e}')
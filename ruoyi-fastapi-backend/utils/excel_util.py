@@ -1,10 +1,386 @@
+import asyncio
 import io
+import os
+import tempfile
+from collections.abc import AsyncGenerator, Awaitable
+from datetime import date, datetime, time
+from decimal import Decimal
+from itertools import islice
+from typing import Any, BinaryIO, Callable, Optional, get_args
 
+import aiofiles
 import pandas as pd
-from openpyxl import Workbook
-from openpyxl.styles import Alignment, PatternFill
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.cell.cell import ILLEGAL_CHARACTERS_RE
+from openpyxl.styles import Alignment, Font, PatternFill
 from openpyxl.utils import get_column_letter
 from openpyxl.worksheet.datavalidation import DataValidation
+from pydantic import BaseModel, ValidationError
+from pydantic_validation_decorator import FieldValidationError
+from sqlalchemy import Select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from common.vo import ImportResultModel
+from exceptions.exception import ServiceException
+from utils.common_util import CamelCaseUtil
+from utils.log_util import logger
+
+# 导出行处理方法：入参为小驼峰形式的查询结果行，返回用于导出的字典
+ExportRowHandler = Callable[[Any], dict[str, Any]]
+# 导出参数：(查询语句, 映射字典, 导出行处理方法)
+ExcelExportParams = tuple[Select, dict, Optional[ExportRowHandler]]
+# 导出进度回调方法：入参为已写入的数据行数
+ExportProgressHandler = Callable[[int], Awaitable[None]]
+# 导入时查询已存在数据的方法：入参为(orm对象, 业务键列表)，返回业务键到已存在数据行的字典
+ImportExistingGetter = Callable[[AsyncSession, list[str]], Awaitable[dict[str, Any]]]
+# 导入时批量写入数据的方法：入参为(orm对象, 待写入的字典列表)
+ImportWriteHandler = Callable[[AsyncSession, list[dict[str, Any]]], Awaitable[None]]
+# 导入时校验已存在数据能否被更新的方法：入参为已存在数据行，返回错误信息，可更新时返回None
+ImportExistingChecker = Callable[[Any], Optional[str]]
+
+
+class ExcelStreamWriter:
+    """
+    基于openpyxl只写模式的Excel写入器，数据行直接写入临时文件，内存占用与导出行数无关
+    """
+
+    def __init__(self, file_path: str, mapping_dict: dict) -> None:
+        """
+        初始化Excel写入器并写入表头
+
+        :param file_path: Excel文件路径
+        :param mapping_dict: 映射字典
+        :return:
+        """
+        self.file_path = file_path
+        self.keys = list(mapping_dict.keys())
+        self._workbook = Workbook(write_only=True)
+        self._worksheet = self._workbook.create_sheet()
+        header_font = Font(bold=True)
+        header_row = []
+        for header in mapping_dict.values():
+            cell = WriteOnlyCell(self._worksheet, value=header)
+            cell.font = header_font
+            header_row.append(cell)
+        self._worksheet.append(header_row)
+
+    def append_rows(self, rows: list[dict[str, Any]]) -> None:
+        """
+        按映射字典的字段顺序写入一批数据行
+
+        :param rows: 数据行列表
+        :return:
+        """
+        for row in rows:
+            self._worksheet.append([self._get_cell_value(row.get(key)) for key in self.keys])
+
+    def save(self) -> None:
+        """
+        保存Excel文件
+
+        :return:
+        """
+        self._workbook.save(self.file_path)
+        self._workbook.close()
+
+    def discard(self) -> None:
+        """
+        放弃未完成的写入，关闭并删除工作表的临时文件
+
+        :return:
+        """
+        try:
+            self._worksheet.close()
+            self._worksheet._writer.cleanup()
+        except Exception as e:
+            logger.warning(f'Excel临时文件清理失败，详细错误信息：{e}')
+
+    @staticmethod
+    def _get_cell_value(value: Any) -> Any:
+        """
+        将数据转换为可写入单元格的值
+
+        :param value: 原始数据
+        :return: 单元格的值
+        """
+        if value is None or isinstance(value, (bool, int, float, Decimal, datetime, date, time)):
+            return value
+        return ILLEGAL_CHARACTERS_RE.sub('', str(value))
+
+
+class ExcelImporter:
+    """
+    基于openpyxl只读模式的Excel导入器，按块读取、校验并批量写入数据，内存占用与导入行数无关
+
+    表头通过映射字典声明式地对应到pydantic模型字段，每块数据以业务键一次查询已存在的数据，
+    不存在的新增、已存在的更新，校验失败的行记录行号及原因；dry_run模式仅校验并统计，不写入数据库
+    """
+
+    # 每块读取、校验及写入的行数
+    IMPORT_CHUNK_SIZE = 500
+    # 返回的错误信息条数上限
+    IMPORT_MAX_ERRORS = 1000
+
+    def __init__(
+        self,
+        model: type[BaseModel],
+        header_dict: dict[str, str],
+        key_field: str,
+        pk_field: str,
+        existing_getter: ImportExistingGetter,
+        insert_handler: ImportWriteHandler,
+        update_handler: ImportWriteHandler,
+        existing_checker: Optional[ImportExistingChecker] = None,
+    ) -> None:
+        """
+        初始化Excel导入器
+
+        :param model: 行数据对应的pydantic模型，提供validate_fields方法时一并执行字段校验
+        :param header_dict: 表头映射字典，键为Excel表头，值为模型字段名
+        :param key_field: 业务键字段名，用于识别新增或更新
+        :param pk_field: 主键字段名，更新时以主键定位数据
+        :param existing_getter: 按业务键查询已存在数据的方法
+        :param insert_handler: 批量新增数据的方法
+        :param update_handler: 批量更新数据的方法
+        :param existing_checker: 可选，校验已存在数据能否被更新的方法
+        :return:
+        """
+        self.model = model
+        self.header_dict = header_dict
+        self.key_field = key_field
+        self.pk_field = pk_field
+        self.existing_getter = existing_getter
+        self.insert_handler = insert_handler
+        self.update_handler = update_handler
+        self.existing_checker = existing_checker
+        self._field_header_dict = {field: header for header, field in header_dict.items()}
+        self._alias_dict = {field: model.model_fields[field].alias or field for field in header_dict.values()}
+        self._alias_header_dict = {self._alias_dict[field]: header for field, header in self._field_header_dict.items()}
+        self._str_field_set = {
+            field
+            for field in header_dict.values()
+            if model.model_fields[field].annotation is str or str in get_args(model.model_fields[field].annotation)
+        }
+
+    @classmethod
+    def get_result_message(cls, import_result: ImportResultModel) -> str:
+        """
+        生成导入结果提示信息
+
+        :param import_result: 导入结果
+        :return: 提示信息
+        """
+        if import_result.dry_run:
+            return (
+                f'校验完成，可新增{import_result.insert_count}条，可更新{import_result.update_count}条，'
+                f'失败{import_result.fail_count}条，数据未写入'
+            )
+        return (
+            f'导入完成，新增{import_result.insert_count}条，更新{import_result.update_count}条，'
+            f'失败{import_result.fail_count}条'
+        )
+
+    async def import_file(
+        self,
+        db: AsyncSession,
+        file: BinaryIO,
+        insert_values: dict[str, Any],
+        update_values: dict[str, Any],
+        dry_run: bool = False,
+    ) -> ImportResultModel:
+        """
+        读取Excel文件并按块导入数据，事务的提交或回滚由调用方处理
+
+        :param db: orm对象
+        :param file: Excel文件对象
+        :param insert_values: 新增时附加的字段值，如创建人、创建时间
+        :param update_values: 更新时附加的字段值，如更新人、更新时间
+        :param dry_run: 是否仅校验不写入数据
+        :return: 导入结果
+        """
+        try:
+            workbook = await asyncio.to_thread(load_workbook, file, read_only=True, data_only=True)
+        except Exception as e:
+            logger.warning(f'导入文件读取失败，详细错误信息：{e}')
+            raise ServiceException(message='导入文件格式错误，仅支持xlsx文件') from e
+        result = ImportResultModel(dryRun=dry_run)
+        try:
+            row_iter = workbook.active.iter_rows(values_only=True)
+            header_row = await asyncio.to_thread(next, row_iter, None)
+            column_field_list = [
+                self.header_dict.get(header.strip()) if isinstance(header, str) else None for header in header_row or ()
+            ]
+            if self.key_field not in column_field_list:
+                raise ServiceException(message=f'导入文件缺少表头：{self._field_header_dict[self.key_field]}')
+            # 文件内已出现的业务键及其行号，用于识别文件内的重复数据
+            key_row_dict: dict[str, int] = {}
+            row_num = 1
+            while chunk := await asyncio.to_thread(list, islice(row_iter, self.IMPORT_CHUNK_SIZE)):
+                valid_row_list = self._validate_chunk(chunk, row_num + 1, column_field_list, key_row_dict, result)
+                if valid_row_list:
+                    await self._write_chunk(db, valid_row_list, result, dry_run, insert_values, update_values)
+                row_num += len(chunk)
+        finally:
+            workbook.close()
+
+        return result
+
+    def _validate_chunk(
+        self,
+        chunk: list[tuple[Any, ...]],
+        start_row_num: int,
+        column_field_list: list[Optional[str]],
+        key_row_dict: dict[str, int],
+        result: ImportResultModel,
+    ) -> list[tuple[int, str, BaseModel]]:
+        """
+        校验一块数据，记录失败行并识别文件内的重复数据
+
+        :param chunk: 数据行列表
+        :param start_row_num: 首行在Excel中的行号
+        :param column_field_list: 各列对应的模型字段名，未映射的列为None
+        :param key_row_dict: 文件内已出现的业务键及其行号
+        :param result: 导入结果
+        :return: 校验通过的(行号, 业务键, 行数据模型)列表
+        """
+        valid_row_list: list[tuple[int, str, BaseModel]] = []
+        for row_num, values in enumerate(chunk, start=start_row_num):
+            row = self._get_row_dict(values, column_field_list)
+            if not row:
+                continue
+            result.total_count += 1
+            try:
+                row_model = self.model.model_validate(row)
+                if hasattr(row_model, 'validate_fields'):
+                    row_model.validate_fields()
+            except ValidationError as e:
+                self._add_error(result, row_num, self._get_validation_message(e))
+                continue
+            except FieldValidationError as e:
+                self._add_error(result, row_num, e.message)
+                continue
+            key = getattr(row_model, self.key_field)
+            if not key:
+                self._add_error(result, row_num, f'{self._field_header_dict[self.key_field]}不能为空')
+                continue
+            # 业务键忽略大小写比较，与数据库默认排序规则下唯一约束的判定一致
+            duplicate_row_num = key_row_dict.setdefault(key.casefold(), row_num)
+            if duplicate_row_num != row_num:
+                self._add_error(result, row_num, f'与第{duplicate_row_num}行重复')
+                continue
+            valid_row_list.append((row_num, key, row_model))
+
+        return valid_row_list
+
+    async def _write_chunk(
+        self,
+        db: AsyncSession,
+        valid_row_list: list[tuple[int, str, BaseModel]],
+        result: ImportResultModel,
+        dry_run: bool,
+        insert_values: dict[str, Any],
+        update_values: dict[str, Any],
+    ) -> None:
+        """
+        以一次查询识别一块数据中需新增或更新的行，并分别批量写入
+
+        :param db: orm对象
+        :param valid_row_list: 校验通过的(行号, 业务键, 行数据模型)列表
+        :param result: 导入结果
+        :param dry_run: 是否仅校验不写入数据
+        :param insert_values: 新增时附加的字段值
+        :param update_values: 更新时附加的字段值
+        :return:
+        """
+        existing_dict = await self.existing_getter(db, [key for _, key, _ in valid_row_list])
+        # 数据库按排序规则匹配业务键，返回的键可能与文件中的大小写不同，统一按忽略大小写对应
+        existing_key_dict = {key.casefold(): existing_row for key, existing_row in existing_dict.items()}
+        insert_list: list[dict[str, Any]] = []
+        update_list: list[dict[str, Any]] = []
+        for row_num, key, row_model in valid_row_list:
+            existing_row = existing_key_dict.get(key.casefold())
+            if existing_row is None:
+                insert_list.append({**row_model.model_dump(exclude={self.pk_field}), **insert_values})
+                continue
+            if self.existing_checker is not None and (error_message := self.existing_checker(existing_row)):
+                self._add_error(result, row_num, error_message)
+                continue
+            # 仅更新文件中有值的字段，空单元格不覆盖已有数据
+            update_list.append(
+                {
+                    **row_model.model_dump(exclude_unset=True, exclude={self.pk_field}),
+                    **update_values,
+                    self.pk_field: getattr(existing_row, self.pk_field),
+                }
+            )
+        if not dry_run:
+            if insert_list:
+                await self.insert_handler(db, insert_list)
+            if update_list:
+                await self.update_handler(db, update_list)
+        result.insert_count += len(insert_list)
+        result.update_count += len(update_list)
+
+    def _get_row_dict(self, values: tuple[Any, ...], column_field_list: list[Optional[str]]) -> dict[str, Any]:
+        """
+        将Excel数据行转换为以字段别名为键的字典，忽略空单元格
+
+        :param values: 数据行的单元格值
+        :param column_field_list: 各列对应的模型字段名
+        :return: 数据行字典，整行为空时返回空字典
+        """
+        row: dict[str, Any] = {}
+        for field, value in zip(column_field_list, values):
+            if field is None:
+                continue
+            cell_value = self._get_cell_value(field, value)
+            if cell_value is not None:
+                row[self._alias_dict[field]] = cell_value
+
+        return row
+
+    def _get_cell_value(self, field: str, value: Any) -> Any:
+        """
+        清理单元格的值：文本去除首尾空白，文本字段中存为数字的值转换为文本
+
+        :param field: 模型字段名
+        :param value: 单元格的值
+        :return: 清理后的值，空单元格返回None
+        """
+        if isinstance(value, str):
+            return value.strip() or None
+        if field in self._str_field_set and isinstance(value, (int, float)) and not isinstance(value, bool):
+            # 编号、电话等文本字段在Excel中可能被存为数字
+            return str(int(value) if isinstance(value, float) and value.is_integer() else value)
+        return value
+
+    def _get_validation_message(self, error: ValidationError) -> str:
+        """
+        将pydantic校验异常转换为以Excel表头描述的错误信息
+
+        :param error: pydantic校验异常
+        :return: 错误信息
+        """
+        header_list = []
+        for error_detail in error.errors():
+            header = self._alias_header_dict.get(str(error_detail['loc'][0])) if error_detail['loc'] else None
+            header_list.append(f'{header}格式错误' if header else error_detail['msg'])
+
+        return '；'.join(dict.fromkeys(header_list))
+
+    def _add_error(self, result: ImportResultModel, row_num: int, message: str) -> None:
+        """
+        记录失败行，错误信息超过上限时只计数
+
+        :param result: 导入结果
+        :param row_num: 行号
+        :param message: 错误信息
+        :return:
+        """
+        result.fail_count += 1
+        if len(result.error_list) < self.IMPORT_MAX_ERRORS:
+            result.error_list.append(f'第{row_num}行：{message}')
 
 
 class ExcelUtil:
@@ -12,6 +388,11 @@ class ExcelUtil:
     Excel操作类
     """
 
+    # 流式导出时每批从数据库读取的行数
+    EXPORT_BATCH_SIZE = 1000
+    # 流式返回文件时每次读取的字节数
+    STREAM_CHUNK_SIZE = 64 * 1024
+
     @classmethod
     def __mapping_list(cls, list_data: list, mapping_dict: dict) -> list[dict]:
         """
@@ -42,6 +423,87 @@ class ExcelUtil:
 
         return binary_data
 
+    @classmethod
+    async def export_query2excel_file(
+        cls,
+        db: AsyncSession,
+        query: Select,
+        mapping_dict: dict,
+        file_path: str,
+        row_handler: Optional[ExportRowHandler] = None,
+        progress_handler: Optional[ExportProgressHandler] = None,
+    ) -> int:
+        """
+        工具方法：使用服务端游标分批读取查询结果并写入Excel文件，写入操作在线程池中执行，不阻塞事件循环
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param mapping_dict: 映射字典
+        :param file_path: Excel文件路径
+        :param row_handler: 可选，导出行处理方法，用于字典值转换等
+        :param progress_handler: 可选，每写入一批数据后调用的进度回调方法
+        :return: 导出的数据行数
+        """
+        writer = await asyncio.to_thread(ExcelStreamWriter, file_path, mapping_dict)
+        row_count = 0
+        try:
+            query_result = await db.stream(query.execution_options(yield_per=cls.EXPORT_BATCH_SIZE))
+            async for partition in query_result.partitions():
+                rows = CamelCaseUtil.transform_result([row[0] if len(row) == 1 else row for row in partition])
+                if row_handler is not None:
+                    rows = [row_handler(row) for row in rows]
+                await asyncio.to_thread(writer.append_rows, rows)
+                row_count += len(rows)
+                if progress_handler is not None:
+                    await progress_handler(row_count)
+        except BaseException:
+            # 查询出错或任务被取消时，删除只写模式产生的临时文件
+            writer.discard()
+            raise
+        await asyncio.to_thread(writer.save)
+
+        return row_count
+
+    @classmethod
+    async def export_query2excel(
+        cls, db: AsyncSession, query: Select, mapping_dict: dict, row_handler: Optional[ExportRowHandler] = None
+    ) -> AsyncGenerator[bytes, None]:
+        """
+        工具方法：将查询结果导出至临时Excel文件，返回分块读取该文件的流式数据，读取完毕后删除临时文件
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句
+        :param mapping_dict: 映射字典
+        :param row_handler: 可选，导出行处理方法，用于字典值转换等
+        :return: Excel文件的流式数据
+        """
+        fd, file_path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+        try:
+            await cls.export_query2excel_file(db, query, mapping_dict, file_path, row_handler)
+        except Exception as e:
+            os.remove(file_path)
+            raise e
+
+        return cls.iter_file_chunks(file_path, delete_after=True)
+
+    @classmethod
+    async def iter_file_chunks(cls, file_path: str, delete_after: bool = False) -> AsyncGenerator[bytes, None]:
+        """
+        工具方法：分块读取文件，用于流式响应
+
+        :param file_path: 文件路径
+        :param delete_after: 读取完毕后是否删除文件
+        :return: 文件的流式数据
+        """
+        try:
+            async with aiofiles.open(file_path, 'rb') as file:
+                while chunk := await file.read(cls.STREAM_CHUNK_SIZE):
+                    yield chunk
+        finally:
+            if delete_after and os.path.exists(file_path):
+                os.remove(file_path)
+
     @classmethod
     def get_excel_template(cls, header_list: list, selector_header_list: list, option_list: list[dict]) -> bytes:
         """
@@ -1,11 +1,22 @@
+import base64
+import binascii
+import json
 import math
-from typing import Any, Union
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, Optional, Union
 
-from sqlalchemy import Row, Select, func, select
+from sqlalchemy import ColumnElement, Row, Select, and_, or_
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
 from common.vo import PageModel
+from exceptions.exception import ServiceException
 from utils.common_util import CamelCaseUtil
+from utils.count_util import CountMode, CountUtil
+
+# 游标分页排序键：(实体排序字段, 是否降序)
+KeysetColumn = tuple[InstrumentedAttribute, bool]
 
 
 class PageUtil:
@@ -39,7 +50,13 @@ class PageUtil:
 
     @classmethod
     async def paginate(
-        cls, db: AsyncSession, query: Select, page_num: int, page_size: int, is_page: bool = False
+        cls,
+        db: AsyncSession,
+        query: Select,
+        page_num: int,
+        page_size: int,
+        is_page: bool = False,
+        count_mode: CountMode = 'exact',
     ) -> Union[PageModel, list[Union[dict[str, Any], list[dict[Any, Any]]]]]:
         """
         输入查询语句和分页信息，返回分页数据列表结果
@@ -49,37 +66,158 @@ class PageUtil:
         :param page_num: 当前页码
         :param page_size: 当前页面数据量
         :param is_page: 是否开启分页
+        :param count_mode: 总数统计方式（exact精确统计 cached缓存精确统计结果 estimated大表估算）
         :return: 分页数据对象
         """
         if is_page:
-            total = (await db.execute(select(func.count('*')).select_from(query.subquery()))).scalar()
+            total, total_exact = await CountUtil.count(db, query, count_mode)
             query_result = await db.execute(query.offset((page_num - 1) * page_size).limit(page_size))
-            paginated_data: list[Row] = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    paginated_data.append(row[0])
-                else:
-                    paginated_data.append(row)
             has_next = math.ceil(total / page_size) > page_num
             result = PageModel[Any](
-                rows=CamelCaseUtil.transform_result(paginated_data),
+                rows=CamelCaseUtil.transform_result(cls._unwrap_rows(query_result)),
                 pageNum=page_num,
                 pageSize=page_size,
                 total=total,
+                totalExact=total_exact,
                 hasNext=has_next,
             )
         else:
             query_result = await db.execute(query)
-            no_paginated_data: list[Row] = []
-            for row in query_result:
-                if row and len(row) == 1:
-                    no_paginated_data.append(row[0])
-                else:
-                    no_paginated_data.append(row)
-            result = CamelCaseUtil.transform_result(no_paginated_data)
+            result = CamelCaseUtil.transform_result(cls._unwrap_rows(query_result))
+
+        return result
+
+    @classmethod
+    async def paginate_keyset(
+        cls, db: AsyncSession, query: Select, keyset_columns: list[KeysetColumn], page_size: int, cursor: Optional[str]
+    ) -> PageModel:
+        """
+        输入查询语句、排序键和游标，返回游标分页数据列表结果，不统计总数，深度翻页耗时与页码无关
+
+        :param db: orm对象
+        :param query: sqlalchemy查询语句，原有排序将被排序键替换
+        :param keyset_columns: 排序键列表，最后一项须为主键以保证顺序唯一，排序字段不应包含空值（由调用方限制可用的排序字段）
+        :param page_size: 当前页面数据量
+        :param cursor: 上一页返回的游标，为空时查询第一页
+        :return: 分页数据对象，nextCursor为下一页游标
+        """
+        key_count = len(keyset_columns)
+        query = query.order_by(None).order_by(
+            *[column.desc() if is_desc else column.asc() for column, is_desc in keyset_columns]
+        )
+        if cursor:
+            query = query.where(cls._get_keyset_condition(keyset_columns, cls._decode_cursor(cursor, key_count)))
+        query_result = (await db.execute(query.limit(page_size + 1))).all()
+        has_next = len(query_result) > page_size
+        query_result = query_result[:page_size]
+        next_cursor = cls._encode_cursor(cls._get_keyset_values(query_result[-1], keyset_columns)) if has_next else None
+        result = PageModel[Any](
+            rows=CamelCaseUtil.transform_result(cls._unwrap_rows(query_result)),
+            pageNum=1,
+            pageSize=page_size,
+            hasNext=has_next,
+            nextCursor=next_cursor,
+        )
 
         return result
 
+    @classmethod
+    def _unwrap_rows(cls, query_result: Any) -> list[Any]:
+        """
+        将查询结果中仅包含单个实体的行展开为实体本身
+
+        :param query_result: 查询结果
+        :return: 数据列表
+        """
+        return [row[0] if row and len(row) == 1 else row for row in query_result]
+
+    @classmethod
+    def _get_keyset_values(cls, row: Row, keyset_columns: list[KeysetColumn]) -> list[Any]:
+        """
+        从查询结果行中读取排序键取值，排序字段须属于查询结果中的实体
+
+        :param row: 查询结果行
+        :param keyset_columns: 排序键列表
+        :return: 排序键取值
+        """
+        values = []
+        for column, _ in keyset_columns:
+            entity = next(item for item in row if isinstance(item, column.class_))
+            values.append(getattr(entity, column.key))
+
+        return values
+
+    @classmethod
+    def _get_keyset_condition(cls, keyset_columns: list[KeysetColumn], cursor_values: list[Any]) -> ColumnElement:
+        """
+        生成定位至游标之后的查询条件，按 (c1 > v1) OR (c1 = v1 AND c2 > v2) ... 展开以兼容不同排序方向
+
+        :param keyset_columns: 排序键列表
+        :param cursor_values: 游标中的排序键取值
+        :return: 查询条件
+        """
+        conditions = []
+        for index, (column, is_desc) in enumerate(keyset_columns):
+            equals = [keyset_columns[i][0] == cursor_values[i] for i in range(index)]
+            seek = column < cursor_values[index] if is_desc else column > cursor_values[index]
+            conditions.append(and_(*equals, seek))
+        # 首列额外附加范围条件，便于数据库使用索引范围扫描
+        first_column, first_is_desc = keyset_columns[0]
+        first_range = first_column <= cursor_values[0] if first_is_desc else first_column >= cursor_values[0]
+
+        return and_(first_range, or_(*conditions))
+
+    @classmethod
+    def _encode_cursor(cls, values: list[Any]) -> str:
+        """
+        将排序键取值编码为不透明的游标字符串
+
+        :param values: 排序键取值
+        :return: 游标字符串
+        """
+
+        def _default(value: Any) -> dict[str, str]:
+            if isinstance(value, datetime):
+                return {'$dt': value.isoformat()}
+            if isinstance(value, date):
+                return {'$d': value.isoformat()}
+            if isinstance(value, Decimal):
+                return {'$dec': str(value)}
+            raise TypeError(f'不支持的游标取值类型：{type(value)}')
+
+        payload = json.dumps(values, default=_default, separators=(',', ':'))
+
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii').rstrip('=')
+
+    @classmethod
+    def _decode_cursor(cls, cursor: str, key_count: int) -> list[Any]:
+        """
+        解析游标字符串为排序键取值
+
+        :param cursor: 游标字符串
+        :param key_count: 排序键数量
+        :return: 排序键取值
+        """
+
+        def _object_hook(value: dict[str, Any]) -> Any:
+            if '$dt' in value:
+                return datetime.fromisoformat(value['$dt'])
+            if '$d' in value:
+                return date.fromisoformat(value['$d'])
+            if '$dec' in value:
+                return Decimal(value['$dec'])
+            return value
+
+        try:
+            payload = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+            values = json.loads(payload, object_hook=_object_hook)
+        except (binascii.Error, ValueError) as e:
+            raise ServiceException(message='分页游标无效') from e
+        if not isinstance(values, list) or len(values) != key_count or None in values:
+            raise ServiceException(message='分页游标无效')
+
+        return values
+
 
 def get_page_obj(data_list: list, page_num: int, page_size: int) -> PageModel:
     """
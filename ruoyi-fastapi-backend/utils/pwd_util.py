@@ -1,11 +1,19 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Union
+
 import bcrypt
 
+from config.env import AppConfig
+
 
 class PwdUtil:
     """
     密码工具类
     """
 
+    _executor: Union[ThreadPoolExecutor, None] = None
+
     @classmethod
     def verify_password(cls, plain_password: str, hashed_password: str) -> bool:
         """
@@ -28,3 +36,50 @@ class PwdUtil:
         :return: 加密成功的密码
         """
         return bcrypt.hashpw(input_password.encode('utf-8'), bcrypt.gensalt()).decode('utf-8')
+
+    @classmethod
+    async def verify_password_async(cls, plain_password: str, hashed_password: str) -> bool:
+        """
+        工具方法：在专用线程池中校验密码，避免bcrypt运算阻塞事件循环
+
+        :param plain_password: 当前输入的密码
+        :param hashed_password: 数据库存储的密码
+        :return: 校验结果
+        """
+        return await cls._run_in_executor(cls.verify_password, plain_password, hashed_password)
+
+    @classmethod
+    async def get_password_hash_async(cls, input_password: str) -> str:
+        """
+        工具方法：在专用线程池中对密码进行加密，避免bcrypt运算阻塞事件循环
+
+        :param input_password: 输入的密码
+        :return: 加密成功的密码
+        """
+        return await cls._run_in_executor(cls.get_password_hash, input_password)
+
+    @classmethod
+    async def _run_in_executor(cls, func: Callable[..., Any], *args) -> Any:
+        """
+        在大小受限的专用线程池中执行bcrypt运算，超出线程数的任务在线程池队列中等待
+
+        :param func: 待执行的同步方法
+        :param args: 方法参数
+        :return: 方法执行结果
+        """
+        if cls._executor is None:
+            cls._executor = ThreadPoolExecutor(
+                max_workers=AppConfig.app_pwd_hash_workers, thread_name_prefix='pwd-hash'
+            )
+        return await asyncio.get_running_loop().run_in_executor(cls._executor, func, *args)
+
+    @classmethod
+    def shutdown_executor(cls) -> None:
+        """
+        工具方法：关闭密码运算线程池
+
+        :return:
+        """
+        if cls._executor is not None:
+            cls._executor.shutdown(wait=False, cancel_futures=True)
+            cls._executor = None
@@ -0,0 +1,181 @@
+import re
+from typing import Any, Optional
+
+from sqlalchemy import Alias, Connection, Executable, Insert, Table, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.util import find_tables
+
+
+class QueryPlanSession:
+    """
+    DAO查询执行计划分析所用的会话对象
+
+    以异步会话的接口包装同步会话，DAO方法可直接在本地同步数据库（如SQLite）上执行，并记录执行过的语句用于分析执行计划
+    """
+
+    def __init__(self, session: Session) -> None:
+        self.sync_session = session
+        self.statements: list[Executable] = []
+
+    @property
+    def bind(self) -> Any:
+        return self.sync_session.bind
+
+    @property
+    def info(self) -> dict[Any, Any]:
+        return self.sync_session.info
+
+    def add(self, instance: Any) -> None:
+        self.sync_session.add(instance)
+
+    async def execute(self, statement: Executable, params: Optional[Any] = None, **kwargs: Any) -> Any:
+        # 以参数列表批量执行的语句（如按主键批量更新）不记录执行计划
+        if not isinstance(params, list):
+            self.statements.append(statement)
+        return self.sync_session.execute(statement, params, **kwargs)
+
+    async def get(self, entity: Any, ident: Any) -> Any:
+        return self.sync_session.get(entity, ident)
+
+    async def flush(self) -> None:
+        self.sync_session.flush()
+
+    async def commit(self) -> None:
+        self.sync_session.commit()
+
+    async def rollback(self) -> None:
+        self.sync_session.rollback()
+
+
+class QueryPlanUtil:
+    """
+    查询执行计划分析工具类（基于SQLite的EXPLAIN QUERY PLAN）
+    """
+
+    # 执行计划中访问数据表的行，如 SCAN project、SEARCH project_prefect USING INDEX idx_xxx (pro_id=? AND del_flag=?)
+    TABLE_ACCESS_PATTERN = re.compile(
+        r'^(?P<access>SCAN|SEARCH) (?P<table>\w+)(?: AS \w+)?'
+        r'(?: USING (?:(?:COVERING )?INDEX (?P<index>\w+)|(?P<pk>INTEGER PRIMARY KEY|PRIMARY KEY)))?'
+        r'(?: \((?P<condition>[^)]*)\))?'
+    )
+
+    @classmethod
+    def get_sqlite_query_plan(cls, connection: Connection, statement: Executable) -> list[str]:
+        """
+        获取语句在SQLite上的执行计划
+
+        :param connection: SQLite数据库连接
+        :param statement: sqlalchemy语句
+        :return: 执行计划各行的说明
+        """
+        return [detail for _, _, detail in cls.get_sqlite_query_plan_rows(connection, statement)]
+
+    @classmethod
+    def get_sqlite_query_plan_rows(cls, connection: Connection, statement: Executable) -> list[tuple[int, int, str]]:
+        """
+        获取语句在SQLite上的执行计划（含节点层级）
+
+        :param connection: SQLite数据库连接
+        :param statement: sqlalchemy语句
+        :return: (节点id, 父节点id, 说明)列表
+        """
+        compiled = statement.compile(dialect=connection.dialect, compile_kwargs={'render_postcompile': True})
+        parameters = (
+            tuple(compiled.params[name] for name in compiled.positiontup) if compiled.positional else compiled.params
+        )
+        plan_rows = connection.exec_driver_sql(f'EXPLAIN QUERY PLAN {compiled}', parameters).all()
+
+        return [(plan_row[0], plan_row[1], plan_row[-1]) for plan_row in plan_rows]
+
+    @classmethod
+    def get_sqlite_table_stats(cls, connection: Connection) -> dict[str, dict[Optional[str], list[int]]]:
+        """
+        读取ANALYZE收集的统计信息
+
+        :param connection: SQLite数据库连接
+        :return: 表名与{索引名: [总行数, 按索引前1列匹配的平均行数, 前2列..., ...]}的映射字典，无索引的表索引名为None
+        """
+        table_stats: dict[str, dict[Optional[str], list[int]]] = {}
+        for table_name, index_name, stat in connection.execute(text('SELECT tbl, idx, stat FROM sqlite_stat1')):
+            table_stats.setdefault(table_name, {})[index_name] = [
+                int(value) for value in stat.split() if value.isdigit()
+            ]
+
+        return table_stats
+
+    @classmethod
+    def estimate_access_rows(cls, detail: str, table_stats: dict[Optional[str], list[int]]) -> Optional[int]:
+        """
+        按统计信息估算执行计划中一次数据表访问读取的行数，规则与SQLite查询优化器一致：
+        等值匹配索引前n列时取该索引统计的平均行数，存在范围条件时再按1/4估算
+
+        :param detail: 执行计划行的说明
+        :param table_stats: 该表的统计信息
+        :return: 估算行数，非数据表访问时返回None
+        """
+        matched = cls.TABLE_ACCESS_PATTERN.match(detail.strip())
+        if not matched:
+            return None
+        row_count = next((stat[0] for stat in table_stats.values() if stat), 0)
+        index_name, primary_key = matched.group('index'), matched.group('pk')
+        if matched.group('access') == 'SCAN' or not (index_name or primary_key):
+            return row_count
+        terms = [term.strip() for term in (matched.group('condition') or '').split(' AND ') if term.strip()]
+        range_terms = [term for term in terms if '>' in term or '<' in term]
+        equal_count = len(terms) - len(range_terms)
+        index_stat = table_stats.get(index_name, []) if index_name else []
+        if not equal_count:
+            rows = row_count
+        elif primary_key:
+            rows = 1
+        elif equal_count < len(index_stat):
+            rows = index_stat[equal_count]
+        else:
+            rows = 1 if len(index_stat) > 1 else max(1, row_count // 10)
+        if range_terms:
+            rows = max(1, rows // 4)
+
+        return rows
+
+    @classmethod
+    def get_table_aliases(cls, statement: Executable) -> dict[str, str]:
+        """
+        获取语句中数据表别名与表名的映射，SQLite执行计划中的数据表以别名显示
+
+        :param statement: sqlalchemy语句
+        :return: 别名与表名的映射字典，未使用别名的表映射为自身
+        """
+        table_aliases = {}
+        for from_clause in find_tables(statement, include_aliases=True, include_joins=True, include_crud=True):
+            if isinstance(from_clause, Alias) and isinstance(from_clause.element, Table):
+                table_aliases[from_clause.name] = from_clause.element.name
+            elif isinstance(from_clause, Table):
+                table_aliases[from_clause.name] = from_clause.name
+
+        return table_aliases
+
+    @classmethod
+    def get_table_access(cls, query_plan: list[str]) -> list[tuple[str, Optional[str]]]:
+        """
+        解析执行计划中各数据表的访问方式
+
+        :param query_plan: 执行计划各行的说明
+        :return: (表名, 使用的索引)列表，全表扫描时索引为None，按主键访问时索引为PRIMARY KEY
+        """
+        table_access = []
+        for detail in query_plan:
+            matched = cls.TABLE_ACCESS_PATTERN.match(detail.strip())
+            if matched:
+                table_access.append((matched.group('table'), matched.group('index') or matched.group('pk')))
+
+        return table_access
+
+    @classmethod
+    def is_explainable(cls, statement: Executable) -> bool:
+        """
+        判断语句是否需要分析执行计划，不含查询的插入语句无需分析
+
+        :param statement: sqlalchemy语句
+        :return: 是否需要分析执行计划
+        """
+        return not (isinstance(statement, Insert) and statement.select is None)
@@ -1,7 +1,11 @@
+from collections import deque
 from collections.abc import Mapping
 from datetime import datetime
+from decimal import Decimal
+from types import GeneratorType
 from typing import Any, Optional
 
+import orjson
 from fastapi import status
 from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse, Response, StreamingResponse
@@ -11,6 +15,33 @@ from starlette.background import BackgroundTask
 from common.constant import HttpStatusConstant
 
 
+def _orjson_default(obj: Any) -> Any:
+    """
+    orjson无法原生序列化的类型的转换方法，转换结果与jsonable_encoder保持一致
+
+    :param obj: 待序列化对象
+    :return: 可序列化的对象
+    """
+    if isinstance(obj, Decimal):
+        return int(obj) if obj.as_tuple().exponent >= 0 else float(obj)
+    if isinstance(obj, BaseModel):
+        return obj.model_dump(mode='json', by_alias=True)
+    if isinstance(obj, (set, frozenset, GeneratorType, deque)):
+        return list(obj)
+    if isinstance(obj, bytes):
+        return obj.decode()
+    return jsonable_encoder(obj)
+
+
+class OrjsonResponse(JSONResponse):
+    """
+    基于orjson的JSON响应类，原生序列化datetime、dataclass等类型，无需预先经过jsonable_encoder递归转换
+    """
+
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=_orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
+
 class ResponseUtil:
     """
     响应工具类
@@ -54,9 +85,9 @@ class ResponseUtil:
 
         result.update({'success': True, 'time': datetime.now()})
 
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -100,9 +131,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -146,9 +177,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -192,9 +223,55 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return OrjsonResponse(
+            status_code=status.HTTP_200_OK,
+            content=result,
+            headers=headers,
+            media_type=media_type,
+            background=background,
+        )
+
+    @classmethod
+    def conflict(
+        cls,
+        msg: str = '资源状态已变化，请刷新后重试',
+        data: Optional[Any] = None,
+        rows: Optional[Any] = None,
+        dict_content: Optional[dict] = None,
+        model_content: Optional[BaseModel] = None,
+        headers: Optional[Mapping[str, str]] = None,
+        media_type: Optional[str] = None,
+        background: Optional[BackgroundTask] = None,
+    ) -> Response:
+        """
+        资源冲突响应方法
+
+        :param msg: 可选，自定义资源冲突响应信息
+        :param data: 可选，资源冲突响应结果中属性为data的值
+        :param rows: 可选，资源冲突响应结果中属性为rows的值
+        :param dict_content: 可选，dict类型，资源冲突响应结果中自定义属性的值
+        :param model_content: 可选，BaseModel类型，资源冲突响应结果中自定义属性的值
+        :param headers: 可选，响应头信息
+        :param media_type: 可选，响应结果媒体类型
+        :param background: 可选，响应返回后执行的后台任务
+        :return: 资源冲突响应结果
+        """
+        result = {'code': HttpStatusConstant.CONFLICT, 'msg': msg}
+
+        if data is not None:
+            result['data'] = data
+        if rows is not None:
+            result['rows'] = rows
+        if dict_content is not None:
+            result.update(dict_content)
+        if model_content is not None:
+            result.update(model_content.model_dump(by_alias=True))
+
+        result.update({'success': False, 'time': datetime.now()})
+
+        return OrjsonResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -238,9 +315,9 @@ class ResponseUtil:
 
         result.update({'success': False, 'time': datetime.now()})
 
-        return JSONResponse(
+        return OrjsonResponse(
             status_code=status.HTTP_200_OK,
-            content=jsonable_encoder(result),
+            content=result,
             headers=headers,
             media_type=media_type,
             background=background,
@@ -0,0 +1,195 @@
+from typing import Any, Optional, Union
+
+from sqlalchemy import DDL, Column, ColumnElement, Connection, Index, Table, and_, event, func, literal_column, select
+from sqlalchemy import table as table_clause
+from sqlalchemy.dialects.mysql import match
+from sqlalchemy.orm import InstrumentedAttribute
+
+from config.env import AppConfig
+
+SearchColumn = Union[Column, InstrumentedAttribute]
+
+
+class SearchUtil:
+    """
+    关键字搜索工具类
+
+    可搜索字段以 get_search_index 声明全文索引：MySQL为ngram分词的FULLTEXT索引，按 MATCH ... AGAINST 查询并排序；
+    PostgreSQL为pg_trgm的GIN索引，LIKE查询由索引加速，按 word_similarity 排序；SQLite为FTS5 trigram虚拟表，仅用于本地测试及基准测试。
+    关键字短于分词长度或字段未声明全文索引时使用LIKE查询，不按相关度排序
+    """
+
+    # pg_trgm及FTS5 trigram的分词长度
+    TRIGRAM_SIZE = 3
+
+    @classmethod
+    def get_search_index(cls, name: str, column_name: str) -> Index:
+        """
+        声明字段的全文索引，用于模型的__table_args__
+
+        :param name: 索引名称
+        :param column_name: 字段名
+        :return: 索引对象
+        """
+        search_index = Index(
+            name,
+            column_name,
+            info={'search_column': column_name},
+            mysql_prefix='FULLTEXT',
+            mysql_with_parser='ngram',
+            postgresql_using='gin',
+            postgresql_ops={column_name: 'gin_trgm_ops'},
+        ).ddl_if(dialect=('mysql', 'postgresql'))
+        event.listen(search_index, 'after_parent_attach', cls._listen_create_extension)
+
+        return search_index
+
+    @classmethod
+    def get_keyword_search(
+        cls, dialect_name: str, column: SearchColumn, keyword: Optional[str]
+    ) -> tuple[Union[ColumnElement[bool], bool], Optional[ColumnElement[Any]]]:
+        """
+        按数据库类型构造字段的关键字搜索条件及相关度
+
+        :param dialect_name: 数据库方言名称，如 db.bind.dialect.name
+        :param column: 搜索的字段
+        :param keyword: 关键字
+        :return: (搜索条件, 相关度)，关键字为空时搜索条件为True，使用LIKE查询时相关度为None
+        """
+        if not keyword:
+            return True, None
+        like_condition = column.contains(keyword, autoescape=True)
+        min_length = AppConfig.app_search_ngram_token_size if dialect_name == 'mysql' else cls.TRIGRAM_SIZE
+        if len(keyword.strip()) < min_length or not cls.has_search_index(column):
+            return like_condition, None
+        if dialect_name == 'mysql':
+            # 以短语匹配保证ngram分词相邻，再以LIKE排除停用词等导致的误匹配
+            relevance = match(column, against=f'"{keyword.replace(chr(34), " ")}"').in_boolean_mode()
+            return and_(relevance, like_condition), relevance
+        if dialect_name == 'postgresql':
+            return like_condition, func.word_similarity(keyword, column)
+        if dialect_name == 'sqlite':
+            return cls._get_sqlite_keyword_search(column, keyword)
+
+        return like_condition, None
+
+    @classmethod
+    def get_total_relevance(cls, *relevances: Optional[ColumnElement[Any]]) -> Optional[ColumnElement[Any]]:
+        """
+        合计多个字段搜索的相关度，用于按相关度排序
+
+        :param relevances: 各字段搜索的相关度
+        :return: 相关度之和，均为None时返回None
+        """
+        relevance_list = [relevance for relevance in relevances if relevance is not None]
+        if not relevance_list:
+            return None
+
+        return sum(relevance_list[1:], relevance_list[0])
+
+    @classmethod
+    def has_search_index(cls, column: SearchColumn) -> bool:
+        """
+        判断字段是否声明了全文索引
+
+        :param column: 字段
+        :return: 是否声明了全文索引
+        """
+        table_column = cls._get_table_column(column)
+
+        return any(index.info.get('search_column') == table_column.name for index in table_column.table.indexes)
+
+    @classmethod
+    def get_sqlite_search_table_name(cls, table_name: str, column_name: str) -> str:
+        """
+        获取SQLite中字段对应的FTS5虚拟表名称
+
+        :param table_name: 表名
+        :param column_name: 字段名
+        :return: 虚拟表名称
+        """
+        return f'{table_name}_{column_name}_fts'
+
+    @classmethod
+    def create_sqlite_search_tables(cls, connection: Connection, table: Table) -> None:
+        """
+        在SQLite中为表中声明了全文索引的字段创建FTS5 trigram虚拟表，并以触发器与原表同步
+
+        :param connection: SQLite数据库连接
+        :param table: 数据表
+        :return:
+        """
+        primary_key = next(iter(table.primary_key.columns)).name
+        for index in table.indexes:
+            column_name = index.info.get('search_column')
+            if not column_name:
+                continue
+            fts_name = cls.get_sqlite_search_table_name(table.name, column_name)
+            statements = [
+                f'CREATE VIRTUAL TABLE IF NOT EXISTS {fts_name} USING fts5({column_name}, '
+                f"content='{table.name}', content_rowid='{primary_key}', tokenize='trigram')",
+                f"INSERT INTO {fts_name}({fts_name}) VALUES('rebuild')",
+                f'CREATE TRIGGER IF NOT EXISTS {fts_name}_ai AFTER INSERT ON {table.name} BEGIN '
+                f'INSERT INTO {fts_name}(rowid, {column_name}) VALUES (new.{primary_key}, new.{column_name}); END',
+                f'CREATE TRIGGER IF NOT EXISTS {fts_name}_ad AFTER DELETE ON {table.name} BEGIN '
+                f"INSERT INTO {fts_name}({fts_name}, rowid, {column_name}) VALUES('delete', old.{primary_key}, "
+                f'old.{column_name}); END',
+                f'CREATE TRIGGER IF NOT EXISTS {fts_name}_au AFTER UPDATE OF {column_name} ON {table.name} BEGIN '
+                f"INSERT INTO {fts_name}({fts_name}, rowid, {column_name}) VALUES('delete', old.{primary_key}, "
+                f'old.{column_name}); '
+                f'INSERT INTO {fts_name}(rowid, {column_name}) VALUES (new.{primary_key}, new.{column_name}); END',
+            ]
+            for statement in statements:
+                connection.exec_driver_sql(statement)
+
+    @classmethod
+    def _get_sqlite_keyword_search(
+        cls, column: SearchColumn, keyword: str
+    ) -> tuple[ColumnElement[bool], ColumnElement[Any]]:
+        """
+        构造SQLite FTS5虚拟表的关键字搜索条件及相关度
+
+        :param column: 搜索的字段
+        :param keyword: 关键字
+        :return: (搜索条件, 相关度)
+        """
+        table_column = cls._get_table_column(column)
+        primary_key = next(iter(table_column.table.primary_key.columns))
+        fts_name = cls.get_sqlite_search_table_name(table_column.table.name, table_column.name)
+        fts_match = literal_column(fts_name).op('MATCH')(f'"{keyword.replace(chr(34), chr(34) * 2)}"')
+        # 匹配结果物化为CTE只执行一次全文检索，按行关联取相关度时SQLite为其建立自动索引
+        # bm25越小相关度越高，取负值使相关度与其他数据库一致按降序排列
+        match_cte = (
+            select(literal_column('rowid').label('rowid'), (-func.bm25(literal_column(fts_name))).label('relevance'))
+            .select_from(table_clause(fts_name))
+            .where(fts_match)
+            .cte(f'{fts_name}_match')
+            .prefix_with('MATERIALIZED')
+        )
+        condition = primary_key.in_(select(match_cte.c.rowid))
+        relevance = select(match_cte.c.relevance).where(match_cte.c.rowid == primary_key).scalar_subquery()
+
+        return condition, relevance
+
+    @classmethod
+    def _get_table_column(cls, column: SearchColumn) -> Column:
+        """
+        获取模型属性对应的数据表字段
+
+        :param column: 模型属性或数据表字段
+        :return: 数据表字段
+        """
+        return column.property.columns[0] if isinstance(column, InstrumentedAttribute) else column
+
+    @classmethod
+    def _listen_create_extension(cls, search_index: Index, table: Table) -> None:
+        """
+        全文索引关联数据表后，注册PostgreSQL建表前创建pg_trgm扩展
+
+        :param search_index: 索引对象
+        :param table: 数据表
+        :return:
+        """
+        event.listen(
+            table, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql')
+        )